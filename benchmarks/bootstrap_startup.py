@@ -0,0 +1,189 @@
+"""
+Time until an in-memory factory is ready, against a local mock of the Split backend.
+
+The mock server serves feature flags in pages, every flag referencing a segment, and adds a fixed
+latency to each request. Optionally it rejects segment requests with a 429 once too many of them
+are in flight, to see how the segment fetch concurrency adapts.
+
+    python benchmarks/bootstrap_startup.py --flags 2000 --segments 200 --latency 50 --max-concurrent 8
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from splitio import get_factory, get_factory_async
+from splitio.optional.loaders import asyncio
+
+
+def _raw_flag(index, segment_name):
+    """Build a raw feature flag matching users in a segment."""
+    return {
+        'name': 'flag_%d' % index,
+        'seed': index,
+        'killed': False,
+        'defaultTreatment': 'off',
+        'trafficTypeName': 'user',
+        'status': 'ACTIVE',
+        'changeNumber': 1,
+        'conditions': [{
+            'conditionType': 'WHITELIST',
+            'matcherGroup': {'combiner': 'AND', 'matchers': [{
+                'matcherType': 'IN_SEGMENT', 'negate': False, 'keySelector': None,
+                'userDefinedSegmentMatcherData': {'segmentName': segment_name}
+            }]},
+            'partitions': [{'treatment': 'on', 'size': 100}],
+            'label': 'in segment'
+        }]
+    }
+
+
+class _Backend(object):
+    """State shared by the mock server request handlers."""
+
+    def __init__(self, flags, segments, page_size, keys, latency, max_concurrent):
+        self.pages = [
+            [_raw_flag(index, 'segment_%d' % (index % segments)) for index in range(start, min(start + page_size, flags))]
+            for start in range(0, flags, page_size)
+        ]
+        self.keys = ['key_%d' % index for index in range(keys)]
+        self.latency = latency
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.segments = segments
+        self.segments_served = set()
+        self.lock = threading.Lock()
+
+    def split_changes(self, since):
+        page = since + 1 if since >= 0 else 0
+        if page >= len(self.pages):
+            return {'splits': [], 'since': since, 'till': since}
+        return {'splits': self.pages[page], 'since': since, 'till': page}
+
+    def segment_changes(self, name, since):
+        if since == -1:
+            with self.lock:
+                self.segments_served.add(name)
+            return {'name': name, 'added': self.keys, 'removed': [], 'since': -1, 'till': 1}
+        return {'name': name, 'added': [], 'removed': [], 'since': since, 'till': since}
+
+
+def _make_handler(backend):
+    """Build a request handler class bound to the backend state."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            pass
+
+        def _respond(self, status, body=None):
+            content = json.dumps(body).encode('utf-8') if body is not None else b''
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            url = urlparse(self.path)
+            since = int(parse_qs(url.query).get('since', ['-1'])[0])
+            is_segment = '/segmentChanges/' in url.path
+            with backend.lock:
+                backend.requests += 1
+                backend.in_flight += 1 if is_segment else 0
+                throttled = is_segment and backend.max_concurrent is not None and backend.in_flight > backend.max_concurrent
+                backend.throttled += 1 if throttled else 0
+            try:
+                time.sleep(backend.latency)
+                if throttled:
+                    self._respond(429)
+                elif url.path.endswith('/splitChanges'):
+                    self._respond(200, backend.split_changes(since))
+                elif is_segment:
+                    self._respond(200, backend.segment_changes(url.path.rsplit('/', 1)[1], since))
+                else:
+                    self._respond(404)
+            finally:
+                with backend.lock:
+                    backend.in_flight -= 1 if is_segment else 0
+
+        def do_POST(self):  # pylint: disable=invalid-name
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            self._respond(200)
+
+    return _Handler
+
+
+def _factory_kwargs(url):
+    return {
+        'sdk_api_base_url': url,
+        'events_api_base_url': url,
+        'auth_api_base_url': url,
+        'telemetry_api_base_url': url,
+        'config': {'streamingEnabled': False, 'featuresRefreshRate': 3600, 'segmentsRefreshRate': 3600},
+    }
+
+
+def measure(url):
+    """
+    Build a factory against the mock server and return the seconds until it's ready.
+
+    :rtype: float
+    """
+    start = time.perf_counter()
+    factory = get_factory('bench_sdk_key', **_factory_kwargs(url))
+    factory.block_until_ready(300)
+    elapsed = time.perf_counter() - start
+    event = threading.Event()
+    factory.destroy(event)
+    event.wait(10)
+    return elapsed
+
+
+async def measure_async(url):
+    """
+    Build an async factory against the mock server and return the seconds until it's ready.
+
+    :rtype: float
+    """
+    start = time.perf_counter()
+    factory = await get_factory_async('bench_sdk_key', **_factory_kwargs(url))
+    await factory.block_until_ready(300)
+    elapsed = time.perf_counter() - start
+    await factory.destroy()
+    return elapsed
+
+
+def main():
+    """Run the benchmark and print the time to ready."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--flags', type=int, default=1000, help='number of feature flags')
+    parser.add_argument('--segments', type=int, default=100, help='number of segments referenced by the flags')
+    parser.add_argument('--page-size', type=int, default=100, help='feature flags per splitChanges page')
+    parser.add_argument('--keys', type=int, default=100, help='keys per segment')
+    parser.add_argument('--latency', type=float, default=50, help='milliseconds added to every request')
+    parser.add_argument('--max-concurrent', type=int, default=None, help='answer 429 above this many segment requests in flight')
+    parser.add_argument('--mode', choices=['sync', 'asyncio'], default='sync')
+    args = parser.parse_args()
+
+    backend = _Backend(args.flags, args.segments, args.page_size, args.keys, args.latency / 1000, args.max_concurrent)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _make_handler(backend))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:%d/api' % server.server_address[1]
+    try:
+        if args.mode == 'sync':
+            elapsed = measure(url)
+        else:
+            elapsed = asyncio.run(measure_async(url))
+    finally:
+        server.shutdown()
+
+    print('%s: ready in %.2fs, %d/%d segments loaded, %d requests, %d throttled' % (
+        args.mode, elapsed, len(backend.segments_served), backend.segments, backend.requests, backend.throttled))
+
+
+if __name__ == '__main__':
+    main()
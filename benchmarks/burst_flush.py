@@ -0,0 +1,98 @@
+"""
+Impressions dropped under bursty load, and the posts it takes to send the rest.
+
+Impressions are queued in bursts into the in-memory storage while the impressions task flushes it
+to an impressions API that takes a while to answer, then at a steady trickle. The storage and
+synchronizer are compared with the way they used to flush: one bulk per run, and early only once
+the queue was already full and dropping impressions.
+
+    PYTHONPATH=. python benchmarks/burst_flush.py --bursts 40 --burst-size 2000
+"""
+import argparse
+import logging
+import time
+from unittest import mock
+
+from splitio.engine.telemetry import TelemetryStorageProducer
+from splitio.models.impressions import Impression
+from splitio.models.telemetry import CounterConstants
+from splitio.storage.inmemmory import InMemoryImpressionStorage, InMemoryImpressionStorageBase, InMemoryTelemetryStorage
+from splitio.sync.impression import ImpressionSynchronizer
+from splitio.sync.util import FlushPacer
+from splitio.tasks.impressions_sync import ImpressionsSyncTask
+
+
+class _SlowImpressionsAPI(object):  # pylint: disable=too-few-public-methods
+    """Impressions API answering after a fixed latency."""
+
+    def __init__(self, latency):
+        self._latency = latency
+        self.posts = 0
+
+    def flush_impressions(self, impressions):
+        time.sleep(self._latency)
+        self.posts += 1
+
+
+def _load(storage, bursts, burst_size, pause, steady_seconds):
+    """Queue bursts of impressions, then a steady trickle for a number of seconds."""
+    impressions = [Impression('key%d' % index, 'flag', 'on', 'label', 1, None, 1) for index in range(burst_size)]
+    for _ in range(bursts):
+        storage.put(impressions)
+        time.sleep(pause)
+
+    deadline = time.monotonic() + steady_seconds
+    while time.monotonic() < deadline:
+        storage.put(impressions[:10])
+        time.sleep(0.1)
+
+
+def measure(args):
+    """
+    Run the load and return the impressions dropped, and the posts during the bursts and steady load.
+
+    :rtype: tuple(int, int, int)
+    """
+    telemetry_storage = InMemoryTelemetryStorage()
+    runtime_producer = TelemetryStorageProducer(telemetry_storage).get_telemetry_runtime_producer()
+    storage = InMemoryImpressionStorage(args.queue_size, runtime_producer)
+    api = _SlowImpressionsAPI(args.latency)
+    synchronizer = ImpressionSynchronizer(api, storage, args.bulk_size)
+    task = ImpressionsSyncTask(synchronizer.synchronize_impressions, args.period)
+    storage.set_queue_full_hook(task.flush)
+    task.start()
+
+    _load(storage, args.bursts, args.burst_size, args.pause, 0)
+    time.sleep(args.period)  # let the last flushes and a periodic run go through
+    burst_posts = api.posts
+    _load(storage, 0, args.burst_size, args.pause, args.steady)
+    task.stop()
+    return (telemetry_storage.get_impressions_stats(CounterConstants.IMPRESSIONS_DROPPED),
+            burst_posts, api.posts - burst_posts)
+
+
+def main():
+    """Run the benchmark and print drops and posts, before and after."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bursts', type=int, default=40, help='bursts of impressions queued')
+    parser.add_argument('--burst-size', type=int, default=2000, help='impressions per burst')
+    parser.add_argument('--pause', type=float, default=0.05, help='seconds between bursts')
+    parser.add_argument('--steady', type=float, default=5, help='seconds of steady load after the bursts')
+    parser.add_argument('--queue-size', type=int, default=10000, help='impressionsQueueSize')
+    parser.add_argument('--bulk-size', type=int, default=5000, help='impressionsBulkSize')
+    parser.add_argument('--period', type=float, default=1, help='impressionsRefreshRate, in seconds')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds the api takes per post')
+    args = parser.parse_args()
+    logging.getLogger('splitio').setLevel(logging.ERROR)  # queue full warnings
+
+    with mock.patch.object(InMemoryImpressionStorageBase, '_reached_high_water', return_value=False), \
+            mock.patch.object(FlushPacer, 'keep_sending', return_value=False):
+        before = measure(args)
+    after = measure(args)
+    print('%-8s %10s %12s %12s' % ('', 'dropped', 'burst posts', 'steady posts'))
+    for name, (dropped, burst_posts, steady_posts) in (('before', before), ('after', after)):
+        print('%-8s %10d %12d %12d' % (name, dropped, burst_posts, steady_posts))
+
+
+if __name__ == '__main__':
+    main()
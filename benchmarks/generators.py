@@ -0,0 +1,132 @@
+"""
+Synthetic feature flags, segments and impressions for the benchmarks.
+
+Flags mimic what the backend usually serves: a whitelist, a segment condition and a percentage
+rollout over all keys, with a handful of attribute matchers.
+"""
+from splitio.models import splits
+from splitio.models.impressions import Impression
+from splitio.models.segments import Segment
+
+
+def raw_flag(index, segment_name=None, attributes=3):
+    """
+    Return a raw feature flag, as served by splitChanges.
+
+    :param index: Flag number, used in its name and seed.
+    :type index: int
+    :param segment_name: Segment targeted by one condition, if any.
+    :type segment_name: str
+    :param attributes: Number of attribute matchers in the attributes condition.
+    :type attributes: int
+
+    :rtype: dict
+    """
+    conditions = [{
+        'conditionType': 'WHITELIST',
+        'matcherGroup': {'combiner': 'AND', 'matchers': [{
+            'matcherType': 'WHITELIST', 'negate': False, 'keySelector': None,
+            'whitelistMatcherData': {'whitelist': ['qa_key_%d' % key for key in range(10)]}
+        }]},
+        'partitions': [{'treatment': 'on', 'size': 100}],
+        'label': 'whitelisted'
+    }, {
+        'conditionType': 'ROLLOUT',
+        'matcherGroup': {'combiner': 'AND', 'matchers': [{
+            'matcherType': 'GREATER_THAN_OR_EQUAL_TO', 'negate': False,
+            'keySelector': {'trafficType': 'user', 'attribute': 'attribute_%d' % attribute},
+            'unaryNumericMatcherData': {'dataType': 'NUMBER', 'value': 100}
+        } for attribute in range(attributes)]},
+        'partitions': [{'treatment': 'on', 'size': 50}, {'treatment': 'off', 'size': 50}],
+        'label': 'attributes'
+    }]
+    if segment_name is not None:
+        conditions.append({
+            'conditionType': 'ROLLOUT',
+            'matcherGroup': {'combiner': 'AND', 'matchers': [{
+                'matcherType': 'IN_SEGMENT', 'negate': False,
+                'keySelector': {'trafficType': 'user', 'attribute': None},
+                'userDefinedSegmentMatcherData': {'segmentName': segment_name}
+            }]},
+            'partitions': [{'treatment': 'on', 'size': 100}],
+            'label': 'in segment %s' % segment_name
+        })
+    conditions.append({
+        'conditionType': 'ROLLOUT',
+        'matcherGroup': {'combiner': 'AND', 'matchers': [{
+            'matcherType': 'ALL_KEYS', 'negate': False,
+            'keySelector': {'trafficType': 'user', 'attribute': None}
+        }]},
+        'partitions': [{'treatment': 'on', 'size': 10}, {'treatment': 'off', 'size': 90}],
+        'label': 'default rule'
+    })
+    return {
+        'name': 'flag_%d' % index,
+        'seed': index,
+        'trafficAllocation': 100,
+        'trafficAllocationSeed': index,
+        'killed': False,
+        'defaultTreatment': 'off',
+        'trafficTypeName': 'user',
+        'status': 'ACTIVE',
+        'changeNumber': 1000 + index,
+        'algo': 2,
+        'configurations': {'on': '{"color": "blue"}'},
+        'sets': ['set_%d' % (index % 10)],
+        'conditions': conditions
+    }
+
+
+def raw_flags(count, segment_count):
+    """
+    Return raw feature flags, every one targeting one of `segment_count` segments.
+
+    :rtype: list(dict)
+    """
+    return [raw_flag(index, segment_name(index % segment_count) if segment_count else None) for index in range(count)]
+
+
+def flags(count, segment_count):
+    """
+    Return parsed feature flags, every one targeting one of `segment_count` segments.
+
+    :rtype: list(splitio.models.splits.Split)
+    """
+    return [splits.from_raw(flag) for flag in raw_flags(count, segment_count)]
+
+
+def segment_name(index):
+    """Return the name of a segment."""
+    return 'segment_%d' % index
+
+
+def segment_keys(count, prefix='user_key'):
+    """
+    Return keys shaped like user ids.
+
+    :rtype: list(str)
+    """
+    return ['%s_%012d' % (prefix, index) for index in range(count)]
+
+
+def segments(count, key_count):
+    """
+    Return segments holding every other key of `key_count` keys.
+
+    :rtype: list(splitio.models.segments.Segment)
+    """
+    return [Segment(segment_name(index), segment_keys(key_count)[index % 2::2], 2000 + index) for index in range(count)]
+
+
+def impressions(count, flag_count, key_count):
+    """
+    Return impressions of `key_count` keys over `flag_count` flags.
+
+    :rtype: list(splitio.models.impressions.Impression)
+    """
+    keys = segment_keys(key_count)
+    return [
+        Impression(keys[index % key_count], 'flag_%d' % (index % flag_count), 'on' if index % 3 else 'off',
+                   'default rule', 1000 + index % flag_count, None, 1700000000000 + index)
+        for index in range(count)
+    ]
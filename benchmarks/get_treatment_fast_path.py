@@ -0,0 +1,102 @@
+"""
+Per-call cost of validating get_treatment input and handing back its result.
+
+Compares the way the client used to do it with the way it does it now: validating the key and flag
+name on every call against caching the ones already seen valid, and evaluating into nested dicts
+against a slotted result record. Keys are drawn from a small pool, the way a service evaluates
+several flags for each user it serves. The whole call is tracked by the `client_get_treatment` case
+of the suite, where the evaluation itself dominates.
+
+    PYTHONPATH=. python benchmarks/get_treatment_fast_path.py --calls 200000
+"""
+import argparse
+import time
+from unittest import mock
+
+from splitio.client import input_validator
+from splitio.client.client import Client, _InvalidInputError
+from splitio.engine.evaluator import EvaluationResult, CONTROL
+from splitio.models.impressions import Label
+from splitio.models.telemetry import MethodExceptionsAndLatencies
+
+import generators
+
+
+def _validate_every_call(key, feature, attributes, method):
+    """Validation the way it used to be: every input, every call."""
+    matching_key, bucketing_key = input_validator.validate_key(key, 'get_' + method.value)
+    if not matching_key:
+        raise _InvalidInputError()
+
+    feature = input_validator.validate_feature_flag_name(feature, 'get_' + method.value)
+    if not feature:
+        raise _InvalidInputError()
+
+    if not input_validator.validate_attributes(attributes, 'get_' + method.value):
+        raise _InvalidInputError()
+
+    return matching_key, bucketing_key, feature, attributes
+
+
+def _best(run, calls, repeat):
+    """Return the nanoseconds per call of the fastest of `repeat` runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        run(calls)
+        elapsed = (time.perf_counter_ns() - start) / calls
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    """Run the benchmark and print the cost per call, before and after."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=200000, help='calls per run')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per case, the fastest is kept')
+    args = parser.parse_args()
+
+    method = MethodExceptionsAndLatencies.TREATMENT
+    keys = generators.segment_keys(1000)
+    names = ['flag_%d' % index for index in range(100)]
+    attributes = {'attribute_0': 150, 'attribute_1': 50, 'attribute_2': 150}
+    flags = dict.fromkeys(names, object())
+    cached = Client(mock.Mock(), mock.Mock(), True)
+
+    def validate_uncached(calls):
+        for index in range(calls):
+            _, _, feature, _ = _validate_every_call(keys[index % 1000], names[index % 100], attributes, method)
+            input_validator.validate_feature_flag_names({feature: flags.get(feature)}, 'get_' + method.value)
+
+    def validate_cached(calls):
+        for index in range(calls):
+            _, _, feature, _ = cached._validate_treatment_input(keys[index % 1000], names[index % 100], attributes, method)
+            if flags.get(feature) is None:
+                input_validator.validate_feature_flag_names({feature: None}, 'get_' + method.value)
+
+    def result_dict(calls):
+        for index in range(calls):
+            result = {'treatment': CONTROL, 'configurations': None,
+                      'impression': {'label': Label.KILLED, 'change_number': index}}
+            (result['treatment'], result['impression']['label'], result['impression']['change_number'],
+             result['configurations'])
+
+    def result_record(calls):
+        for index in range(calls):
+            result = EvaluationResult(CONTROL, None, Label.KILLED, index)
+            result.treatment, result.label, result.change_number, result.configurations  # pylint: disable=pointless-statement
+
+    cases = [
+        ('validate', validate_uncached, validate_cached),
+        ('result', result_dict, result_record),
+    ]
+    print('%-14s %10s %10s' % ('', 'before', 'after'))
+    for name, before, after in cases:
+        before(1000)
+        after(1000)
+        print('%-14s %7.0f ns %7.0f ns' % (name, _best(before, args.calls, args.repeat),
+                                          _best(after, args.calls, args.repeat)))
+
+
+if __name__ == '__main__':
+    main()
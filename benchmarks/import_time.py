@@ -0,0 +1,87 @@
+"""
+Cold start cost of importing the SDK and building a factory.
+
+Every run starts a fresh interpreter, imports the SDK and builds a factory for one operation mode
+against backends that aren't there (nothing is synchronized), then reports how long that took and
+which of the heavier third party packages ended up imported. Python's own `-X importtime` output
+can be used to break the time down further.
+
+    PYTHONPATH=. python benchmarks/import_time.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PACKAGES = ['aiohttp', 'aiofiles', 'redis', 'requests', 'yaml', 'bloom_filter2']
+
+_SCRIPT = '''
+import os, sys, time
+start = time.perf_counter()
+from splitio import get_factory
+factory = get_factory(%(sdk_key)r, config=%(config)r, **%(kwargs)r)
+elapsed = time.perf_counter() - start
+print(elapsed, ','.join(package for package in %(packages)r if package in sys.modules), flush=True)
+os._exit(0)
+'''
+
+_UNREACHABLE = 'http://127.0.0.1:9/api'
+
+
+def modes(split_file):
+    """
+    Return the sdk key, config and extra arguments building a factory, by operation mode.
+
+    :rtype: dict
+    """
+    return {
+        'memory': ('some_sdk_key', {'streamingEnabled': False}, {
+            'sdk_api_base_url': _UNREACHABLE, 'events_api_base_url': _UNREACHABLE,
+            'auth_api_base_url': _UNREACHABLE, 'telemetry_api_base_url': _UNREACHABLE,
+        }),
+        'redis': ('some_sdk_key', {'redisHost': '127.0.0.1', 'redisPort': 9}, {}),
+        'localhost': ('localhost', {'splitFile': split_file}, {}),
+    }
+
+
+def measure(sdk_key, config, kwargs):
+    """
+    Build a factory in a fresh interpreter and return the seconds it took and the packages imported.
+
+    :rtype: tuple(float, list(str))
+    """
+    script = _SCRIPT % {'sdk_key': sdk_key, 'config': config, 'kwargs': kwargs, 'packages': PACKAGES}
+    process = subprocess.run([sys.executable, '-c', script], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                             check=False, env=dict(os.environ, PYTHONDONTWRITEBYTECODE='1'))
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.decode().strip().splitlines()[-1])
+    elapsed, _, packages = process.stdout.decode().strip().partition(' ')
+    return float(elapsed), [package for package in packages.split(',') if package]
+
+
+def main():
+    """Run the benchmark and print the median cold start by mode."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='interpreters started per mode')
+    parser.add_argument('--mode', action='append', choices=['memory', 'redis', 'localhost'], help='modes to measure')
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.yaml') as split_file:
+        split_file.write('- my_feature:\n    treatment: "on"\n')
+        split_file.flush()
+        for mode, (sdk_key, config, kwargs) in modes(split_file.name).items():
+            if args.mode and mode not in args.mode:
+                continue
+            try:
+                runs = [measure(sdk_key, config, kwargs) for _ in range(args.runs)]
+            except RuntimeError as exc:
+                print('%-10s failed: %s' % (mode, exc))
+                continue
+            print('%-10s %7.1f ms  imports: %s' % (mode, statistics.median(run[0] for run in runs) * 1000,
+                                                  ', '.join(runs[-1][1]) or '-'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Overhead of measuring and recording the latency of a client method call.
+
+Times a call, maps the latency to its telemetry bucket and counts it, the way the client and the
+in-memory telemetry storage do, and the way it used to be done: epoch milliseconds and an if/elif
+chain over the methods under a lock. Calls are spread over a number of threads to show the cost of
+contention on the counters.
+
+    python benchmarks/method_latency.py --calls 1000000 --threads 4
+"""
+import argparse
+import threading
+import time
+from bisect import bisect_left
+from time import perf_counter_ns
+
+from splitio.models.telemetry import MethodLatencies, MethodLatencyHistograms, MethodExceptionsAndLatencies, \
+    get_latency_bucket_index, BUCKETS, MAX_LATENCY, MAX_LATENCY_BUCKET_COUNT
+from splitio.util.time import get_current_epoch_time_ms
+
+
+class _LockedMethodLatencies(object):
+    """Latency counters the way they used to be: one list per method, guarded by a lock."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._treatment = [0] * MAX_LATENCY_BUCKET_COUNT
+        self._treatments = [0] * MAX_LATENCY_BUCKET_COUNT
+        self._track = [0] * MAX_LATENCY_BUCKET_COUNT
+
+    def add_latency(self, method, latency):
+        if latency > MAX_LATENCY:
+            latency_bucket = len(BUCKETS) - 1
+        else:
+            latency_bucket = bisect_left(BUCKETS, latency)
+        with self._lock:
+            if method == MethodExceptionsAndLatencies.TREATMENT:
+                self._treatment[latency_bucket] += 1
+            elif method == MethodExceptionsAndLatencies.TREATMENTS:
+                self._treatments[latency_bucket] += 1
+            elif method == MethodExceptionsAndLatencies.TRACK:
+                self._track[latency_bucket] += 1
+
+
+def _record_locked(latencies, calls):
+    """Time calls in epoch milliseconds and count them under a lock."""
+    method = MethodExceptionsAndLatencies.TREATMENT
+    for _ in range(calls):
+        start = get_current_epoch_time_ms()
+        latencies.add_latency(method, get_current_epoch_time_ms() - start)
+
+
+def _record(latencies, calls):
+    """Time calls with the monotonic clock and count them lock-free."""
+    method = MethodExceptionsAndLatencies.TREATMENT
+    for _ in range(calls):
+        start = perf_counter_ns()
+        latencies.add_bucket(method, get_latency_bucket_index((perf_counter_ns() - start) // 1000))
+
+
+def _record_histograms(histograms, calls):
+    """Time calls with the monotonic clock and record them in histograms."""
+    method = MethodExceptionsAndLatencies.TREATMENT
+    for _ in range(calls):
+        start = perf_counter_ns()
+        histograms.record(method, (perf_counter_ns() - start) // 1000)
+
+
+def _noop(_, calls):
+    """Loop without measuring, to subtract the loop cost."""
+    for _ in range(calls):
+        pass
+
+
+def measure(func, target, calls, threads):
+    """
+    Run a function over `calls` split across threads and return the nanoseconds each call took.
+
+    :rtype: float
+    """
+    workers = [threading.Thread(target=func, args=(target, calls // threads)) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - start) * 1e9 / calls
+
+
+def main():
+    """Run the benchmark and print the overhead per call."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=1000000, help='calls to measure')
+    parser.add_argument('--threads', type=int, default=4, help='threads making the calls')
+    args = parser.parse_args()
+
+    loop = measure(_noop, None, args.calls, args.threads)
+    locked = measure(_record_locked, _LockedMethodLatencies(), args.calls, args.threads)
+    latencies = MethodLatencies()
+    lock_free = measure(_record, latencies, args.calls, args.threads)
+    recorded = sum(latencies.pop_all()['methodLatencies']['treatment'])
+    assert recorded == args.calls // args.threads * args.threads
+    print('%-12s %7.0f ns/call' % ('locked', locked - loop))
+    print('%-12s %7.0f ns/call' % ('lock-free', lock_free - loop))
+
+    try:
+        histograms = MethodLatencyHistograms()
+    except NotImplementedError:
+        return
+    print('%-12s %7.0f ns/call' % ('histograms', measure(_record_histograms, histograms, args.calls, args.threads) - loop))
+
+
+if __name__ == '__main__':
+    main()
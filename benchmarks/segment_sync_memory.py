@@ -0,0 +1,94 @@
+"""
+Peak memory of a first-time segment synchronization.
+
+Serves a segmentChanges body with a configurable number of keys through a stub http client and
+measures, with tracemalloc, the peak memory allocated while SegmentSynchronizer fetches, parses
+and stores it. Runs once with the standard library parser and once with orjson when installed.
+
+    python benchmarks/segment_sync_memory.py --keys 1000000
+"""
+import argparse
+import json
+import tracemalloc
+from unittest import mock
+
+from splitio.api import commons
+from splitio.api.client import HttpResponse
+from splitio.api.segments import SegmentsAPI
+from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage
+from splitio.sync.segment import SegmentSynchronizer
+
+
+class _StubHttpClient(object):
+    """Http client serving a fixed segmentChanges page, and an empty one afterwards."""
+
+    def __init__(self, body, till):
+        self._body = body
+        self._till = till
+
+    def set_telemetry_data(self, metric_name, telemetry_runtime_producer):
+        pass
+
+    def get(self, server, path, sdk_key, query=None, extra_headers=None):  # pylint: disable=too-many-arguments
+        if query['since'] == -1:
+            return HttpResponse(200, self._body, {})
+
+        return HttpResponse(200, json.dumps({'name': 'segment', 'added': [], 'removed': [],
+                                             'since': self._till, 'till': self._till}), {})
+
+
+def _build_body(key_count):
+    """Return a segmentChanges body holding `key_count` keys."""
+    return json.dumps({
+        'name': 'segment',
+        'added': ['user_key_%012d' % index for index in range(key_count)],
+        'removed': [],
+        'since': -1,
+        'till': 1
+    })
+
+
+def measure(body, decoder):
+    """
+    Synchronize the segment and return the peak memory traced, in bytes.
+
+    :param body: segmentChanges response body.
+    :type body: str
+    :param decoder: JSON decoding function used by the api.
+    :type decoder: callable
+
+    :rtype: int
+    """
+    api = SegmentsAPI(_StubHttpClient(body, 1), 'some_key', mock.Mock(sdk_version='bench', instance_ip='NA'), mock.Mock())
+    synchronizer = SegmentSynchronizer(api, InMemorySplitStorage(), InMemorySegmentStorage())
+    with mock.patch('splitio.api.segments.decode_json', new=decoder):
+        tracemalloc.start()
+        synchronizer._fetch_until('segment', commons.FetchOptions())  # pylint: disable=protected-access
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    synchronizer.shutdown()
+    return peak
+
+
+def main():
+    """Run the benchmark and print peak memory per decoder."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--keys', type=int, default=500000, help='number of keys in the segment')
+    args = parser.parse_args()
+
+    body = _build_body(args.keys)
+    decoders = [('json', json.loads)]
+    try:
+        import orjson
+        decoders.append(('orjson', orjson.loads))
+    except ImportError:
+        pass
+
+    print('segment keys: %d, body: %.1f MiB' % (args.keys, len(body) / 2 ** 20))
+    for name, decoder in decoders:
+        peak = measure(body, decoder)
+        print('%-8s peak: %.1f MiB (%.2fx body)' % (name, peak / 2 ** 20, peak / len(body)))
+
+
+if __name__ == '__main__':
+    main()
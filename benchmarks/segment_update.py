@@ -0,0 +1,78 @@
+"""
+Latency and memory of incremental updates to a large in-memory segment.
+
+Stores a segment with a configurable number of keys and applies small deltas through
+InMemorySegmentStorage.update, reporting the mean time per update and, with tracemalloc, the peak
+memory allocated by one update. The same deltas are also applied rebuilding the key set, as
+segments used to be updated, for comparison.
+
+    python benchmarks/segment_update.py --keys 10000000 --changes 3
+"""
+import argparse
+import time
+import tracemalloc
+
+from splitio.models.segments import Segment
+from splitio.storage.inmemmory import InMemorySegmentStorage
+
+
+class _RebuildSegment(Segment):
+    """Segment applying updates by building new key sets."""
+
+    def update(self, to_add, to_remove):
+        self._keys = self._keys.union(set(to_add)).difference(to_remove)
+
+
+def _deltas(count, changes):
+    """Return `count` deltas adding and removing `changes` keys each."""
+    return [
+        (['new_key_%d_%d' % (index, change) for change in range(changes)],
+         ['user_key_%012d' % (index * changes + change) for change in range(changes)])
+        for index in range(count)
+    ]
+
+
+def measure(segment, deltas):
+    """
+    Apply the deltas to the segment and return the mean seconds per update and the peak bytes of one.
+
+    :param segment: Segment to update.
+    :type segment: splitio.models.segments.Segment
+    :param deltas: Keys to add and remove on each update.
+    :type deltas: list(tuple)
+
+    :rtype: tuple(float, int)
+    """
+    storage = InMemorySegmentStorage()
+    storage.put(segment)
+    start = time.perf_counter()
+    for change_number, (to_add, to_remove) in enumerate(deltas[1:]):
+        storage.update(segment.name, to_add, to_remove, change_number)
+    mean = (time.perf_counter() - start) / max(1, len(deltas) - 1)
+
+    to_add, to_remove = deltas[0]
+    tracemalloc.start()
+    storage.update(segment.name, to_add, to_remove, len(deltas))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return mean, peak
+
+
+def main():
+    """Run the benchmark and print update latency and memory per strategy."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--keys', type=int, default=1000000, help='number of keys in the segment')
+    parser.add_argument('--changes', type=int, default=3, help='keys added and removed on each update')
+    parser.add_argument('--updates', type=int, default=20, help='number of updates to time')
+    args = parser.parse_args()
+
+    keys = ['user_key_%012d' % index for index in range(args.keys)]
+    deltas = _deltas(args.updates + 1, args.changes)
+    print('segment keys: %d, keys changed per update: %d' % (args.keys, args.changes * 2))
+    for name, segment_class in [('in place', Segment), ('rebuild', _RebuildSegment)]:
+        mean, peak = measure(segment_class('segment', keys, 1), deltas)
+        print('%-8s update: %10.3f ms, peak: %8.1f KiB' % (name, mean * 1000, peak / 2 ** 10))
+
+
+if __name__ == '__main__':
+    main()
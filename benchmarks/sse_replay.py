@@ -0,0 +1,181 @@
+"""
+Throughput of reading and parsing a streaming notifications channel.
+
+Replays an event stream, as recorded from the streaming endpoint or generated with gzip compressed
+instant feature flag updates, through the sse client reader and the push parser. The stream is
+served as a chunked http response, read with http.client like the sse client does. The same stream
+is also handled the way it used to be, reading line by line and decoding through intermediate
+strings, for comparison.
+
+    python benchmarks/sse_replay.py --events 5000 --conditions 50
+    python benchmarks/sse_replay.py --file recorded_stream.txt
+"""
+import argparse
+import base64
+import gzip
+import io
+import json
+import time
+from http.client import HTTPResponse
+
+from splitio.push.parser import parse_incoming_event, decode_feature_flag_definition, SplitChangeUpdate
+from splitio.push.sse import EventBuffer, SSEEvent
+
+
+def _raw_flag(index, conditions):
+    """Build a raw feature flag with a number of whitelist conditions."""
+    return {
+        'name': 'flag_%d' % index,
+        'seed': index,
+        'killed': False,
+        'defaultTreatment': 'off',
+        'trafficTypeName': 'user',
+        'status': 'ACTIVE',
+        'changeNumber': index,
+        'conditions': [{
+            'conditionType': 'WHITELIST',
+            'matcherGroup': {'combiner': 'AND', 'matchers': [{
+                'matcherType': 'WHITELIST', 'negate': False, 'keySelector': None,
+                'whitelistMatcherData': {'whitelist': ['key_%d_%d' % (condition, key) for key in range(20)]}
+            }]},
+            'partitions': [{'treatment': 'on', 'size': 100}],
+            'label': 'condition %d' % condition
+        } for condition in range(conditions)]
+    }
+
+
+def _build_stream(events, conditions):
+    """Return an event stream of instant feature flag updates with keepalive comments in between."""
+    stream = io.BytesIO()
+    for index in range(events):
+        payload = base64.b64encode(gzip.compress(json.dumps(_raw_flag(index, conditions)).encode('utf-8')))
+        data = json.dumps({
+            'id': 'event_%d' % index,
+            'timestamp': 1591996755043,
+            'encoding': 'json',
+            'channel': 'xxxx_xxxx_splits',
+            'data': json.dumps({'type': 'SPLIT_UPDATE', 'changeNumber': index + 1, 'pcn': index,
+                                'c': 1, 'd': payload.decode('utf-8')})
+        })
+        stream.write(('id: event_%d\r\nevent: message\r\ndata: %s\r\n\r\n' % (index, data)).encode('utf-8'))
+        if index % 10 == 0:
+            stream.write(b':keepalive\n\n')
+    return stream.getvalue()
+
+
+class _ReplaySocket(object):
+    """Socket serving a recorded stream as a chunked http response."""
+
+    def __init__(self, stream, chunk_size):
+        response = io.BytesIO()
+        response.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n\r\n')
+        for start in range(0, len(stream), chunk_size):
+            chunk = stream[start:start + chunk_size]
+            response.write(b'%X\r\n%s\r\n' % (len(chunk), chunk))
+        response.write(b'0\r\n\r\n')
+        self._response = response.getvalue()
+
+    def makefile(self, mode):  # pylint: disable=unused-argument
+        return io.BufferedReader(io.BytesIO(self._response))
+
+    def response(self):
+        """Return an http response reading from this socket."""
+        response = HTTPResponse(self)
+        response.begin()
+        return response
+
+
+def _read_lines(replay_socket):
+    """Split the stream into events reading line by line, decoding every field as it comes."""
+    events = []
+    lines = {}
+    response = replay_socket.response()
+    for line in iter(response.readline, b''):
+        if line.startswith(b':'):
+            continue
+        if line in (b'\n', b'\r\n'):
+            events.append(SSEEvent(lines.get('id'), lines.get('event'), lines.get('retry'), lines.get('data')))
+            lines = {}
+            continue
+        try:
+            key, val = line.split(b':', 1)
+            lines[key.decode('utf8').strip()] = val.decode('utf8').strip()
+        except ValueError:
+            lines[line.decode('utf8').strip()] = None
+    return events
+
+
+def _read_buffered(replay_socket, read_size):
+    """Split the stream into events feeding reads of up to `read_size` bytes to the event buffer."""
+    events = []
+    event_buffer = EventBuffer()
+    response = replay_socket.response()
+    for chunk in iter(lambda: response.read1(read_size), b''):
+        events.extend(event_buffer.feed(chunk))
+    return events
+
+
+def _parse_strings(events):
+    """Parse events and instant updates the way they used to be, through intermediate strings."""
+    for event in events:
+        if event.data is None:
+            continue
+        message = json.loads(json.loads(event.data)['data'])
+        if message.get('d') is not None:
+            json.loads(gzip.decompress(base64.b64decode(message['d'])).decode('utf-8'))
+
+
+def _parse(events):
+    """Parse events with the push parser and decode their instant updates."""
+    for event in events:
+        if event.data is None:
+            continue
+        parsed = parse_incoming_event(event)
+        if isinstance(parsed, SplitChangeUpdate) and parsed.feature_flag_definition is not None:
+            decode_feature_flag_definition(parsed)
+
+
+def measure(func, *args):
+    """
+    Run a function and return its result and the seconds it took.
+
+    :rtype: tuple(object, float)
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark and print read and parse throughput."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--file', help='recorded event stream to replay, generated when missing')
+    parser.add_argument('--events', type=int, default=2000, help='instant updates in the generated stream')
+    parser.add_argument('--conditions', type=int, default=50, help='conditions per generated feature flag')
+    parser.add_argument('--chunk-size', type=int, default=4096, help='bytes per http chunk of the response')
+    parser.add_argument('--read-size', type=int, default=64 * 1024, help='bytes per read from the response')
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, 'rb') as stream_file:
+            stream = stream_file.read()
+    else:
+        stream = _build_stream(args.events, args.conditions)
+
+    replay_socket = _ReplaySocket(stream, args.chunk_size)
+    line_events, line_read = measure(_read_lines, replay_socket)
+    buffer_events, buffer_read = measure(_read_buffered, replay_socket, args.read_size)
+    assert [event for event in line_events if event.data] == [event for event in buffer_events if event.data]
+    _, strings_parse = measure(_parse_strings, line_events)
+    _, parse = measure(_parse, buffer_events)
+
+    count = len([event for event in buffer_events if event.data])
+    print('stream: %.1f MiB, %d events' % (len(stream) / 2 ** 20, count))
+    print('%-9s read: %8.1f ms, parse: %8.1f ms, %9.0f events/s' % (
+        'lines', line_read * 1000, strings_parse * 1000, count / (line_read + strings_parse)))
+    print('%-9s read: %8.1f ms, parse: %8.1f ms, %9.0f events/s' % (
+        'buffered', buffer_read * 1000, parse * 1000, count / (buffer_read + parse)))
+
+
+if __name__ == '__main__':
+    main()
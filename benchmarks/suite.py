@@ -0,0 +1,338 @@
+"""
+Benchmark suite of the evaluation, impression and synchronization hot paths.
+
+Runs every case over synthetic flags, segments and impressions, reporting operations per second and
+the peak memory allocated per call, traced with tracemalloc. Everything runs in process, with no
+network: redis cases use fakeredis as a local stand-in and are skipped when it's not installed, and
+pluggable cases use a dict backed adapter.
+
+Results can be saved and later compared against, failing when any case got slower or allocates
+more than a threshold. Saving a baseline from the target branch and comparing on the same machine
+keeps the comparison meaningful on shared CI runners:
+
+    python benchmarks/suite.py --save baseline.json
+    python benchmarks/suite.py --baseline baseline.json --threshold 0.15
+    python benchmarks/suite.py --scale 0.1 --filter evaluator
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+from splitio.api.commons import FetchOptions
+from splitio.api.impressions import ImpressionsAPIBase
+from splitio.api.segments import SegmentsAPI
+from splitio.client.factory import SplitFactory
+from splitio.engine.evaluator import Evaluator, EvaluationDataFactory
+from splitio.engine.impressions.impressions import Manager as ImpressionsManager
+from splitio.engine.impressions.manager import Observer
+from splitio.engine.impressions.strategies import StrategyOptimizedMode
+from splitio.engine.impressions.unique_keys_tracker import UniqueKeysTracker
+from splitio.engine.splitters import Splitter
+from splitio.engine.telemetry import TelemetryStorageProducer
+from splitio.models.segments import Segment
+from splitio.recorder.recorder import StandardRecorder
+from splitio.storage.adapters.redis import RedisAdapter
+from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage, InMemoryImpressionStorage, \
+    InMemoryEventStorage, InMemoryTelemetryStorage
+from splitio.storage.pluggable import PluggableSplitStorage
+from splitio.storage.redis import RedisSplitStorage
+from splitio.sync.segment import SegmentSynchronizer
+
+import generators
+import segment_sync_memory
+import segment_update
+import sse_replay
+import telemetry_counters
+
+
+def _in_memory_storages(flag_count, segment_count, key_count):
+    """Return in-memory flag and segment storages filled with synthetic data."""
+    split_storage = InMemorySplitStorage()
+    split_storage.update(generators.flags(flag_count, segment_count), [], 1)
+    segment_storage = InMemorySegmentStorage()
+    for segment in generators.segments(segment_count, key_count):
+        segment_storage.put(segment)
+    return split_storage, segment_storage
+
+
+def _client_get_treatment(scale):
+    """Client.get_treatment of one flag, over in-memory storages with impressions in optimized mode."""
+    flag_count = int(500 * scale) or 1
+    split_storage, segment_storage = _in_memory_storages(flag_count, 10, int(100000 * scale) or 1)
+    telemetry_producer = TelemetryStorageProducer(InMemoryTelemetryStorage())
+    runtime_producer = telemetry_producer.get_telemetry_runtime_producer()
+    impression_storage = InMemoryImpressionStorage(1000000, runtime_producer)
+    impressions_manager = ImpressionsManager(StrategyOptimizedMode(), runtime_producer)
+    recorder = StandardRecorder(impressions_manager, InMemoryEventStorage(1000, runtime_producer), impression_storage,
+                                telemetry_producer.get_telemetry_evaluation_producer(), runtime_producer,
+                                imp_counter=mock.Mock())
+    factory = SplitFactory('bench', {'splits': split_storage, 'segments': segment_storage,
+                                     'impressions': impression_storage, 'events': mock.Mock()},
+                           True, recorder, telemetry_producer=telemetry_producer,
+                           telemetry_init_producer=telemetry_producer.get_telemetry_init_producer())
+    client = factory.client()
+    keys = generators.segment_keys(1000)
+    attributes = {'attribute_0': 150, 'attribute_1': 50, 'attribute_2': 150}
+    state = {'index': 0}
+
+    def run():
+        index = state['index'] = state['index'] + 1
+        client.get_treatment(keys[index % 1000], 'flag_%d' % (index % min(100, flag_count)), attributes)
+    return run, 1
+
+
+def _evaluator_eval_many_with_context(scale):
+    """Evaluator.eval_many_with_context of 20 flags with their context already fetched."""
+    split_storage, segment_storage = _in_memory_storages(int(500 * scale) or 1, 10, int(100000 * scale) or 1)
+    evaluator = Evaluator(Splitter())
+    names = ['flag_%d' % index for index in range(min(20, split_storage.get_splits_count()))]
+    contexts = [(key, EvaluationDataFactory(split_storage, segment_storage).context_for(key, names))
+                for key in generators.segment_keys(100)]
+    attributes = {'attribute_0': 150, 'attribute_1': 50, 'attribute_2': 150}
+
+    def run():
+        for key, context in contexts:
+            evaluator.eval_many_with_context(key, None, names, attributes, context)
+    return run, len(contexts) * len(names)
+
+
+def _observer_test_and_set(scale):
+    """Observer.test_and_set of impressions, half of them already seen."""
+    impressions = generators.impressions(int(20000 * scale) or 1, 50, int(10000 * scale) or 1)
+    observer = Observer(len(impressions) // 2)
+
+    def run():
+        for impression in impressions:
+            observer.test_and_set(impression)
+    return run, len(impressions)
+
+
+def _telemetry_record(scale):
+    """Telemetry recorded by a get_treatment call: latency, impressions queued and deduped."""
+    storage = InMemoryTelemetryStorage()
+    calls = max(1, int(1000 * scale))
+
+    def run():
+        telemetry_counters._record(storage, calls)
+    return run, calls
+
+
+def _unique_keys_track(scale):
+    """UniqueKeysTracker.track of keys over 50 flags, popped whenever the tracker is full."""
+    keys = generators.segment_keys(int(20000 * scale) or 1)
+    tracker = UniqueKeysTracker(len(keys) // 2 or 1)
+    tracker.set_queue_full_hook(tracker.get_cache_info_and_pop_all)
+
+    def run():
+        tracker.clear_filter()
+        for index, key in enumerate(keys):
+            tracker.track(key, 'flag_%d' % (index % 50))
+    return run, len(keys)
+
+
+def _impressions_build_bulk(scale):
+    """ImpressionsAPIBase._build_bulk of a bulk of impressions over 50 flags."""
+    impressions = generators.impressions(int(10000 * scale) or 1, 50, 5000)
+
+    def run():
+        ImpressionsAPIBase._build_bulk(impressions)  # pylint: disable=protected-access
+    return run, len(impressions)
+
+
+def _segment_update(scale):
+    """Segment.update of a large segment, adding and removing a few keys."""
+    segment = Segment('large', generators.segment_keys(int(1000000 * scale) or 1), 1)
+    deltas = segment_update._deltas(100, 10)  # pylint: disable=protected-access
+    state = {'index': 0}
+
+    def run():
+        to_add, to_remove = deltas[state['index'] % len(deltas)]
+        state['index'] += 1
+        segment.update(to_add, to_remove)
+        segment.update(to_remove, to_add)
+    return run, 2
+
+
+def _segment_sync(scale):
+    """First-time fetch of a segment through SegmentsAPI and SegmentSynchronizer."""
+    body = segment_sync_memory._build_body(int(100000 * scale) or 1)  # pylint: disable=protected-access
+    metadata = mock.Mock(sdk_version='bench', instance_ip='NA')
+
+    def run():
+        api = SegmentsAPI(segment_sync_memory._StubHttpClient(body, 1), 'bench', metadata, mock.Mock())  # pylint: disable=protected-access
+        synchronizer = SegmentSynchronizer(api, InMemorySplitStorage(), InMemorySegmentStorage())
+        synchronizer._fetch_until('segment', FetchOptions())  # pylint: disable=protected-access
+        synchronizer.shutdown()
+    return run, 1
+
+
+def _sse_read_and_parse(scale):
+    """Reading instant feature flag updates from an event stream and parsing them."""
+    replay_socket = sse_replay._ReplaySocket(sse_replay._build_stream(int(200 * scale) or 1, 20), 4096)  # pylint: disable=protected-access
+
+    def run():
+        events = sse_replay._read_buffered(replay_socket, 64 * 1024)  # pylint: disable=protected-access
+        sse_replay._parse(events)  # pylint: disable=protected-access
+    return run, int(200 * scale) or 1
+
+
+def _redis_fetch_many(scale):
+    """RedisSplitStorage.fetch_many of 20 flags from a local redis stand-in."""
+    try:
+        import fakeredis  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+
+    client = fakeredis.FakeStrictRedis(decode_responses=True)
+    raw_flags = generators.raw_flags(int(500 * scale) or 1, 10)
+    for raw_flag in raw_flags:
+        client.set('SPLITIO.split.' + raw_flag['name'], json.dumps(raw_flag))
+    storage = RedisSplitStorage(RedisAdapter(client))
+    names = [raw_flag['name'] for raw_flag in raw_flags[:20]]
+
+    def run():
+        storage.fetch_many(names)
+    return run, len(names)
+
+
+class _DictAdapter(object):
+    """Pluggable storage adapter keeping items in a dict."""
+
+    def __init__(self):
+        self._items = {}
+
+    def get(self, key):
+        return self._items.get(key)
+
+    def get_many(self, keys):
+        return [self._items[key] for key in keys if key in self._items]
+
+    def set(self, key, value):
+        self._items[key] = value
+
+
+def _pluggable_fetch_many(scale):
+    """PluggableSplitStorage.fetch_many of 20 flags from a dict backed adapter."""
+    adapter = _DictAdapter()
+    raw_flags = generators.raw_flags(int(500 * scale) or 1, 10)
+    for raw_flag in raw_flags:
+        adapter.set('SPLITIO.split.' + raw_flag['name'], raw_flag)
+    storage = PluggableSplitStorage(adapter)
+    names = [raw_flag['name'] for raw_flag in raw_flags[:20]]
+
+    def run():
+        storage.fetch_many(names)
+    return run, len(names)
+
+
+CASES = (
+    ('client_get_treatment', _client_get_treatment),
+    ('evaluator_eval_many_with_context', _evaluator_eval_many_with_context),
+    ('observer_test_and_set', _observer_test_and_set),
+    ('telemetry_record', _telemetry_record),
+    ('unique_keys_track', _unique_keys_track),
+    ('impressions_build_bulk', _impressions_build_bulk),
+    ('segment_update', _segment_update),
+    ('segment_sync', _segment_sync),
+    ('sse_read_and_parse', _sse_read_and_parse),
+    ('redis_fetch_many', _redis_fetch_many),
+    ('pluggable_fetch_many', _pluggable_fetch_many),
+)
+
+
+def measure(run, ops, min_time, repeat):
+    """
+    Call `run` for at least `min_time` seconds, `repeat` times, and trace the memory of one call.
+
+    :param run: Function running the case once.
+    :type run: callable
+    :param ops: Operations performed by each call.
+    :type ops: int
+
+    :return: best operations per second and peak KiB allocated by a call.
+    :rtype: tuple(float, float)
+    """
+    run()
+    best = 0
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            run()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, calls * ops / elapsed)
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1024
+
+
+def compare(results, baseline, threshold):
+    """
+    Return the regressions of results against a baseline.
+
+    A case regresses when its operations per second drop, or its peak memory grows, by more than the
+    threshold ratio. Cases missing on either side are ignored.
+
+    :rtype: list(str)
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result['ops_per_sec'] < expected['ops_per_sec'] * (1 - threshold):
+            regressions.append('%s: %.0f ops/s, baseline %.0f ops/s' % (name, result['ops_per_sec'], expected['ops_per_sec']))
+        # Small allocations vary with interpreter internals, so a few KiB of slack are allowed.
+        if result['peak_kib'] > expected['peak_kib'] * (1 + threshold) + 4:
+            regressions.append('%s: %.1f KiB peak, baseline %.1f KiB' % (name, result['peak_kib'], expected['peak_kib']))
+    return regressions
+
+
+def main():
+    """Run the suite, print the results and compare them with a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=1, help='multiplier of the synthetic data sizes')
+    parser.add_argument('--filter', default='', help='only run cases with this text in their name')
+    parser.add_argument('--min-time', type=float, default=0.5, help='seconds each case is repeatedly run for')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each case, the best one is kept')
+    parser.add_argument('--save', help='write the results to this json file')
+    parser.add_argument('--baseline', help='json file of results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2, help='ratio of slowdown or memory growth allowed')
+    args = parser.parse_args()
+
+    results = {}
+    for name, setup in CASES:
+        if args.filter not in name:
+            continue
+        case = setup(args.scale)
+        if case is None:
+            print('%-34s skipped, missing dependencies' % name)
+            continue
+        ops_per_sec, peak_kib = measure(case[0], case[1], args.min_time, args.repeat)
+        results[name] = {'ops_per_sec': ops_per_sec, 'peak_kib': peak_kib}
+        print('%-34s %12.0f ops/s %10.1f KiB peak' % (name, ops_per_sec, peak_kib))
+
+    if args.save:
+        with open(args.save, 'w') as results_file:
+            json.dump(results, results_file, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Overhead of the telemetry recorded on every get_treatment call.
+
+Each call records its latency bucket, the impressions queued and the impressions deduped in the
+in-memory telemetry storage, and the storage is popped every so often the way the telemetry
+synchronizer does. The counters are compared with the way they used to be kept: plain attributes
+updated under a lock. Calls are spread over a number of threads to show the cost of contention.
+
+    python benchmarks/telemetry_counters.py --calls 1000000 --threads 4
+"""
+import argparse
+import threading
+
+from splitio.models.telemetry import CounterConstants, MethodExceptionsAndLatencies
+from splitio.storage.inmemmory import InMemoryTelemetryStorage
+
+import method_latency
+
+
+class _LockedTelemetryCounters(object):
+    """Impression counters the way they used to be: attributes guarded by a lock."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._impressions_queued = 0
+        self._impressions_deduped = 0
+        self._impressions_dropped = 0
+
+    def record_impressions_value(self, resource, value):
+        with self._lock:
+            if resource == CounterConstants.IMPRESSIONS_QUEUED:
+                self._impressions_queued += value
+            elif resource == CounterConstants.IMPRESSIONS_DEDUPED:
+                self._impressions_deduped += value
+            elif resource == CounterConstants.IMPRESSIONS_DROPPED:
+                self._impressions_dropped += value
+
+
+class _LockedTelemetryStorage(object):
+    """The recording side of the telemetry storage, over the locked counters."""
+
+    def __init__(self):
+        self._method_latencies = method_latency._LockedMethodLatencies()
+        self._counters = _LockedTelemetryCounters()
+
+    def record_latency(self, method, latency):
+        self._method_latencies.add_latency(method, latency)
+
+    def record_impression_stats(self, data_type, count):
+        self._counters.record_impressions_value(data_type, count)
+
+
+def _record(storage, calls):
+    """Record the telemetry of get_treatment calls."""
+    method = MethodExceptionsAndLatencies.TREATMENT
+    queued = CounterConstants.IMPRESSIONS_QUEUED
+    deduped = CounterConstants.IMPRESSIONS_DEDUPED
+    for _ in range(calls):
+        storage.record_latency(method, 0)
+        storage.record_impression_stats(queued, 1)
+        storage.record_impression_stats(deduped, 0)
+
+
+def _pop(storage, stop):
+    """Pop the storage in a loop, the way the telemetry synchronizer does, much more often."""
+    while not stop.wait(0.01):
+        storage.pop_latencies()
+        storage.get_impressions_stats(CounterConstants.IMPRESSIONS_QUEUED)
+
+
+def measure(storage, calls, threads):
+    """
+    Record `calls` split across threads and return the nanoseconds each call took.
+
+    :rtype: float
+    """
+    stop = threading.Event()
+    popper = None
+    if hasattr(storage, 'pop_latencies'):
+        popper = threading.Thread(target=_pop, args=(storage, stop))
+        popper.start()
+    elapsed = method_latency.measure(_record, storage, calls, threads)
+    stop.set()
+    if popper is not None:
+        popper.join()
+    return elapsed
+
+
+def main():
+    """Run the benchmark and print the overhead per call."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=1000000, help='calls to measure')
+    parser.add_argument('--threads', type=int, default=4, help='threads making the calls')
+    args = parser.parse_args()
+
+    loop = method_latency.measure(method_latency._noop, None, args.calls, args.threads)
+    locked = measure(_LockedTelemetryStorage(), args.calls, args.threads)
+    storage = InMemoryTelemetryStorage()
+    per_thread = measure(storage, args.calls, args.threads)
+    assert storage.get_impressions_stats(CounterConstants.IMPRESSIONS_QUEUED) == args.calls // args.threads * args.threads
+    print('%-12s %7.0f ns/call' % ('locked', locked - loop))
+    print('%-12s %7.0f ns/call' % ('per-thread', per_thread - loop))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Cost of tracking unique keys in NONE impressions mode, and the memory kept doing it.
+
+Every get_treatment call in NONE mode tracks its key and flag. The tracker is compared with the way
+it used to be: a bloom_filter2 filter over the flag name and key, behind its own lock, and a dict of
+sets of keys by flag name behind the tracker's lock. Calls are spread over a number of threads, and
+the memory held by each tracker once the keys are tracked is traced with tracemalloc.
+
+    PYTHONPATH=. python benchmarks/unique_keys_tracker.py --calls 1000000 --threads 4
+"""
+import argparse
+import threading
+import tracemalloc
+
+from splitio.engine.filters import BloomFilter
+from splitio.engine.impressions.unique_keys_tracker import UniqueKeysTracker
+
+import method_latency
+
+
+class _LockedUniqueKeysTracker(object):
+    """Unique keys tracker the way it used to be: a locked bloom filter and a locked dict of sets."""
+
+    def __init__(self, cache_size=30000):
+        self._cache_size = cache_size
+        self._filter = BloomFilter(cache_size)
+        self._lock = threading.RLock()
+        self._cache = {}
+        self._current_cache_size = 0
+        self._queue_full_hook = None
+
+    def set_queue_full_hook(self, hook):
+        self._queue_full_hook = hook
+
+    def track(self, key, feature_flag_name):
+        if self._filter.contains(feature_flag_name+key):
+            return False
+        with self._lock:
+            self._filter.add(feature_flag_name+key)
+            self._cache.setdefault(feature_flag_name, set()).add(key)
+            self._current_cache_size += 1
+        if self._current_cache_size > self._cache_size:
+            self._queue_full_hook()
+        return True
+
+    def get_cache_info_and_pop_all(self):
+        with self._lock:
+            cache, size = self._cache, self._current_cache_size
+            self._cache = {}
+            self._current_cache_size = 0
+        return cache, size
+
+
+def _track(tracker, calls):
+    """Track `calls` keys over 50 flags, one in ten of them tracked just before."""
+    start = threading.get_ident() % 1000003 * calls
+    for index in range(calls):
+        key = start + index - 1 if index % 10 == 9 else start + index
+        tracker.track('key_%d' % key, 'flag_%d' % (key % 50))
+
+
+def _retained_kib(build, calls):
+    """Return the KiB still allocated by a tracker after tracking `calls` keys in this thread."""
+    tracemalloc.start()
+    tracker = build(calls)
+    tracker.set_queue_full_hook(lambda: None)
+    _track(tracker, calls)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tracker
+    return current / 1024
+
+
+def _build(tracker):
+    """Return the tracker, popping its keys when it's full the way the unique keys task does."""
+    tracker.set_queue_full_hook(tracker.get_cache_info_and_pop_all)
+    return tracker
+
+
+def main():
+    """Run the benchmark and print the cost per call and the memory held, before and after."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=1000000, help='calls to measure')
+    parser.add_argument('--threads', type=int, default=4, help='threads making the calls')
+    parser.add_argument('--cache-size', type=int, default=30000, help='keys kept before flushing')
+    args = parser.parse_args()
+
+    loop = method_latency.measure(method_latency._noop, None, args.calls, args.threads)
+    cases = [
+        ('locked', _LockedUniqueKeysTracker),
+        ('striped', UniqueKeysTracker),
+    ]
+    for name, build in cases:
+        elapsed = method_latency.measure(_track, _build(build(args.cache_size)), args.calls, args.threads)
+        print('%-10s %7.0f ns/call %9.0f KiB held for %d keys' % (
+            name, elapsed - loop, _retained_kib(build, args.cache_size), args.cache_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,23 @@
-from splitio.client.factory import get_factory, get_factory_async
-from splitio.client.key import Key
 from splitio.version import __version__
+
+# Factory and key modules pull in the storages, sync and http modules, so they're imported on first access.
+_LAZY = {
+    'get_factory': 'splitio.client.factory',
+    'get_factory_async': 'splitio.client.factory',
+    'Key': 'splitio.client.key',
+}
+
+
+def __getattr__(name):
+    """Import the public entry points on first access."""
+    if name not in _LAZY:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+    import importlib
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
@@ -6,8 +6,10 @@ import abc
 import logging
 import json
 import threading
+from time import perf_counter_ns
 from urllib3.util import parse_url
 
+from splitio.api.commons import NOT_MODIFIED
 from splitio.optional.loaders import HTTPKerberosAuth, OPTIONAL
 from splitio.client.config import AuthenticateScheme
 from splitio.optional.loaders import aiohttp
@@ -126,11 +128,11 @@ class HttpClientBase(object, metaclass=abc.ABCMeta):
         :param status_code: http request status code
         :type status_code: int
 
-        :param elapsed: response time elapsed.
+        :param elapsed: response time elapsed in microseconds.
         :type status_code: int
         """
         self._telemetry_runtime_producer.record_sync_latency(self._metric_name, elapsed)
-        if 200 <= status_code < 300:
+        if 200 <= status_code < 300 or status_code == NOT_MODIFIED:
             self._telemetry_runtime_producer.record_successful_sync(self._metric_name, get_current_epoch_time_ms())
             return
 
@@ -176,7 +178,7 @@ class HttpClient(HttpClientBase):
         :return: Tuple of status_code & response text
         :rtype: HttpResponse
         """
-        start = get_current_epoch_time_ms()
+        start = perf_counter_ns()
         try:
             response = requests.get(
                 _build_url(server, path, self._urls),
@@ -184,7 +186,7 @@ class HttpClient(HttpClientBase):
                 headers=self._get_headers(extra_headers, sdk_key),
                 timeout=self._timeout
             )
-            self._record_telemetry(response.status_code, get_current_epoch_time_ms() - start)
+            self._record_telemetry(response.status_code, (perf_counter_ns() - start) // 1000)
             return HttpResponse(response.status_code, response.text, response.headers)
 
         except Exception as exc:  # pylint: disable=broad-except
@@ -210,7 +212,7 @@ class HttpClient(HttpClientBase):
         :return: Tuple of status_code & response text
         :rtype: HttpResponse
         """
-        start = get_current_epoch_time_ms()
+        start = perf_counter_ns()
         try:
             response = requests.post(
                 _build_url(server, path, self._urls),
@@ -219,7 +221,7 @@ class HttpClient(HttpClientBase):
                 headers=self._get_headers(extra_headers, sdk_key),
                 timeout=self._timeout,
             )
-            self._record_telemetry(response.status_code, get_current_epoch_time_ms() - start)
+            self._record_telemetry(response.status_code, (perf_counter_ns() - start) // 1000)
             return HttpResponse(response.status_code, response.text, response.headers)
         except Exception as exc:  # pylint: disable=broad-except
             raise HttpClientException(_EXC_MSG.format(source='request')) from exc
@@ -261,7 +263,7 @@ class HttpClientAsync(HttpClientBase):
         :return: Tuple of status_code & response text
         :rtype: HttpResponse
         """
-        start = get_current_epoch_time_ms()
+        start = perf_counter_ns()
         headers = self._get_headers(extra_headers, apikey)
         try:
             url = _build_url(server, path, self._urls)
@@ -278,7 +280,7 @@ class HttpClientAsync(HttpClientBase):
                 _LOGGER.debug("Response:")
                 _LOGGER.debug(response)
                 _LOGGER.debug(body)
-                await self._record_telemetry(response.status, get_current_epoch_time_ms() - start)
+                await self._record_telemetry(response.status, (perf_counter_ns() - start) // 1000)
                 return HttpResponse(response.status, body, response.headers)
 
         except aiohttp.ClientError as exc:  # pylint: disable=broad-except
@@ -303,7 +305,7 @@ class HttpClientAsync(HttpClientBase):
         :rtype: HttpResponse
         """
         headers = self._get_headers(extra_headers, apikey)
-        start = get_current_epoch_time_ms()
+        start = perf_counter_ns()
         try:
             headers['Accept-Encoding'] = 'gzip'
             _LOGGER.debug("POST request: %s", _build_url(server, path, self._urls))
@@ -322,7 +324,7 @@ class HttpClientAsync(HttpClientBase):
                 _LOGGER.debug("Response:")
                 _LOGGER.debug(response)
                 _LOGGER.debug(body)
-                await self._record_telemetry(response.status, get_current_epoch_time_ms() - start)
+                await self._record_telemetry(response.status, (perf_counter_ns() - start) // 1000)
                 return HttpResponse(response.status, body, response.headers)
 
         except aiohttp.ClientError as exc:  # pylint: disable=broad-except
@@ -335,11 +337,11 @@ class HttpClientAsync(HttpClientBase):
         :param status_code: http request status code
         :type status_code: int
 
-        :param elapsed: response time elapsed.
+        :param elapsed: response time elapsed in microseconds.
         :type status_code: int
         """
         await self._telemetry_runtime_producer.record_sync_latency(self._metric_name, elapsed)
-        if 200 <= status_code < 300:
+        if 200 <= status_code < 300 or status_code == NOT_MODIFIED:
             await self._telemetry_runtime_producer.record_successful_sync(self._metric_name, get_current_epoch_time_ms())
             return
 
@@ -401,7 +403,7 @@ class HttpClientKerberos(HttpClientBase):
         :rtype: HttpResponse
         """
         with self._lock:
-            start = get_current_epoch_time_ms()
+            start = perf_counter_ns()
             try:
                 return self._do_get(server, path, sdk_key, query, extra_headers, start)
 
@@ -442,7 +444,7 @@ class HttpClientKerberos(HttpClientBase):
             params=query,
             timeout=self._timeout
         ) as response:
-            self._record_telemetry(response.status_code, get_current_epoch_time_ms() - start)
+            self._record_telemetry(response.status_code, (perf_counter_ns() - start) // 1000)
             return HttpResponse(response.status_code, response.text, response.headers)
 
     def post(self, server, path, sdk_key, body, query=None, extra_headers=None):  # pylint: disable=too-many-arguments
@@ -466,7 +468,7 @@ class HttpClientKerberos(HttpClientBase):
         :rtype: HttpResponse
         """
         with self._lock:
-            start = get_current_epoch_time_ms()
+            start = perf_counter_ns()
             try:
                 return self._do_post(server, path, sdk_key, query, extra_headers, body, start)
 
@@ -511,7 +513,7 @@ class HttpClientKerberos(HttpClientBase):
             json=body,
             timeout=self._timeout,
         ) as response:
-            self._record_telemetry(response.status_code, get_current_epoch_time_ms() - start)
+            self._record_telemetry(response.status_code, (perf_counter_ns() - start) // 1000)
             return HttpResponse(response.status_code, response.text, response.headers)
 
     def _set_authentication(self, server_name=None):
@@ -1,9 +1,43 @@
 """Commons module."""
+import json
+
 from splitio.util.time import get_current_epoch_time_ms
 from splitio.spec import SPEC_VERSION
 
+try:
+    # orjson parses large payloads (i.e. first-time segment fetches) faster and with fewer allocations.
+    import orjson
+
+    def decode_json(body):
+        """
+        Parse a JSON response body.
+
+        :param body: Response body.
+        :type body: str
+
+        :rtype: object
+        """
+        return orjson.loads(body)
+
+except ImportError:
+    # Fallback to the standard library parser.
+    def decode_json(body):
+        """
+        Parse a JSON response body.
+
+        :param body: Response body.
+        :type body: str
+
+        :rtype: object
+        """
+        return json.loads(body)
+
 _CACHE_CONTROL = 'Cache-Control'
 _CACHE_CONTROL_NO_CACHE = 'no-cache'
+_IF_NONE_MATCH = 'If-None-Match'
+_ETAG = 'ETag'
+
+NOT_MODIFIED = 304
 
 def headers_from_metadata(sdk_metadata, client_key=None):
     """
@@ -49,7 +83,7 @@ def record_telemetry(status_code, elapsed, metric_name, telemetry_runtime_produc
     :type telemetry_runtime_producer: splitio.engine.telemetry.TelemetryRuntimeProducer
     """
     telemetry_runtime_producer.record_sync_latency(metric_name, elapsed)
-    if 200 <= status_code < 300:
+    if 200 <= status_code < 300 or status_code == NOT_MODIFIED:
         telemetry_runtime_producer.record_successful_sync(metric_name, get_current_epoch_time_ms())
         return
     telemetry_runtime_producer.record_sync_error(metric_name, status_code)
@@ -138,4 +172,89 @@ def build_fetch(change_number, fetch_options, metadata):
         query['sets'] = fetch_options.sets
     if fetch_options.change_number is not None:
         query['till'] = fetch_options.change_number
-    return query, extra_headers
\ No newline at end of file
+    return query, extra_headers
+
+
+class NotModifiedCache(object):
+    """
+    Keep the entity tag and body of the last response without changes for each resource.
+
+    Most polling requests get no changes back. When the server tags those responses, the following request
+    for the same resource and query is sent with `If-None-Match`, and a `304 Not Modified` answer is served
+    from here without transferring or parsing a body.
+    """
+
+    def __init__(self):
+        """Class constructor."""
+        self._responses = {}
+
+    def add_conditional_headers(self, resource, query, extra_headers):
+        """
+        Return the headers to request a resource, conditional on the cached response when there's one.
+
+        :param resource: Path of the requested resource.
+        :type resource: str
+        :param query: Query string of the request.
+        :type query: dict
+        :param extra_headers: Headers of the request.
+        :type extra_headers: dict
+
+        :rtype: dict
+        """
+        cached = self._responses.get(resource)
+        if cached is None or cached[0] != _query_key(query):
+            return extra_headers
+
+        headers = dict(extra_headers)
+        headers[_IF_NONE_MATCH] = cached[1]
+        return headers
+
+    def get(self, resource, query):
+        """
+        Return the cached body to serve a `304 Not Modified` response.
+
+        :param resource: Path of the requested resource.
+        :type resource: str
+        :param query: Query string of the request.
+        :type query: dict
+
+        :return: Cached body, None if there isn't one for this query.
+        :rtype: dict
+        """
+        cached = self._responses.get(resource)
+        if cached is None or cached[0] != _query_key(query):
+            return None
+
+        return cached[2]
+
+    def update(self, resource, query, headers, body):
+        """
+        Cache a response when it's tagged and has no changes, drop the cached one otherwise.
+
+        :param resource: Path of the requested resource.
+        :type resource: str
+        :param query: Query string of the request.
+        :type query: dict
+        :param headers: Response headers.
+        :type headers: dict
+        :param body: Parsed response body.
+        :type body: dict
+        """
+        etag = headers.get(_ETAG) if headers else None
+        if etag is None or body.get('since') is None or body.get('since') != body.get('till'):
+            self._responses.pop(resource, None)
+            return
+
+        self._responses[resource] = (_query_key(query), etag, body)
+
+
+def _query_key(query):
+    """
+    Return a hashable representation of a query string.
+
+    :param query: Query string.
+    :type query: dict
+
+    :rtype: tuple
+    """
+    return tuple(sorted(query.items()))
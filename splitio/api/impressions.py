@@ -29,18 +29,7 @@ class ImpressionsAPIBase(object):  # pylint: disable=too-few-public-methods
         return [
             {
                 'f': test_name,
-                'i': [
-                    {
-                        'k': impression.matching_key,
-                        't': impression.treatment,
-                        'm': impression.time,
-                        'c': impression.change_number,
-                        'r': impression.label,
-                        'b': impression.bucketing_key,
-                        'pt': impression.previous_time
-                    }
-                    for impression in imps
-                ]
+                'i': [ImpressionsAPIBase._build_impression(impression) for impression in imps]
             }
             for (test_name, imps) in groupby(
                 sorted(impressions, key=lambda i: i.feature_name),
@@ -48,6 +37,31 @@ class ImpressionsAPIBase(object):  # pylint: disable=too-few-public-methods
             )
         ]
 
+    @staticmethod
+    def _build_impression(impression):
+        """
+        Build a single impression formatted as the API expects it.
+
+        The sampling rate is only sent for sampled impressions, so they can be re-weighted.
+
+        :param impression: impression to format.
+        :type impression: splitio.models.impressions.Impression
+
+        :rtype: dict
+        """
+        dto = {
+            'k': impression.matching_key,
+            't': impression.treatment,
+            'm': impression.time,
+            'c': impression.change_number,
+            'r': impression.label,
+            'b': impression.bucketing_key,
+            'pt': impression.previous_time
+        }
+        if impression.sampling_rate is not None:
+            dto['sr'] = impression.sampling_rate
+        return dto
+
     @staticmethod
     def _build_counters(counters):
         """
@@ -1,12 +1,12 @@
 """Segments API module."""
 
-import json
 import logging
 
 from splitio.api import APIException, headers_from_metadata
-from splitio.api.commons import build_fetch
+from splitio.api.commons import build_fetch, decode_json, NotModifiedCache, NOT_MODIFIED
 from splitio.api.client import HttpClientException
 from splitio.models.telemetry import HTTPExceptionsAndLatencies
+from splitio.util.offload import LoopOffloader
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -31,6 +31,7 @@ class SegmentsAPI(object):  # pylint: disable=too-few-public-methods
         self._sdk_key = sdk_key
         self._metadata = headers_from_metadata(sdk_metadata)
         self._telemetry_runtime_producer = telemetry_runtime_producer
+        self._not_modified = NotModifiedCache()
         self._client.set_telemetry_data(HTTPExceptionsAndLatencies.SEGMENT, self._telemetry_runtime_producer)
 
     def fetch_segment(self, segment_name, change_number, fetch_options):
@@ -51,15 +52,23 @@ class SegmentsAPI(object):  # pylint: disable=too-few-public-methods
         """
         try:
             query, extra_headers = build_fetch(change_number, fetch_options, self._metadata)
+            resource = 'segmentChanges/{segment_name}'.format(segment_name=segment_name)
             response = self._client.get(
                 'sdk',
-                'segmentChanges/{segment_name}'.format(segment_name=segment_name),
+                resource,
                 self._sdk_key,
-                extra_headers=extra_headers,
+                extra_headers=self._not_modified.add_conditional_headers(resource, query, extra_headers),
                 query=query,
             )
+            if response.status_code == NOT_MODIFIED:
+                cached = self._not_modified.get(resource, query)
+                if cached is not None:
+                    return cached
+
             if 200 <= response.status_code < 300:
-                return json.loads(response.body)
+                parsed = decode_json(response.body)
+                self._not_modified.update(resource, query, response.headers, parsed)
+                return parsed
 
             raise APIException(response.body, response.status_code)
         except HttpClientException as exc:
@@ -74,7 +83,7 @@ class SegmentsAPI(object):  # pylint: disable=too-few-public-methods
 class SegmentsAPIAsync(object):  # pylint: disable=too-few-public-methods
     """Async Class that uses an httpClient to communicate with the segments API."""
 
-    def __init__(self, http_client, sdk_key, sdk_metadata, telemetry_runtime_producer):
+    def __init__(self, http_client, sdk_key, sdk_metadata, telemetry_runtime_producer, offloader=None):
         """
         Class constructor.
 
@@ -84,12 +93,16 @@ class SegmentsAPIAsync(object):  # pylint: disable=too-few-public-methods
         :type sdk_key: string
         :param sdk_metadata: SDK version & machine name & IP.
         :type sdk_metadata: splitio.client.util.SdkMetadata
+        :param offloader: Parses large responses off the event loop.
+        :type offloader: splitio.util.offload.LoopOffloader
 
         """
         self._client = http_client
         self._sdk_key = sdk_key
         self._metadata = headers_from_metadata(sdk_metadata)
         self._telemetry_runtime_producer = telemetry_runtime_producer
+        self._not_modified = NotModifiedCache()
+        self._offloader = offloader if offloader is not None else LoopOffloader()
         self._client.set_telemetry_data(HTTPExceptionsAndLatencies.SEGMENT, self._telemetry_runtime_producer)
 
     async def fetch_segment(self, segment_name, change_number, fetch_options):
@@ -110,15 +123,23 @@ class SegmentsAPIAsync(object):  # pylint: disable=too-few-public-methods
         """
         try:
             query, extra_headers = build_fetch(change_number, fetch_options, self._metadata)
+            resource = 'segmentChanges/{segment_name}'.format(segment_name=segment_name)
             response = await self._client.get(
                 'sdk',
-                'segmentChanges/{segment_name}'.format(segment_name=segment_name),
+                resource,
                 self._sdk_key,
-                extra_headers=extra_headers,
+                extra_headers=self._not_modified.add_conditional_headers(resource, query, extra_headers),
                 query=query,
             )
+            if response.status_code == NOT_MODIFIED:
+                cached = self._not_modified.get(resource, query)
+                if cached is not None:
+                    return cached
+
             if 200 <= response.status_code < 300:
-                return json.loads(response.body)
+                parsed = await self._offloader.decode_json(response.body)
+                self._not_modified.update(resource, query, response.headers, parsed)
+                return parsed
 
             raise APIException(response.body, response.status_code)
         except HttpClientException as exc:
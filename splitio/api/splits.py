@@ -1,12 +1,12 @@
 """Splits API module."""
 
 import logging
-import json
 
 from splitio.api import APIException, headers_from_metadata
-from splitio.api.commons import build_fetch
+from splitio.api.commons import build_fetch, decode_json, NotModifiedCache, NOT_MODIFIED
 from splitio.api.client import HttpClientException
 from splitio.models.telemetry import HTTPExceptionsAndLatencies
+from splitio.util.offload import LoopOffloader
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,6 +29,7 @@ class SplitsAPI(object):  # pylint: disable=too-few-public-methods
         self._sdk_key = sdk_key
         self._metadata = headers_from_metadata(sdk_metadata)
         self._telemetry_runtime_producer = telemetry_runtime_producer
+        self._not_modified = NotModifiedCache()
         self._client.set_telemetry_data(HTTPExceptionsAndLatencies.SPLIT, self._telemetry_runtime_producer)
 
     def fetch_splits(self, change_number, fetch_options):
@@ -46,15 +47,23 @@ class SplitsAPI(object):  # pylint: disable=too-few-public-methods
         """
         try:
             query, extra_headers = build_fetch(change_number, fetch_options, self._metadata)
+            resource = 'splitChanges'
             response = self._client.get(
                 'sdk',
-                'splitChanges',
+                resource,
                 self._sdk_key,
-                extra_headers=extra_headers,
+                extra_headers=self._not_modified.add_conditional_headers(resource, query, extra_headers),
                 query=query,
             )
+            if response.status_code == NOT_MODIFIED:
+                cached = self._not_modified.get(resource, query)
+                if cached is not None:
+                    return cached
+
             if 200 <= response.status_code < 300:
-                return json.loads(response.body)
+                parsed = decode_json(response.body)
+                self._not_modified.update(resource, query, response.headers, parsed)
+                return parsed
 
             else:
                 if response.status_code == 414:
@@ -69,7 +78,7 @@ class SplitsAPI(object):  # pylint: disable=too-few-public-methods
 class SplitsAPIAsync(object):  # pylint: disable=too-few-public-methods
     """Class that uses an httpClient to communicate with the splits API."""
 
-    def __init__(self, client, sdk_key, sdk_metadata, telemetry_runtime_producer):
+    def __init__(self, client, sdk_key, sdk_metadata, telemetry_runtime_producer, offloader=None):
         """
         Class constructor.
 
@@ -79,11 +88,15 @@ class SplitsAPIAsync(object):  # pylint: disable=too-few-public-methods
         :type sdk_key: string
         :param sdk_metadata: SDK version & machine name & IP.
         :type sdk_metadata: splitio.client.util.SdkMetadata
+        :param offloader: Parses large responses off the event loop.
+        :type offloader: splitio.util.offload.LoopOffloader
         """
         self._client = client
         self._sdk_key = sdk_key
         self._metadata = headers_from_metadata(sdk_metadata)
         self._telemetry_runtime_producer = telemetry_runtime_producer
+        self._not_modified = NotModifiedCache()
+        self._offloader = offloader if offloader is not None else LoopOffloader()
         self._client.set_telemetry_data(HTTPExceptionsAndLatencies.SPLIT, self._telemetry_runtime_producer)
 
     async def fetch_splits(self, change_number, fetch_options):
@@ -101,15 +114,23 @@ class SplitsAPIAsync(object):  # pylint: disable=too-few-public-methods
         """
         try:
             query, extra_headers = build_fetch(change_number, fetch_options, self._metadata)
+            resource = 'splitChanges'
             response = await self._client.get(
                 'sdk',
-                'splitChanges',
+                resource,
                 self._sdk_key,
-                extra_headers=extra_headers,
+                extra_headers=self._not_modified.add_conditional_headers(resource, query, extra_headers),
                 query=query,
             )
+            if response.status_code == NOT_MODIFIED:
+                cached = self._not_modified.get(resource, query)
+                if cached is not None:
+                    return cached
+
             if 200 <= response.status_code < 300:
-                return json.loads(response.body)
+                parsed = await self._offloader.decode_json(response.body)
+                self._not_modified.update(resource, query, response.headers, parsed)
+                return parsed
 
             else:
                 if response.status_code == 414:
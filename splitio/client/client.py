@@ -1,13 +1,16 @@
 """A module for Split.io SDK API clients."""
 import logging
+from time import perf_counter_ns
 
-from splitio.engine.evaluator import Evaluator, CONTROL, EvaluationDataFactory, AsyncEvaluationDataFactory
+from splitio.engine.evaluator import Evaluator, CONTROL, EvaluationDataFactory, AsyncEvaluationDataFactory, \
+    EvaluationResult
 from splitio.engine.splitters import Splitter
 from splitio.models.impressions import Impression, Label
 from splitio.models.events import Event, EventWrapper
 from splitio.models.telemetry import get_latency_bucket_index, MethodExceptionsAndLatencies
 from splitio.client import input_validator
-from splitio.util.time import get_current_epoch_time_ms, utctime_ms
+from splitio.engine.profiling import EvaluationStage
+from splitio.util.time import utctime_ms
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -16,23 +19,12 @@ _LOGGER = logging.getLogger(__name__)
 class ClientBase(object):  # pylint: disable=too-many-instance-attributes
     """Entry point for the split sdk."""
 
-    _FAILED_EVAL_RESULT = {
-        'treatment': CONTROL,
-        'configurations': None,
-        'impression': {
-            'label': Label.EXCEPTION,
-            'change_number': None,
-        }
-    }
-
-    _NON_READY_EVAL_RESULT = {
-        'treatment': CONTROL,
-        'configurations': None,
-        'impression': {
-            'label': Label.NOT_READY,
-            'change_number': None
-        }
-    }
+    _FAILED_EVAL_RESULT = EvaluationResult(CONTROL, None, Label.EXCEPTION, None)
+
+    _NON_READY_EVAL_RESULT = EvaluationResult(CONTROL, None, Label.NOT_READY, None)
+
+    # Validated keys and flag names kept per client, dropped all at once when reaching this size.
+    _VALIDATED_INPUT_CACHE_SIZE = 10000
 
     def __init__(self, factory, recorder, labels_enabled=True):
         """
@@ -59,6 +51,10 @@ class ClientBase(object):  # pylint: disable=too-many-instance-attributes
         self._evaluator = Evaluator(self._splitter)
         self._telemetry_evaluation_producer = self._factory._telemetry_evaluation_producer
         self._telemetry_init_producer = self._factory._telemetry_init_producer
+        self._latency_histograms = self._factory._latency_histograms  # pylint: disable=protected-access
+        self._profiler = self._factory._evaluation_profiler  # pylint: disable=protected-access
+        self._validated_keys = set()
+        self._validated_flag_names = set()
 
     @property
     def ready(self):
@@ -70,6 +66,22 @@ class ClientBase(object):  # pylint: disable=too-many-instance-attributes
         """Return whether the factory holding this client has been destroyed."""
         return self._factory.destroyed
 
+    def _get_latency_bucket(self, start, method):
+        """
+        Return the telemetry bucket of a call latency, also recording it in the histograms when enabled.
+
+        :param start: perf_counter_ns() when the call started
+        :type start: int
+        :param method: method called
+        :type method: splitio.models.telemetry.MethodExceptionsAndLatencies
+
+        :rtype: int
+        """
+        latency = (perf_counter_ns() - start) // 1000
+        if self._latency_histograms is not None:
+            self._latency_histograms.record(method, latency)
+        return get_latency_bucket_index(latency)
+
     def _client_is_usable(self):
         if self.destroyed:
             _LOGGER.error("Client has already been destroyed - no calls possible")
@@ -81,21 +93,43 @@ class ClientBase(object):  # pylint: disable=too-many-instance-attributes
 
         return True
 
-    @staticmethod
-    def _validate_treatment_input(key, feature, attributes, method):
-        """Perform all static validations on user supplied input."""
-        matching_key, bucketing_key = input_validator.validate_key(key, 'get_' + method.value)
-        if not matching_key:
-            raise _InvalidInputError()
+    def _validate_treatment_input(self, key, feature, attributes, method):
+        """
+        Perform all static validations on user supplied input.
 
-        feature = input_validator.validate_feature_flag_name(feature, 'get_' + method.value)
-        if not feature:
-            raise _InvalidInputError()
+        String keys and flag names that passed validation untouched are cached, so they skip it
+        from then on. Inputs validation fixed or rejected aren't, to keep logging about them.
+        """
+        if not isinstance(key, str) or key not in self._validated_keys:
+            matching_key, bucketing_key = input_validator.validate_key(key, 'get_' + method.value)
+            if not matching_key:
+                raise _InvalidInputError()
+
+            if matching_key is key:
+                self._cache_validated(self._validated_keys, key)
+            key = matching_key
+        else:
+            bucketing_key = None
+
+        if not isinstance(feature, str) or feature not in self._validated_flag_names:
+            validated = input_validator.validate_feature_flag_name(feature, 'get_' + method.value)
+            if not validated:
+                raise _InvalidInputError()
+
+            if validated == feature:
+                self._cache_validated(self._validated_flag_names, feature)
+            feature = validated
 
         if not input_validator.validate_attributes(attributes, 'get_' + method.value):
             raise _InvalidInputError()
 
-        return matching_key, bucketing_key, feature, attributes
+        return key, bucketing_key, feature, attributes
+
+    def _cache_validated(self, cache, value):
+        """Remember a valid input, starting over when the cache is full."""
+        if len(cache) >= self._VALIDATED_INPUT_CACHE_SIZE:
+            cache.clear()
+        cache.add(value)
 
     @staticmethod
     def _validate_treatments_input(key, features, attributes, method):
@@ -119,9 +153,9 @@ class ClientBase(object):  # pylint: disable=too-many-instance-attributes
         return Impression(
                 matching_key=key,
                 feature_name=feature,
-                treatment=result['treatment'],
-                label=result['impression']['label'] if self._labels_enabled else None,
-                change_number=result['impression']['change_number'],
+                treatment=result.treatment,
+                label=result.label if self._labels_enabled else None,
+                change_number=result.change_number,
                 bucketing_key=bucketing,
                 time=utctime_ms())
 
@@ -198,7 +232,8 @@ class Client(ClientBase):  # pylint: disable=too-many-instance-attributes
         :rtype: Client
         """
         ClientBase.__init__(self, factory, recorder, labels_enabled)
-        self._context_factory = EvaluationDataFactory(factory._get_storage('splits'), factory._get_storage('segments'))
+        self._context_factory = EvaluationDataFactory(factory._get_storage('splits'), factory._get_storage('segments'),
+                                                      factory._get_storage('evaluation'))
 
     def destroy(self):
         """
@@ -273,7 +308,8 @@ class Client(ClientBase):  # pylint: disable=too-many-instance-attributes
         if not self._client_is_usable(): # not destroyed & not waiting for a fork
             return CONTROL, None
 
-        start = get_current_epoch_time_ms()
+        start = perf_counter_ns()
+        profile = self._profiler.sample(method) if self._profiler is not None else None
         if not self.ready:
             _LOGGER.error("Client is not ready - no calls possible")
             self._telemetry_init_producer.record_not_ready_usage()
@@ -283,23 +319,31 @@ class Client(ClientBase):  # pylint: disable=too-many-instance-attributes
         except _InvalidInputError:
             return CONTROL, None
 
+        if profile is not None:
+            profile.mark(EvaluationStage.VALIDATE)
         result = self._NON_READY_EVAL_RESULT
         if self.ready:
             try:
-                ctx = self._context_factory.context_for(key, [feature])
-                input_validator.validate_feature_flag_names({feature: ctx.flags.get(feature)}, 'get_' + method.value)
+                ctx = self._context_factory.context_for(key, [feature], profile)
+                if ctx.flags.get(feature) is None:
+                    input_validator.validate_feature_flag_names({feature: None}, 'get_' + method.value)
                 result = self._evaluator.eval_with_context(key, bucketing, feature, attributes, ctx)
             except RuntimeError as e:
                 _LOGGER.error('Error getting treatment for feature flag')
                 _LOGGER.debug('Error: ', exc_info=True)
                 self._telemetry_evaluation_producer.record_exception(method)
                 result = self._FAILED_EVAL_RESULT
+            if profile is not None:
+                profile.mark(EvaluationStage.EVALUATE)
 
-        if result['impression']['label'] != Label.SPLIT_NOT_FOUND:
+        if result.label != Label.SPLIT_NOT_FOUND:
             impression = self._build_impression(key, bucketing, feature, result)
             self._record_stats([(impression, attributes)], start, method)
 
-        return result['treatment'], result['configurations']
+        if profile is not None:
+            profile.mark(EvaluationStage.RECORD_IMPRESSIONS)
+            self._profiler.finish(profile)
+        return result.treatment, result.configurations
 
     def get_treatments(self, key, feature_flag_names, attributes=None):
         """
@@ -546,10 +590,11 @@ class Client(ClientBase):  # pylint: disable=too-many-instance-attributes
         :return: The treatments and configs for the key and feature flags
         :rtype: dict
         """
-        start = get_current_epoch_time_ms()
+        start = perf_counter_ns()
         if not self._client_is_usable():
             return input_validator.generate_control_treatments(features)
 
+        profile = self._profiler.sample(method) if self._profiler is not None else None
         if not self.ready:
             _LOGGER.error("Client is not ready - no calls possible")
             self._telemetry_init_producer.record_not_ready_usage()
@@ -559,10 +604,12 @@ class Client(ClientBase):  # pylint: disable=too-many-instance-attributes
         except _InvalidInputError:
             return input_validator.generate_control_treatments(features)
 
+        if profile is not None:
+            profile.mark(EvaluationStage.VALIDATE)
         results = {n: self._NON_READY_EVAL_RESULT for n in features}
         if self.ready:
             try:
-                ctx = self._context_factory.context_for(key, features)
+                ctx = self._context_factory.context_for(key, features, profile)
                 input_validator.validate_feature_flag_names({feature: ctx.flags.get(feature) for feature in features}, 'get_' + method.value)
                 results = self._evaluator.eval_many_with_context(key, bucketing, features, attributes, ctx)
             except RuntimeError as e:
@@ -570,15 +617,20 @@ class Client(ClientBase):  # pylint: disable=too-many-instance-attributes
                 _LOGGER.debug('Error: ', exc_info=True)
                 self._telemetry_evaluation_producer.record_exception(method)
                 results = {n: self._FAILED_EVAL_RESULT for n in features}
+            if profile is not None:
+                profile.mark(EvaluationStage.EVALUATE)
 
         imp_attrs = [
             (i, attributes) for i in self._build_impressions(key, bucketing, results)
             if i.label != Label.SPLIT_NOT_FOUND
         ]
         self._record_stats(imp_attrs, start, method)
+        if profile is not None:
+            profile.mark(EvaluationStage.RECORD_IMPRESSIONS)
+            self._profiler.finish(profile)
 
         return {
-            feature: (results[feature]['treatment'], results[feature]['configurations'])
+            feature: (results[feature].treatment, results[feature].configurations)
             for feature in results
         }
 
@@ -589,14 +641,13 @@ class Client(ClientBase):  # pylint: disable=too-many-instance-attributes
         :param impressions: Generated impressions
         :type impressions: list[tuple[splitio.models.impression.Impression, dict]]
 
-        :param start: timestamp when get_treatment or get_treatments was called
+        :param start: perf_counter_ns() when get_treatment or get_treatments was called
         :type start: int
 
         :param operation: operation performed.
         :type operation: str
         """
-        end = get_current_epoch_time_ms()
-        self._recorder.record_treatment_stats(impressions, get_latency_bucket_index(end - start),
+        self._recorder.record_treatment_stats(impressions, self._get_latency_bucket(start, operation),
                                               operation, 'get_' + operation.value)
 
     def track(self, key, traffic_type, event_type, value=None, properties=None):
@@ -621,7 +672,7 @@ class Client(ClientBase):  # pylint: disable=too-many-instance-attributes
             _LOGGER.warning("track: the SDK is not ready, results may be incorrect. Make sure to wait for SDK readiness before using this method")
             self._telemetry_init_producer.record_not_ready_usage()
 
-        start = get_current_epoch_time_ms()
+        start = perf_counter_ns()
         should_validate_existance = self.ready and self._factory._sdk_key != 'localhost'  # pylint: disable=protected-access
         traffic_type = input_validator.validate_traffic_type(
             traffic_type,
@@ -636,7 +687,7 @@ class Client(ClientBase):  # pylint: disable=too-many-instance-attributes
             return_flag = self._recorder.record_track_stats([EventWrapper(
                 event=event,
                 size=size,
-            )], get_latency_bucket_index(get_current_epoch_time_ms() - start))
+            )], self._get_latency_bucket(start, MethodExceptionsAndLatencies.TRACK))
             return return_flag
 
         except Exception:  # pylint: disable=broad-except
@@ -665,7 +716,8 @@ class ClientAsync(ClientBase):  # pylint: disable=too-many-instance-attributes
         :rtype: Client
         """
         ClientBase.__init__(self, factory, recorder, labels_enabled)
-        self._context_factory = AsyncEvaluationDataFactory(factory._get_storage('splits'), factory._get_storage('segments'))
+        self._context_factory = AsyncEvaluationDataFactory(factory._get_storage('splits'), factory._get_storage('segments'),
+                                                           factory._get_storage('evaluation'))
 
     async def destroy(self):
         """
@@ -740,7 +792,8 @@ class ClientAsync(ClientBase):  # pylint: disable=too-many-instance-attributes
         if not self._client_is_usable(): # not destroyed & not waiting for a fork
             return CONTROL, None
 
-        start = get_current_epoch_time_ms()
+        start = perf_counter_ns()
+        profile = self._profiler.sample(method) if self._profiler is not None else None
         if not self.ready:
             _LOGGER.error("Client is not ready - no calls possible")
             await self._telemetry_init_producer.record_not_ready_usage()
@@ -750,22 +803,31 @@ class ClientAsync(ClientBase):  # pylint: disable=too-many-instance-attributes
         except _InvalidInputError:
             return CONTROL, None
 
+        if profile is not None:
+            profile.mark(EvaluationStage.VALIDATE)
         result = self._NON_READY_EVAL_RESULT
         if self.ready:
             try:
-                ctx = await self._context_factory.context_for(key, [feature])
-                input_validator.validate_feature_flag_names({feature: ctx.flags.get(feature)}, 'get_' + method.value)
+                ctx = await self._context_factory.context_for(key, [feature], profile)
+                if ctx.flags.get(feature) is None:
+                    input_validator.validate_feature_flag_names({feature: None}, 'get_' + method.value)
                 result = self._evaluator.eval_with_context(key, bucketing, feature, attributes, ctx)
             except Exception as e: # toto narrow this
                 _LOGGER.error('Error getting treatment for feature flag')
                 _LOGGER.debug('Error: ', exc_info=True)
                 await self._telemetry_evaluation_producer.record_exception(method)
                 result = self._FAILED_EVAL_RESULT
+            if profile is not None:
+                profile.mark(EvaluationStage.EVALUATE)
 
-        if result['impression']['label'] != Label.SPLIT_NOT_FOUND:
+        if result.label != Label.SPLIT_NOT_FOUND:
             impression = self._build_impression(key, bucketing, feature, result)
             await self._record_stats([(impression, attributes)], start, method)
-        return result['treatment'], result['configurations']
+
+        if profile is not None:
+            profile.mark(EvaluationStage.RECORD_IMPRESSIONS)
+            self._profiler.finish(profile)
+        return result.treatment, result.configurations
 
     async def get_treatments(self, key, feature_flag_names, attributes=None):
         """
@@ -935,10 +997,11 @@ class ClientAsync(ClientBase):  # pylint: disable=too-many-instance-attributes
         :return: The treatments and configs for the key and feature flags
         :rtype: dict
         """
-        start = get_current_epoch_time_ms()
+        start = perf_counter_ns()
         if not self._client_is_usable():
             return input_validator.generate_control_treatments(features)
 
+        profile = self._profiler.sample(method) if self._profiler is not None else None
         if not self.ready:
             _LOGGER.error("Client is not ready - no calls possible")
             await self._telemetry_init_producer.record_not_ready_usage()
@@ -948,10 +1011,12 @@ class ClientAsync(ClientBase):  # pylint: disable=too-many-instance-attributes
         except _InvalidInputError:
             return input_validator.generate_control_treatments(features)
 
+        if profile is not None:
+            profile.mark(EvaluationStage.VALIDATE)
         results = {n: self._NON_READY_EVAL_RESULT for n in features}
         if self.ready:
             try:
-                ctx = await self._context_factory.context_for(key, features)
+                ctx = await self._context_factory.context_for(key, features, profile)
                 input_validator.validate_feature_flag_names({feature: ctx.flags.get(feature) for feature in features}, 'get_' + method.value)
                 results = self._evaluator.eval_many_with_context(key, bucketing, features, attributes, ctx)
             except Exception as e: # toto narrow this
@@ -959,15 +1024,20 @@ class ClientAsync(ClientBase):  # pylint: disable=too-many-instance-attributes
                 _LOGGER.debug('Error: ', exc_info=True)
                 await self._telemetry_evaluation_producer.record_exception(method)
                 results = {n: self._FAILED_EVAL_RESULT for n in features}
+            if profile is not None:
+                profile.mark(EvaluationStage.EVALUATE)
 
         imp_attrs = [
             (i, attributes) for i in self._build_impressions(key, bucketing, results)
             if i.label != Label.SPLIT_NOT_FOUND
         ]
         await self._record_stats(imp_attrs, start, method)
+        if profile is not None:
+            profile.mark(EvaluationStage.RECORD_IMPRESSIONS)
+            self._profiler.finish(profile)
 
         return {
-            feature: (res['treatment'], res['configurations'])
+            feature: (res.treatment, res.configurations)
             for feature, res in results.items()
         }
 
@@ -978,14 +1048,13 @@ class ClientAsync(ClientBase):  # pylint: disable=too-many-instance-attributes
         :param impressions: Generated impressions
         :type impressions: list[tuple[splitio.models.impression.Impression, dict]]
 
-        :param start: timestamp when get_treatment or get_treatments was called
+        :param start: perf_counter_ns() when get_treatment or get_treatments was called
         :type start: int
 
         :param operation: operation performed.
         :type operation: str
         """
-        end = get_current_epoch_time_ms()
-        await self._recorder.record_treatment_stats(impressions, get_latency_bucket_index(end - start),
+        await self._recorder.record_treatment_stats(impressions, self._get_latency_bucket(start, operation),
                                               operation, 'get_' + operation.value)
 
     async def track(self, key, traffic_type, event_type, value=None, properties=None):
@@ -1010,7 +1079,7 @@ class ClientAsync(ClientBase):  # pylint: disable=too-many-instance-attributes
             _LOGGER.warning("track: the SDK is not ready, results may be incorrect. Make sure to wait for SDK readiness before using this method")
             await self._telemetry_init_producer.record_not_ready_usage()
 
-        start = get_current_epoch_time_ms()
+        start = perf_counter_ns()
         should_validate_existance = self.ready and self._factory._sdk_key != 'localhost'  # pylint: disable=protected-access
         traffic_type = await input_validator.validate_traffic_type_async(
             traffic_type,
@@ -1025,7 +1094,7 @@ class ClientAsync(ClientBase):  # pylint: disable=too-many-instance-attributes
             return_flag = await self._recorder.record_track_stats([EventWrapper(
                 event=event,
                 size=size,
-            )], get_latency_bucket_index(get_current_epoch_time_ms() - start))
+            )], self._get_latency_bucket(start, MethodExceptionsAndLatencies.TRACK))
             return return_flag
 
         except Exception:  # pylint: disable=broad-except
@@ -34,6 +34,7 @@ DEFAULT_CONFIG = {
     'impressionListener': None,
     'redisLocalCacheEnabled': True,
     'redisLocalCacheTTL': 5,
+    'redisEvaluationScriptEnabled': False,
     'redisHost': 'localhost',
     'redisPort': 6379,
     'redisDb': 0,
@@ -56,6 +57,7 @@ DEFAULT_CONFIG = {
     'redisSslCertReqs': None,
     'redisSslCaCerts': None,
     'redisMaxConnections': None,
+    'redisClusterKeyHashTag': None,
     'machineName': None,
     'machineIp': None,
     'splitFile': os.path.join(os.path.expanduser('~'), '.split'),
@@ -63,9 +65,25 @@ DEFAULT_CONFIG = {
     'localhostRefreshEnabled': False,
     'preforkedInitialization': False,
     'dataSampling': DEFAULT_DATA_SAMPLING,
+    'impressionsSamplingByFlag': None,
+    'impressionsRateLimit': None,
     'storageWrapper': None,
     'storagePrefix': None,
     'storageType': None,
+    'storageLocalCacheEnabled': False,
+    'storageLocalCacheTTL': 5,
+    'storageLocalCacheMaxSize': 10000,
+    'storageSnapshotFile': None,
+    'storageSnapshotRefreshRate': 300,
+    'storageSnapshotMaxAge': 86400,
+    'asyncExecutor': None,
+    'asyncLoopBudget': 10,
+    'asyncLoopLagThreshold': None,
+    'hostSyncLockFile': None,
+    'hostSyncRefreshRate': 5,
+    'latencyHistograms': False,
+    'evaluationProfilingRate': 0,
+    'evaluationProfilingHook': None,
     'flagSetsFilter': None,
     'httpAuthenticateScheme': AuthenticateScheme.NONE,
     'kerberosPrincipalUser': None,
@@ -86,7 +104,7 @@ def _parse_operation_mode(sdk_key, config):
         _LOGGER.debug('Using Localhost operation mode')
         return 'localhost', 'localhost'
 
-    if 'redisHost' in config or 'redisSentinels' in config:
+    if 'redisHost' in config or 'redisSentinels' in config or 'redisClusterNodes' in config:
         _LOGGER.debug('Using Redis storage operation mode')
         return 'consumer', 'redis'
 
@@ -128,6 +146,31 @@ def _sanitize_impressions_mode(storage_type, mode, refresh_rate=None):
 
     return mode, refresh_rate
 
+def _sanitize_sampling_by_flag(rates):
+    """
+    Check the sampling rates of impressions by flag, discarding invalid ones.
+
+    :param rates: sampling rate by flag name
+    :type rates: dict
+
+    :returns: valid sampling rates by flag name
+    :rtype: dict
+    """
+    if rates is None:
+        return None
+
+    if not isinstance(rates, dict):
+        _LOGGER.warning('impressionsSamplingByFlag must be a dictionary of flag names and rates, discarding it.')
+        return None
+
+    valid = {}
+    for name, rate in rates.items():
+        if not isinstance(rate, (int, float)) or isinstance(rate, bool) or not 0 <= rate <= 1:
+            _LOGGER.warning('impressionsSamplingByFlag: rate of %s must be between 0 and 1, discarding it.', name)
+            continue
+        valid[name] = rate
+    return valid
+
 def sanitize(sdk_key, config):
     """
     Look for inconsistencies or ill-formed configs and tune it accordingly.
@@ -152,6 +195,20 @@ def sanitize(sdk_key, config):
         _LOGGER.warning('metricRefreshRate parameter minimum value is 60 seconds, defaulting to 3600 seconds.')
         processed['metricsRefreshRate'] = 3600
 
+    if not 0 <= processed['evaluationProfilingRate'] <= 1:
+        _LOGGER.warning('evaluationProfilingRate must be between 0 and 1, evaluation profiling is disabled.')
+        processed['evaluationProfilingRate'] = 0
+
+    processed['impressionsSamplingByFlag'] = _sanitize_sampling_by_flag(processed['impressionsSamplingByFlag'])
+    if processed['impressionsRateLimit'] is not None and \
+       (not isinstance(processed['impressionsRateLimit'], int) or processed['impressionsRateLimit'] < 1):
+        _LOGGER.warning('impressionsRateLimit must be a positive integer, impressions are not rate limited.')
+        processed['impressionsRateLimit'] = None
+
+    if processed['evaluationProfilingHook'] is not None and not callable(processed['evaluationProfilingHook']):
+        _LOGGER.warning('evaluationProfilingHook must be callable, discarding it.')
+        processed['evaluationProfilingHook'] = None
+
     if config['operationMode'] == 'consumer' and config.get('flagSetsFilter') is not None:
         processed['flagSetsFilter'] = None
         _LOGGER.warning('config: FlagSets filter is not applicable for Consumer modes where the SDK does keep rollout data in sync. FlagSet filter was discarded.')
@@ -1,5 +1,6 @@
 """A module for Split.io Factories."""
 import logging
+import sys
 import threading
 from collections import Counter
 from enum import Enum
@@ -11,68 +12,19 @@ from splitio.client.config import sanitize as sanitize_config, DEFAULT_DATA_SAMP
 from splitio.client.manager import SplitManager, SplitManagerAsync
 from splitio.client import util
 from splitio.client.listener import ImpressionListenerWrapper, ImpressionListenerWrapperAsync
+from splitio.client.profiling import EvaluationProfiler
 from splitio.engine.impressions.impressions import Manager as ImpressionsManager
-from splitio.engine.impressions import set_classes, set_classes_async
+from splitio.engine.impressions import set_classes, set_classes_async, ImpressionsMode
 from splitio.engine.impressions.strategies import StrategyDebugMode
 from splitio.engine.telemetry import TelemetryStorageProducer, TelemetryStorageConsumer, \
     TelemetryStorageProducerAsync, TelemetryStorageConsumerAsync
-from splitio.engine.impressions.manager import Counter as ImpressionsCounter
-from splitio.engine.impressions.unique_keys_tracker import UniqueKeysTracker, UniqueKeysTrackerAsync
-
-# Storage
-from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage, \
-    InMemoryImpressionStorage, InMemoryEventStorage, InMemoryTelemetryStorage, LocalhostTelemetryStorage, \
-    InMemorySplitStorageAsync, InMemorySegmentStorageAsync, InMemoryImpressionStorageAsync, \
-    InMemoryEventStorageAsync, InMemoryTelemetryStorageAsync, LocalhostTelemetryStorageAsync
-from splitio.storage.adapters import redis
-from splitio.storage.redis import RedisSplitStorage, RedisSegmentStorage, RedisImpressionsStorage, \
-    RedisEventsStorage, RedisTelemetryStorage, RedisSplitStorageAsync, RedisEventsStorageAsync,\
-    RedisSegmentStorageAsync, RedisImpressionsStorageAsync, RedisTelemetryStorageAsync
-from splitio.storage.pluggable import PluggableEventsStorage, PluggableImpressionsStorage, PluggableSegmentStorage, \
-    PluggableSplitStorage, PluggableTelemetryStorage, PluggableTelemetryStorageAsync, PluggableEventsStorageAsync, \
-    PluggableImpressionsStorageAsync, PluggableSegmentStorageAsync, PluggableSplitStorageAsync
-
-# APIs
-from splitio.api.client import HttpClient, HttpClientAsync, HttpClientKerberos
-from splitio.api.splits import SplitsAPI, SplitsAPIAsync
-from splitio.api.segments import SegmentsAPI, SegmentsAPIAsync
-from splitio.api.impressions import ImpressionsAPI, ImpressionsAPIAsync
-from splitio.api.events import EventsAPI, EventsAPIAsync
-from splitio.api.auth import AuthAPI, AuthAPIAsync
-from splitio.api.telemetry import TelemetryAPI, TelemetryAPIAsync
-from splitio.util.time import get_current_epoch_time_ms
-
-# Tasks
-from splitio.tasks.split_sync import SplitSynchronizationTask, SplitSynchronizationTaskAsync
-from splitio.tasks.segment_sync import SegmentSynchronizationTask, SegmentSynchronizationTaskAsync
-from splitio.tasks.impressions_sync import ImpressionsSyncTask, ImpressionsCountSyncTask,\
-    ImpressionsCountSyncTaskAsync, ImpressionsSyncTaskAsync
-from splitio.tasks.events_sync import EventsSyncTask, EventsSyncTaskAsync
-from splitio.tasks.telemetry_sync import TelemetrySyncTask, TelemetrySyncTaskAsync
-
-# Synchronizer
-from splitio.sync.synchronizer import SplitTasks, SplitSynchronizers, Synchronizer, \
-    LocalhostSynchronizer, RedisSynchronizer, PluggableSynchronizer,\
-    SynchronizerAsync, RedisSynchronizerAsync, LocalhostSynchronizerAsync
-from splitio.sync.manager import Manager, RedisManager, ManagerAsync, RedisManagerAsync
-from splitio.sync.split import SplitSynchronizer, LocalSplitSynchronizer, LocalhostMode,\
-    SplitSynchronizerAsync, LocalSplitSynchronizerAsync
-from splitio.sync.segment import SegmentSynchronizer, LocalSegmentSynchronizer, SegmentSynchronizerAsync,\
-    LocalSegmentSynchronizerAsync
-from splitio.sync.impression import ImpressionSynchronizer, ImpressionsCountSynchronizer, \
-    ImpressionsCountSynchronizerAsync, ImpressionSynchronizerAsync
-from splitio.sync.event import EventSynchronizer, EventSynchronizerAsync
-from splitio.sync.telemetry import TelemetrySynchronizer, InMemoryTelemetrySubmitter, \
-    LocalhostTelemetrySubmitter, RedisTelemetrySubmitter, LocalhostTelemetrySubmitterAsync, \
-    InMemoryTelemetrySubmitterAsync, TelemetrySynchronizerAsync, RedisTelemetrySubmitterAsync
-
-
-# Recorder
+from splitio.engine.impressions.manager import Counter as ImpressionsCounter, Sampler as ImpressionsSampler
+from splitio.models.telemetry import MethodLatencyHistograms
 from splitio.recorder.recorder import StandardRecorder, PipelinedRecorder, StandardRecorderAsync, PipelinedRecorderAsync
+from splitio.util.time import get_current_epoch_time_ms
 
-# Localhost stuff
-from splitio.client.localhost import LocalhostEventsStorage, LocalhostImpressionsStorage, \
-    LocalhostImpressionsStorageAsync, LocalhostEventsStorageAsync
+# Storages, APIs, tasks and synchronizers are imported by the builder of the mode using them,
+# so that importing the SDK doesn't load the redis, http and async clients nobody asked for.
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -105,6 +57,8 @@ class SplitFactoryBase(object):  # pylint: disable=too-many-instance-attributes
         self._sdk_key = sdk_key
         self._storages = storages
         self._status = None
+        self._latency_histograms = None
+        self._evaluation_profiler = None
 
     def _get_storage(self, name):
         """
@@ -113,10 +67,10 @@ class SplitFactoryBase(object):  # pylint: disable=too-many-instance-attributes
         :param name: Name of the requested storage.
         :type name: str
 
-        :return: requested factory.
+        :return: requested storage, None if it's not used by this factory.
         :rtype: object
         """
-        return self._storages[name]
+        return self._storages.get(name)
 
     @property
     def ready(self):
@@ -128,6 +82,31 @@ class SplitFactoryBase(object):  # pylint: disable=too-many-instance-attributes
         """
         return self._status == Status.READY
 
+    def latency_percentiles(self):
+        """
+        Return the p50, p99 and p999 latencies of client methods called since the factory was built.
+
+        :return: dict of percentiles in microseconds by method, or None when `latencyHistograms` isn't enabled.
+        :rtype: dict
+        """
+        if self._latency_histograms is None:
+            return None
+
+        return self._latency_histograms.percentiles()
+
+    def evaluation_profile(self):
+        """
+        Return how long each stage of the sampled get_treatment(s) calls took.
+
+        :return: dict of sampled call count, mean and max in microseconds by stage,
+            or None when `evaluationProfilingRate` isn't set.
+        :rtype: dict
+        """
+        if self._evaluation_profiler is None:
+            return None
+
+        return self._evaluation_profiler.stats()
+
     def _update_instantiated_factories(self):
         self._status = Status.DESTROYED
         with _INSTANTIATED_FACTORIES_LOCK:
@@ -335,7 +314,9 @@ class SplitFactoryAsync(SplitFactoryBase):  # pylint: disable=too-many-instance-
             telemetry_init_producer=None,
             telemetry_submitter=None,
             manager_start_task=None,
-            api_client=None
+            api_client=None,
+            ready_from_snapshot=False,
+            loop_lag_monitor=None
     ):
         """
         Class constructor.
@@ -354,11 +335,17 @@ class SplitFactoryAsync(SplitFactoryBase):  # pylint: disable=too-many-instance-
         :type recorder: StatsRecorder
         :param preforked_initialization: Whether should be instantiated as preforked or not.
         :type preforked_initialization: bool
+        :param ready_from_snapshot: Whether storages were loaded from a snapshot, so there's no need to wait for the initial sync.
+        :type ready_from_snapshot: bool
+        :param loop_lag_monitor: Monitor measuring how long the event loop gets blocked, if enabled.
+        :type loop_lag_monitor: splitio.util.offload.LoopLagMonitor
         """
         SplitFactoryBase.__init__(self, sdk_key, storages)
         self._labels_enabled = labels_enabled
         self._sync_manager = sync_manager
         self._recorder = recorder
+        self._ready_from_snapshot = ready_from_snapshot
+        self._loop_lag_monitor = loop_lag_monitor
         self._telemetry_evaluation_producer = telemetry_producer.get_telemetry_evaluation_producer()
         self._telemetry_init_producer = telemetry_init_producer
         self._telemetry_submitter = telemetry_submitter
@@ -372,7 +359,7 @@ class SplitFactoryAsync(SplitFactoryBase):  # pylint: disable=too-many-instance-
 
     async def _update_status_when_ready_async(self):
         """Wait until the sdk is ready and update the status for async mode."""
-        if self._manager_start_task is not None:
+        if self._manager_start_task is not None and not self._ready_from_snapshot:
             await self._manager_start_task
             self._manager_start_task = None
         await self._telemetry_init_producer.record_ready_time(get_current_epoch_time_ms() - self._ready_time)
@@ -395,6 +382,19 @@ class SplitFactoryAsync(SplitFactoryBase):  # pylint: disable=too-many-instance-
         """
         return SplitManagerAsync(self)
 
+    @property
+    def loop_lag(self):
+        """
+        Return the last and max event loop lag in milliseconds since the previous call.
+
+        :return: dict with `last` and `max` lags, or None when `asyncLoopLagThreshold` isn't set.
+        :rtype: dict
+        """
+        if self._loop_lag_monitor is None:
+            return None
+
+        return self._loop_lag_monitor.pop_stats()
+
     async def block_until_ready(self, timeout=None):
         """
         Blocks until the sdk is ready or the timeout specified by the user expires.
@@ -438,12 +438,17 @@ class SplitFactoryAsync(SplitFactoryBase):  # pylint: disable=too-many-instance-
                     self._ready_task.cancel()
                     self._ready_task = None
 
-                if isinstance(self._storages['splits'], RedisSplitStorageAsync):
+                # Redis storages can only be in use when their module was imported by the redis builder.
+                redis_storage = sys.modules.get('splitio.storage.redis')
+                if redis_storage is not None and isinstance(self._storages['splits'], redis_storage.RedisSplitStorageAsync):
                     await self._get_storage('splits').redis.close()
 
-                if isinstance(self._sync_manager, ManagerAsync) and isinstance(self._telemetry_submitter, InMemoryTelemetrySubmitterAsync):
+                if self._api_client is not None:
                     await self._api_client.close_session()
 
+            if self._loop_lag_monitor is not None:
+                await self._loop_lag_monitor.stop()
+
         except Exception as e:
             _LOGGER.error('Exception destroying factory.')
             _LOGGER.debug(str(e))
@@ -491,6 +496,33 @@ def _build_in_memory_factory(api_key, cfg, sdk_url=None, events_url=None,  # pyl
                              auth_api_base_url=None, streaming_api_base_url=None, telemetry_api_base_url=None,
                              total_flag_sets=0, invalid_flag_sets=0):
     """Build and return a split factory tailored to the supplied config."""
+    from splitio.engine.impressions.unique_keys_tracker import UniqueKeysTracker
+    from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage, InMemoryImpressionStorage, \
+        InMemoryEventStorage, InMemoryTelemetryStorage
+    from splitio.storage.snapshot import StorageSnapshot
+    from splitio.api.client import HttpClient, HttpClientKerberos
+    from splitio.api.splits import SplitsAPI
+    from splitio.api.segments import SegmentsAPI
+    from splitio.api.impressions import ImpressionsAPI
+    from splitio.api.events import EventsAPI
+    from splitio.api.auth import AuthAPI
+    from splitio.api.telemetry import TelemetryAPI
+    from splitio.tasks.split_sync import SplitSynchronizationTask
+    from splitio.tasks.segment_sync import SegmentSynchronizationTask
+    from splitio.tasks.impressions_sync import ImpressionsSyncTask
+    from splitio.tasks.events_sync import EventsSyncTask
+    from splitio.tasks.telemetry_sync import TelemetrySyncTask
+    from splitio.tasks.snapshot_sync import SnapshotSyncTask
+    from splitio.sync.synchronizer import SplitTasks, SplitSynchronizers, Synchronizer
+    from splitio.sync.host import HostLeaderLock, HostSyncManager, Forwarder, ForwardingImpressionsAPI, \
+        ForwardingEventsAPI
+    from splitio.sync.manager import Manager
+    from splitio.sync.split import SplitSynchronizer
+    from splitio.sync.segment import SegmentSynchronizer
+    from splitio.sync.impression import ImpressionSynchronizer
+    from splitio.sync.event import EventSynchronizer
+    from splitio.sync.telemetry import TelemetrySynchronizer, InMemoryTelemetrySubmitter
+
     if not input_validator.validate_factory_instantiation(api_key):
         return None
 
@@ -547,13 +579,29 @@ def _build_in_memory_factory(api_key, cfg, sdk_url=None, events_url=None,  # pyl
         'events': InMemoryEventStorage(cfg['eventsQueueSize'], telemetry_runtime_producer),
     }
 
+    leader_lock = None
+    if cfg['hostSyncLockFile'] is not None:
+        leader_lock = HostLeaderLock(cfg['hostSyncLockFile'])
+        forwarder = Forwarder(cfg['hostSyncLockFile'] + '.sock')
+        apis['impressions'] = ForwardingImpressionsAPI(apis['impressions'], leader_lock, forwarder)
+        apis['events'] = ForwardingEventsAPI(apis['events'], leader_lock, forwarder)
+
     telemetry_submitter = InMemoryTelemetrySubmitter(telemetry_consumer, storages['splits'], storages['segments'], apis['telemetry'])
 
+    snapshot_task = None
+    ready_from_snapshot = False
+    if cfg.get('storageSnapshotFile') is not None:
+        snapshot = StorageSnapshot(cfg['storageSnapshotFile'], api_key, cfg['flagSetsFilter'], cfg.get('storageSnapshotMaxAge'))
+        ready_from_snapshot = snapshot.load(storages['splits'], storages['segments'])
+        snapshot_task = SnapshotSyncTask(lambda: snapshot.save(storages['splits'], storages['segments']),
+                                         cfg.get('storageSnapshotRefreshRate', 300))
+
     imp_counter = ImpressionsCounter()
     unique_keys_tracker = UniqueKeysTracker(_UNIQUE_KEYS_CACHE_SIZE)
     unique_keys_synchronizer, clear_filter_sync, unique_keys_task, \
     clear_filter_task, impressions_count_sync, impressions_count_task, \
-    imp_strategy = set_classes('MEMORY', cfg['impressionsMode'], apis, imp_counter, unique_keys_tracker)
+    imp_strategy = set_classes('MEMORY', cfg['impressionsMode'], apis, imp_counter, unique_keys_tracker,
+                               sampler=_build_impressions_sampler(cfg))
 
     imp_manager = ImpressionsManager(
         imp_strategy, telemetry_runtime_producer)
@@ -588,6 +636,7 @@ def _build_in_memory_factory(api_key, cfg, sdk_url=None, events_url=None,  # pyl
         TelemetrySyncTask(synchronizers.telemetry_sync.synchronize_stats, cfg['metricsRefreshRate']),
         unique_keys_task,
         clear_filter_task,
+        snapshot_task,
     )
 
     synchronizer = Synchronizer(synchronizers, tasks)
@@ -597,6 +646,10 @@ def _build_in_memory_factory(api_key, cfg, sdk_url=None, events_url=None,  # pyl
     sdk_ready_flag = threading.Event() if not preforked_initialization else None
     manager = Manager(sdk_ready_flag, synchronizer, apis['auth'], cfg['streamingEnabled'],
                       sdk_metadata, telemetry_runtime_producer, streaming_api_base_url, api_key[-4:])
+    if leader_lock is not None:
+        manager = HostSyncManager(sdk_ready_flag, manager, synchronizer, leader_lock,
+                                  StorageSnapshot(cfg['hostSyncLockFile'] + '.snapshot', api_key, cfg['flagSetsFilter']),
+                                  storages, cfg['hostSyncLockFile'] + '.sock', cfg['hostSyncRefreshRate'])
 
     storages['events'].set_queue_full_hook(tasks.events_task.flush)
     storages['impressions'].set_queue_full_hook(tasks.impressions_task.flush)
@@ -621,6 +674,10 @@ def _build_in_memory_factory(api_key, cfg, sdk_url=None, events_url=None,  # pyl
         return SplitFactory(api_key, storages, cfg['labelsEnabled'],
                             recorder, manager, None, telemetry_producer, telemetry_init_producer, telemetry_submitter, preforked_initialization=preforked_initialization)
 
+    if ready_from_snapshot:
+        # storages hold the last snapshot, the initial sync catches them up in the background.
+        sdk_ready_flag.set()
+
     initialization_thread = threading.Thread(target=manager.start, name="SDKInitializer", daemon=True)
     initialization_thread.start()
 
@@ -633,6 +690,32 @@ async def _build_in_memory_factory_async(api_key, cfg, sdk_url=None, events_url=
                              auth_api_base_url=None, streaming_api_base_url=None, telemetry_api_base_url=None,
                              total_flag_sets=0, invalid_flag_sets=0):
     """Build and return a split factory tailored to the supplied config in async mode."""
+    from splitio.engine.impressions.unique_keys_tracker import UniqueKeysTrackerAsync
+    from splitio.storage.inmemmory import InMemorySplitStorageAsync, InMemorySegmentStorageAsync, \
+        InMemoryImpressionStorageAsync, InMemoryEventStorageAsync, InMemoryTelemetryStorageAsync
+    from splitio.storage.snapshot import StorageSnapshotAsync
+    from splitio.api.client import HttpClientAsync
+    from splitio.api.splits import SplitsAPIAsync
+    from splitio.api.segments import SegmentsAPIAsync
+    from splitio.api.impressions import ImpressionsAPIAsync
+    from splitio.api.events import EventsAPIAsync
+    from splitio.api.auth import AuthAPIAsync
+    from splitio.api.telemetry import TelemetryAPIAsync
+    from splitio.util.offload import LoopOffloader, LoopLagMonitor
+    from splitio.tasks.split_sync import SplitSynchronizationTaskAsync
+    from splitio.tasks.segment_sync import SegmentSynchronizationTaskAsync
+    from splitio.tasks.impressions_sync import ImpressionsSyncTaskAsync
+    from splitio.tasks.events_sync import EventsSyncTaskAsync
+    from splitio.tasks.telemetry_sync import TelemetrySyncTaskAsync
+    from splitio.tasks.snapshot_sync import SnapshotSyncTaskAsync
+    from splitio.sync.synchronizer import SplitTasks, SplitSynchronizers, SynchronizerAsync
+    from splitio.sync.manager import ManagerAsync
+    from splitio.sync.split import SplitSynchronizerAsync
+    from splitio.sync.segment import SegmentSynchronizerAsync
+    from splitio.sync.impression import ImpressionSynchronizerAsync
+    from splitio.sync.event import EventSynchronizerAsync
+    from splitio.sync.telemetry import InMemoryTelemetrySubmitterAsync, TelemetrySynchronizerAsync
+
     if not input_validator.validate_factory_instantiation(api_key):
         return None
 
@@ -658,11 +741,15 @@ async def _build_in_memory_factory_async(api_key, cfg, sdk_url=None, events_url=
         timeout=cfg.get('connectionTimeout')
     )
 
+    if cfg['hostSyncLockFile'] is not None:
+        _LOGGER.warning('hostSyncLockFile is only supported in threading mode, this process will synchronize on its own.')
+
+    offloader = LoopOffloader(cfg['asyncExecutor'], cfg['asyncLoopBudget'] / 1000)
     sdk_metadata = util.get_metadata(cfg)
     apis = {
         'auth': AuthAPIAsync(http_client, api_key, sdk_metadata, telemetry_runtime_producer),
-        'splits': SplitsAPIAsync(http_client, api_key, sdk_metadata, telemetry_runtime_producer),
-        'segments': SegmentsAPIAsync(http_client, api_key, sdk_metadata, telemetry_runtime_producer),
+        'splits': SplitsAPIAsync(http_client, api_key, sdk_metadata, telemetry_runtime_producer, offloader),
+        'segments': SegmentsAPIAsync(http_client, api_key, sdk_metadata, telemetry_runtime_producer, offloader),
         'impressions': ImpressionsAPIAsync(http_client, api_key, sdk_metadata, telemetry_runtime_producer, cfg['impressionsMode']),
         'events': EventsAPIAsync(http_client, api_key, sdk_metadata, telemetry_runtime_producer),
         'telemetry': TelemetryAPIAsync(http_client, api_key, sdk_metadata, telemetry_runtime_producer),
@@ -670,25 +757,34 @@ async def _build_in_memory_factory_async(api_key, cfg, sdk_url=None, events_url=
 
     storages = {
         'splits': InMemorySplitStorageAsync(cfg['flagSetsFilter'] if cfg['flagSetsFilter'] is not None else []),
-        'segments': InMemorySegmentStorageAsync(),
+        'segments': InMemorySegmentStorageAsync(offloader),
         'impressions': InMemoryImpressionStorageAsync(cfg['impressionsQueueSize'], telemetry_runtime_producer),
         'events': InMemoryEventStorageAsync(cfg['eventsQueueSize'], telemetry_runtime_producer),
     }
 
     telemetry_submitter = InMemoryTelemetrySubmitterAsync(telemetry_consumer, storages['splits'], storages['segments'], apis['telemetry'])
 
+    snapshot_task = None
+    ready_from_snapshot = False
+    if cfg.get('storageSnapshotFile') is not None:
+        snapshot = StorageSnapshotAsync(cfg['storageSnapshotFile'], api_key, cfg['flagSetsFilter'], cfg.get('storageSnapshotMaxAge'))
+        ready_from_snapshot = await snapshot.load(storages['splits'], storages['segments'])
+        snapshot_task = SnapshotSyncTaskAsync(lambda: snapshot.save(storages['splits'], storages['segments']),
+                                              cfg.get('storageSnapshotRefreshRate', 300))
+
     imp_counter = ImpressionsCounter()
     unique_keys_tracker = UniqueKeysTrackerAsync(_UNIQUE_KEYS_CACHE_SIZE)
     unique_keys_synchronizer, clear_filter_sync, unique_keys_task, \
     clear_filter_task, impressions_count_sync, impressions_count_task, \
-    imp_strategy = set_classes_async('MEMORY', cfg['impressionsMode'], apis, imp_counter, unique_keys_tracker)
+    imp_strategy = set_classes_async('MEMORY', cfg['impressionsMode'], apis, imp_counter, unique_keys_tracker,
+                                     sampler=_build_impressions_sampler(cfg))
 
     imp_manager = ImpressionsManager(
         imp_strategy, telemetry_runtime_producer)
 
     synchronizers = SplitSynchronizers(
         SplitSynchronizerAsync(apis['splits'], storages['splits']),
-        SegmentSynchronizerAsync(apis['segments'], storages['splits'], storages['segments']),
+        SegmentSynchronizerAsync(apis['segments'], storages['splits'], storages['segments'], offloader=offloader),
         ImpressionSynchronizerAsync(apis['impressions'], storages['impressions'],
                                cfg['impressionsBulkSize']),
         EventSynchronizerAsync(apis['events'], storages['events'], cfg['eventsBulkSize']),
@@ -716,6 +812,7 @@ async def _build_in_memory_factory_async(api_key, cfg, sdk_url=None, events_url=
         TelemetrySyncTaskAsync(synchronizers.telemetry_sync.synchronize_stats, cfg['metricsRefreshRate']),
         unique_keys_task,
         clear_filter_task,
+        snapshot_task,
     )
 
     synchronizer = SynchronizerAsync(synchronizers, tasks)
@@ -739,16 +836,47 @@ async def _build_in_memory_factory_async(api_key, cfg, sdk_url=None, events_url=
 
     await telemetry_init_producer.record_config(cfg, extra_cfg, total_flag_sets, invalid_flag_sets)
 
+    loop_lag_monitor = None
+    if cfg['asyncLoopLagThreshold'] is not None:
+        loop_lag_monitor = LoopLagMonitor(cfg['asyncLoopLagThreshold'] / 1000)
+        loop_lag_monitor.start()
+
     manager_start_task = asyncio.get_running_loop().create_task(manager.start())
 
     return SplitFactoryAsync(api_key, storages, cfg['labelsEnabled'],
                         recorder, manager,
                         telemetry_producer, telemetry_init_producer,
                         telemetry_submitter, manager_start_task=manager_start_task,
-                        api_client=http_client)
+                        api_client=http_client, ready_from_snapshot=ready_from_snapshot,
+                        loop_lag_monitor=loop_lag_monitor)
+
+def _use_redis_evaluation_script(cfg):
+    """
+    Return whether evaluation data should be fetched through the redis lua script.
+
+    The script reads keys it can't declare upfront, which redis only allows outside of
+    cluster mode.
+    """
+    if not cfg.get('redisEvaluationScriptEnabled', False):
+        return False
+
+    if 'redisClusterNodes' in cfg:
+        _LOGGER.warning('redisEvaluationScriptEnabled is not supported with redis cluster. '
+                        'Evaluation data will be fetched without the lua script.')
+        return False
+
+    return True
 
 def _build_redis_factory(api_key, cfg):
     """Build and return a split factory with redis-based storage."""
+    from splitio.engine.impressions.unique_keys_tracker import UniqueKeysTracker
+    from splitio.storage.adapters import redis
+    from splitio.storage.redis import RedisSplitStorage, RedisSegmentStorage, RedisImpressionsStorage, \
+        RedisEventsStorage, RedisTelemetryStorage, RedisEvaluationStorage
+    from splitio.sync.synchronizer import SplitTasks, SplitSynchronizers, RedisSynchronizer
+    from splitio.sync.manager import RedisManager
+    from splitio.sync.telemetry import RedisTelemetrySubmitter
+
     sdk_metadata = util.get_metadata(cfg)
     redis_adapter = redis.build(cfg)
     cache_enabled = cfg.get('redisLocalCacheEnabled', False)
@@ -760,16 +888,14 @@ def _build_redis_factory(api_key, cfg):
         'events': RedisEventsStorage(redis_adapter, sdk_metadata),
         'telemetry': RedisTelemetryStorage(redis_adapter, sdk_metadata)
     }
+    if _use_redis_evaluation_script(cfg):
+        storages['evaluation'] = RedisEvaluationStorage(redis_adapter)
     telemetry_producer = TelemetryStorageProducer(storages['telemetry'])
     telemetry_runtime_producer = telemetry_producer.get_telemetry_runtime_producer()
     telemetry_init_producer = telemetry_producer.get_telemetry_init_producer()
     telemetry_submitter = RedisTelemetrySubmitter(storages['telemetry'])
 
-    data_sampling = cfg.get('dataSampling', DEFAULT_DATA_SAMPLING)
-    if data_sampling < _MIN_DEFAULT_DATA_SAMPLING_ALLOWED:
-        _LOGGER.warning("dataSampling cannot be less than %.2f, defaulting to minimum",
-                        _MIN_DEFAULT_DATA_SAMPLING_ALLOWED)
-        data_sampling = _MIN_DEFAULT_DATA_SAMPLING_ALLOWED
+    data_sampling = _get_data_sampling(cfg)
 
     imp_counter = ImpressionsCounter()
     unique_keys_tracker = UniqueKeysTracker(_UNIQUE_KEYS_CACHE_SIZE)
@@ -832,6 +958,14 @@ def _build_redis_factory(api_key, cfg):
 
 async def _build_redis_factory_async(api_key, cfg):
     """Build and return a split factory with redis-based storage."""
+    from splitio.engine.impressions.unique_keys_tracker import UniqueKeysTrackerAsync
+    from splitio.storage.adapters import redis
+    from splitio.storage.redis import RedisSplitStorageAsync, RedisEventsStorageAsync, RedisSegmentStorageAsync, \
+        RedisImpressionsStorageAsync, RedisTelemetryStorageAsync, RedisEvaluationStorageAsync
+    from splitio.sync.synchronizer import SplitTasks, SplitSynchronizers, RedisSynchronizerAsync
+    from splitio.sync.manager import RedisManagerAsync
+    from splitio.sync.telemetry import RedisTelemetrySubmitterAsync
+
     sdk_metadata = util.get_metadata(cfg)
     redis_adapter = await redis.build_async(cfg)
     cache_enabled = cfg.get('redisLocalCacheEnabled', False)
@@ -843,16 +977,14 @@ async def _build_redis_factory_async(api_key, cfg):
         'events': RedisEventsStorageAsync(redis_adapter, sdk_metadata),
         'telemetry': await RedisTelemetryStorageAsync.create(redis_adapter, sdk_metadata)
     }
+    if _use_redis_evaluation_script(cfg):
+        storages['evaluation'] = RedisEvaluationStorageAsync(redis_adapter)
     telemetry_producer = TelemetryStorageProducerAsync(storages['telemetry'])
     telemetry_runtime_producer = telemetry_producer.get_telemetry_runtime_producer()
     telemetry_init_producer = telemetry_producer.get_telemetry_init_producer()
     telemetry_submitter = RedisTelemetrySubmitterAsync(storages['telemetry'])
 
-    data_sampling = cfg.get('dataSampling', DEFAULT_DATA_SAMPLING)
-    if data_sampling < _MIN_DEFAULT_DATA_SAMPLING_ALLOWED:
-        _LOGGER.warning("dataSampling cannot be less than %.2f, defaulting to minimum",
-                        _MIN_DEFAULT_DATA_SAMPLING_ALLOWED)
-        data_sampling = _MIN_DEFAULT_DATA_SAMPLING_ALLOWED
+    data_sampling = _get_data_sampling(cfg)
 
     imp_counter = ImpressionsCounter()
     unique_keys_tracker = UniqueKeysTrackerAsync(_UNIQUE_KEYS_CACHE_SIZE)
@@ -913,15 +1045,25 @@ async def _build_redis_factory_async(api_key, cfg):
 
 def _build_pluggable_factory(api_key, cfg):
     """Build and return a split factory with pluggable storage."""
+    from splitio.engine.impressions.unique_keys_tracker import UniqueKeysTracker
+    from splitio.storage.pluggable import PluggableEventsStorage, PluggableImpressionsStorage, PluggableSegmentStorage, \
+        PluggableSplitStorage, PluggableTelemetryStorage
+    from splitio.sync.synchronizer import SplitTasks, SplitSynchronizers, RedisSynchronizer
+    from splitio.sync.manager import RedisManager
+    from splitio.sync.telemetry import RedisTelemetrySubmitter
+
     sdk_metadata = util.get_metadata(cfg)
     if not input_validator.validate_pluggable_adapter(cfg):
         raise Exception("Pluggable Adapter validation failed, exiting")
 
     pluggable_adapter = cfg.get('storageWrapper')
     storage_prefix = cfg.get('storagePrefix')
+    cache_enabled = cfg.get('storageLocalCacheEnabled', False)
+    cache_ttl = cfg.get('storageLocalCacheTTL', 5)
+    cache_size = cfg.get('storageLocalCacheMaxSize', 10000)
     storages = {
-        'splits': PluggableSplitStorage(pluggable_adapter, storage_prefix, []),
-        'segments': PluggableSegmentStorage(pluggable_adapter, storage_prefix),
+        'splits': PluggableSplitStorage(pluggable_adapter, storage_prefix, [], enable_caching=cache_enabled, max_age=cache_ttl, max_size=cache_size),
+        'segments': PluggableSegmentStorage(pluggable_adapter, storage_prefix, enable_caching=cache_enabled, max_age=cache_ttl, max_size=cache_size),
         'impressions': PluggableImpressionsStorage(pluggable_adapter, sdk_metadata, storage_prefix),
         'events': PluggableEventsStorage(pluggable_adapter, sdk_metadata, storage_prefix),
         'telemetry': PluggableTelemetryStorage(pluggable_adapter, sdk_metadata, storage_prefix)
@@ -994,15 +1136,25 @@ def _build_pluggable_factory(api_key, cfg):
 
 async def _build_pluggable_factory_async(api_key, cfg):
     """Build and return a split factory with pluggable storage."""
+    from splitio.engine.impressions.unique_keys_tracker import UniqueKeysTrackerAsync
+    from splitio.storage.pluggable import PluggableTelemetryStorageAsync, PluggableEventsStorageAsync, \
+        PluggableImpressionsStorageAsync, PluggableSegmentStorageAsync, PluggableSplitStorageAsync
+    from splitio.sync.synchronizer import SplitTasks, SplitSynchronizers, RedisSynchronizerAsync
+    from splitio.sync.manager import RedisManagerAsync
+    from splitio.sync.telemetry import RedisTelemetrySubmitterAsync
+
     sdk_metadata = util.get_metadata(cfg)
     if not input_validator.validate_pluggable_adapter(cfg):
         raise Exception("Pluggable Adapter validation failed, exiting")
 
     pluggable_adapter = cfg.get('storageWrapper')
     storage_prefix = cfg.get('storagePrefix')
+    cache_enabled = cfg.get('storageLocalCacheEnabled', False)
+    cache_ttl = cfg.get('storageLocalCacheTTL', 5)
+    cache_size = cfg.get('storageLocalCacheMaxSize', 10000)
     storages = {
-        'splits': PluggableSplitStorageAsync(pluggable_adapter, storage_prefix),
-        'segments': PluggableSegmentStorageAsync(pluggable_adapter, storage_prefix),
+        'splits': PluggableSplitStorageAsync(pluggable_adapter, storage_prefix, enable_caching=cache_enabled, max_age=cache_ttl, max_size=cache_size),
+        'segments': PluggableSegmentStorageAsync(pluggable_adapter, storage_prefix, enable_caching=cache_enabled, max_age=cache_ttl, max_size=cache_size),
         'impressions': PluggableImpressionsStorageAsync(pluggable_adapter, sdk_metadata, storage_prefix),
         'events': PluggableEventsStorageAsync(pluggable_adapter, sdk_metadata, storage_prefix),
         'telemetry': await PluggableTelemetryStorageAsync.create(pluggable_adapter, sdk_metadata, storage_prefix)
@@ -1073,6 +1225,16 @@ async def _build_pluggable_factory_async(api_key, cfg):
 
 def _build_localhost_factory(cfg):
     """Build and return a localhost factory for testing/development purposes."""
+    from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage, LocalhostTelemetryStorage
+    from splitio.tasks.split_sync import SplitSynchronizationTask
+    from splitio.tasks.segment_sync import SegmentSynchronizationTask
+    from splitio.sync.synchronizer import SplitTasks, SplitSynchronizers, LocalhostSynchronizer
+    from splitio.sync.manager import Manager
+    from splitio.sync.split import LocalSplitSynchronizer, LocalhostMode
+    from splitio.sync.segment import LocalSegmentSynchronizer
+    from splitio.sync.telemetry import LocalhostTelemetrySubmitter
+    from splitio.client.localhost import LocalhostEventsStorage, LocalhostImpressionsStorage
+
     telemetry_storage = LocalhostTelemetryStorage()
     telemetry_producer = TelemetryStorageProducer(telemetry_storage)
     telemetry_runtime_producer = telemetry_producer.get_telemetry_runtime_producer()
@@ -1143,14 +1305,27 @@ def _build_localhost_factory(cfg):
 
 async def _build_localhost_factory_async(cfg):
     """Build and return a localhost async factory for testing/development purposes."""
+    from splitio.storage.inmemmory import InMemorySplitStorageAsync, InMemorySegmentStorageAsync, \
+        LocalhostTelemetryStorageAsync
+    from splitio.util.offload import LoopOffloader
+    from splitio.tasks.split_sync import SplitSynchronizationTaskAsync
+    from splitio.tasks.segment_sync import SegmentSynchronizationTaskAsync
+    from splitio.sync.synchronizer import SplitTasks, SplitSynchronizers, LocalhostSynchronizerAsync
+    from splitio.sync.manager import ManagerAsync
+    from splitio.sync.split import LocalhostMode, LocalSplitSynchronizerAsync
+    from splitio.sync.segment import LocalSegmentSynchronizerAsync
+    from splitio.sync.telemetry import LocalhostTelemetrySubmitterAsync
+    from splitio.client.localhost import LocalhostImpressionsStorageAsync, LocalhostEventsStorageAsync
+
     telemetry_storage = LocalhostTelemetryStorageAsync()
     telemetry_producer = TelemetryStorageProducerAsync(telemetry_storage)
     telemetry_runtime_producer = telemetry_producer.get_telemetry_runtime_producer()
     telemetry_evaluation_producer = telemetry_producer.get_telemetry_evaluation_producer()
 
+    offloader = LoopOffloader(cfg['asyncExecutor'], cfg['asyncLoopBudget'] / 1000)
     storages = {
         'splits': InMemorySplitStorageAsync(),
-        'segments': InMemorySegmentStorageAsync(),  # not used, just to avoid possible future errors.
+        'segments': InMemorySegmentStorageAsync(offloader),  # not used, just to avoid possible future errors.
         'impressions': LocalhostImpressionsStorageAsync(),
         'events': LocalhostEventsStorageAsync(),
     }
@@ -1158,8 +1333,9 @@ async def _build_localhost_factory_async(cfg):
     synchronizers = SplitSynchronizers(
         LocalSplitSynchronizerAsync(cfg['splitFile'],
                                storages['splits'],
-                               localhost_mode),
-        LocalSegmentSynchronizerAsync(cfg['segmentDirectory'], storages['splits'], storages['segments']),
+                               localhost_mode,
+                               offloader),
+        LocalSegmentSynchronizerAsync(cfg['segmentDirectory'], storages['splits'], storages['segments'], offloader),
         None, None, None,
     )
 
@@ -1256,6 +1432,8 @@ def get_factory(api_key, **kwargs):
         total_flag_sets,
         invalid_flag_sets)
 
+    split_factory._latency_histograms = _build_latency_histograms(config)  # pylint: disable=protected-access
+    split_factory._evaluation_profiler = _build_evaluation_profiler(config)  # pylint: disable=protected-access
     return split_factory
 
 async def get_factory_async(api_key, **kwargs):
@@ -1303,8 +1481,79 @@ async def get_factory_async(api_key, **kwargs):
         kwargs.get('telemetry_api_base_url'),
         total_flag_sets,
         invalid_flag_sets)
+
+    split_factory._latency_histograms = _build_latency_histograms(config)  # pylint: disable=protected-access
+    split_factory._evaluation_profiler = _build_evaluation_profiler(config)  # pylint: disable=protected-access
     return split_factory
 
+def _build_latency_histograms(cfg):
+    """
+    Build the method latency histograms when enabled and hdrhistogram is installed.
+
+    :param cfg: sanitized configuration.
+    :type cfg: dict
+
+    :rtype: splitio.models.telemetry.MethodLatencyHistograms
+    """
+    if not cfg['latencyHistograms']:
+        return None
+
+    try:
+        return MethodLatencyHistograms()
+    except NotImplementedError:
+        _LOGGER.warning('latencyHistograms requires the hdrhistogram package, '
+                        'use `pip install splitio_client[hdr]` to install it. Latency histograms are disabled.')
+        return None
+
+def _build_evaluation_profiler(cfg):
+    """
+    Build the evaluation profiler when a sampling rate is set.
+
+    :param cfg: sanitized configuration.
+    :type cfg: dict
+
+    :rtype: splitio.client.profiling.EvaluationProfiler
+    """
+    if not cfg['evaluationProfilingRate']:
+        return None
+
+    return EvaluationProfiler(cfg['evaluationProfilingRate'], cfg['evaluationProfilingHook'])
+
+def _get_data_sampling(cfg):
+    """
+    Return the fraction of impressions to keep, no lower than the minimum allowed.
+
+    :param cfg: sanitized configuration.
+    :type cfg: dict
+
+    :rtype: float
+    """
+    data_sampling = cfg.get('dataSampling', DEFAULT_DATA_SAMPLING)
+    if data_sampling < _MIN_DEFAULT_DATA_SAMPLING_ALLOWED:
+        _LOGGER.warning("dataSampling cannot be less than %.2f, defaulting to minimum",
+                        _MIN_DEFAULT_DATA_SAMPLING_ALLOWED)
+        data_sampling = _MIN_DEFAULT_DATA_SAMPLING_ALLOWED
+    return data_sampling
+
+def _build_impressions_sampler(cfg):
+    """
+    Build the sampler of debug mode impressions when sampling or a rate limit is set.
+
+    :param cfg: sanitized configuration.
+    :type cfg: dict
+
+    :rtype: splitio.engine.impressions.manager.Sampler
+    """
+    if cfg['impressionsMode'] != ImpressionsMode.DEBUG:
+        return None
+
+    data_sampling = _get_data_sampling(cfg)
+    if data_sampling >= DEFAULT_DATA_SAMPLING and not cfg.get('impressionsSamplingByFlag') \
+       and cfg.get('impressionsRateLimit') is None:
+        return None
+
+    return ImpressionsSampler(data_sampling, cfg.get('impressionsSamplingByFlag'), cfg.get('impressionsRateLimit'))
+
 def _get_active_and_redundant_count():
     redundant_factory_count = 0
     active_factory_count = 0
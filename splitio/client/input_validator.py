@@ -666,6 +666,17 @@ def validate_pluggable_adapter(config):
             _LOGGER.error("Pluggable adapter method %s has less than required arguments count: %s : " % (exp_method, len(get_method_args)))
             return False
 
+    optional_methods = {'item_contains_many': 2}
+    for opt_method in optional_methods:
+        for method in methods:
+            if opt_method == method[0]:
+                if len(inspect.signature(method[1]).parameters) < optional_methods[opt_method]:
+                    _LOGGER.error("Pluggable adapter method %s has less than required arguments count: %s : " % (opt_method, len(inspect.signature(method[1]).parameters)))
+                    return False
+
+                _LOGGER.debug("Pluggable adapter supports batch method: %s" % opt_method)
+                break
+
     return True
 
 def validate_flag_sets(flag_sets, method_name):
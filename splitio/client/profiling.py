@@ -0,0 +1,118 @@
+"""Per-stage profiling of client evaluations."""
+import logging
+import random
+import threading
+
+from splitio.engine.profiling import EvaluationStage, EvaluationProfile  # pylint: disable=unused-import
+from splitio.optional.loaders import set_span_in_context
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EvaluationProfiler(object):
+    """
+    Sample client calls and aggregate how long each of their stages took.
+
+    Only sampled calls pay for timing, counting and the hook, the rest just skip a random draw.
+    """
+
+    def __init__(self, rate, hook=None):
+        """
+        Construct a profiler.
+
+        :param rate: fraction of calls to profile, between 0 and 1
+        :type rate: float
+        :param hook: callable receiving the method and stages of every sampled call
+        :type hook: callable
+        """
+        self._rate = rate
+        self._hook = hook
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def sample(self, method):
+        """
+        Return a profile for the call when it's sampled.
+
+        :param method: method called
+        :type method: splitio.models.telemetry.MethodExceptionsAndLatencies
+
+        :rtype: splitio.engine.profiling.EvaluationProfile
+        """
+        if self._rate < 1 and random.random() >= self._rate:
+            return None
+
+        return EvaluationProfile(method)
+
+    def finish(self, profile):
+        """
+        Aggregate the stages of a finished call and hand them to the hook.
+
+        :param profile: profile of the finished call
+        :type profile: splitio.engine.profiling.EvaluationProfile
+        """
+        stages = profile.stages()
+        with self._lock:
+            for stage, start, end in stages:
+                elapsed = end - start
+                stats = self._stats.get(stage)
+                if stats is None:
+                    self._stats[stage] = [1, elapsed, elapsed]
+                    continue
+                stats[0] += 1
+                stats[1] += elapsed
+                if elapsed > stats[2]:
+                    stats[2] = elapsed
+
+        if self._hook is None:
+            return
+
+        try:
+            self._hook(profile.method, stages)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.error('Evaluation profiling hook failed')
+            _LOGGER.debug('Error: ', exc_info=True)
+
+    def stats(self):
+        """
+        Return the number of sampled calls and their mean and max time in microseconds, by stage.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                stage.value: {'count': count, 'mean': total / count / 1000, 'max': peak / 1000}
+                for stage, (count, total, peak) in self._stats.items()
+            }
+
+
+class OpenTelemetryProfilingHook(object):  # pylint: disable=too-few-public-methods
+    """Profiling hook reporting each sampled call as a span, with a child span per stage."""
+
+    def __init__(self, tracer):
+        """
+        Construct the hook.
+
+        :param tracer: tracer creating the spans
+        :type tracer: opentelemetry.trace.Tracer
+        """
+        self._tracer = tracer
+
+    def __call__(self, method, stages):
+        """
+        Report a sampled call.
+
+        :param method: method called
+        :type method: splitio.models.telemetry.MethodExceptionsAndLatencies
+        :param stages: stages run, with their start and end as nanoseconds since the epoch
+        :type stages: list(tuple(splitio.engine.profiling.EvaluationStage, int, int))
+        """
+        if not stages:
+            return
+
+        call = self._tracer.start_span('split.get_' + method.value, start_time=stages[0][1])
+        context = set_span_in_context(call)
+        for stage, start, end in stages:
+            self._tracer.start_span('split.' + stage.value, context=context, start_time=start).end(end_time=end)
+        call.end(end_time=stages[-1][2])
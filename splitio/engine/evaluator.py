@@ -6,7 +6,7 @@ from splitio.models.impressions import Label
 from splitio.models.grammar.condition import ConditionType
 from splitio.models.grammar.matchers.misc import DependencyMatcher
 from splitio.models.grammar.matchers.keys import UserDefinedSegmentMatcher
-from splitio.optional.loaders import asyncio
+from splitio.engine.profiling import EvaluationStage
 
 CONTROL = 'control'
 EvaluationContext = namedtuple('EvaluationContext', ['flags', 'segment_memberships'])
@@ -14,6 +14,43 @@ EvaluationContext = namedtuple('EvaluationContext', ['flags', 'segment_membershi
 _LOGGER = logging.getLogger(__name__)
 
 
+class EvaluationResult(object):  # pylint: disable=too-few-public-methods
+    """Treatment of a single evaluation, with the config, label and change number its impression needs."""
+
+    __slots__ = ('treatment', 'configurations', 'label', 'change_number')
+
+    def __init__(self, treatment, configurations, label, change_number):
+        """
+        Construct a result.
+
+        :param treatment: treatment evaluated
+        :type treatment: str
+        :param configurations: config attached to the treatment
+        :type configurations: str
+        :param label: label explaining the treatment
+        :type label: str
+        :param change_number: change number of the flag evaluated
+        :type change_number: int
+        """
+        self.treatment = treatment
+        self.configurations = configurations
+        self.label = label
+        self.change_number = change_number
+
+    def _astuple(self):
+        return self.treatment, self.configurations, self.label, self.change_number
+
+    def __eq__(self, other):
+        return isinstance(other, EvaluationResult) and self._astuple() == other._astuple()
+
+    def __repr__(self):
+        return 'EvaluationResult(%r, %r, %r, %r)' % self._astuple()
+
+
+# Results don't change once built, so the ones not depending on a flag are shared.
+_NOT_FOUND_RESULT = EvaluationResult(CONTROL, None, Label.SPLIT_NOT_FOUND, -1)
+
+
 class Evaluator(object):  # pylint: disable=too-few-public-methods
     """Split Evaluator class."""
 
@@ -40,35 +77,21 @@ class Evaluator(object):  # pylint: disable=too-few-public-methods
         """
         ...
         """
-        label = ''
-        _treatment = CONTROL
-        _change_number = -1
-
         feature = ctx.flags.get(feature_name)
         if not feature:
             _LOGGER.warning('Unknown or invalid feature: %s', feature)
-            label = Label.SPLIT_NOT_FOUND
+            return _NOT_FOUND_RESULT
+
+        if feature.killed:
+            label = Label.KILLED
+            treatment = feature.default_treatment
         else:
-            _change_number = feature.change_number
-            if feature.killed:
-                label = Label.KILLED
-                _treatment = feature.default_treatment
-            else:
-                treatment, label = self._treatment_for_flag(feature, key, bucketing, attrs, ctx)
-                if treatment is None:
-                    label = Label.NO_CONDITION_MATCHED
-                    _treatment = feature.default_treatment
-                else:
-                    _treatment = treatment
+            treatment, label = self._treatment_for_flag(feature, key, bucketing, attrs, ctx)
+            if treatment is None:
+                label = Label.NO_CONDITION_MATCHED
+                treatment = feature.default_treatment
 
-        return {
-            'treatment': _treatment,
-            'configurations': feature.get_configurations_for(_treatment) if feature else None,
-            'impression': {
-                'label': label,
-                'change_number': _change_number
-            }
-        }
+        return EvaluationResult(treatment, feature.get_configurations_for(treatment), label, feature.change_number)
 
     def _treatment_for_flag(self, flag, key, bucketing, attributes, ctx):
         """
@@ -97,19 +120,30 @@ class Evaluator(object):  # pylint: disable=too-few-public-methods
 
 class EvaluationDataFactory:
 
-    def __init__(self, split_storage, segment_storage):
+    def __init__(self, split_storage, segment_storage, evaluation_storage=None):
         self._flag_storage = split_storage
         self._segment_storage = segment_storage
+        self._evaluation_storage = evaluation_storage
 
-    def context_for(self, key, feature_names):
+    def context_for(self, key, feature_names, profile=None):
         """
         Recursively iterate & fetch all data required to evaluate these flags.
         :type features: list
         :type bucketing_key: str
         :type attributes: dict
+        :param profile: profile of the call, to close the flags and segments fetching stages on
+        :type profile: splitio.engine.profiling.EvaluationProfile
 
         :rtype: EvaluationContext
         """
+        if self._evaluation_storage is not None:
+            fetched = self._evaluation_storage.fetch_evaluation_data(key, feature_names)
+            if fetched is not None:
+                if profile is not None:
+                    profile.mark(EvaluationStage.FETCH_FLAGS)
+                    profile.mark(EvaluationStage.FETCH_SEGMENTS)
+                return EvaluationContext(*fetched)
+
         pending = set(feature_names)
         splits = {}
         pending_memberships = set()
@@ -123,27 +157,41 @@ class EvaluationDataFactory:
                 pending.update(filter(lambda f: f not in splits, cf))
                 pending_memberships.update(cs)
 
-        return EvaluationContext(splits, {
-            segment: self._segment_storage.segment_contains(segment, key)
-            for segment in pending_memberships
-        })
+        if profile is not None:
+            profile.mark(EvaluationStage.FETCH_FLAGS)
+        memberships = self._segment_storage.segment_contains_many(list(pending_memberships), key) \
+            if pending_memberships else {}
+        if profile is not None:
+            profile.mark(EvaluationStage.FETCH_SEGMENTS)
+        return EvaluationContext(splits, memberships)
 
 
 class AsyncEvaluationDataFactory:
 
-    def __init__(self, split_storage, segment_storage):
+    def __init__(self, split_storage, segment_storage, evaluation_storage=None):
         self._flag_storage = split_storage
         self._segment_storage = segment_storage
+        self._evaluation_storage = evaluation_storage
 
-    async def context_for(self, key, feature_names):
+    async def context_for(self, key, feature_names, profile=None):
         """
         Recursively iterate & fetch all data required to evaluate these flags.
         :type features: list
         :type bucketing_key: str
         :type attributes: dict
+        :param profile: profile of the call, to close the flags and segments fetching stages on
+        :type profile: splitio.engine.profiling.EvaluationProfile
 
         :rtype: EvaluationContext
         """
+        if self._evaluation_storage is not None:
+            fetched = await self._evaluation_storage.fetch_evaluation_data(key, feature_names)
+            if fetched is not None:
+                if profile is not None:
+                    profile.mark(EvaluationStage.FETCH_FLAGS)
+                    profile.mark(EvaluationStage.FETCH_SEGMENTS)
+                return EvaluationContext(*fetched)
+
         pending = set(feature_names)
         splits = {}
         pending_memberships = set()
@@ -157,13 +205,13 @@ class AsyncEvaluationDataFactory:
                 pending.update(filter(lambda f: f not in splits, cf))
                 pending_memberships.update(cs)
 
-        segment_names = list(pending_memberships)
-        segment_memberships = await asyncio.gather(*[
-            self._segment_storage.segment_contains(segment, key)
-            for segment in segment_names
-        ])
-
-        return EvaluationContext(splits, dict(zip(segment_names, segment_memberships)))
+        if profile is not None:
+            profile.mark(EvaluationStage.FETCH_FLAGS)
+        memberships = await self._segment_storage.segment_contains_many(list(pending_memberships), key) \
+            if pending_memberships else {}
+        if profile is not None:
+            profile.mark(EvaluationStage.FETCH_SEGMENTS)
+        return EvaluationContext(splits, memberships)
 
 
 def get_dependencies(feature):
@@ -1,13 +1,7 @@
 from splitio.engine.impressions.impressions import ImpressionsMode
 from splitio.engine.impressions.strategies import StrategyNoneMode, StrategyDebugMode, StrategyOptimizedMode
-from splitio.engine.impressions.adapters import InMemorySenderAdapter, RedisSenderAdapter, PluggableSenderAdapter, RedisSenderAdapterAsync, \
-    InMemorySenderAdapterAsync, PluggableSenderAdapterAsync
-from splitio.tasks.unique_keys_sync import UniqueKeysSyncTask, ClearFilterSyncTask, UniqueKeysSyncTaskAsync, ClearFilterSyncTaskAsync
-from splitio.sync.unique_keys import UniqueKeysSynchronizer, ClearFilterSynchronizer, UniqueKeysSynchronizerAsync, ClearFilterSynchronizerAsync
-from splitio.sync.impression import ImpressionsCountSynchronizer, ImpressionsCountSynchronizerAsync
-from splitio.tasks.impressions_sync import ImpressionsCountSyncTask, ImpressionsCountSyncTaskAsync
 
-def set_classes(storage_mode, impressions_mode, api_adapter, imp_counter, unique_keys_tracker, prefix=None):
+def set_classes(storage_mode, impressions_mode, api_adapter, imp_counter, unique_keys_tracker, prefix=None, sampler=None):
     """
     Createe and return instances based on storage, impressions and threading mode
 
@@ -23,6 +17,8 @@ def set_classes(storage_mode, impressions_mode, api_adapter, imp_counter, unique
     :type unique_keys_tracker: splitio.engine.unique_keys_tracker.UniqueKeysTracker/splitio.engine.unique_keys_tracker.UniqueKeysTrackerAsync
     :param prefix: Prefix used for redis or pluggable adapters
     :type prefix: str
+    :param sampler: Sampler of debug mode impressions
+    :type sampler: splitio.engine.impressions.manager.Sampler
 
     :return: tuple of classes instances.
     :rtype: (splitio.sync.unique_keys.UniqueKeysSynchronizer,
@@ -33,6 +29,13 @@ def set_classes(storage_mode, impressions_mode, api_adapter, imp_counter, unique
             splitio.tasks.impressions_sync.ImpressionsCountSyncTask,
             splitio.engine.impressions.strategies.StrategyNoneMode/splitio.engine.impressions.strategies.StrategyDebugMode/splitio.engine.impressions.strategies.StrategyOptimizedMode)
     """
+    # Sender adapters pull in the redis client and tasks the sync modules, so they're imported once a factory is built.
+    from splitio.engine.impressions.adapters import InMemorySenderAdapter, RedisSenderAdapter, PluggableSenderAdapter
+    from splitio.tasks.unique_keys_sync import UniqueKeysSyncTask, ClearFilterSyncTask
+    from splitio.sync.unique_keys import UniqueKeysSynchronizer, ClearFilterSynchronizer
+    from splitio.sync.impression import ImpressionsCountSynchronizer
+    from splitio.tasks.impressions_sync import ImpressionsCountSyncTask
+
     unique_keys_synchronizer = None
     clear_filter_sync = None
     unique_keys_task = None
@@ -63,7 +66,7 @@ def set_classes(storage_mode, impressions_mode, api_adapter, imp_counter, unique
         clear_filter_task = ClearFilterSyncTask(clear_filter_sync.clear_all)
         unique_keys_tracker.set_queue_full_hook(unique_keys_task.flush)
     elif impressions_mode == ImpressionsMode.DEBUG:
-        imp_strategy = StrategyDebugMode()
+        imp_strategy = StrategyDebugMode(sampler)
     else:
         imp_strategy = StrategyOptimizedMode()
         impressions_count_sync = ImpressionsCountSynchronizer(api_impressions_adapter, imp_counter)
@@ -72,7 +75,7 @@ def set_classes(storage_mode, impressions_mode, api_adapter, imp_counter, unique
     return unique_keys_synchronizer, clear_filter_sync, unique_keys_task, clear_filter_task, \
             impressions_count_sync, impressions_count_task, imp_strategy
 
-def set_classes_async(storage_mode, impressions_mode, api_adapter, imp_counter, unique_keys_tracker, prefix=None):
+def set_classes_async(storage_mode, impressions_mode, api_adapter, imp_counter, unique_keys_tracker, prefix=None, sampler=None):
     """
     Createe and return instances based on storage, impressions and async mode
 
@@ -88,6 +91,8 @@ def set_classes_async(storage_mode, impressions_mode, api_adapter, imp_counter,
     :type unique_keys_tracker: splitio.engine.unique_keys_tracker.UniqueKeysTracker/splitio.engine.unique_keys_tracker.UniqueKeysTrackerAsync
     :param prefix: Prefix used for redis or pluggable adapters
     :type prefix: str
+    :param sampler: Sampler of debug mode impressions
+    :type sampler: splitio.engine.impressions.manager.Sampler
 
     :return: tuple of classes instances.
     :rtype: (splitio.sync.unique_keys.UniqueKeysSynchronizerAsync,
@@ -98,6 +103,12 @@ def set_classes_async(storage_mode, impressions_mode, api_adapter, imp_counter,
             splitio.tasks.impressions_sync.ImpressionsCountSyncTaskAsync,
             splitio.engine.impressions.strategies.StrategyNoneMode/splitio.engine.impressions.strategies.StrategyDebugMode/splitio.engine.impressions.strategies.StrategyOptimizedMode)
     """
+    from splitio.engine.impressions.adapters import InMemorySenderAdapterAsync, RedisSenderAdapterAsync, PluggableSenderAdapterAsync
+    from splitio.tasks.unique_keys_sync import UniqueKeysSyncTaskAsync, ClearFilterSyncTaskAsync
+    from splitio.sync.unique_keys import UniqueKeysSynchronizerAsync, ClearFilterSynchronizerAsync
+    from splitio.sync.impression import ImpressionsCountSynchronizerAsync
+    from splitio.tasks.impressions_sync import ImpressionsCountSyncTaskAsync
+
     unique_keys_synchronizer = None
     clear_filter_sync = None
     unique_keys_task = None
@@ -128,7 +139,7 @@ def set_classes_async(storage_mode, impressions_mode, api_adapter, imp_counter,
         clear_filter_task = ClearFilterSyncTaskAsync(clear_filter_sync.clear_all)
         unique_keys_tracker.set_queue_full_hook(unique_keys_task.flush)
     elif impressions_mode == ImpressionsMode.DEBUG:
-        imp_strategy = StrategyDebugMode()
+        imp_strategy = StrategyDebugMode(sampler)
     else:
         imp_strategy = StrategyOptimizedMode()
         impressions_count_sync = ImpressionsCountSynchronizerAsync(api_impressions_adapter, imp_counter)
@@ -2,7 +2,7 @@ import abc
 import logging
 import json
 
-from splitio.storage.adapters.redis import RedisAdapterException
+from splitio.storage.adapters import RedisAdapterException
 
 _LOGGER = logging.getLogger(__name__)
 _MTK_QUEUE_KEY = 'SPLITIO.uniquekeys'
@@ -1,4 +1,6 @@
+import random
 import threading
+import time
 from collections import defaultdict, namedtuple
 
 from splitio.util.time import utctime_ms
@@ -111,7 +113,68 @@ class Observer(object):  # pylint:disable=too-few-public-methods
                           impression.change_number,
                           impression.bucketing_key,
                           impression.time,
-                          previous_time)
+                          previous_time,
+                          impression.sampling_rate)
+
+
+class Sampler(object):  # pylint:disable=too-few-public-methods
+    """
+    Sample impressions and cap how many are kept per second.
+
+    Kept impressions carry the rate they were sampled at, so that they can be re-weighted. Those
+    dropped by the rate limit aren't re-weighted, the cap is meant for bursts.
+    """
+
+    def __init__(self, rate=1, rates_by_flag=None, max_per_second=None):
+        """
+        Class constructor.
+
+        :param rate: fraction of impressions to keep, between 0 and 1
+        :type rate: float
+        :param rates_by_flag: fraction of impressions to keep by flag name, overriding the rate
+        :type rates_by_flag: dict
+        :param max_per_second: impressions kept per second, with bursts of up to as many, or None for no limit
+        :type max_per_second: int
+        """
+        self._rate = rate
+        self._rates_by_flag = rates_by_flag or {}
+        self._max_per_second = max_per_second
+        self._tokens = max_per_second
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+    def sample(self, impressions):
+        """
+        Return the impressions kept.
+
+        :param impressions: List of impression objects with attributes
+        :type impressions: list[tuple[splitio.models.impression.Impression, dict]]
+
+        :returns: impressions kept, with their sampling rate set when sampled
+        :rtype: list[tuple[splitio.models.impression.Impression, dict]]
+        """
+        kept = []
+        for impression, attributes in impressions:
+            rate = self._rates_by_flag.get(impression.feature_name, self._rate)
+            if rate >= 1:
+                kept.append((impression, attributes))
+            elif random.random() < rate:
+                kept.append((impression._replace(sampling_rate=rate), attributes))
+
+        if self._max_per_second is None or not kept:
+            return kept
+
+        return kept[:self._take(len(kept))]
+
+    def _take(self, count):
+        """Take up to `count` tokens from the bucket, refilled since the last time, and return how many were taken."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._max_per_second, self._tokens + (now - self._refilled) * self._max_per_second)
+            self._refilled = now
+            taken = min(count, int(self._tokens))
+            self._tokens -= taken
+            return taken
 
 
 class Counter(object):
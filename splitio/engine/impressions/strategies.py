@@ -19,18 +19,22 @@ class BaseStrategy(object, metaclass=abc.ABCMeta):
 class StrategyDebugMode(BaseStrategy):
     """Debug mode strategy."""
 
-    def __init__(self):
+    def __init__(self, sampler=None):
         """
         Construct a strategy instance for debug mode.
 
+        :param sampler: sampler of impressions, applied before they're observed
+        :type sampler: splitio.engine.impressions.manager.Sampler
         """
         self._observer = Observer(_IMPRESSION_OBSERVER_CACHE_SIZE)
+        self._sampler = sampler
 
     def process_impressions(self, impressions):
         """
         Process impressions.
 
-        Impressions are analyzed to see if they've been seen before.
+        Impressions are sampled when there's a sampler, and the ones kept analyzed to see if
+        they've been seen before. Those sampled out are neither stored nor sent to the listener.
 
         :param impressions: List of impression objects with attributes
         :type impressions: list[tuple[splitio.models.impression.Impression, dict]]
@@ -38,6 +42,8 @@ class StrategyDebugMode(BaseStrategy):
         :returns: Tuple of to be stored, observed and counted impressions, and unique keys tuple
         :rtype: list[tuple[splitio.models.impression.Impression, dict]], list[], list[], list[]
         """
+        if self._sampler is not None:
+            impressions = self._sampler.sample(impressions)
         imps = [(self._observer.test_and_set(imp), attrs) for imp, attrs in impressions]
         return [i for i, _ in imps], imps, [], []
 
@@ -2,13 +2,61 @@ import abc
 import threading
 import logging
 
-from splitio.engine.filters import BloomFilter
-from splitio.optional.loaders import asyncio
-
 _LOGGER = logging.getLogger(__name__)
 
+# Filter bits kept per key the tracker holds, and bits set by each key: about 1% false positives.
+_BITS_PER_KEY = 10
+_HASHES = 7
+_MAX_STRIPES = 16
+_KEYS_PER_STRIPE = 1024
+_MASK_64 = (1 << 64) - 1
+_GOLDEN_64 = 0x9E3779B97F4A7C15
+
+
+class _Stripe(object):  # pylint: disable=too-few-public-methods
+    """Slice of the filter bits and of the keys tracked, guarded by its own lock."""
+
+    __slots__ = ('lock', 'bits', 'size_bits', 'keys', 'count')
+
+    def __init__(self, size_bits):
+        self.lock = threading.Lock()
+        self.bits = bytearray((size_bits + 7) // 8)
+        self.size_bits = size_bits
+        self.keys = {}
+        self.count = 0
+
+
 class UniqueKeysTrackerBase(object, metaclass=abc.ABCMeta):
-    """Unique Keys Tracker base class."""
+    """
+    Unique Keys Tracker base class.
+
+    Flag names are interned to small ints and each key is hashed with its flag's id into a 64 bit
+    fingerprint, which picks the stripe and the bits of its bloom filter. The stripe also holds the
+    keys not seen yet, in a list per flag id, so that a key is checked and kept under a single lock.
+    Filter bits are allocated upfront, so the filter doesn't grow however many keys are tracked.
+    """
+
+    def __init__(self, cache_size, stripes):
+        """
+        Initialize the stripes of the tracker.
+
+        :param cache_size: The number of keys kept before the queue full hook is called
+        :type cache_size: int
+        :param stripes: The maximum number of stripes, a power of two
+        :type stripes: int
+        """
+        self._cache_size = cache_size
+        while stripes > 1 and cache_size // stripes < _KEYS_PER_STRIPE:
+            stripes //= 2
+        self._stripe_mask = stripes - 1
+        self._stripe_capacity = cache_size // stripes
+        size_bits = max(64, cache_size * _BITS_PER_KEY // stripes)
+        self._stripes = [_Stripe(size_bits) for _ in range(stripes)]
+        self._flag_ids = {}
+        self._flag_names = []
+        self._intern_lock = threading.Lock()
+        self._queue_full_hook = None
+        self._flush_requested = False
 
     @abc.abstractmethod
     def track(self, key, feature_flag_name):
@@ -26,18 +74,91 @@ class UniqueKeysTrackerBase(object, metaclass=abc.ABCMeta):
         if callable(hook):
             self._queue_full_hook = hook
 
-    def _add_or_update(self, feature_flag_name, key):
+    def _flag_id(self, feature_flag_name):
+        """Return the small int standing for a flag name, assigning the next one to new names."""
+        flag_id = self._flag_ids.get(feature_flag_name)
+        if flag_id is None:
+            with self._intern_lock:
+                flag_id = self._flag_ids.get(feature_flag_name)
+                if flag_id is None:
+                    flag_id = len(self._flag_names)
+                    self._flag_names.append(feature_flag_name)
+                    self._flag_ids[feature_flag_name] = flag_id
+        return flag_id
+
+    def _add(self, key, feature_flag_name):
         """
-        Add the feature_name+key to both bloom filter and dictionary.
+        Add a key to its stripe unless its filter has already seen it.
 
+        :param key: key to be added to MTK list
+        :type key: str
         :param feature_flag_name: feature flag name associated with the key
         :type feature_flag_name: str
-        :param key: key to be added to MTK list
-        :type key: int
+
+        :return: whether the key was added, and whether to flush because its stripe just went over
+            capacity, only once until the keys are popped
+        :rtype: tuple(bool, bool)
+        """
+        flag_id = self._flag_id(feature_flag_name)
+        fingerprint = (hash(key) ^ (flag_id * _GOLDEN_64)) & _MASK_64
+        stripe = self._stripes[(fingerprint >> 32) & self._stripe_mask]
+        low = fingerprint & 0xFFFFFFFF
+        high = (fingerprint >> 36) | 1
+        with stripe.lock:
+            bits = stripe.bits
+            size_bits = stripe.size_bits
+            seen = True
+            for index in range(_HASHES):
+                position = (low + index * high) % size_bits
+                mask = 1 << (position & 7)
+                if not bits[position >> 3] & mask:
+                    bits[position >> 3] |= mask
+                    seen = False
+            if seen:
+                return False, False
+
+            keys = stripe.keys.get(flag_id)
+            if keys is None:
+                stripe.keys[flag_id] = keys = []
+            keys.append(key)
+            stripe.count += 1
+            if stripe.count <= self._stripe_capacity or self._flush_requested:
+                return True, False
+
+            self._flush_requested = True
+            return True, True
+
+    def _clear_filter(self):
+        """Unset the filter bits of every stripe."""
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.bits = bytearray(len(stripe.bits))
+
+    def _pop_all(self):
         """
-        if feature_flag_name not in self._cache:
-            self._cache[feature_flag_name] = set()
-        self._cache[feature_flag_name].add(key)
+        Take the keys of every stripe and return them by flag name, with their count.
+
+        :rtype: tuple(dict, int)
+        """
+        self._flush_requested = False
+        taken = []
+        for stripe in self._stripes:
+            with stripe.lock:
+                taken.append((stripe.keys, stripe.count))
+                stripe.keys = {}
+                stripe.count = 0
+
+        cache = {}
+        total = 0
+        for keys_by_flag, count in taken:
+            total += count
+            for flag_id, keys in keys_by_flag.items():
+                name = self._flag_names[flag_id]
+                if name in cache:
+                    cache[name].extend(keys)
+                else:
+                    cache[name] = keys
+        return cache, total
 
 
 class UniqueKeysTracker(UniqueKeysTrackerBase):
@@ -50,12 +171,7 @@ class UniqueKeysTracker(UniqueKeysTrackerBase):
         :param cache_size: The size of the unique keys dictionary
         :type key: int
         """
-        self._cache_size = cache_size
-        self._filter = BloomFilter(cache_size)
-        self._lock = threading.RLock()
-        self._cache = {}
-        self._queue_full_hook = None
-        self._current_cache_size = 0
+        UniqueKeysTrackerBase.__init__(self, cache_size, _MAX_STRIPES)
 
     def track(self, key, feature_flag_name):
         """
@@ -69,43 +185,38 @@ class UniqueKeysTracker(UniqueKeysTrackerBase):
         :return: True if successful
         :rtype: boolean
         """
-        with self._lock:
-            if self._filter.contains(feature_flag_name+key):
-                return False
-
-            self._add_or_update(feature_flag_name, key)
-            self._filter.add(feature_flag_name+key)
-            self._current_cache_size += 1
-
-        if self._current_cache_size > self._cache_size:
+        added, full = self._add(key, feature_flag_name)
+        if full:
             _LOGGER.info(
                 'Unique Keys queue is full, flushing the current queue now.'
             )
             if self._queue_full_hook is not None and callable(self._queue_full_hook):
                 _LOGGER.info('Calling hook.')
                 self._queue_full_hook()
-        return True
+        return added
 
     def clear_filter(self):
         """
         Delete the filter items
 
         """
-        with self._lock:
-            self._filter.clear()
+        self._clear_filter()
 
     def get_cache_info_and_pop_all(self):
-        with self._lock:
-            temp_cach = self._cache
-            temp_cache_size = self._current_cache_size
-            self._cache = {}
-            self._current_cache_size = 0
+        """
+        Return the keys tracked by flag name, with their count, and start over.
 
-            return temp_cach, temp_cache_size
+        :rtype: tuple(dict, int)
+        """
+        return self._pop_all()
 
 
 class UniqueKeysTrackerAsync(UniqueKeysTrackerBase):
-    """Unique Keys Tracker async class."""
+    """
+    Unique Keys Tracker async class.
+
+    Keys are checked and added without awaiting, so a single stripe is enough.
+    """
 
     def __init__(self, cache_size=30000):
         """
@@ -114,12 +225,7 @@ class UniqueKeysTrackerAsync(UniqueKeysTrackerBase):
         :param cache_size: The size of the unique keys dictionary
         :type key: int
         """
-        self._cache_size = cache_size
-        self._filter = BloomFilter(cache_size)
-        self._lock = asyncio.Lock()
-        self._cache = {}
-        self._queue_full_hook = None
-        self._current_cache_size = 0
+        UniqueKeysTrackerBase.__init__(self, cache_size, 1)
 
     async def track(self, key, feature_flag_name):
         """
@@ -133,36 +239,27 @@ class UniqueKeysTrackerAsync(UniqueKeysTrackerBase):
         :return: True if successful
         :rtype: boolean
         """
-        async with self._lock:
-            if self._filter.contains(feature_flag_name+key):
-                return False
-
-            self._add_or_update(feature_flag_name, key)
-            self._filter.add(feature_flag_name+key)
-            self._current_cache_size += 1
-
-        if self._current_cache_size > self._cache_size:
+        added, full = self._add(key, feature_flag_name)
+        if full:
             _LOGGER.info(
                 'Unique Keys queue is full, flushing the current queue now.'
             )
             if self._queue_full_hook is not None and callable(self._queue_full_hook):
                 _LOGGER.info('Calling hook.')
                 await self._queue_full_hook()
-        return True
+        return added
 
     async def clear_filter(self):
         """
         Delete the filter items
 
         """
-        async with self._lock:
-            self._filter.clear()
+        self._clear_filter()
 
     async def get_cache_info_and_pop_all(self):
-        async with self._lock:
-            temp_cach = self._cache
-            temp_cache_size = self._current_cache_size
-            self._cache = {}
-            self._current_cache_size = 0
+        """
+        Return the keys tracked by flag name, with their count, and start over.
 
-            return temp_cach, temp_cache_size
\ No newline at end of file
+        :rtype: tuple(dict, int)
+        """
+        return self._pop_all()
@@ -0,0 +1,48 @@
+"""Stages and stage timings of profiled evaluations."""
+from enum import Enum
+from time import perf_counter_ns, time_ns
+
+
+class EvaluationStage(Enum):
+    """Stages of a get_treatment(s) call."""
+
+    VALIDATE = 'validate'
+    FETCH_FLAGS = 'fetch_flags'
+    FETCH_SEGMENTS = 'fetch_segments'
+    EVALUATE = 'evaluate'
+    RECORD_IMPRESSIONS = 'record_impressions'
+
+
+class EvaluationProfile(object):
+    """Stage boundaries of a single sampled call."""
+
+    __slots__ = ('method', '_marks')
+
+    def __init__(self, method):
+        """
+        Start profiling a call.
+
+        :param method: method called
+        :type method: splitio.models.telemetry.MethodExceptionsAndLatencies
+        """
+        self.method = method
+        self._marks = [(None, perf_counter_ns())]
+
+    def mark(self, stage):
+        """
+        Close a stage, which ran since the previous one was closed or the call started.
+
+        :param stage: stage that just finished
+        :type stage: splitio.engine.profiling.EvaluationStage
+        """
+        self._marks.append((stage, perf_counter_ns()))
+
+    def stages(self):
+        """
+        Return the stages run, with their start and end as nanoseconds since the epoch.
+
+        :rtype: list(tuple(splitio.engine.profiling.EvaluationStage, int, int))
+        """
+        offset = time_ns() - perf_counter_ns()
+        return [(stage, self._marks[index][1] + offset, end + offset)
+                for index, (stage, end) in enumerate(self._marks[1:])]
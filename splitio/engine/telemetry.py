@@ -7,6 +7,9 @@ _LOGGER = logging.getLogger(__name__)
 
 from splitio.models.telemetry import CounterConstants, UpdateFromSSE
 
+# coalesced updates are only tracked locally, they are not part of the telemetry payload.
+_REPORTED_UPDATES_FROM_SSE = (UpdateFromSSE.SPLIT_UPDATE,)
+
 class TelemetryStorageProducerBase(object):
     """Telemetry storage producer base class."""
 
@@ -228,9 +231,9 @@ class TelemetryRuntimeProducer(object):
         """Record session length."""
         self._telemetry_storage.record_session_length(session)
 
-    def record_update_from_sse(self, event):
+    def record_update_from_sse(self, event, value=1):
         """Record update from sse."""
-        self._telemetry_storage.record_update_from_sse(event)
+        self._telemetry_storage.record_update_from_sse(event, value)
 
 class TelemetryRuntimeProducerAsync(object):
     """Telemetry runtime producer async class."""
@@ -279,9 +282,9 @@ class TelemetryRuntimeProducerAsync(object):
         """Record session length."""
         await self._telemetry_storage.record_session_length(session)
 
-    async def record_update_from_sse(self, event):
+    async def record_update_from_sse(self, event, value=1):
         """Record update from sse."""
-        await self._telemetry_storage.record_update_from_sse(event)
+        await self._telemetry_storage.record_update_from_sse(event, value)
 
 class TelemetryStorageConsumerBase(object):
     """Telemetry storage consumer base class."""
@@ -595,7 +598,7 @@ class TelemetryRuntimeConsumer(TelemetryRuntimeConsumerBase):
             'eQ': self.get_events_stats(CounterConstants.EVENTS_QUEUED),
             'eD': self.get_events_stats(CounterConstants.EVENTS_DROPPED),
             'lS': self._last_synchronization_to_json(last_synchronization),
-            'ufs': {event.value: self.pop_update_from_sse(event) for event in UpdateFromSSE},
+            'ufs': {event.value: self.pop_update_from_sse(event) for event in _REPORTED_UPDATES_FROM_SSE},
             't': self.pop_tags(),
             'hE': self._http_errors_to_json(http_errors),
             'hL': self._http_latencies_to_json(http_latencies),
@@ -675,7 +678,7 @@ class TelemetryRuntimeConsumerAsync(TelemetryRuntimeConsumerBase):
             'iDr': await self.get_impressions_stats(CounterConstants.IMPRESSIONS_DROPPED),
             'eQ': await self.get_events_stats(CounterConstants.EVENTS_QUEUED),
             'eD': await self.get_events_stats(CounterConstants.EVENTS_DROPPED),
-            'ufs': {event.value: await self.pop_update_from_sse(event) for event in UpdateFromSSE},
+            'ufs': {event.value: await self.pop_update_from_sse(event) for event in _REPORTED_UPDATES_FROM_SSE},
             'lS': self._last_synchronization_to_json(last_synchronization),
             't': await self.pop_tags(),
             'hE': self._http_errors_to_json(http_errors['httpErrors']),
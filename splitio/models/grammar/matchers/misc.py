@@ -36,7 +36,7 @@ class DependencyMatcher(Matcher):
 
         bucketing_key = context.get('bucketing_key')
         result = evaluator.eval_with_context(key, bucketing_key, self._split_name, attributes, context['ec'])
-        return result['treatment'] in self._treatments
+        return result.treatment in self._treatments
 
     def _add_matcher_specific_properties_to_json(self):
         """Return Dependency specific properties."""
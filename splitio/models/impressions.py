@@ -12,12 +12,13 @@ Impression = namedtuple(
         'change_number',
         'bucketing_key',
         'time',
-        'previous_time'
+        'previous_time',
+        'sampling_rate'
     ]
 )
 
-# pre-python3.7 hack to make previous_time optional
-Impression.__new__.__defaults__ = (None,)
+# pre-python3.7 hack to make previous_time and sampling_rate optional
+Impression.__new__.__defaults__ = (None, None)
 
 
 class Label(object):  # pylint: disable=too-few-public-methods
@@ -37,14 +37,25 @@ class Segment(object):
 
     def update(self, to_add, to_remove):
         """
-        Add supplied keys to the segment.
+        Add and remove supplied keys, in place so the cost depends on the size of the change only.
+
+        Callers sharing the segment across threads must hold a lock while updating it.
 
         :param to_add: List of keys to add.
         :type to_add: list
         :param to_remove: List of keys to remove.
         :type to_remove: list
         """
-        self._keys = self._keys.union(set(to_add)).difference(to_remove)
+        self._keys.update(to_add)
+        self._keys.difference_update(to_remove)
+
+    def copy(self):
+        """
+        Return a copy of the segment that is not affected by later updates.
+
+        :rtype: splitio.models.segments.Segment
+        """
+        return Segment(self._name, self._keys, self._change_number)
 
     @property
     def keys(self):
@@ -82,5 +93,39 @@ def from_raw(raw_segment):
     :return: New segment model object
     :rtype: splitio.models.segment.Segment
     """
-    keys = set(raw_segment['added']).difference(raw_segment['removed'])
-    return Segment(raw_segment['name'], keys, raw_segment['till'])
+    # Segment builds its key set from the list, first-time fetches usually have nothing removed.
+    segment = Segment(raw_segment['name'], raw_segment['added'], raw_segment['till'])
+    if raw_segment['removed']:
+        segment.update([], raw_segment['removed'])
+    return segment
+
+
+def merge_changes(merged, segment_changes):
+    """
+    Fold a segment changes response into the net keys added and removed by the previous ones.
+
+    The keys of a single response with changes are returned as they are, sets are only built
+    once a second one has to be combined with it.
+
+    :param merged: Net keys added and removed so far, None before the first response.
+    :type merged: tuple
+    :param segment_changes: Segment changes response, fetched after the ones already folded.
+    :type segment_changes: dict
+
+    :return: Keys to add and keys to remove.
+    :rtype: tuple
+    """
+    if not segment_changes['added'] and not segment_changes['removed'] and merged is not None:
+        return merged
+
+    if merged is None or (not merged[0] and not merged[1]):
+        return segment_changes['added'], segment_changes['removed']
+
+    to_add, to_remove = merged
+    if not isinstance(to_add, set):
+        to_add, to_remove = set(to_add), set(to_remove)
+    to_add.difference_update(segment_changes['removed'])
+    to_remove.update(segment_changes['removed'])
+    to_remove.difference_update(segment_changes['added'])
+    to_add.update(segment_changes['added'])
+    return to_add, to_remove
@@ -6,7 +6,7 @@ from enum import Enum
 import abc
 
 from splitio.engine.impressions import ImpressionsMode
-from splitio.optional.loaders import asyncio
+from splitio.optional.loaders import HdrHistogram
 
 BUCKETS = (
     1000, 1500, 2250, 3375, 5063,
@@ -18,6 +18,7 @@ BUCKETS = (
 
 MAX_LATENCY = 7481828
 MAX_LATENCY_BUCKET_COUNT = 23
+MAX_HISTOGRAM_LATENCY = 60000000
 MAX_STREAMING_EVENTS = 20
 MAX_TAGS = 10
 
@@ -140,37 +141,156 @@ class OperationMode(Enum):
 class UpdateFromSSE(Enum):
     """Update from sse constants"""
     SPLIT_UPDATE = 'sp'
+    SPLIT_UPDATE_COALESCED = 'spc'
+    SEGMENT_UPDATE_COALESCED = 'sgc'
 
 def get_latency_bucket_index(micros):
     """
     Find the bucket index for a measured latency.
 
+    Bounds grow geometrically, so the search over the fixed bounds takes a bounded number of comparisons
+    in a single C call, capped at the last bucket without branching on the maximum latency.
+
     :param micros: Measured latency in microseconds
     :type micros: int
     :return: Bucket index for the given latency
     :rtype: int
     """
-    if micros > MAX_LATENCY:
-        return len(BUCKETS) - 1
+    return bisect_left(BUCKETS, micros, 0, MAX_LATENCY_BUCKET_COUNT - 1)
+
+_LATENCY_METHODS = (
+    MethodExceptionsAndLatencies.TREATMENT,
+    MethodExceptionsAndLatencies.TREATMENTS,
+    MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG,
+    MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG,
+    MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET,
+    MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS,
+    MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET,
+    MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS,
+    MethodExceptionsAndLatencies.TRACK
+)
+# Keyed by id, as enum members are hashed in python code and their ids aren't.
+_LATENCY_METHOD_INDEXES = {id(method): index for index, method in enumerate(_LATENCY_METHODS)}
+
+class _ThreadCounters(object):
+    """
+    Counters each thread increments in its own list, so counting takes no lock and no increment is
+    lost to a thread switch. Reading adds up what every thread counted.
+    """
+    def __init__(self, size):
+        """
+        Constructor
+
+        :param size: number of counters
+        :type size: int
+        """
+        self._size = size
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._threads = []
+        self._finished = [0] * size
+        self._popped = [0] * size
+
+    def local(self):
+        """
+        Return the counters of the current thread, to be incremented in place.
+
+        :rtype: list[int]
+        """
+        try:
+            return self._local.counts
+        except AttributeError:
+            return self._register_thread()
+
+    def _register_thread(self):
+        """
+        Create the counters of the current thread.
+
+        :rtype: list[int]
+        """
+        counts = [0] * self._size
+        with self._lock:
+            self._threads.append((threading.current_thread(), counts))
+        self._local.counts = counts
+        return counts
+
+    def _totals(self):
+        """
+        Add up the counters of every thread. Must be called with the lock held.
+
+        :rtype: list[int]
+        """
+        totals = list(self._finished)
+        threads = []
+        for thread, counts in self._threads:
+            # A thread found finished before reading won't count anything else, so its counters can go.
+            alive = thread.is_alive()
+            for index, count in enumerate(counts):
+                totals[index] += count
+            if alive:
+                threads.append((thread, counts))
+            else:
+                for index, count in enumerate(counts):
+                    self._finished[index] += count
+        self._threads = threads
+        return totals
+
+    def get(self, index):
+        """
+        Return what every thread counted so far on a counter.
+
+        :param index: counter index
+        :type index: int
+
+        :rtype: int
+        """
+        with self._lock:
+            return self._totals()[index]
+
+    def pop(self, start=0, stop=None):
+        """
+        Return what every thread counted since the previous pop, on a range of counters.
+
+        :param start: first counter index
+        :type start: int
+        :param stop: counter index to stop at, all counters after start by default
+        :type stop: int
+
+        :rtype: list[int]
+        """
+        stop = self._size if stop is None else stop
+        with self._lock:
+            totals = self._totals()
+            counted = [totals[index] - self._popped[index] for index in range(start, stop)]
+            self._popped[start:stop] = totals[start:stop]
+        return counted
 
-    return bisect_left(BUCKETS, micros)
 
 class MethodLatenciesBase(object, metaclass=abc.ABCMeta):
     """
     Method Latency base class
 
+    Latencies are counted in one array of buckets per method, indexed by the method position.
     """
-    def _reset_all(self):
-        """Reset variables"""
-        self._treatment = [0] * MAX_LATENCY_BUCKET_COUNT
-        self._treatments = [0] * MAX_LATENCY_BUCKET_COUNT
-        self._treatment_with_config = [0] * MAX_LATENCY_BUCKET_COUNT
-        self._treatments_with_config = [0] * MAX_LATENCY_BUCKET_COUNT
-        self._treatments_by_flag_set = [0] * MAX_LATENCY_BUCKET_COUNT
-        self._treatments_by_flag_sets = [0] * MAX_LATENCY_BUCKET_COUNT
-        self._treatments_with_config_by_flag_set = [0] * MAX_LATENCY_BUCKET_COUNT
-        self._treatments_with_config_by_flag_sets = [0] * MAX_LATENCY_BUCKET_COUNT
-        self._track = [0] * MAX_LATENCY_BUCKET_COUNT
+    @staticmethod
+    def _new_latencies():
+        """Return empty bucket counters for every method."""
+        return [[0] * MAX_LATENCY_BUCKET_COUNT for _ in _LATENCY_METHODS]
+
+    @staticmethod
+    def _build_latencies(latencies):
+        """
+        Build the telemetry dictionary of latencies.
+
+        :param latencies: bucket counters by method index
+        :type latencies: list[list[int]]
+
+        :return: Dictonary of latencies
+        :rtype: dict
+        """
+        return {MethodExceptionsAndLatencies.METHOD_LATENCIES.value: {
+            method.value: latencies[index] for index, method in enumerate(_LATENCY_METHODS)
+        }}
 
     @abc.abstractmethod
     def add_latency(self, method, latency):
@@ -178,6 +298,12 @@ class MethodLatenciesBase(object, metaclass=abc.ABCMeta):
         Add Latency method
         """
 
+    @abc.abstractmethod
+    def add_bucket(self, method, bucket):
+        """
+        Add a latency already mapped to its bucket
+        """
+
     @abc.abstractmethod
     def pop_all(self):
         """
@@ -188,12 +314,12 @@ class MethodLatencies(MethodLatenciesBase):
     """
     Method Latency class
 
+    Each thread counts latencies in its own arrays, one bucket after the other by method, and pop_all
+    adds up what every thread counted since the previous call.
     """
     def __init__(self):
         """Constructor"""
-        self._lock = threading.RLock()
-        with self._lock:
-            self._reset_all()
+        self._counters = _ThreadCounters(len(_LATENCY_METHODS) * MAX_LATENCY_BUCKET_COUNT)
 
     def add_latency(self, method, latency):
         """
@@ -204,28 +330,20 @@ class MethodLatencies(MethodLatenciesBase):
         :param latency: amount of latency in microseconds
         :type latency: int
         """
-        latency_bucket = get_latency_bucket_index(latency)
-        with self._lock:
-            if method == MethodExceptionsAndLatencies.TREATMENT:
-                self._treatment[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS:
-                self._treatments[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG:
-                self._treatment_with_config[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG:
-                self._treatments_with_config[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET:
-                self._treatments_by_flag_set[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS:
-                self._treatments_by_flag_sets[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET:
-                self._treatments_with_config_by_flag_set[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS:
-                self._treatments_with_config_by_flag_sets[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TRACK:
-                self._track[latency_bucket] += 1
-            else:
-                return
+        self.add_bucket(method, get_latency_bucket_index(latency))
+
+    def add_bucket(self, method, bucket):
+        """
+        Add a latency already mapped to its bucket
+
+        :param method: passed method name
+        :type method: str
+        :param bucket: latency bucket index
+        :type bucket: int
+        """
+        index = _LATENCY_METHOD_INDEXES.get(id(method))
+        if index is not None:
+            self._counters.local()[index * MAX_LATENCY_BUCKET_COUNT + bucket] += 1
 
     def pop_all(self):
         """
@@ -234,34 +352,22 @@ class MethodLatencies(MethodLatenciesBase):
         :return: Dictonary of latencies
         :rtype: dict
         """
-        with self._lock:
-            latencies = {MethodExceptionsAndLatencies.METHOD_LATENCIES.value: {
-                MethodExceptionsAndLatencies.TREATMENT.value: self._treatment,
-                MethodExceptionsAndLatencies.TREATMENTS.value: self._treatments,
-                MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG.value: self._treatment_with_config,
-                MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG.value: self._treatments_with_config,
-                MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET.value: self._treatments_by_flag_set,
-                MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS.value: self._treatments_by_flag_sets,
-                MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET.value: self._treatments_with_config_by_flag_set,
-                MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS.value: self._treatments_with_config_by_flag_sets,
-                MethodExceptionsAndLatencies.TRACK.value: self._track}
-            }
-            self._reset_all()
-            return latencies
+        counted = self._counters.pop()
+        return self._build_latencies([counted[index:index + MAX_LATENCY_BUCKET_COUNT]
+                                      for index in range(0, len(counted), MAX_LATENCY_BUCKET_COUNT)])
 
 
 class MethodLatenciesAsync(MethodLatenciesBase):
     """
     Method async Latency class
 
+    Latencies are only counted from the event loop, so no lock is needed.
     """
     @classmethod
     async def create(cls):
         """Constructor"""
         self = cls()
-        self._lock = asyncio.Lock()
-        async with self._lock:
-            self._reset_all()
+        self._latencies = self._new_latencies()
         return self
 
     async def add_latency(self, method, latency):
@@ -273,28 +379,20 @@ class MethodLatenciesAsync(MethodLatenciesBase):
         :param latency: amount of latency in microseconds
         :type latency: int
         """
-        latency_bucket = get_latency_bucket_index(latency)
-        async with self._lock:
-            if method == MethodExceptionsAndLatencies.TREATMENT:
-                self._treatment[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS:
-                self._treatments[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG:
-                self._treatment_with_config[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG:
-                self._treatments_with_config[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET:
-                self._treatments_by_flag_set[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS:
-                self._treatments_by_flag_sets[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET:
-                self._treatments_with_config_by_flag_set[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS:
-                self._treatments_with_config_by_flag_sets[latency_bucket] += 1
-            elif method == MethodExceptionsAndLatencies.TRACK:
-                self._track[latency_bucket] += 1
-            else:
-                return
+        await self.add_bucket(method, get_latency_bucket_index(latency))
+
+    async def add_bucket(self, method, bucket):
+        """
+        Add a latency already mapped to its bucket
+
+        :param method: passed method name
+        :type method: str
+        :param bucket: latency bucket index
+        :type bucket: int
+        """
+        index = _LATENCY_METHOD_INDEXES.get(id(method))
+        if index is not None:
+            self._latencies[index][bucket] += 1
 
     async def pop_all(self):
         """
@@ -303,36 +401,131 @@ class MethodLatenciesAsync(MethodLatenciesBase):
         :return: Dictonary of latencies
         :rtype: dict
         """
-        async with self._lock:
-            latencies = {MethodExceptionsAndLatencies.METHOD_LATENCIES.value: {
-                MethodExceptionsAndLatencies.TREATMENT.value: self._treatment,
-                MethodExceptionsAndLatencies.TREATMENTS.value: self._treatments,
-                MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG.value: self._treatment_with_config,
-                MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG.value: self._treatments_with_config,
-                MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET.value: self._treatments_by_flag_set,
-                MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS.value: self._treatments_by_flag_sets,
-                MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET.value: self._treatments_with_config_by_flag_set,
-                MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS.value: self._treatments_with_config_by_flag_sets,
-                MethodExceptionsAndLatencies.TRACK.value: self._track}
+        latencies, self._latencies = self._latencies, self._new_latencies()
+        return self._build_latencies(latencies)
+
+
+class MethodLatencyHistograms(object):
+    """
+    HDR histograms of method latencies, to look at percentiles locally.
+
+    Telemetry buckets grow 50% each, which hides the difference between i.e. 100us and 900us. HDR
+    histograms keep 3 significant digits instead. Like MethodLatencies, each thread records to its own
+    histograms, added up when percentiles are read. Requires the hdrhistogram package.
+    """
+    def __init__(self, highest_latency=MAX_HISTOGRAM_LATENCY, significant_figures=3):
+        """
+        Constructor
+
+        :param highest_latency: highest latency tracked in microseconds, higher ones are recorded as this.
+        :type highest_latency: int
+        :param significant_figures: precision of recorded latencies
+        :type significant_figures: int
+        """
+        self._highest_latency = highest_latency
+        self._significant_figures = significant_figures
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._threads = []
+        self._finished = self._new_histograms()
+
+    def _new_histograms(self):
+        """Return empty histograms for every method."""
+        return [HdrHistogram(1, self._highest_latency, self._significant_figures) for _ in _LATENCY_METHODS]
+
+    def _register_thread(self):
+        """
+        Create the histograms of the current thread.
+
+        :rtype: list[hdrh.histogram.HdrHistogram]
+        """
+        histograms = self._new_histograms()
+        with self._lock:
+            self._threads.append((threading.current_thread(), histograms))
+        self._local.histograms = histograms
+        return histograms
+
+    def record(self, method, latency):
+        """
+        Record a method latency.
+
+        :param method: passed method name
+        :type method: splitio.models.telemetry.MethodExceptionsAndLatencies
+        :param latency: amount of latency in microseconds
+        :type latency: int
+        """
+        index = _LATENCY_METHOD_INDEXES.get(id(method))
+        if index is None:
+            return
+
+        try:
+            histograms = self._local.histograms
+        except AttributeError:
+            histograms = self._register_thread()
+        histograms[index].record_value(min(latency, self._highest_latency))
+
+    def percentiles(self):
+        """
+        Return the p50, p99 and p999 latencies of each method recorded so far.
+
+        :return: Dictionary of percentiles in microseconds and count of calls by method name
+        :rtype: dict
+        """
+        merged = self._new_histograms()
+        with self._lock:
+            threads = []
+            for thread, histograms in self._threads:
+                if thread.is_alive():
+                    threads.append((thread, histograms))
+                else:
+                    # Histograms of finished threads are kept added up, so they don't pile up.
+                    for method_finished, histogram in zip(self._finished, histograms):
+                        method_finished.add(histogram)
+            self._threads = threads
+            for histograms in [self._finished] + [histograms for _, histograms in threads]:
+                for method_merged, histogram in zip(merged, histograms):
+                    method_merged.add(histogram)
+        return {
+            method.value: {
+                'p50': histogram.get_value_at_percentile(50),
+                'p99': histogram.get_value_at_percentile(99),
+                'p999': histogram.get_value_at_percentile(99.9),
+                'count': histogram.get_total_count()
             }
-            self._reset_all()
-            return latencies
+            for method, histogram in zip(_LATENCY_METHODS, merged)
+        }
+
 
+_HTTP_RESOURCES = (
+    HTTPExceptionsAndLatencies.SPLIT,
+    HTTPExceptionsAndLatencies.SEGMENT,
+    HTTPExceptionsAndLatencies.IMPRESSION,
+    HTTPExceptionsAndLatencies.IMPRESSION_COUNT,
+    HTTPExceptionsAndLatencies.EVENT,
+    HTTPExceptionsAndLatencies.TELEMETRY,
+    HTTPExceptionsAndLatencies.TOKEN
+)
+_HTTP_RESOURCE_INDEXES = {id(resource): index for index, resource in enumerate(_HTTP_RESOURCES)}
 
 class HTTPLatenciesBase(object, metaclass=abc.ABCMeta):
     """
     HTTP Latency class
 
     """
-    def _reset_all(self):
-        """Reset variables"""
-        self._split = [0] * MAX_LATENCY_BUCKET_COUNT
-        self._segment = [0] * MAX_LATENCY_BUCKET_COUNT
-        self._impression = [0] * MAX_LATENCY_BUCKET_COUNT
-        self._impression_count = [0] * MAX_LATENCY_BUCKET_COUNT
-        self._event = [0] * MAX_LATENCY_BUCKET_COUNT
-        self._telemetry = [0] * MAX_LATENCY_BUCKET_COUNT
-        self._token = [0] * MAX_LATENCY_BUCKET_COUNT
+    @staticmethod
+    def _build_latencies(latencies):
+        """
+        Build the telemetry dictionary of latencies.
+
+        :param latencies: bucket counters by resource index
+        :type latencies: list[list[int]]
+
+        :return: Dictonary of latencies
+        :rtype: dict
+        """
+        return {HTTPExceptionsAndLatencies.HTTP_LATENCIES.value: {
+            resource.value: latencies[index] for index, resource in enumerate(_HTTP_RESOURCES)
+        }}
 
     @abc.abstractmethod
     def add_latency(self, resource, latency):
@@ -351,12 +544,11 @@ class HTTPLatencies(HTTPLatenciesBase):
     """
     HTTP Latency class
 
+    Latencies are counted per thread, one bucket after the other by resource.
     """
     def __init__(self):
         """Constructor"""
-        self._lock = threading.RLock()
-        with self._lock:
-            self._reset_all()
+        self._counters = _ThreadCounters(len(_HTTP_RESOURCES) * MAX_LATENCY_BUCKET_COUNT)
 
     def add_latency(self, resource, latency):
         """
@@ -367,24 +559,9 @@ class HTTPLatencies(HTTPLatenciesBase):
         :param latency: amount of latency in microseconds
         :type latency: int
         """
-        latency_bucket = get_latency_bucket_index(latency)
-        with self._lock:
-            if resource == HTTPExceptionsAndLatencies.SPLIT:
-                self._split[latency_bucket] += 1
-            elif resource == HTTPExceptionsAndLatencies.SEGMENT:
-                self._segment[latency_bucket] += 1
-            elif resource == HTTPExceptionsAndLatencies.IMPRESSION:
-                self._impression[latency_bucket] += 1
-            elif resource == HTTPExceptionsAndLatencies.IMPRESSION_COUNT:
-                self._impression_count[latency_bucket] += 1
-            elif resource == HTTPExceptionsAndLatencies.EVENT:
-                self._event[latency_bucket] += 1
-            elif resource == HTTPExceptionsAndLatencies.TELEMETRY:
-                self._telemetry[latency_bucket] += 1
-            elif resource == HTTPExceptionsAndLatencies.TOKEN:
-                self._token[latency_bucket] += 1
-            else:
-                return
+        index = _HTTP_RESOURCE_INDEXES.get(id(resource))
+        if index is not None:
+            self._counters.local()[index * MAX_LATENCY_BUCKET_COUNT + get_latency_bucket_index(latency)] += 1
 
     def pop_all(self):
         """
@@ -393,27 +570,22 @@ class HTTPLatencies(HTTPLatenciesBase):
         :return: Dictonary of latencies
         :rtype: dict
         """
-        with self._lock:
-            latencies = {HTTPExceptionsAndLatencies.HTTP_LATENCIES.value: {HTTPExceptionsAndLatencies.SPLIT.value: self._split, HTTPExceptionsAndLatencies.SEGMENT.value: self._segment, HTTPExceptionsAndLatencies.IMPRESSION.value: self._impression,
-                                        HTTPExceptionsAndLatencies.IMPRESSION_COUNT.value: self._impression_count, HTTPExceptionsAndLatencies.EVENT.value: self._event,
-                                        HTTPExceptionsAndLatencies.TELEMETRY.value: self._telemetry, HTTPExceptionsAndLatencies.TOKEN.value: self._token}
-                    }
-            self._reset_all()
-            return latencies
+        counted = self._counters.pop()
+        return self._build_latencies([counted[index:index + MAX_LATENCY_BUCKET_COUNT]
+                                      for index in range(0, len(counted), MAX_LATENCY_BUCKET_COUNT)])
 
 
 class HTTPLatenciesAsync(HTTPLatenciesBase):
     """
     HTTP Latency async class
 
+    Latencies are only counted from the event loop, so no lock is needed.
     """
     @classmethod
     async def create(cls):
         """Constructor"""
         self = cls()
-        self._lock = asyncio.Lock()
-        async with self._lock:
-            self._reset_all()
+        self._latencies = [[0] * MAX_LATENCY_BUCKET_COUNT for _ in _HTTP_RESOURCES]
         return self
 
     async def add_latency(self, resource, latency):
@@ -425,24 +597,9 @@ class HTTPLatenciesAsync(HTTPLatenciesBase):
         :param latency: amount of latency in microseconds
         :type latency: int
         """
-        latency_bucket = get_latency_bucket_index(latency)
-        async with self._lock:
-            if resource == HTTPExceptionsAndLatencies.SPLIT:
-                self._split[latency_bucket] += 1
-            elif resource == HTTPExceptionsAndLatencies.SEGMENT:
-                self._segment[latency_bucket] += 1
-            elif resource == HTTPExceptionsAndLatencies.IMPRESSION:
-                self._impression[latency_bucket] += 1
-            elif resource == HTTPExceptionsAndLatencies.IMPRESSION_COUNT:
-                self._impression_count[latency_bucket] += 1
-            elif resource == HTTPExceptionsAndLatencies.EVENT:
-                self._event[latency_bucket] += 1
-            elif resource == HTTPExceptionsAndLatencies.TELEMETRY:
-                self._telemetry[latency_bucket] += 1
-            elif resource == HTTPExceptionsAndLatencies.TOKEN:
-                self._token[latency_bucket] += 1
-            else:
-                return
+        index = _HTTP_RESOURCE_INDEXES.get(id(resource))
+        if index is not None:
+            self._latencies[index][get_latency_bucket_index(latency)] += 1
 
     async def pop_all(self):
         """
@@ -451,13 +608,8 @@ class HTTPLatenciesAsync(HTTPLatenciesBase):
         :return: Dictonary of latencies
         :rtype: dict
         """
-        async with self._lock:
-            latencies = {HTTPExceptionsAndLatencies.HTTP_LATENCIES.value: {HTTPExceptionsAndLatencies.SPLIT.value: self._split, HTTPExceptionsAndLatencies.SEGMENT.value: self._segment, HTTPExceptionsAndLatencies.IMPRESSION.value: self._impression,
-                                        HTTPExceptionsAndLatencies.IMPRESSION_COUNT.value: self._impression_count, HTTPExceptionsAndLatencies.EVENT.value: self._event,
-                                        HTTPExceptionsAndLatencies.TELEMETRY.value: self._telemetry, HTTPExceptionsAndLatencies.TOKEN.value: self._token}
-                    }
-            self._reset_all()
-            return latencies
+        latencies, self._latencies = self._latencies, [[0] * MAX_LATENCY_BUCKET_COUNT for _ in _HTTP_RESOURCES]
+        return self._build_latencies(latencies)
 
 
 class MethodExceptionsBase(object, metaclass=abc.ABCMeta):
@@ -563,9 +715,7 @@ class MethodExceptionsAsync(MethodExceptionsBase):
     async def create(cls):
         """Constructor"""
         self = cls()
-        self._lock = asyncio.Lock()
-        async with self._lock:
-            self._reset_all()
+        self._reset_all()
         return self
 
     async def add_exception(self, method):
@@ -575,27 +725,26 @@ class MethodExceptionsAsync(MethodExceptionsBase):
         :param method: passed method name
         :type method: str
         """
-        async with self._lock:
-            if method == MethodExceptionsAndLatencies.TREATMENT:
-                self._treatment += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS:
-                self._treatments += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG:
-                self._treatment_with_config += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG:
-                self._treatments_with_config += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET:
-                self._treatments_by_flag_set += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS:
-                self._treatments_by_flag_sets += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET:
-                self._treatments_with_config_by_flag_set += 1
-            elif method == MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS:
-                self._treatments_with_config_by_flag_sets += 1
-            elif method == MethodExceptionsAndLatencies.TRACK:
-                self._track += 1
-            else:
-                return
+        if method == MethodExceptionsAndLatencies.TREATMENT:
+            self._treatment += 1
+        elif method == MethodExceptionsAndLatencies.TREATMENTS:
+            self._treatments += 1
+        elif method == MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG:
+            self._treatment_with_config += 1
+        elif method == MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG:
+            self._treatments_with_config += 1
+        elif method == MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET:
+            self._treatments_by_flag_set += 1
+        elif method == MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS:
+            self._treatments_by_flag_sets += 1
+        elif method == MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET:
+            self._treatments_with_config_by_flag_set += 1
+        elif method == MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS:
+            self._treatments_with_config_by_flag_sets += 1
+        elif method == MethodExceptionsAndLatencies.TRACK:
+            self._track += 1
+        else:
+            return
 
     async def pop_all(self):
         """
@@ -604,21 +753,20 @@ class MethodExceptionsAsync(MethodExceptionsBase):
         :return: Dictonary of exceptions
         :rtype: dict
         """
-        async with self._lock:
-            exceptions = {
-                MethodExceptionsAndLatencies.METHOD_EXCEPTIONS.value: {
-                MethodExceptionsAndLatencies.TREATMENT.value: self._treatment,
-                MethodExceptionsAndLatencies.TREATMENTS.value: self._treatments,
-                MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG.value: self._treatment_with_config,
-                MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG.value: self._treatments_with_config,
-                MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET.value: self._treatments_by_flag_set,
-                MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS.value: self._treatments_by_flag_sets,
-                MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET.value: self._treatments_with_config_by_flag_set,
-                MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS.value: self._treatments_with_config_by_flag_sets,
-                MethodExceptionsAndLatencies.TRACK.value: self._track}
-            }
-            self._reset_all()
-            return exceptions
+        exceptions = {
+            MethodExceptionsAndLatencies.METHOD_EXCEPTIONS.value: {
+            MethodExceptionsAndLatencies.TREATMENT.value: self._treatment,
+            MethodExceptionsAndLatencies.TREATMENTS.value: self._treatments,
+            MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG.value: self._treatment_with_config,
+            MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG.value: self._treatments_with_config,
+            MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET.value: self._treatments_by_flag_set,
+            MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS.value: self._treatments_by_flag_sets,
+            MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET.value: self._treatments_with_config_by_flag_set,
+            MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS.value: self._treatments_with_config_by_flag_sets,
+            MethodExceptionsAndLatencies.TRACK.value: self._track}
+        }
+        self._reset_all()
+        return exceptions
 
 
 class LastSynchronizationBase(object, metaclass=abc.ABCMeta):
@@ -714,9 +862,7 @@ class LastSynchronizationAsync(LastSynchronizationBase):
     async def create(cls):
         """Constructor"""
         self = cls()
-        self._lock = asyncio.Lock()
-        async with self._lock:
-            self._reset_all()
+        self._reset_all()
         return self
 
     async def add_latency(self, resource, sync_time):
@@ -728,23 +874,22 @@ class LastSynchronizationAsync(LastSynchronizationBase):
         :param sync_time: amount of last sync time
         :type sync_time: int
         """
-        async with self._lock:
-            if resource == HTTPExceptionsAndLatencies.SPLIT:
-                self._split = sync_time
-            elif resource == HTTPExceptionsAndLatencies.SEGMENT:
-                self._segment = sync_time
-            elif resource == HTTPExceptionsAndLatencies.IMPRESSION:
-                self._impression = sync_time
-            elif resource == HTTPExceptionsAndLatencies.IMPRESSION_COUNT:
-                self._impression_count = sync_time
-            elif resource == HTTPExceptionsAndLatencies.EVENT:
-                self._event = sync_time
-            elif resource == HTTPExceptionsAndLatencies.TELEMETRY:
-                self._telemetry = sync_time
-            elif resource == HTTPExceptionsAndLatencies.TOKEN:
-                self._token = sync_time
-            else:
-                return
+        if resource == HTTPExceptionsAndLatencies.SPLIT:
+            self._split = sync_time
+        elif resource == HTTPExceptionsAndLatencies.SEGMENT:
+            self._segment = sync_time
+        elif resource == HTTPExceptionsAndLatencies.IMPRESSION:
+            self._impression = sync_time
+        elif resource == HTTPExceptionsAndLatencies.IMPRESSION_COUNT:
+            self._impression_count = sync_time
+        elif resource == HTTPExceptionsAndLatencies.EVENT:
+            self._event = sync_time
+        elif resource == HTTPExceptionsAndLatencies.TELEMETRY:
+            self._telemetry = sync_time
+        elif resource == HTTPExceptionsAndLatencies.TOKEN:
+            self._token = sync_time
+        else:
+            return
 
     async def get_all(self):
         """
@@ -753,17 +898,16 @@ class LastSynchronizationAsync(LastSynchronizationBase):
         :return: Dictonary of latencies
         :rtype: dict
         """
-        async with self._lock:
-            return {
-                _LastSynchronizationConstants.LAST_SYNCHRONIZATIONS.value: {
-                HTTPExceptionsAndLatencies.SPLIT.value: self._split,
-                HTTPExceptionsAndLatencies.SEGMENT.value: self._segment,
-                HTTPExceptionsAndLatencies.IMPRESSION.value: self._impression,
-                HTTPExceptionsAndLatencies.IMPRESSION_COUNT.value: self._impression_count,
-                HTTPExceptionsAndLatencies.EVENT.value: self._event,
-                HTTPExceptionsAndLatencies.TELEMETRY.value: self._telemetry,
-                HTTPExceptionsAndLatencies.TOKEN.value: self._token}
-            }
+        return {
+            _LastSynchronizationConstants.LAST_SYNCHRONIZATIONS.value: {
+            HTTPExceptionsAndLatencies.SPLIT.value: self._split,
+            HTTPExceptionsAndLatencies.SEGMENT.value: self._segment,
+            HTTPExceptionsAndLatencies.IMPRESSION.value: self._impression,
+            HTTPExceptionsAndLatencies.IMPRESSION_COUNT.value: self._impression_count,
+            HTTPExceptionsAndLatencies.EVENT.value: self._event,
+            HTTPExceptionsAndLatencies.TELEMETRY.value: self._telemetry,
+            HTTPExceptionsAndLatencies.TOKEN.value: self._token}
+        }
 
 
 class HTTPErrorsBase(object, metaclass=abc.ABCMeta):
@@ -877,9 +1021,7 @@ class HTTPErrorsAsync(HTTPErrorsBase):
     async def create(cls):
         """Constructor"""
         self = cls()
-        self._lock = asyncio.Lock()
-        async with self._lock:
-            self._reset_all()
+        self._reset_all()
         return self
 
     async def add_error(self, resource, status):
@@ -892,37 +1034,36 @@ class HTTPErrorsAsync(HTTPErrorsBase):
         :type status: str
         """
         status = str(status)
-        async with self._lock:
-            if resource == HTTPExceptionsAndLatencies.SPLIT:
-                if status not in self._split:
-                    self._split[status] = 0
-                self._split[status] += 1
-            elif resource == HTTPExceptionsAndLatencies.SEGMENT:
-                if status not in self._segment:
-                    self._segment[status] = 0
-                self._segment[status] += 1
-            elif resource == HTTPExceptionsAndLatencies.IMPRESSION:
-                if status not in self._impression:
-                    self._impression[status] = 0
-                self._impression[status] += 1
-            elif resource == HTTPExceptionsAndLatencies.IMPRESSION_COUNT:
-                if status not in self._impression_count:
-                    self._impression_count[status] = 0
-                self._impression_count[status] += 1
-            elif resource == HTTPExceptionsAndLatencies.EVENT:
-                if status not in self._event:
-                    self._event[status] = 0
-                self._event[status] += 1
-            elif resource == HTTPExceptionsAndLatencies.TELEMETRY:
-                if status not in self._telemetry:
-                    self._telemetry[status] = 0
-                self._telemetry[status] += 1
-            elif resource == HTTPExceptionsAndLatencies.TOKEN:
-                if status not in self._token:
-                    self._token[status] = 0
-                self._token[status] += 1
-            else:
-                return
+        if resource == HTTPExceptionsAndLatencies.SPLIT:
+            if status not in self._split:
+                self._split[status] = 0
+            self._split[status] += 1
+        elif resource == HTTPExceptionsAndLatencies.SEGMENT:
+            if status not in self._segment:
+                self._segment[status] = 0
+            self._segment[status] += 1
+        elif resource == HTTPExceptionsAndLatencies.IMPRESSION:
+            if status not in self._impression:
+                self._impression[status] = 0
+            self._impression[status] += 1
+        elif resource == HTTPExceptionsAndLatencies.IMPRESSION_COUNT:
+            if status not in self._impression_count:
+                self._impression_count[status] = 0
+            self._impression_count[status] += 1
+        elif resource == HTTPExceptionsAndLatencies.EVENT:
+            if status not in self._event:
+                self._event[status] = 0
+            self._event[status] += 1
+        elif resource == HTTPExceptionsAndLatencies.TELEMETRY:
+            if status not in self._telemetry:
+                self._telemetry[status] = 0
+            self._telemetry[status] += 1
+        elif resource == HTTPExceptionsAndLatencies.TOKEN:
+            if status not in self._token:
+                self._token[status] = 0
+            self._token[status] += 1
+        else:
+            return
 
     async def pop_all(self):
         """
@@ -931,37 +1072,40 @@ class HTTPErrorsAsync(HTTPErrorsBase):
         :return: Dictonary of exceptions
         :rtype: dict
         """
-        async with self._lock:
-            http_errors = {
-                HTTPExceptionsAndLatencies.HTTP_ERRORS.value: {
-                    HTTPExceptionsAndLatencies.SPLIT.value: self._split,
-                    HTTPExceptionsAndLatencies.SEGMENT.value: self._segment,
-                    HTTPExceptionsAndLatencies.IMPRESSION.value: self._impression,
-                    HTTPExceptionsAndLatencies.IMPRESSION_COUNT.value: self._impression_count, HTTPExceptionsAndLatencies.EVENT.value: self._event,
-                    HTTPExceptionsAndLatencies.TELEMETRY.value: self._telemetry, HTTPExceptionsAndLatencies.TOKEN.value: self._token
-                }
+        http_errors = {
+            HTTPExceptionsAndLatencies.HTTP_ERRORS.value: {
+                HTTPExceptionsAndLatencies.SPLIT.value: self._split,
+                HTTPExceptionsAndLatencies.SEGMENT.value: self._segment,
+                HTTPExceptionsAndLatencies.IMPRESSION.value: self._impression,
+                HTTPExceptionsAndLatencies.IMPRESSION_COUNT.value: self._impression_count, HTTPExceptionsAndLatencies.EVENT.value: self._event,
+                HTTPExceptionsAndLatencies.TELEMETRY.value: self._telemetry, HTTPExceptionsAndLatencies.TOKEN.value: self._token
             }
-            self._reset_all()
-            return http_errors
+        }
+        self._reset_all()
+        return http_errors
 
 
+_IMPRESSION_COUNTERS = (
+    CounterConstants.IMPRESSIONS_QUEUED,
+    CounterConstants.IMPRESSIONS_DEDUPED,
+    CounterConstants.IMPRESSIONS_DROPPED
+)
+_EVENT_COUNTERS = (
+    CounterConstants.EVENTS_QUEUED,
+    CounterConstants.EVENTS_DROPPED
+)
+_IMPRESSION_COUNTER_INDEXES = {id(counter): index for index, counter in enumerate(_IMPRESSION_COUNTERS)}
+_EVENT_COUNTER_INDEXES = {id(counter): index + len(_IMPRESSION_COUNTERS) for index, counter in enumerate(_EVENT_COUNTERS)}
+_COUNTER_INDEXES = {**_IMPRESSION_COUNTER_INDEXES, **_EVENT_COUNTER_INDEXES}
+_AUTH_REJECTIONS_INDEX = len(_COUNTER_INDEXES)
+_TOKEN_REFRESHES_INDEX = _AUTH_REJECTIONS_INDEX + 1
+_UPDATE_FROM_SSE_INDEXES = {id(event): index + _TOKEN_REFRESHES_INDEX + 1 for index, event in enumerate(UpdateFromSSE)}
+
 class TelemetryCountersBase(object, metaclass=abc.ABCMeta):
     """
     Counters base class
 
     """
-    def _reset_all(self):
-        """Reset variables"""
-        self._impressions_queued = 0
-        self._impressions_deduped = 0
-        self._impressions_dropped = 0
-        self._events_queued = 0
-        self._events_dropped = 0
-        self._auth_rejections = 0
-        self._token_refreshes = 0
-        self._session_length = 0
-        self._update_from_sse = {}
-
     @abc.abstractmethod
     def record_impressions_value(self, resource, value):
         """
@@ -1021,12 +1165,13 @@ class TelemetryCounters(TelemetryCountersBase):
     """
     Counters class
 
+    Impressions, events, auth and sse counters are counted per thread, the rest of the telemetry
+    storage reads them only when it's synchronized.
     """
     def __init__(self):
         """Constructor"""
-        self._lock = threading.RLock()
-        with self._lock:
-            self._reset_all()
+        self._counters = _ThreadCounters(max(_UPDATE_FROM_SSE_INDEXES.values()) + 1)
+        self._session_length = 0
 
     def record_impressions_value(self, resource, value):
         """
@@ -1037,15 +1182,9 @@ class TelemetryCounters(TelemetryCountersBase):
         :param value: value to be appended
         :type value: int
         """
-        with self._lock:
-            if resource == CounterConstants.IMPRESSIONS_QUEUED:
-                self._impressions_queued += value
-            elif resource == CounterConstants.IMPRESSIONS_DEDUPED:
-                self._impressions_deduped += value
-            elif resource == CounterConstants.IMPRESSIONS_DROPPED:
-                self._impressions_dropped += value
-            else:
-                return
+        index = _IMPRESSION_COUNTER_INDEXES.get(id(resource))
+        if index is not None:
+            self._counters.local()[index] += value
 
     def record_events_value(self, resource, value):
         """
@@ -1056,38 +1195,34 @@ class TelemetryCounters(TelemetryCountersBase):
         :param value: value to be appended
         :type value: int
         """
-        with self._lock:
-            if resource == CounterConstants.EVENTS_QUEUED:
-                self._events_queued += value
-            elif resource == CounterConstants.EVENTS_DROPPED:
-                self._events_dropped += value
-            else:
-                return
+        index = _EVENT_COUNTER_INDEXES.get(id(resource))
+        if index is not None:
+            self._counters.local()[index] += value
 
-    def record_update_from_sse(self, event):
+    def record_update_from_sse(self, event, value=1):
         """
-        Increment the update from sse resource by one.
+        Increment the update from sse resource.
+
+        :param event: update from sse resource
+        :type event: splitio.models.telemetry.UpdateFromSSE
+        :param value: value to be added
+        :type value: int
         """
-        with self._lock:
-            if event.value not in self._update_from_sse:
-                self._update_from_sse[event.value] = 0
-            self._update_from_sse[event.value] += 1
+        self._counters.local()[_UPDATE_FROM_SSE_INDEXES[id(event)]] += value
 
     def record_auth_rejections(self):
         """
         Increment the auth rejection resource by one.
 
         """
-        with self._lock:
-            self._auth_rejections += 1
+        self._counters.local()[_AUTH_REJECTIONS_INDEX] += 1
 
     def record_token_refreshes(self):
         """
         Increment the token refreshes resource by one.
 
         """
-        with self._lock:
-            self._token_refreshes += 1
+        self._counters.local()[_TOKEN_REFRESHES_INDEX] += 1
 
     def pop_update_from_sse(self, event):
         """
@@ -1095,13 +1230,8 @@ class TelemetryCounters(TelemetryCountersBase):
         :return: update from sse value
         :rtype: int
         """
-        with self._lock:
-            if self._update_from_sse.get(event.value) is None:
-                return 0
-
-            update_from_sse = self._update_from_sse[event.value]
-            self._update_from_sse[event.value] = 0
-            return update_from_sse
+        index = _UPDATE_FROM_SSE_INDEXES[id(event)]
+        return self._counters.pop(index, index + 1)[0]
 
     def record_session_length(self, session):
         """
@@ -1110,8 +1240,7 @@ class TelemetryCounters(TelemetryCountersBase):
         :param session: value to be set
         :type session: int
         """
-        with self._lock:
-            self._session_length = session
+        self._session_length = session
 
     def get_counter_stats(self, resource):
         """
@@ -1123,25 +1252,11 @@ class TelemetryCounters(TelemetryCountersBase):
         :return: resource value
         :rtype: int
         """
+        index = _COUNTER_INDEXES.get(id(resource))
+        if index is None:
+            return 0
 
-        with self._lock:
-            if resource == CounterConstants.IMPRESSIONS_QUEUED:
-                return self._impressions_queued
-
-            elif resource == CounterConstants.IMPRESSIONS_DEDUPED:
-                return self._impressions_deduped
-
-            elif resource == CounterConstants.IMPRESSIONS_DROPPED:
-                return self._impressions_dropped
-
-            elif resource == CounterConstants.EVENTS_QUEUED:
-                return self._events_queued
-
-            elif resource == CounterConstants.EVENTS_DROPPED:
-                return self._events_dropped
-
-            else:
-                return 0
+        return self._counters.get(index)
 
     def get_session_length(self):
         """
@@ -1150,8 +1265,7 @@ class TelemetryCounters(TelemetryCountersBase):
         :return: session length value
         :rtype: int
         """
-        with self._lock:
-            return self._session_length
+        return self._session_length
 
     def pop_auth_rejections(self):
         """
@@ -1160,10 +1274,7 @@ class TelemetryCounters(TelemetryCountersBase):
         :return: auth rejections value
         :rtype: int
         """
-        with self._lock:
-            auth_rejections = self._auth_rejections
-            self._auth_rejections = 0
-            return auth_rejections
+        return self._counters.pop(_AUTH_REJECTIONS_INDEX, _AUTH_REJECTIONS_INDEX + 1)[0]
 
     def pop_token_refreshes(self):
         """
@@ -1172,25 +1283,33 @@ class TelemetryCounters(TelemetryCountersBase):
         :return: token refreshes value
         :rtype: int
         """
-        with self._lock:
-            token_refreshes = self._token_refreshes
-            self._token_refreshes = 0
-            return token_refreshes
+        return self._counters.pop(_TOKEN_REFRESHES_INDEX, _TOKEN_REFRESHES_INDEX + 1)[0]
 
 class TelemetryCountersAsync(TelemetryCountersBase):
     """
     Counters async class
 
+    Counters are only updated from the event loop, so no lock is needed.
     """
     @classmethod
     async def create(cls):
         """Constructor"""
         self = cls()
-        self._lock = asyncio.Lock()
-        async with self._lock:
-            self._reset_all()
+        self._reset_all()
         return self
 
+    def _reset_all(self):
+        """Reset variables"""
+        self._impressions_queued = 0
+        self._impressions_deduped = 0
+        self._impressions_dropped = 0
+        self._events_queued = 0
+        self._events_dropped = 0
+        self._auth_rejections = 0
+        self._token_refreshes = 0
+        self._session_length = 0
+        self._update_from_sse = {}
+
     async def record_impressions_value(self, resource, value):
         """
         Append to the resource value
@@ -1200,15 +1319,14 @@ class TelemetryCountersAsync(TelemetryCountersBase):
         :param value: value to be appended
         :type value: int
         """
-        async with self._lock:
-            if resource == CounterConstants.IMPRESSIONS_QUEUED:
-                self._impressions_queued += value
-            elif resource == CounterConstants.IMPRESSIONS_DEDUPED:
-                self._impressions_deduped += value
-            elif resource == CounterConstants.IMPRESSIONS_DROPPED:
-                self._impressions_dropped += value
-            else:
-                return
+        if resource == CounterConstants.IMPRESSIONS_QUEUED:
+            self._impressions_queued += value
+        elif resource == CounterConstants.IMPRESSIONS_DEDUPED:
+            self._impressions_deduped += value
+        elif resource == CounterConstants.IMPRESSIONS_DROPPED:
+            self._impressions_dropped += value
+        else:
+            return
 
     async def record_events_value(self, resource, value):
         """
@@ -1219,38 +1337,39 @@ class TelemetryCountersAsync(TelemetryCountersBase):
         :param value: value to be appended
         :type value: int
         """
-        async with self._lock:
-            if resource == CounterConstants.EVENTS_QUEUED:
-                self._events_queued += value
-            elif resource == CounterConstants.EVENTS_DROPPED:
-                self._events_dropped += value
-            else:
-                return
+        if resource == CounterConstants.EVENTS_QUEUED:
+            self._events_queued += value
+        elif resource == CounterConstants.EVENTS_DROPPED:
+            self._events_dropped += value
+        else:
+            return
 
-    async def record_update_from_sse(self, event):
+    async def record_update_from_sse(self, event, value=1):
         """
-        Increment the update from sse resource by one.
+        Increment the update from sse resource.
+
+        :param event: update from sse resource
+        :type event: splitio.models.telemetry.UpdateFromSSE
+        :param value: value to be added
+        :type value: int
         """
-        async with self._lock:
-            if event.value not in self._update_from_sse:
-                self._update_from_sse[event.value] = 0
-            self._update_from_sse[event.value] += 1
+        if event.value not in self._update_from_sse:
+            self._update_from_sse[event.value] = 0
+        self._update_from_sse[event.value] += value
 
     async def record_auth_rejections(self):
         """
         Increment the auth rejection resource by one.
 
         """
-        async with self._lock:
-            self._auth_rejections += 1
+        self._auth_rejections += 1
 
     async def record_token_refreshes(self):
         """
         Increment the token refreshes resource by one.
 
         """
-        async with self._lock:
-            self._token_refreshes += 1
+        self._token_refreshes += 1
 
     async def pop_update_from_sse(self, event):
         """
@@ -1258,13 +1377,12 @@ class TelemetryCountersAsync(TelemetryCountersBase):
         :return: update from sse value
         :rtype: int
         """
-        async with self._lock:
-            if self._update_from_sse.get(event.value) is None:
-                return 0
+        if self._update_from_sse.get(event.value) is None:
+            return 0
 
-            update_from_sse = self._update_from_sse[event.value]
-            self._update_from_sse[event.value] = 0
-            return update_from_sse
+        update_from_sse = self._update_from_sse[event.value]
+        self._update_from_sse[event.value] = 0
+        return update_from_sse
 
     async def record_session_length(self, session):
         """
@@ -1273,8 +1391,7 @@ class TelemetryCountersAsync(TelemetryCountersBase):
         :param session: value to be set
         :type session: int
         """
-        async with self._lock:
-            self._session_length = session
+        self._session_length = session
 
     async def get_counter_stats(self, resource):
         """
@@ -1286,24 +1403,23 @@ class TelemetryCountersAsync(TelemetryCountersBase):
         :return: resource value
         :rtype: int
         """
-        async with self._lock:
-            if resource == CounterConstants.IMPRESSIONS_QUEUED:
-                return self._impressions_queued
+        if resource == CounterConstants.IMPRESSIONS_QUEUED:
+            return self._impressions_queued
 
-            elif resource == CounterConstants.IMPRESSIONS_DEDUPED:
-                return self._impressions_deduped
+        elif resource == CounterConstants.IMPRESSIONS_DEDUPED:
+            return self._impressions_deduped
 
-            elif resource == CounterConstants.IMPRESSIONS_DROPPED:
-                return self._impressions_dropped
+        elif resource == CounterConstants.IMPRESSIONS_DROPPED:
+            return self._impressions_dropped
 
-            elif resource == CounterConstants.EVENTS_QUEUED:
-                return self._events_queued
+        elif resource == CounterConstants.EVENTS_QUEUED:
+            return self._events_queued
 
-            elif resource == CounterConstants.EVENTS_DROPPED:
-                return self._events_dropped
+        elif resource == CounterConstants.EVENTS_DROPPED:
+            return self._events_dropped
 
-            else:
-                return 0
+        else:
+            return 0
 
     async def get_session_length(self):
         """
@@ -1312,8 +1428,7 @@ class TelemetryCountersAsync(TelemetryCountersBase):
         :return: session length value
         :rtype: int
         """
-        async with self._lock:
-            return self._session_length
+        return self._session_length
 
     async def pop_auth_rejections(self):
         """
@@ -1322,10 +1437,9 @@ class TelemetryCountersAsync(TelemetryCountersBase):
         :return: auth rejections value
         :rtype: int
         """
-        async with self._lock:
-            auth_rejections = self._auth_rejections
-            self._auth_rejections = 0
-            return auth_rejections
+        auth_rejections = self._auth_rejections
+        self._auth_rejections = 0
+        return auth_rejections
 
     async def pop_token_refreshes(self):
         """
@@ -1334,10 +1448,9 @@ class TelemetryCountersAsync(TelemetryCountersBase):
         :return: token refreshes value
         :rtype: int
         """
-        async with self._lock:
-            token_refreshes = self._token_refreshes
-            self._token_refreshes = 0
-            return token_refreshes
+        token_refreshes = self._token_refreshes
+        self._token_refreshes = 0
+        return token_refreshes
 
 
 class StreamingEvent(object):
@@ -1395,9 +1508,7 @@ class StreamingEventsAsync(object):
     async def create(cls):
         """Constructor"""
         self = cls()
-        self._lock = asyncio.Lock()
-        async with self._lock:
-            self._streaming_events = []
+        self._streaming_events = []
         return self
 
     async def record_streaming_event(self, streaming_event):
@@ -1410,9 +1521,8 @@ class StreamingEventsAsync(object):
         """
         if not StreamingEvent(streaming_event):
             return
-        async with self._lock:
-            if len(self._streaming_events) < MAX_STREAMING_EVENTS:
-                self._streaming_events.append(StreamingEvent(streaming_event))
+        if len(self._streaming_events) < MAX_STREAMING_EVENTS:
+            self._streaming_events.append(StreamingEvent(streaming_event))
 
     async def pop_streaming_events(self):
         """
@@ -1421,12 +1531,11 @@ class StreamingEventsAsync(object):
         :return: streaming events dict
         :rtype: dict
         """
-        async with self._lock:
-            streaming_events = self._streaming_events
-            self._streaming_events = []
-            return {_StreamingEventsConstant.STREAMING_EVENTS.value: [
-                {'e': streaming_event.type, 'd': streaming_event.data,
-                't': streaming_event.time} for streaming_event in streaming_events]}
+        streaming_events = self._streaming_events
+        self._streaming_events = []
+        return {_StreamingEventsConstant.STREAMING_EVENTS.value: [
+            {'e': streaming_event.type, 'd': streaming_event.data,
+            't': streaming_event.time} for streaming_event in streaming_events]}
 
 class StreamingEvents(object):
     """
@@ -1814,9 +1923,7 @@ class TelemetryConfigAsync(TelemetryConfigBase):
     async def create(cls):
         """Constructor"""
         self = cls()
-        self._lock = asyncio.Lock()
-        async with self._lock:
-            self._reset_all()
+        self._reset_all()
         return self
 
     async def record_config(self, config, extra_config, total_flag_sets, invalid_flag_sets):
@@ -1841,19 +1948,18 @@ class TelemetryConfigAsync(TelemetryConfigBase):
         }
         :type config: dict
         """
-        async with self._lock:
-            self._operation_mode = self._get_operation_mode(config[_ConfigParams.OPERATION_MODE.value])
-            self._storage_type = self._get_storage_type(config[_ConfigParams.OPERATION_MODE.value], config[_ConfigParams.STORAGE_TYPE.value])
-            self._streaming_enabled = config[_ConfigParams.STREAMING_ENABLED.value]
-            self._refresh_rate = self._get_refresh_rates(config)
-            self._url_override = self._get_url_overrides(extra_config)
-            self._impressions_queue_size = config[_ConfigParams.IMPRESSIONS_QUEUE_SIZE.value]
-            self._events_queue_size = config[_ConfigParams.EVENTS_QUEUE_SIZE.value]
-            self._impressions_mode = self._get_impressions_mode(config[_ConfigParams.IMPRESSIONS_MODE.value])
-            self._impression_listener = True if config[_ConfigParams.IMPRESSIONS_LISTENER.value] is not None else False
-            self._http_proxy = self._check_if_proxy_detected()
-            self._flag_sets = total_flag_sets
-            self._flag_sets_invalid = invalid_flag_sets
+        self._operation_mode = self._get_operation_mode(config[_ConfigParams.OPERATION_MODE.value])
+        self._storage_type = self._get_storage_type(config[_ConfigParams.OPERATION_MODE.value], config[_ConfigParams.STORAGE_TYPE.value])
+        self._streaming_enabled = config[_ConfigParams.STREAMING_ENABLED.value]
+        self._refresh_rate = self._get_refresh_rates(config)
+        self._url_override = self._get_url_overrides(extra_config)
+        self._impressions_queue_size = config[_ConfigParams.IMPRESSIONS_QUEUE_SIZE.value]
+        self._events_queue_size = config[_ConfigParams.EVENTS_QUEUE_SIZE.value]
+        self._impressions_mode = self._get_impressions_mode(config[_ConfigParams.IMPRESSIONS_MODE.value])
+        self._impression_listener = True if config[_ConfigParams.IMPRESSIONS_LISTENER.value] is not None else False
+        self._http_proxy = self._check_if_proxy_detected()
+        self._flag_sets = total_flag_sets
+        self._flag_sets_invalid = invalid_flag_sets
 
     async def record_active_and_redundant_factories(self, active_factory_count, redundant_factory_count):
         """
@@ -1865,9 +1971,8 @@ class TelemetryConfigAsync(TelemetryConfigBase):
         :param redundant_factory_count: redundant factories count
         :type redundant_factory_count: int
         """
-        async with self._lock:
-            self._active_factory_count = active_factory_count
-            self._redundant_factory_count = redundant_factory_count
+        self._active_factory_count = active_factory_count
+        self._redundant_factory_count = redundant_factory_count
 
     async def record_ready_time(self, ready_time):
         """
@@ -1876,24 +1981,21 @@ class TelemetryConfigAsync(TelemetryConfigBase):
         :param ready_time: SDK ready time
         :type ready_time: int
         """
-        async with self._lock:
-            self._time_until_ready = ready_time
+        self._time_until_ready = ready_time
 
     async def record_bur_time_out(self):
         """
         Record block until ready timeout count
 
         """
-        async with self._lock:
-            self._block_until_ready_timeout += 1
+        self._block_until_ready_timeout += 1
 
     async def record_not_ready_usage(self):
         """
         record non-ready usage count
 
         """
-        async with self._lock:
-            self._not_ready += 1
+        self._not_ready += 1
 
     async def get_bur_time_outs(self):
         """
@@ -1902,8 +2004,7 @@ class TelemetryConfigAsync(TelemetryConfigBase):
         :return: block until ready timeouts count
         :rtype: int
         """
-        async with self._lock:
-            return self._block_until_ready_timeout
+        return self._block_until_ready_timeout
 
     async def get_non_ready_usage(self):
         """
@@ -1912,8 +2013,7 @@ class TelemetryConfigAsync(TelemetryConfigBase):
         :return: non-ready usage count
         :rtype: int
         """
-        async with self._lock:
-            return self._not_ready
+        return self._not_ready
 
     async def get_stats(self):
         """
@@ -1922,33 +2022,32 @@ class TelemetryConfigAsync(TelemetryConfigBase):
         :return: dict of all config stats.
         :rtype: dict
         """
-        async with self._lock:
-            return {
-                'bT':  self._block_until_ready_timeout,
-                'nR': self._not_ready,
-                'tR': self._time_until_ready,
-                'oM': self._operation_mode,
-                'sT': self._storage_type,
-                'sE': self._streaming_enabled,
-                'rR': {
-                    'sp': self._refresh_rate[_ConfigParams.SPLITS_REFRESH_RATE.value],
-                    'se': self._refresh_rate[_ConfigParams.SEGMENTS_REFRESH_RATE.value],
-                    'im': self._refresh_rate[_ConfigParams.IMPRESSIONS_REFRESH_RATE.value],
-                    'ev': self._refresh_rate[_ConfigParams.EVENTS_REFRESH_RATE.value],
-                    'te': self._refresh_rate[_ConfigParams.TELEMETRY_REFRESH_RATE.value]},
-                'uO': {
-                    's': self._url_override[_ApiURLs.SDK_URL.value],
-                    'e': self._url_override[_ApiURLs.EVENTS_URL.value],
-                    'a': self._url_override[_ApiURLs.AUTH_URL.value],
-                    'st': self._url_override[_ApiURLs.STREAMING_URL.value],
-                    't': self._url_override[_ApiURLs.TELEMETRY_URL.value]},
-                'iQ': self._impressions_queue_size,
-                'eQ': self._events_queue_size,
-                'iM': self._impressions_mode,
-                'iL': self._impression_listener,
-                'hp': self._http_proxy,
-                'aF': self._active_factory_count,
-                'rF': self._redundant_factory_count,
-                'fsT': self._flag_sets,
-                'fsI': self._flag_sets_invalid
-            }
\ No newline at end of file
+        return {
+            'bT':  self._block_until_ready_timeout,
+            'nR': self._not_ready,
+            'tR': self._time_until_ready,
+            'oM': self._operation_mode,
+            'sT': self._storage_type,
+            'sE': self._streaming_enabled,
+            'rR': {
+                'sp': self._refresh_rate[_ConfigParams.SPLITS_REFRESH_RATE.value],
+                'se': self._refresh_rate[_ConfigParams.SEGMENTS_REFRESH_RATE.value],
+                'im': self._refresh_rate[_ConfigParams.IMPRESSIONS_REFRESH_RATE.value],
+                'ev': self._refresh_rate[_ConfigParams.EVENTS_REFRESH_RATE.value],
+                'te': self._refresh_rate[_ConfigParams.TELEMETRY_REFRESH_RATE.value]},
+            'uO': {
+                's': self._url_override[_ApiURLs.SDK_URL.value],
+                'e': self._url_override[_ApiURLs.EVENTS_URL.value],
+                'a': self._url_override[_ApiURLs.AUTH_URL.value],
+                'st': self._url_override[_ApiURLs.STREAMING_URL.value],
+                't': self._url_override[_ApiURLs.TELEMETRY_URL.value]},
+            'iQ': self._impressions_queue_size,
+            'eQ': self._events_queue_size,
+            'iM': self._impressions_mode,
+            'iL': self._impression_listener,
+            'hp': self._http_proxy,
+            'aF': self._active_factory_count,
+            'rF': self._redundant_factory_count,
+            'fsT': self._flag_sets,
+            'fsI': self._flag_sets_invalid
+        }
\ No newline at end of file
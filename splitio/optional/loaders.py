@@ -1,30 +1,81 @@
-import sys
-try:
-    import asyncio
-    import aiohttp
-    import aiofiles
-except ImportError:
-    def missing_asyncio_dependencies(*_, **__):
-        """Fail if missing dependencies are used."""
-        raise NotImplementedError(
-            'Missing aiohttp dependency. '
-            'Please use `pip install splitio_client[asyncio]` to install the sdk with asyncio support'
-        )
-    aiohttp = missing_asyncio_dependencies
-    asyncio = missing_asyncio_dependencies
-    aiofiles = missing_asyncio_dependencies
-
-try:
-    from requests_kerberos import HTTPKerberosAuth, OPTIONAL
-except ImportError:
-    def missing_auth_dependencies(*_, **__):
+"""Optional dependencies, imported the first time they're used."""
+import asyncio  # pylint: disable=unused-import
+import importlib
+from importlib.util import find_spec
+from types import ModuleType
+
+
+# Modules that must be installed, missing dependency, extra and feature, by group of optional dependencies.
+_ASYNCIO = (('aiohttp', 'aiofiles'), 'aiohttp', 'asyncio', 'asyncio')
+_KERBEROS = ((), 'kerberos auth', 'kerberos', 'kerberos auth')
+_HDR = ((), 'hdrhistogram', 'hdr', 'latency histograms')
+_OTEL = ((), 'opentelemetry', 'otel', 'opentelemetry')
+
+# Module and attribute providing each name, and its group. Modules are handed out as lazy proxies.
+_OPTIONAL = {
+    'aiohttp': ('aiohttp', None, _ASYNCIO),
+    'aiofiles': ('aiofiles', None, _ASYNCIO),
+    'HTTPKerberosAuth': ('requests_kerberos', 'HTTPKerberosAuth', _KERBEROS),
+    'OPTIONAL': ('requests_kerberos', 'OPTIONAL', _KERBEROS),
+    'HdrHistogram': ('hdrh.histogram', 'HdrHistogram', _HDR),
+    'set_span_in_context': ('opentelemetry.trace', 'set_span_in_context', _OTEL),
+}
+
+
+def _missing(dependency, extra, feature):
+    """Return a stub failing when a missing dependency is used."""
+    def missing_dependencies(*_, **__):
         """Fail if missing dependencies are used."""
         raise NotImplementedError(
-            'Missing kerberos auth dependency. '
-            'Please use `pip install splitio_client[kerberos]` to install the sdk with kerberos auth support'
+            'Missing %s dependency. '
+            'Please use `pip install splitio_client[%s]` to install the sdk with %s support' % (dependency, extra, feature)
         )
-    HTTPKerberosAuth = missing_auth_dependencies
-    OPTIONAL = missing_auth_dependencies
+    return missing_dependencies
+
+
+def _import(module, attribute, group):
+    """Import an optional dependency, or return a stub raising NotImplementedError when it's missing."""
+    required, dependency, extra, feature = group
+    try:
+        if any(find_spec(requirement) is None for requirement in required):
+            raise ImportError(dependency)
+        value = importlib.import_module(module)
+        if attribute is not None:
+            value = getattr(value, attribute)
+    except ImportError:
+        value = _missing(dependency, extra, feature)
+    return value
+
+
+class _LazyModule(object):  # pylint: disable=too-few-public-methods
+    """Module proxy importing the module the first time one of its attributes is used, then caching them."""
+
+    def __init__(self, module, group):
+        self._name = module
+        self._group = group
+        self._module = None
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            module = _import(self._name, None, self._group)
+            if not isinstance(module, ModuleType):
+                module()  # raises NotImplementedError naming the missing dependency
+            self._module = module
+        value = getattr(self._module, attribute)
+        setattr(self, attribute, value)  # later lookups don't go through __getattr__
+        return value
+
+
+def __getattr__(name):
+    """Resolve optional dependencies on first access."""
+    if name not in _OPTIONAL:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+    module, attribute, group = _OPTIONAL[name]
+    value = _LazyModule(module, group) if attribute is None else _import(module, attribute, group)
+    globals()[name] = value
+    return value
+
 
 async def _anext(it):
     return await it.__anext__()
@@ -1,8 +1,10 @@
 """SSE Notification definitions."""
 import abc
-import json
+import base64
+import zlib
 from enum import Enum
 
+from splitio.api.commons import decode_json
 from splitio.util.decorators import abstract_property
 from splitio.util.time import utctime_ms
 from splitio.push.sse import SSE_EVENT_ERROR, SSE_EVENT_MESSAGE
@@ -30,6 +32,23 @@ class UpdateType(Enum):
     SEGMENT_UPDATE = 'SEGMENT_UPDATE'
 
 
+class CompressionMode(Enum):
+    """Compression modes """
+
+    NO_COMPRESSION = 0
+    GZIP_COMPRESSION = 1
+    ZLIB_COMPRESSION = 2
+
+
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+_compression_handlers = {
+    CompressionMode.NO_COMPRESSION: lambda payload: payload,
+    CompressionMode.GZIP_COMPRESSION: lambda payload: zlib.decompress(payload, _GZIP_WBITS),
+    CompressionMode.ZLIB_COMPRESSION: zlib.decompress,
+}
+
+
 class ControlType(Enum):
     """Control type enumeration."""
 
@@ -523,12 +542,12 @@ def _parse_message(data):
     :returns: Parsed ably error notification.
     :rtype: BaseEvent
     """
-    if not all(k in data for k in ['data', 'channel']):
+    if 'data' not in data or 'channel' not in data:
         return None
 
     channel = data['channel']
     timestamp = data['timestamp']
-    parsed_data = json.loads(data['data'])
+    parsed_data = decode_json(data['data'])
     if data.get('name') == TAG_OCCUPANCY:
         return OccupancyMessage(channel, timestamp, parsed_data['metrics']['publishers'])
 
@@ -569,7 +588,7 @@ def parse_incoming_event(raw_event):
         return None
 
     try:
-        parsed_data = json.loads(raw_event.data)
+        parsed_data = decode_json(raw_event.data)
     except Exception as exc:  # pylint:disable=broad-except
         raise EventParsingException('Error parsing json') from exc
 
@@ -578,7 +597,27 @@ def parse_incoming_event(raw_event):
     except ValueError as exc:
         raise Exception('unknown event type %s' % raw_event.event) from exc
 
-    return {
-        EventType.ERROR: _parse_error,
-        EventType.MESSAGE: _parse_message,
-    }[event_type](parsed_data)
+    return _EVENT_PARSERS[event_type](parsed_data)
+
+
+def decode_feature_flag_definition(event):
+    """
+    Decode the feature flag sent in a feature flag update notification.
+
+    The definition is base64 decoded and decompressed straight into bytes, which are parsed as json
+    without building an intermediate string.
+
+    :param event: feature flag update notification
+    :type event: SplitChangeUpdate
+
+    :returns: raw feature flag
+    :rtype: dict
+    """
+    compression = CompressionMode(event.compression)  # will throw if the number is not defined in compression mode
+    return decode_json(_compression_handlers[compression](base64.b64decode(event.feature_flag_definition)))
+
+
+_EVENT_PARSERS = {
+    EventType.ERROR: _parse_error,
+    EventType.MESSAGE: _parse_message,
+}
@@ -36,7 +36,7 @@ class MessageProcessor(MessageProcessorBase):
         self._segments_queue = Queue()
         self._synchronizer = synchronizer
         self._feature_flag_worker = SplitWorker(synchronizer.synchronize_splits, synchronizer.synchronize_segment, self._feature_flag_queue, synchronizer.split_sync.feature_flag_storage, synchronizer.segment_storage, telemetry_runtime_producer)
-        self._segments_worker = SegmentWorker(synchronizer.synchronize_segment, self._segments_queue)
+        self._segments_worker = SegmentWorker(synchronizer.synchronize_segment, self._segments_queue, telemetry_runtime_producer)
         self._handlers = {
             UpdateType.SPLIT_UPDATE: self._handle_feature_flag_update,
             UpdateType.SPLIT_KILL: self._handle_feature_flag_kill,
@@ -120,7 +120,7 @@ class MessageProcessorAsync(MessageProcessorBase):
         self._segments_queue = asyncio.Queue()
         self._synchronizer = synchronizer
         self._feature_flag_worker = SplitWorkerAsync(synchronizer.synchronize_splits, synchronizer.synchronize_segment, self._feature_flag_queue, synchronizer.split_sync.feature_flag_storage, synchronizer.segment_storage, telemetry_runtime_producer)
-        self._segments_worker = SegmentWorkerAsync(synchronizer.synchronize_segment, self._segments_queue)
+        self._segments_worker = SegmentWorkerAsync(synchronizer.synchronize_segment, self._segments_queue, telemetry_runtime_producer)
         self._handlers = {
             UpdateType.SPLIT_UPDATE: self._handle_feature_flag_update,
             UpdateType.SPLIT_KILL: self._handle_feature_flag_kill,
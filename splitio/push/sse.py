@@ -12,7 +12,6 @@ _LOGGER = logging.getLogger(__name__)
 SSE_EVENT_ERROR = 'error'
 SSE_EVENT_MESSAGE = 'message'
 _DEFAULT_HEADERS = {'accept': 'text/event-stream'}
-_EVENT_SEPARATORS = set([b'\n', b'\r\n'])
 _DEFAULT_SOCKET_READ_TIMEOUT = 70
 
 SSEEvent = namedtuple('SSEEvent', ['event_id', 'event', 'retry', 'data'])
@@ -20,32 +19,83 @@ SSEEvent = namedtuple('SSEEvent', ['event_id', 'event', 'retry', 'data'])
 
 __ENDING_CHARS = set(['\n', ''])
 
-class EventBuilder(object):
-    """Event builder class."""
+_READ_SIZE = 64 * 1024
+_LINE_SEPARATOR = b'\n'
+_LINE_FEED = 10
+_CARRIAGE_RETURN = 13
+_FIELD_SEPARATOR = b':'
+_EVENT_FIELDS = {b'id': 0, b'event': 1, b'retry': 2, b'data': 3}
 
-    _SEPARATOR = b':'
+
+def parse_event(block):
+    """
+    Build an event from the lines between two event separators.
+
+    Only the id, event, retry & data fields are decoded, comments and any other field are skipped.
+
+    :param block: Event lines.
+    :type block: bytes
+
+    :returns: parsed event
+    :rtype: SSEEvent
+    """
+    fields = [None, None, None, None]
+    for line in block.split(_LINE_SEPARATOR):
+        key, separator, val = line.partition(_FIELD_SEPARATOR)
+        index = _EVENT_FIELDS.get(key)
+        if index is not None and separator:
+            fields[index] = val.strip().decode('utf8')
+
+    return SSEEvent(*fields)
+
+
+class EventBuffer(object):
+    """Split the bytes read from an event stream into events."""
 
     def __init__(self):
-        """Construct a builder."""
-        self._lines = {}
+        """Construct a buffer."""
+        self._buffer = bytearray()
+        self._scan_from = 0
 
-    def process_line(self, line):
+    def feed(self, chunk):
         """
-        Process a new line.
+        Add bytes read from the stream.
 
-        :param line: Line to process
-        :type line: bytes
+        Events end with an empty line, so they're split where a line feed is followed by another one,
+        optionally with a carriage return in between.
+
+        :param chunk: Bytes read.
+        :type chunk: bytes
+
+        :returns: events completed by these bytes.
+        :rtype: list(SSEEvent)
         """
-        try:
-            key, val = line.split(self._SEPARATOR, 1)
-            self._lines[key.decode('utf8').strip()] = val.decode('utf8').strip()
-        except ValueError:  # key without a value
-            self._lines[line.decode('utf8').strip()] = None
+        buffer = self._buffer
+        buffer += chunk
+        size = len(buffer)
+        events = []
+        start = 0
+        line_end = buffer.find(_LINE_SEPARATOR, self._scan_from)
+        with memoryview(buffer) as view:
+            while line_end >= 0:
+                following = line_end + 1
+                if following < size and buffer[following] == _CARRIAGE_RETURN:
+                    following += 1
+                if following >= size:  # wait for more bytes to know whether the next line is empty
+                    break
+                if buffer[following] == _LINE_FEED:
+                    events.append(parse_event(bytes(view[start:line_end])))
+                    start = following + 1
+                    line_end = buffer.find(_LINE_SEPARATOR, start)
+                else:
+                    line_end = buffer.find(_LINE_SEPARATOR, following)
+
+        self._scan_from = (line_end if line_end >= 0 else size) - start
+        if start:
+            del buffer[:start]
+
+        return events
 
-    def build(self):
-        """Construct an event with relevant fields."""
-        return SSEEvent(self._lines.get('id'), self._lines.get('event'),
-                        self._lines.get('retry'), self._lines.get('data'))
 
 class SSEClient(object):
     """SSE Client implementation."""
@@ -70,21 +120,14 @@ class SSEClient(object):
         """
         try:
             response = self._conn.getresponse()
-            event_builder = EventBuilder()
+            event_buffer = EventBuffer()
             while True:
-                line = response.readline()
-                if line is None or len(line) <= 0:  # connection ended
+                chunk = response.read1(_READ_SIZE)
+                if chunk is None or len(chunk) <= 0:  # connection ended
                     break
-                elif line.startswith(b':'):  # comment. Skip
-                    _LOGGER.debug("skipping sse comment")
-                    continue
-                elif line in _EVENT_SEPARATORS:
-                    event = event_builder.build()
+                for event in event_buffer.feed(chunk):
                     _LOGGER.debug("dispatching event: %s", event)
                     self._event_callback(event)
-                    event_builder = EventBuilder()
-                else:
-                    event_builder.process_line(line)
         except Exception:  # pylint:disable=broad-except
             _LOGGER.debug('sse connection ended.')
             _LOGGER.debug('stack trace: ', exc_info=True)
@@ -173,17 +216,11 @@ class SSEClientAsync(object):
         try:
             async with self._sess.get(url, headers=get_headers(extra_headers)) as response:
                 self._response = response
-                event_builder = EventBuilder()
-                async for line in response.content:
-                    if line.startswith(b':'):
-                        _LOGGER.debug("skipping emtpy line / comment")
-                        continue
-                    elif line in _EVENT_SEPARATORS:
-                        _LOGGER.debug("dispatching event: %s", event_builder.build())
-                        yield event_builder.build()
-                        event_builder = EventBuilder()
-                    else:
-                        event_builder.process_line(line)
+                event_buffer = EventBuffer()
+                async for chunk in response.content.iter_any():
+                    for event in event_buffer.feed(chunk):
+                        _LOGGER.debug("dispatching event: %s", event)
+                        yield event
 
         except Exception as exc:  # pylint:disable=broad-except
             if self._is_conn_closed_error(exc):
@@ -2,33 +2,18 @@
 import logging
 import threading
 import abc
-import gzip
-import zlib
-import base64
-import json
-from enum import Enum
+import queue
 
 from splitio.models.splits import from_raw
 from splitio.models.telemetry import UpdateFromSSE
 from splitio.push import SplitStorageException
-from splitio.push.parser import UpdateType
+from splitio.push.parser import UpdateType, decode_feature_flag_definition
 from splitio.optional.loaders import asyncio
 from splitio.util.storage_helper import update_feature_flag_storage, update_feature_flag_storage_async
 
 _LOGGER = logging.getLogger(__name__)
 
-class CompressionMode(Enum):
-    """Compression modes """
-
-    NO_COMPRESSION = 0
-    GZIP_COMPRESSION = 1
-    ZLIB_COMPRESSION = 2
-
-_compression_handlers = {
-    CompressionMode.NO_COMPRESSION: lambda event: base64.b64decode(event.feature_flag_definition),
-    CompressionMode.GZIP_COMPRESSION: lambda event: gzip.decompress(base64.b64decode(event.feature_flag_definition)).decode('utf-8'),
-    CompressionMode.ZLIB_COMPRESSION: lambda event: zlib.decompress(base64.b64decode(event.feature_flag_definition)).decode('utf-8'),
-}
+_MAX_EVENTS_PER_BATCH = 500
 
 class WorkerBase(object, metaclass=abc.ABCMeta):
     """Worker template."""
@@ -47,15 +32,60 @@ class WorkerBase(object, metaclass=abc.ABCMeta):
 
     def _get_feature_flag_definition(self, event):
         """return feature flag definition in event."""
-        cm = CompressionMode(event.compression) # will throw if the number is not defined in compression mode
-        return _compression_handlers[cm](event)
+        return decode_feature_flag_definition(event)
+
+    def _drain(self, pending_queue, event):
+        """
+        Return the event taken from the queue along with every other one already waiting in it.
+
+        :param pending_queue: queue the event was taken from
+        :type pending_queue: queue.Queue or asyncio.Queue
+        :param event: event already taken from the queue
+        :type event: splitio.push.parser.BaseUpdate
+
+        :returns: events in arrival order, without stop centinels
+        :rtype: list
+        """
+        events = [event]
+        while len(events) < _MAX_EVENTS_PER_BATCH:
+            try:
+                events.append(pending_queue.get_nowait())
+            except self._empty_queue_exceptions():
+                break
+
+        return [item for item in events if item is not self._centinel]
+
+    def _empty_queue_exceptions(self):
+        """Return the exceptions raised when reading from an empty queue."""
+        return queue.Empty
+
+
+class SegmentWorkerBase(WorkerBase):
+    """Segment Worker template."""
 
-class SegmentWorker(WorkerBase):
+    def _coalesce(self, events):
+        """
+        Reduce segment update events to the highest change number per segment.
+
+        :param events: segment update events in arrival order
+        :type events: list(splitio.push.parser.SegmentChangeUpdate)
+
+        :returns: change number to synchronize per segment name, in order of first arrival
+        :rtype: dict
+        """
+        latest = {}
+        for event in events:
+            latest[event.segment_name] = max(event.change_number, latest.get(event.segment_name, event.change_number))
+
+        return latest
+
+
+class SegmentWorker(SegmentWorkerBase):
     """Segment Worker for processing updates."""
 
     _centinel = object()
 
-    def __init__(self, synchronize_segment, segment_queue):
+    def __init__(self, synchronize_segment, segment_queue, telemetry_runtime_producer=None):
         """
         Class constructor.
 
@@ -64,9 +94,13 @@ class SegmentWorker(WorkerBase):
 
         :param segment_queue: queue with segment updates notifications
         :type segment_queue: queue
+
+        :param telemetry_runtime_producer: Telemetry runtime producer instance
+        :type telemetry_runtime_producer: splitio.engine.telemetry.TelemetryRuntimeProducer
         """
         self._segment_queue = segment_queue
         self._handler = synchronize_segment
+        self._telemetry_runtime_producer = telemetry_runtime_producer
         self._running = False
         self._worker = None
 
@@ -77,18 +111,24 @@ class SegmentWorker(WorkerBase):
     def _run(self):
         """Run worker handler."""
         while self.is_running():
-            event = self._segment_queue.get()
+            events = self._drain(self._segment_queue, self._segment_queue.get())
             if not self.is_running():
                 break
-            if event == self._centinel:
+            if not events:
                 continue
-            _LOGGER.debug('Processing segment_update: %s, change_number: %d',
-                          event.segment_name, event.change_number)
-            try:
-                self._handler(event.segment_name, event.change_number)
-            except Exception:
-                _LOGGER.error('Exception raised in segment synchronization')
-                _LOGGER.debug('Exception information: ', exc_info=True)
+
+            latest = self._coalesce(events)
+            if len(events) > len(latest) and self._telemetry_runtime_producer is not None:
+                self._telemetry_runtime_producer.record_update_from_sse(UpdateFromSSE.SEGMENT_UPDATE_COALESCED, len(events) - len(latest))
+
+            for segment_name, change_number in latest.items():
+                _LOGGER.debug('Processing segment_update: %s, change_number: %d',
+                              segment_name, change_number)
+                try:
+                    self._handler(segment_name, change_number)
+                except Exception:
+                    _LOGGER.error('Exception raised in segment synchronization')
+                    _LOGGER.debug('Exception information: ', exc_info=True)
 
     def start(self):
         """Start worker."""
@@ -110,12 +150,12 @@ class SegmentWorker(WorkerBase):
         self._running = False
         self._segment_queue.put(self._centinel)
 
-class SegmentWorkerAsync(WorkerBase):
+class SegmentWorkerAsync(SegmentWorkerBase):
     """Segment Worker for processing updates."""
 
     _centinel = object()
 
-    def __init__(self, synchronize_segment, segment_queue):
+    def __init__(self, synchronize_segment, segment_queue, telemetry_runtime_producer=None):
         """
         Class constructor.
 
@@ -124,30 +164,44 @@ class SegmentWorkerAsync(WorkerBase):
 
         :param segment_queue: queue with segment updates notifications
         :type segment_queue: asyncio.Queue
+
+        :param telemetry_runtime_producer: Telemetry runtime producer instance
+        :type telemetry_runtime_producer: splitio.engine.telemetry.TelemetryRuntimeProducerAsync
         """
         self._segment_queue = segment_queue
         self._handler = synchronize_segment
+        self._telemetry_runtime_producer = telemetry_runtime_producer
         self._running = False
 
     def is_running(self):
         """Return whether the working is running."""
         return self._running
 
+    def _empty_queue_exceptions(self):
+        """Return the exceptions raised when reading from an empty queue."""
+        return asyncio.QueueEmpty
+
     async def _run(self):
         """Run worker handler."""
         while self.is_running():
-            event = await self._segment_queue.get()
+            events = self._drain(self._segment_queue, await self._segment_queue.get())
             if not self.is_running():
                 break
-            if event == self._centinel:
+            if not events:
                 continue
-            _LOGGER.debug('Processing segment_update: %s, change_number: %d',
-                          event.segment_name, event.change_number)
-            try:
-                await self._handler(event.segment_name, event.change_number)
-            except Exception:
-                _LOGGER.error('Exception raised in segment synchronization')
-                _LOGGER.debug('Exception information: ', exc_info=True)
+
+            latest = self._coalesce(events)
+            if len(events) > len(latest) and self._telemetry_runtime_producer is not None:
+                await self._telemetry_runtime_producer.record_update_from_sse(UpdateFromSSE.SEGMENT_UPDATE_COALESCED, len(events) - len(latest))
+
+            for segment_name, change_number in latest.items():
+                _LOGGER.debug('Processing segment_update: %s, change_number: %d',
+                              segment_name, change_number)
+                try:
+                    await self._handler(segment_name, change_number)
+                except Exception:
+                    _LOGGER.error('Exception raised in segment synchronization')
+                    _LOGGER.debug('Exception information: ', exc_info=True)
 
     def start(self):
         """Start worker."""
@@ -168,7 +222,27 @@ class SegmentWorkerAsync(WorkerBase):
         self._running = False
         await self._segment_queue.put(self._centinel)
 
-class SplitWorker(WorkerBase):
+class SplitWorkerBase(WorkerBase):
+    """Feature Flag Worker template."""
+
+    def _next_fetch_change_number(self, fetch_change_number, event):
+        """
+        Return the change number to fetch once the event is added to a burst.
+
+        :param fetch_change_number: change number to fetch for the events seen so far, None if there's none
+        :type fetch_change_number: int
+        :param event: event that could not be applied from its payload
+        :type event: splitio.push.parser.BaseUpdate
+
+        :rtype: int
+        """
+        if fetch_change_number is None:
+            return event.change_number
+
+        return max(fetch_change_number, event.change_number)
+
+
+class SplitWorker(SplitWorkerBase):
     """Feature Flag Worker for processing updates."""
 
     _centinel = object()
@@ -208,7 +282,7 @@ class SplitWorker(WorkerBase):
             return False
 
         try:
-            new_feature_flag = from_raw(json.loads(self._get_feature_flag_definition(event)))
+            new_feature_flag = from_raw(self._get_feature_flag_definition(event))
             segment_list = update_feature_flag_storage(self._feature_flag_storage, [new_feature_flag], event.change_number)
             for segment_name in segment_list:
                 if self._segment_storage.get(segment_name) is None:
@@ -230,29 +304,55 @@ class SplitWorker(WorkerBase):
     def _run(self):
         """Run worker handler."""
         while self.is_running():
-            event = self._feature_flag_queue.get()
+            events = self._drain(self._feature_flag_queue, self._feature_flag_queue.get())
             if not self.is_running():
                 break
-            if event == self._centinel:
+            if not events:
                 continue
-            _LOGGER.debug('Processing feature flag update %d', event.change_number)
-            try:
-                if self._apply_iff_if_needed(event):
-                    continue
 
-                sync_result = self._handler(event.change_number)
-                if not sync_result.success and sync_result.error_code is not None and sync_result.error_code == 414:
-                    _LOGGER.error("URI too long exception caught, sync failed")
+            handled = 0
+            fetch_change_number = None
+            applied_change_number = None
+            for event in events:
+                _LOGGER.debug('Processing feature flag update %d', event.change_number)
+                try:
+                    if self._apply_iff_if_needed(event):
+                        handled += 1
+                        applied_change_number = event.change_number
+                        continue
+
+                    fetch_change_number = self._next_fetch_change_number(fetch_change_number, event)
+                except SplitStorageException as e:  # pylint: disable=broad-except
+                    handled += 1
+                    _LOGGER.error('Exception Updating Feature Flag')
+                    _LOGGER.debug('Exception information: ', exc_info=True)
+
+            # Updates applied from their payload supersede any older change that would need a fetch.
+            if fetch_change_number is not None and (applied_change_number is None or fetch_change_number > applied_change_number):
+                handled += 1
+                self._synchronize(fetch_change_number)
+
+            if handled < len(events):
+                self._telemetry_runtime_producer.record_update_from_sse(UpdateFromSSE.SPLIT_UPDATE_COALESCED, len(events) - handled)
+
+    def _synchronize(self, change_number):
+        """
+        Fetch feature flags up to a change number.
+
+        :param change_number: change number to fetch
+        :type change_number: int
+        """
+        try:
+            sync_result = self._handler(change_number)
+            if not sync_result.success and sync_result.error_code is not None and sync_result.error_code == 414:
+                _LOGGER.error("URI too long exception caught, sync failed")
 
-                if not sync_result.success:
-                    _LOGGER.error("feature flags sync failed")
+            if not sync_result.success:
+                _LOGGER.error("feature flags sync failed")
 
-            except SplitStorageException as e:  # pylint: disable=broad-except
-                _LOGGER.error('Exception Updating Feature Flag')
-                _LOGGER.debug('Exception information: ', exc_info=True)
-            except Exception as e:  # pylint: disable=broad-except
-                _LOGGER.error('Exception raised in feature flag synchronization')
-                _LOGGER.debug('Exception information: ', exc_info=True)
+        except Exception as e:  # pylint: disable=broad-except
+            _LOGGER.error('Exception raised in feature flag synchronization')
+            _LOGGER.debug('Exception information: ', exc_info=True)
 
     def start(self):
         """Start worker."""
@@ -274,7 +374,7 @@ class SplitWorker(WorkerBase):
         self._running = False
         self._feature_flag_queue.put(self._centinel)
 
-class SplitWorkerAsync(WorkerBase):
+class SplitWorkerAsync(SplitWorkerBase):
     """Split Worker for processing updates."""
 
     _centinel = object()
@@ -312,7 +412,7 @@ class SplitWorkerAsync(WorkerBase):
         if not await self._check_instant_ff_update(event):
             return False
         try:
-            new_feature_flag = from_raw(json.loads(self._get_feature_flag_definition(event)))
+            new_feature_flag = from_raw(self._get_feature_flag_definition(event))
             segment_list = await update_feature_flag_storage_async(self._feature_flag_storage, [new_feature_flag], event.change_number)
             for segment_name in segment_list:
                 if await self._segment_storage.get(segment_name) is None:
@@ -331,25 +431,47 @@ class SplitWorkerAsync(WorkerBase):
             return True
         return False
 
+    def _empty_queue_exceptions(self):
+        """Return the exceptions raised when reading from an empty queue."""
+        return asyncio.QueueEmpty
+
     async def _run(self):
         """Run worker handler."""
         while self.is_running():
-            event = await self._feature_flag_queue.get()
+            events = self._drain(self._feature_flag_queue, await self._feature_flag_queue.get())
             if not self.is_running():
                 break
-            if event == self._centinel:
+            if not events:
                 continue
-            _LOGGER.debug('Processing split_update %d', event.change_number)
-            try:
-                if await self._apply_iff_if_needed(event):
-                    continue
-                await self._handler(event.change_number)
-            except SplitStorageException as e:  # pylint: disable=broad-except
-                _LOGGER.error('Exception Updating Feature Flag')
-                _LOGGER.debug('Exception information: ', exc_info=True)
-            except Exception as e:  # pylint: disable=broad-except
-                _LOGGER.error('Exception raised in split synchronization')
-                _LOGGER.debug('Exception information: ', exc_info=True)
+
+            handled = 0
+            fetch_change_number = None
+            applied_change_number = None
+            for event in events:
+                _LOGGER.debug('Processing split_update %d', event.change_number)
+                try:
+                    if await self._apply_iff_if_needed(event):
+                        handled += 1
+                        applied_change_number = event.change_number
+                        continue
+
+                    fetch_change_number = self._next_fetch_change_number(fetch_change_number, event)
+                except SplitStorageException as e:  # pylint: disable=broad-except
+                    handled += 1
+                    _LOGGER.error('Exception Updating Feature Flag')
+                    _LOGGER.debug('Exception information: ', exc_info=True)
+
+            # Updates applied from their payload supersede any older change that would need a fetch.
+            if fetch_change_number is not None and (applied_change_number is None or fetch_change_number > applied_change_number):
+                handled += 1
+                try:
+                    await self._handler(fetch_change_number)
+                except Exception as e:  # pylint: disable=broad-except
+                    _LOGGER.error('Exception raised in split synchronization')
+                    _LOGGER.debug('Exception information: ', exc_info=True)
+
+            if handled < len(events):
+                await self._telemetry_runtime_producer.record_update_from_sse(UpdateFromSSE.SPLIT_UPDATE_COALESCED, len(events) - handled)
 
     def start(self):
         """Start worker."""
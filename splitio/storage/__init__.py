@@ -186,6 +186,23 @@ class SegmentStorage(object, metaclass=abc.ABCMeta):
         """
         pass
 
+    def segment_contains_many(self, segment_names, key):
+        """
+        Check whether a specific key belongs to each one of the given segments.
+
+        Storages backed by a remote store should override this to check all the
+        segments in as few calls as possible.
+
+        :param segment_names: Names of the segments to search in.
+        :type segment_names: list(str)
+        :param key: Key to search for.
+        :type key: str
+
+        :return: Membership of the key for each segment.
+        :rtype: dict(str, bool)
+        """
+        return {segment_name: self.segment_contains(segment_name, key) for segment_name in segment_names}
+
 
 class ImpressionStorage(object, metaclass=abc.ABCMeta):
     """Impressions storage interface."""
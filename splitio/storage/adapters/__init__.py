@@ -0,0 +1,22 @@
+"""Storage adapters."""
+
+
+class RedisAdapterException(Exception):
+    """Exception to be thrown when a redis command fails with an exception."""
+
+    def __init__(self, message, original_exception=None):
+        """
+        Exception constructor.
+
+        :param message: Custom exception message.
+        :type message: str
+        :param original_exception: Original exception object.
+        :type original_exception: Exception
+        """
+        Exception.__init__(self, message)
+        self._original_exception = original_exception
+
+    @property
+    def original_exception(self):
+        """Return original exception."""
+        return self._original_exception
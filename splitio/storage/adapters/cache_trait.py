@@ -1,11 +1,14 @@
 """Caching trait module."""
 
+import logging
 import threading
 import time
 from functools import update_wrapper
 
 from splitio.optional.loaders import asyncio
 
+_LOGGER = logging.getLogger(__name__)
+
 DEFAULT_MAX_AGE = 5
 DEFAULT_MAX_SIZE = 100
 
@@ -56,6 +59,7 @@ class LocalMemoryCacheBase(object):  # pylint: disable=too-many-instance-attribu
         self._mru = None
         self._key_func = key_func
         self._user_func = user_func
+        self._in_flight = {}
 
     def clear(self):
         """Clear the cache."""
@@ -64,7 +68,10 @@ class LocalMemoryCacheBase(object):  # pylint: disable=too-many-instance-attribu
         self._mru = None
 
     def _is_expired(self, node):
-        """Return whether the data held by the node is expired."""
+        """Return whether the data held by the node is expired. No max age means it never expires."""
+        if self._max_age_seconds is None:
+            return False
+
         return time.time() - self._max_age_seconds > node.last_update
 
     def _bubble_up(self, node):
@@ -99,6 +106,30 @@ class LocalMemoryCacheBase(object):  # pylint: disable=too-many-instance-attribu
 
         return node
 
+    def _put(self, key, value):
+        """Store a value as the MRU, evicting the LRU if the cache is full."""
+        node = self._data.get(key)
+        if node is not None:
+            node.value = value
+            node.last_update = time.time()
+        else:
+            node = LocalMemoryCacheBase._Node(key, value, time.time(), None, None)
+        node = self._bubble_up(node)
+        self._data[key] = node
+        self._rollover()
+
+    def _remove(self, node):
+        """Unlink a node and drop it from the cache."""
+        if node.previous is not None:
+            node.previous.next = node.next
+        else:
+            self._lru = node.next
+        if node.next is not None:
+            node.next.previous = node.previous
+        else:
+            self._mru = node.previous
+        del self._data[node.key]
+
     def _rollover(self):
         """Check we're within the size limit. Otherwise drop the LRU."""
         if len(self._data) > self._max_size:
@@ -116,6 +147,16 @@ class LocalMemoryCacheBase(object):  # pylint: disable=too-many-instance-attribu
             node = node.previous
         return '<MRU>\n' + '\n'.join(nodes) + '\n<LRU>'
 
+class _InFlight(object):  # pylint: disable=too-few-public-methods
+    """Outcome of a refill shared by every thread waiting on the same key."""
+
+    def __init__(self):
+        """Class constructor."""
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
 class LocalMemoryCache(LocalMemoryCacheBase):  # pylint: disable=too-many-instance-attributes
     """Local cache for threading"""
     def __init__(
@@ -133,6 +174,10 @@ class LocalMemoryCache(LocalMemoryCacheBase):  # pylint: disable=too-many-instan
         """
         Fetch an item from the cache. If it's a miss, call user function to refill.
 
+        Only one thread calls the user function for a given key. Concurrent callers wait for
+        its result, or get the expired value if there is one while it's being refreshed.
+        The user function runs outside the lock so lookups of other keys are not blocked.
+
         :param args: User supplied positional arguments
         :type args: list
         :param kwargs: User supplied keyword arguments
@@ -144,18 +189,69 @@ class LocalMemoryCache(LocalMemoryCacheBase):  # pylint: disable=too-many-instan
         with self._lock:
             key = self._key_func(*args, **kwargs)
             node = self._data.get(key)
-            if node is not None:
-                if self._is_expired(node):
-                    node.value = self._user_func(*args, **kwargs)
-                    node.last_update = time.time()
-            else:
-                value = self._user_func(*args, **kwargs)
-                node = LocalMemoryCache._Node(key, value, time.time(), None, None)
+            if node is not None and not self._is_expired(node):
+                return self._bubble_up(node).value
+
+            flight = self._in_flight.get(key)
+            if flight is not None and node is not None:
+                return node.value
+
+            is_loader = flight is None
+            if is_loader:
+                flight = _InFlight()
+                self._in_flight[key] = flight
+
+        if not is_loader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = self._user_func(*args, **kwargs)
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if flight.error is None:
+                    self._put(key, flight.value)
+            flight.done.set()
+
+        return flight.value
+
+    def get_key(self, key):
+        """
+        Fetch an item from the cache, return None if does not exist
+        :param key: User supplied key
+        :type key: str/frozenset
+        :return: Cached/Fetched object
+        :rtype: object
+        """
+        with self._lock:
+            node = self._data.get(key)
+            if node is None or self._is_expired(node):
+                return None
+
             node = self._bubble_up(node)
-            self._data[key] = node
-            self._rollover()
             return node.value
 
+    def add_key(self, key, value):
+        """
+        Add an item from the cache.
+        :param key: User supplied key
+        :type key: str/frozenset
+        :param value: key value
+        :type value: str
+        """
+        with self._lock:
+            self._put(key, value)
+
+    def clear(self):
+        """Clear the cache."""
+        with self._lock:
+            LocalMemoryCacheBase.clear(self)
 
     def remove_expired(self):
         """Remove expired elements."""
@@ -166,7 +262,12 @@ class LocalMemoryCache(LocalMemoryCacheBase):  # pylint: disable=too-many-instan
             }
 
 class LocalMemoryCacheAsync(LocalMemoryCacheBase):  # pylint: disable=too-many-instance-attributes
-    """Local cache for asyncio"""
+    """
+    Local cache for asyncio.
+
+    The event loop runs one coroutine at a time and no method awaits while touching the
+    linked list, so no lock is needed.
+    """
     def __init__(
             self,
             key_func,
@@ -176,7 +277,74 @@ class LocalMemoryCacheAsync(LocalMemoryCacheBase):  # pylint: disable=too-many-i
     ):
         """Class constructor."""
         LocalMemoryCacheBase.__init__(self, key_func, user_func, max_age_seconds, max_size)
-        self._lock = asyncio.Lock()
+
+    async def get(self, *args, **kwargs):
+        """
+        Fetch an item from the cache. If it's a miss, await the user coroutine function to refill.
+
+        :param args: User supplied positional arguments
+        :type args: list
+        :param kwargs: User supplied keyword arguments
+        :type kwargs: dict
+
+        :return: Cached/Fetched object
+        :rtype: object
+        """
+        return await self.get_or_load(self._key_func(*args, **kwargs), lambda: self._user_func(*args, **kwargs))
+
+    async def get_or_load(self, key, loader):
+        """
+        Fetch an item from the cache, calling the loader on a miss.
+
+        Concurrent misses for the same key share a single loader call. Expired items are
+        returned right away while one refresh runs in the background.
+
+        :param key: User supplied key
+        :type key: str/frozenset
+        :param loader: Function with no arguments returning an awaitable with the fresh value.
+        :type loader: callable
+
+        :return: Cached/Fetched object
+        :rtype: object
+        """
+        node = self._data.get(key)
+        if node is not None:
+            if self._is_expired(node) and key not in self._in_flight:
+                self._start_load(key, loader)
+            return self._bubble_up(node).value
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._start_load(key, loader)
+
+        # shielded so a cancelled caller doesn't cancel the load other callers are waiting on.
+        return await asyncio.shield(task)
+
+    def _start_load(self, key, loader):
+        """Schedule the loader for a key and register it as in flight."""
+        task = asyncio.get_running_loop().create_task(self._load(key, loader))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._finish_load(key, done))
+        return task
+
+    async def _load(self, key, loader):
+        """Await the loader and store its result."""
+        value = await loader()
+        self._put(key, value)
+        return value
+
+    def _finish_load(self, key, task):
+        """Unregister a finished load, dropping the expired item if the refresh failed."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is None:
+            return
+
+        _LOGGER.error('Error refreshing cached item')
+        _LOGGER.debug('Error: ', exc_info=task.exception())
+        node = self._data.get(key)
+        if node is not None and self._is_expired(node):
+            self._remove(node)
 
     async def get_key(self, key):
         """
@@ -186,17 +354,11 @@ class LocalMemoryCacheAsync(LocalMemoryCacheBase):  # pylint: disable=too-many-i
         :return: Cached/Fetched object
         :rtype: object
         """
-        async with self._lock:
-            node = self._data.get(key)
-            if node is not None:
-                if self._is_expired(node):
-                    return None
-
-            if node is None:
-                return None
+        node = self._data.get(key)
+        if node is None or self._is_expired(node):
+            return None
 
-            node = self._bubble_up(node)
-            return node.value
+        return self._bubble_up(node).value
 
     async def add_key(self, key, value):
         """
@@ -206,16 +368,7 @@ class LocalMemoryCacheAsync(LocalMemoryCacheBase):  # pylint: disable=too-many-i
         :param value: key value
         :type value: str
         """
-        async with self._lock:
-            if self._data.get(key) is not None:
-                node = self._data.get(key)
-                node.value = value
-                node.last_update = time.time()
-            else:
-                node = LocalMemoryCache._Node(key, value, time.time(), None, None)
-            node = self._bubble_up(node)
-            self._data[key] = node
-            self._rollover()
+        self._put(key, value)
 
 def decorate(key_func, max_age_seconds=DEFAULT_MAX_AGE, max_size=DEFAULT_MAX_SIZE):
     """
@@ -1,6 +1,9 @@
 """Redis client wrapper with prefix support."""
 from builtins import str
 import abc
+
+from splitio.storage.adapters import RedisAdapterException
+
 try:
     from redis import StrictRedis
     from redis.sentinel import Sentinel
@@ -16,29 +19,27 @@ except ImportError:
         )
     StrictRedis = Sentinel = aioredis = missing_redis_dependencies
 
-class RedisAdapterException(Exception):
-    """Exception to be thrown when a redis command fails with an exception."""
+try:
+    from redis.cluster import RedisCluster, ClusterNode
+    from redis.asyncio.cluster import RedisCluster as RedisClusterAsync, ClusterNode as ClusterNodeAsync
+except ImportError:
+    def missing_redis_cluster_dependencies(*_, **__):
+        """Fail if missing dependencies are used."""
+        raise NotImplementedError(
+            'Missing Redis Cluster support dependencies. '
+            'Please use `pip install splitio_client[redis]` with redis>=4.1.0 to enable redis cluster support'
+        )
+    RedisCluster = ClusterNode = RedisClusterAsync = ClusterNodeAsync = missing_redis_cluster_dependencies
 
-    def __init__(self, message, original_exception=None):
-        """
-        Exception constructor.
 
-        :param message: Custom exception message.
-        :type message: str
-        :param original_exception: Original exception object.
-        :type original_exception: Exception
-        """
-        Exception.__init__(self, message)
-        self._original_exception = original_exception
+class SentinelConfigurationException(Exception):
+    """Exception to be raised when sentinel config options are incorrect."""
 
-    @property
-    def original_exception(self):
-        """Return original exception."""
-        return self._original_exception
+    pass
 
 
-class SentinelConfigurationException(Exception):
-    """Exception to be raised when sentinel config options are incorrect."""
+class ClusterConfigurationException(Exception):
+    """Exception to be raised when cluster config options are incorrect."""
 
     pass
 
@@ -112,6 +113,22 @@ class PrefixHelper(object):
 class RedisAdapterBase(object, metaclass=abc.ABCMeta):
     """Redis adapter template."""
 
+    def _prefix_eval_keys(self, number_of_keys, keys_and_args):
+        """
+        Add the user prefix to the keys of an eval call, leaving script arguments untouched.
+
+        :param number_of_keys: Number of leading items that are redis keys.
+        :type number_of_keys: int
+        :param keys_and_args: Keys followed by script arguments.
+        :type keys_and_args: tuple
+
+        :return: Prefixed keys followed by the original arguments.
+        :rtype: list
+        """
+        keys = list(keys_and_args[:number_of_keys])
+        args = list(keys_and_args[number_of_keys:])
+        return (self._prefix_helper.add_prefix(keys) if keys else []) + args
+
     @abc.abstractmethod
     def keys(self, pattern):
         """Mimic original redis keys."""
@@ -164,6 +181,10 @@ class RedisAdapterBase(object, metaclass=abc.ABCMeta):
     def eval(self, script, number_of_keys, *keys):
         """Mimic original redis eval."""
 
+    @abc.abstractmethod
+    def register_script(self, script):
+        """Mimic original redis register_script."""
+
     @abc.abstractmethod
     def hset(self, name, key, value):
         """Mimic original redis hset."""
@@ -327,10 +348,27 @@ class RedisAdapter(RedisAdapterBase):  # pylint: disable=too-many-public-methods
     def eval(self, script, number_of_keys, *keys):
         """Mimic original redis function but using user custom prefix."""
         try:
-            return self._decorated.eval(script, number_of_keys, *self._prefix_helper.add_prefix(list(keys)))
+            return self._decorated.eval(script, number_of_keys, *self._prefix_eval_keys(number_of_keys, keys))
         except RedisError as exc:
             raise RedisAdapterException('Error executing eval operation') from exc
 
+    def register_script(self, script):
+        """
+        Mimic original redis function but using user custom prefix.
+
+        The returned callable takes the same arguments as eval without the script, and runs it
+        with EVALSHA, loading it again when redis answers NOSCRIPT.
+        """
+        registered = self._decorated.register_script(script)
+
+        def run(number_of_keys, *keys):
+            keys_and_args = self._prefix_eval_keys(number_of_keys, keys)
+            try:
+                return registered(keys=keys_and_args[:number_of_keys], args=keys_and_args[number_of_keys:])
+            except RedisError as exc:
+                raise RedisAdapterException('Error executing evalsha operation') from exc
+        return run
+
     def hset(self, name, key, value):
         """Mimic original redis function but using user custom prefix."""
         try:
@@ -526,10 +564,27 @@ class RedisAdapterAsync(RedisAdapterBase):  # pylint: disable=too-many-public-me
     async def eval(self, script, number_of_keys, *keys):
         """Mimic original redis function but using user custom prefix."""
         try:
-            return await self._decorated.eval(script, number_of_keys, *self._prefix_helper.add_prefix(list(keys)))
+            return await self._decorated.eval(script, number_of_keys, *self._prefix_eval_keys(number_of_keys, keys))
         except RedisError as exc:
             raise RedisAdapterException('Error executing eval operation') from exc
 
+    def register_script(self, script):
+        """
+        Mimic original redis function but using user custom prefix.
+
+        The returned coroutine function takes the same arguments as eval without the script, and
+        runs it with EVALSHA, loading it again when redis answers NOSCRIPT.
+        """
+        registered = self._decorated.register_script(script)
+
+        async def run(number_of_keys, *keys):
+            keys_and_args = self._prefix_eval_keys(number_of_keys, keys)
+            try:
+                return await registered(keys=keys_and_args[:number_of_keys], args=keys_and_args[number_of_keys:])
+            except RedisError as exc:
+                raise RedisAdapterException('Error executing evalsha operation') from exc
+        return run
+
     async def hset(self, name, key, value):
         """Mimic original redis function but using user custom prefix."""
         try:
@@ -613,6 +668,117 @@ class RedisAdapterAsync(RedisAdapterBase):  # pylint: disable=too-many-public-me
         await self._decorated.close()
         await self._decorated.connection_pool.disconnect(inuse_connections=True)
 
+def _group_by_slot(keys, keyslot):
+    """
+    Group key positions by the cluster hash slot each key belongs to.
+
+    :param keys: Prefixed keys.
+    :type keys: list(str)
+    :param keyslot: Function returning the hash slot for a key.
+    :type keyslot: callable
+
+    :return: Key positions grouped by slot.
+    :rtype: list(list(int))
+    """
+    by_slot = {}
+    for index, key in enumerate(keys):
+        by_slot.setdefault(keyslot(key), []).append(index)
+    return list(by_slot.values())
+
+def _merge_slot_results(size, groups, results):
+    """
+    Put per-slot MGET results back in the order the keys were requested.
+
+    :param size: Number of requested keys.
+    :type size: int
+    :param groups: Key positions grouped by slot.
+    :type groups: list(list(int))
+    :param results: One MGET result per group.
+    :type results: list(list)
+
+    :return: Values in the requested order.
+    :rtype: list
+    """
+    to_return = [None] * size
+    for indexes, values in zip(groups, results):
+        for index, value in zip(indexes, values):
+            to_return[index] = value
+    return to_return
+
+class RedisClusterAdapter(RedisAdapter):
+    """
+    Instance decorator for Redis Cluster clients.
+
+    Multi-key reads are split by hash slot and sent through a cluster pipeline,
+    so that every node receives a single MGET per slot it owns.
+    """
+
+    def mget(self, names):
+        """Mimic original redis function but using user custom prefix and grouping keys by slot."""
+        if not names:
+            return []
+
+        try:
+            keys = self._prefix_helper.add_prefix(names)
+            groups = _group_by_slot(keys, self._decorated.keyslot)
+            if len(groups) == 1:
+                return [item for item in self._decorated.mget(keys)]
+
+            pipe = self._decorated.pipeline()
+            for indexes in groups:
+                pipe.mget([keys[index] for index in indexes])
+            return _merge_slot_results(len(keys), groups, pipe.execute())
+        except RedisError as exc:
+            raise RedisAdapterException('Error executing mget operation') from exc
+
+class RedisClusterAdapterAsync(RedisAdapterAsync):
+    """
+    Instance decorator for asyncio Redis Cluster clients.
+
+    Multi-key reads are split by hash slot and sent through a cluster pipeline,
+    so that every node receives a single MGET per slot it owns.
+    """
+
+    async def mget(self, names):
+        """Mimic original redis function but using user custom prefix and grouping keys by slot."""
+        if not names:
+            return []
+
+        try:
+            keys = self._prefix_helper.add_prefix(names)
+            groups = _group_by_slot(keys, self._decorated.keyslot)
+            if len(groups) == 1:
+                return [item for item in await self._decorated.mget(keys)]
+
+            pipe = self._decorated.pipeline()
+            for indexes in groups:
+                pipe.mget([keys[index] for index in indexes])
+            return _merge_slot_results(len(keys), groups, await pipe.execute())
+        except RedisError as exc:
+            raise RedisAdapterException('Error executing mget operation') from exc
+
+    async def rpush(self, key, *values):
+        """Mimic original redis function but using user custom prefix."""
+        try:
+            return await self._decorated.rpush(self._prefix_helper.add_prefix(key), *values)
+        except RedisError as exc:
+            raise RedisAdapterException('Error executing rpush operation') from exc
+
+    async def expire(self, key, value):
+        """Mimic original redis function but using user custom prefix."""
+        try:
+            return await self._decorated.expire(self._prefix_helper.add_prefix(key), value)
+        except RedisError as exc:
+            raise RedisAdapterException('Error executing expire operation') from exc
+
+    async def close(self):
+        """Close the cluster client, with close() on redis versions without aclose()."""
+        aclose = getattr(self._decorated, 'aclose', None)
+        if aclose is not None:
+            await aclose()
+        else:
+            await self._decorated.close()
+
 class RedisPipelineAdapterBase(object):
     """
     Base decorator for Redis Pipeline.
@@ -945,6 +1111,162 @@ async def _build_sentinel_client_async(config):  # pylint: disable=too-many-loca
     )
     return RedisAdapterAsync(redis, prefix=prefix)
 
+def _get_cluster_startup_nodes(config):
+    """
+    Validate and return the configured cluster startup nodes.
+
+    :param config: Redis configuration properties.
+    :type config: dict
+
+    :return: Startup nodes in the form of [(host, port)].
+    :rtype: list(tuple)
+    """
+    nodes = config.get('redisClusterNodes')
+    if nodes is None:
+        raise ClusterConfigurationException('redisClusterNodes must be specified.')
+    if not isinstance(nodes, list):
+        raise ClusterConfigurationException('Cluster nodes must be an array of elements in the form of'
+                                            ' [(host, port)].')
+    if not nodes:
+        raise ClusterConfigurationException('It must be at least one cluster node.')
+    if not all(isinstance(n, tuple) for n in nodes):
+        raise ClusterConfigurationException('Cluster nodes must respect the tuple structure'
+                                            '[(host, port)].')
+    return nodes
+
+def _get_cluster_prefix(config):
+    """
+    Build the key prefix for cluster mode, including the optional hash tag.
+
+    When a hash tag is configured every key shares the same hash slot, so all the
+    SDK data lives in a single shard, in the same layout used by the synchronizer.
+
+    :param config: Redis configuration properties.
+    :type config: dict
+
+    :return: Key prefix.
+    :rtype: str
+    """
+    prefix = config.get('redisPrefix')
+    hash_tag = config.get('redisClusterKeyHashTag')
+    if hash_tag is None:
+        return prefix
+
+    if not isinstance(hash_tag, str) or len(hash_tag) < 3 or not hash_tag.startswith('{') \
+            or not hash_tag.endswith('}') or '}' in hash_tag[1:-1]:
+        raise ClusterConfigurationException('redisClusterKeyHashTag must be a non empty string '
+                                            'wrapped in curly braces, i.e. {SPLITIO}.')
+
+    return hash_tag + prefix if prefix else hash_tag
+
+def _build_cluster_client(config):  # pylint: disable=too-many-locals
+    """
+    Build a redis cluster client.
+
+    :param config: Redis configuration properties.
+    :type config: dict
+
+    :return: A Wrapped redis cluster client
+    :rtype: splitio.storage.adapters.redis.RedisClusterAdapter
+    """
+    nodes = _get_cluster_startup_nodes(config)
+    prefix = _get_cluster_prefix(config)
+    username = config.get('redisUsername', None)
+    password = config.get('redisPassword', None)
+    socket_timeout = config.get('redisSocketTimeout', None)
+    socket_connect_timeout = config.get('redisSocketConnectTimeout', None)
+    socket_keepalive = config.get('redisSocketKeepalive', None)
+    socket_keepalive_options = config.get('redisSocketKeepaliveOptions', None)
+    encoding = config.get('redisEncoding', 'utf-8')
+    encoding_errors = config.get('redisEncodingErrors', 'strict')
+    decode_responses = config.get('redisDecodeResponses', True)
+    retry_on_timeout = config.get('redisRetryOnTimeout', False)
+    ssl = config.get('redisSsl', False)
+    ssl_keyfile = config.get('redisSslKeyfile', None)
+    ssl_certfile = config.get('redisSslCertfile', None)
+    ssl_cert_reqs = config.get('redisSslCertReqs', None)
+    ssl_ca_certs = config.get('redisSslCaCerts', None)
+    max_connections = config.get('redisMaxConnections', None)
+
+    kwargs = {}
+    if max_connections is not None:
+        kwargs['max_connections'] = max_connections
+    if ssl_cert_reqs is not None:
+        kwargs['ssl_cert_reqs'] = ssl_cert_reqs
+
+    redis = RedisCluster(
+        startup_nodes=[ClusterNode(host, port) for host, port in nodes],
+        username=username,
+        password=password,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=socket_connect_timeout,
+        socket_keepalive=socket_keepalive,
+        socket_keepalive_options=socket_keepalive_options,
+        encoding=encoding,
+        encoding_errors=encoding_errors,
+        decode_responses=decode_responses,
+        retry_on_timeout=retry_on_timeout,
+        ssl=ssl,
+        ssl_keyfile=ssl_keyfile,
+        ssl_certfile=ssl_certfile,
+        ssl_ca_certs=ssl_ca_certs,
+        **kwargs
+    )
+    return RedisClusterAdapter(redis, prefix=prefix)
+
+async def _build_cluster_client_async(config):  # pylint: disable=too-many-locals
+    """
+    Build a redis cluster asyncio client.
+
+    :param config: Redis configuration properties.
+    :type config: dict
+
+    :return: A Wrapped redis cluster client
+    :rtype: splitio.storage.adapters.redis.RedisClusterAdapterAsync
+    """
+    nodes = _get_cluster_startup_nodes(config)
+    prefix = _get_cluster_prefix(config)
+    username = config.get('redisUsername', None)
+    password = config.get('redisPassword', None)
+    socket_timeout = config.get('redisSocketTimeout', None)
+    socket_connect_timeout = config.get('redisSocketConnectTimeout', None)
+    socket_keepalive = config.get('redisSocketKeepalive', None)
+    socket_keepalive_options = config.get('redisSocketKeepaliveOptions', None)
+    encoding = config.get('redisEncoding', 'utf-8')
+    encoding_errors = config.get('redisEncodingErrors', 'strict')
+    decode_responses = config.get('redisDecodeResponses', True)
+    ssl = config.get('redisSsl', False)
+    ssl_keyfile = config.get('redisSslKeyfile', None)
+    ssl_certfile = config.get('redisSslCertfile', None)
+    ssl_cert_reqs = config.get('redisSslCertReqs', None)
+    ssl_ca_certs = config.get('redisSslCaCerts', None)
+    max_connections = config.get('redisMaxConnections', None)
+
+    kwargs = {}
+    if max_connections is not None:
+        kwargs['max_connections'] = max_connections
+    if ssl_cert_reqs is not None:
+        kwargs['ssl_cert_reqs'] = ssl_cert_reqs
+
+    redis = RedisClusterAsync(
+        startup_nodes=[ClusterNodeAsync(host, port) for host, port in nodes],
+        username=username,
+        password=password,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=socket_connect_timeout,
+        socket_keepalive=socket_keepalive,
+        socket_keepalive_options=socket_keepalive_options,
+        encoding=encoding,
+        encoding_errors=encoding_errors,
+        decode_responses=decode_responses,
+        ssl=ssl,
+        ssl_keyfile=ssl_keyfile,
+        ssl_certfile=ssl_certfile,
+        ssl_ca_certs=ssl_ca_certs,
+        **kwargs
+    )
+    return RedisClusterAdapterAsync(redis, prefix=prefix)
+
 async def build_async(config):
     """
     Build a async redis storage according to the configuration received.
@@ -958,6 +1280,9 @@ async def build_async(config):
     if 'redisSentinels' in config:
         return await _build_sentinel_client_async(config)
 
+    if 'redisClusterNodes' in config:
+        return await _build_cluster_client_async(config)
+
     return await _build_default_client_async(config)
 
 def build(config):
@@ -973,4 +1298,7 @@ def build(config):
     if 'redisSentinels' in config:
         return _build_sentinel_client(config)
 
+    if 'redisClusterNodes' in config:
+        return _build_cluster_client(config)
+
     return _build_default_client(config)
@@ -9,8 +9,10 @@ from splitio.models.telemetry import HTTPErrors, HTTPLatencies, MethodExceptions
     HTTPErrorsAsync, HTTPLatenciesAsync, MethodExceptionsAsync, MethodLatenciesAsync, LastSynchronizationAsync, StreamingEventsAsync, TelemetryConfigAsync, TelemetryCountersAsync
 from splitio.storage import FlagSetsFilter, SplitStorage, SegmentStorage, ImpressionStorage, EventStorage, TelemetryStorage
 from splitio.optional.loaders import asyncio
+from splitio.util.offload import LoopOffloader
 
 MAX_SIZE_BYTES = 5 * 1024 * 1024
+QUEUE_HIGH_WATER_MARK = 0.75  # share of a queue filled before it's flushed early
 MAX_TAGS = 10
 
 _LOGGER = logging.getLogger(__name__)
@@ -670,6 +672,19 @@ class InMemorySegmentStorage(SegmentStorage):
                 )
             return fetched
 
+    def get_copy(self, segment_name):
+        """
+        Retrieve a copy of a segment, safe to read while the stored one is being updated.
+
+        :param segment_name: Name of the segment to fetch.
+        :type segment_name: str
+
+        :rtype: splitio.models.segment.Segment
+        """
+        with self._lock:
+            fetched = self._segments.get(segment_name)
+            return fetched.copy() if fetched is not None else None
+
     def put(self, segment):
         """
         Store a segment.
@@ -776,11 +791,18 @@ class InMemorySegmentStorage(SegmentStorage):
 class InMemorySegmentStorageAsync(SegmentStorage):
     """In-memory implementation of a segment async storage."""
 
-    def __init__(self):
-        """Constructor."""
+    def __init__(self, offloader=None):
+        """
+        Constructor.
+
+        :param offloader: Applies large updates in slices that don't block the event loop.
+        :type offloader: splitio.util.offload.LoopOffloader
+        """
         self._segments = {}
         self._change_numbers = {}
         self._lock = asyncio.Lock()
+        self._update_lock = asyncio.Lock()
+        self._offloader = offloader if offloader is not None else LoopOffloader()
 
     async def get(self, segment_name):
         """
@@ -800,6 +822,19 @@ class InMemorySegmentStorageAsync(SegmentStorage):
                 )
             return fetched
 
+    async def get_copy(self, segment_name):
+        """
+        Retrieve a copy of a segment, safe to read while the stored one is being updated.
+
+        :param segment_name: Name of the segment to fetch.
+        :type segment_name: str
+
+        :rtype: splitio.models.segment.Segment
+        """
+        async with self._lock:
+            fetched = self._segments.get(segment_name)
+            return fetched.copy() if fetched is not None else None
+
     async def put(self, segment):
         """
         Store a segment.
@@ -807,13 +842,18 @@ class InMemorySegmentStorageAsync(SegmentStorage):
         :param segment: Segment to store.
         :type segment: splitio.models.segment.Segment
         """
-        async with self._lock:
-            self._segments[segment.name] = segment
+        async with self._update_lock:
+            async with self._lock:
+                self._segments[segment.name] = segment
 
     async def update(self, segment_name, to_add, to_remove, change_number=None):
         """
         Update a feature flag. Create it if it doesn't exist.
 
+        Keys are applied in slices without holding the storage lock between them, so readers aren't
+        stalled by a large update. Each slice runs without yielding to the loop, and the change number
+        is only bumped once every slice is in.
+
         :param segment_name: Name of the segment to update.
         :type segment_name: str
         :param to_add: Set of members to add to the segment.
@@ -821,14 +861,23 @@ class InMemorySegmentStorageAsync(SegmentStorage):
         :param to_remove: List of members to remove from the segment.
         :type to_remove: Set
         """
-        async with self._lock:
-            if segment_name not in self._segments:
-                self._segments[segment_name] = Segment(segment_name, to_add, change_number)
+        # serializes writers, so concurrent updates of a segment are applied one after the other.
+        async with self._update_lock:
+            async with self._lock:
+                segment = self._segments.get(segment_name)
+
+            if segment is None:
+                segment = Segment(segment_name, [], change_number)
+                await self._offloader.apply_in_slices(lambda keys: segment.update(keys, []), to_add)
+                async with self._lock:
+                    self._segments[segment_name] = segment
                 return
 
-            self._segments[segment_name].update(to_add, to_remove)
+            await self._offloader.apply_in_slices(lambda keys: segment.update(keys, []), to_add)
+            await self._offloader.apply_in_slices(lambda keys: segment.update([], keys), to_remove)
             if change_number is not None:
-                self._segments[segment_name].change_number = change_number
+                async with self._lock:
+                    segment.change_number = change_number
 
     async def get_change_number(self, segment_name):
         """
@@ -859,6 +908,20 @@ class InMemorySegmentStorageAsync(SegmentStorage):
                 return
             self._segments[segment_name].change_number = new_change_number
 
+    async def segment_contains_many(self, segment_names, key):
+        """
+        Check whether a specific key belongs to each one of the given segments.
+
+        :param segment_names: Names of the segments to search in.
+        :type segment_names: list(str)
+        :param key: Key to search for.
+        :type key: str
+
+        :return: Membership of the key for each segment.
+        :rtype: dict(str, bool)
+        """
+        return {segment_name: await self.segment_contains(segment_name, key) for segment_name in segment_names}
+
     async def segment_contains(self, segment_name, key):
         """
         Check whether a specific key belongs to a segment in storage.
@@ -910,11 +973,25 @@ class InMemoryImpressionStorageBase(ImpressionStorage):
         """
         Set a hook to be called when the queue is full.
 
+        The hook is also called once when the queue reaches its high-water mark, so that it's
+        flushed before impressions are dropped.
+
         :param h: Hook to be called when the queue is full
         """
         if callable(hook):
             self._queue_full_hook = hook
 
+    def _reached_high_water(self):
+        """
+        Return whether the queue just reached its high-water mark, only once until it's popped.
+
+        :rtype: bool
+        """
+        if self._flush_requested or self._impressions.qsize() < self._high_water:
+            return False
+        self._flush_requested = True
+        return True
+
     def put(self, impressions):
         """
         Put one or more impressions in storage.
@@ -949,6 +1026,8 @@ class InMemoryImpressionStorage(InMemoryImpressionStorageBase):
         :param eventsQueueSize: How many events to queue before forcing a submission
         """
         self._queue_size = queue_size
+        self._high_water = max(1, int(queue_size * QUEUE_HIGH_WATER_MARK))
+        self._flush_requested = False
         self._impressions = queue.Queue(maxsize=queue_size)
         self._lock = threading.Lock()
         self._queue_full_hook = None
@@ -967,7 +1046,10 @@ class InMemoryImpressionStorage(InMemoryImpressionStorageBase):
                 for impression in impressions:
                     self._impressions.put(impression, False)
                     impressions_stored += 1
+                flush = self._reached_high_water()
             self._telemetry_runtime_producer.record_impression_stats(CounterConstants.IMPRESSIONS_QUEUED, len(impressions))
+            if flush and self._queue_full_hook is not None:
+                self._queue_full_hook()
             return True
 
         except queue.Full:
@@ -993,6 +1075,7 @@ class InMemoryImpressionStorage(InMemoryImpressionStorageBase):
             while not self._impressions.empty() and count > 0:
                 impressions.append(self._impressions.get(False))
                 count -= 1
+            self._flush_requested = False
         return impressions
 
     def clear(self):
@@ -1013,6 +1096,8 @@ class InMemoryImpressionStorageAsync(InMemoryImpressionStorageBase):
         :param eventsQueueSize: How many events to queue before forcing a submission
         """
         self._queue_size = queue_size
+        self._high_water = max(1, int(queue_size * QUEUE_HIGH_WATER_MARK))
+        self._flush_requested = False
         self._impressions = asyncio.Queue(maxsize=queue_size)
         self._lock = asyncio.Lock()
         self._queue_full_hook = None
@@ -1033,7 +1118,10 @@ class InMemoryImpressionStorageAsync(InMemoryImpressionStorageBase):
                         raise asyncio.QueueFull
                     await self._impressions.put(impression)
                     impressions_stored += 1
+                flush = self._reached_high_water()
             await self._telemetry_runtime_producer.record_impression_stats(CounterConstants.IMPRESSIONS_QUEUED, len(impressions))
+            if flush and self._queue_full_hook is not None:
+                await self._queue_full_hook()
             return True
 
         except asyncio.QueueFull:
@@ -1059,6 +1147,7 @@ class InMemoryImpressionStorageAsync(InMemoryImpressionStorageBase):
             while not self._impressions.empty() and count > 0:
                 impressions.append(await self._impressions.get())
                 count -= 1
+            self._flush_requested = False
         return impressions
 
     async def clear(self):
@@ -1078,11 +1167,27 @@ class InMemoryEventStorageBase(EventStorage):
         """
         Set a hook to be called when the queue is full.
 
+        The hook is also called once when the queue reaches its high-water mark, by count or by
+        size, so that it's flushed before events are dropped.
+
         :param h: Hook to be called when the queue is full
         """
         if callable(hook):
             self._queue_full_hook = hook
 
+    def _reached_high_water(self):
+        """
+        Return whether the queue just reached its high-water mark, only once until it's popped.
+
+        :rtype: bool
+        """
+        if self._flush_requested:
+            return False
+        if self._events.qsize() < self._high_water and self._size < MAX_SIZE_BYTES * QUEUE_HIGH_WATER_MARK:
+            return False
+        self._flush_requested = True
+        return True
+
     def put(self, events):
         """
         Add an event to storage.
@@ -1120,6 +1225,8 @@ class InMemoryEventStorage(InMemoryEventStorageBase):
         :param eventsQueueSize: How many events to queue before forcing a submission
         """
         self._queue_size = eventsQueueSize
+        self._high_water = max(1, int(eventsQueueSize * QUEUE_HIGH_WATER_MARK))
+        self._flush_requested = False
         self._lock = threading.Lock()
         self._events = queue.Queue(maxsize=eventsQueueSize)
         self._queue_full_hook = None
@@ -1144,7 +1251,10 @@ class InMemoryEventStorage(InMemoryEventStorageBase):
 
                     self._events.put(event.event, False)
                     events_stored += 1
+                flush = self._reached_high_water()
             self._telemetry_runtime_producer.record_event_stats(CounterConstants.EVENTS_QUEUED, len(events))
+            if flush and self._queue_full_hook is not None:
+                self._queue_full_hook()
             return True
 
         except queue.Full:
@@ -1169,6 +1279,7 @@ class InMemoryEventStorage(InMemoryEventStorageBase):
             while not self._events.empty() and count > 0:
                 events.append(self._events.get(False))
                 count -= 1
+            self._flush_requested = False
         self._size = 0
         return events
 
@@ -1192,6 +1303,8 @@ class InMemoryEventStorageAsync(InMemoryEventStorageBase):
         :param eventsQueueSize: How many events to queue before forcing a submission
         """
         self._queue_size = eventsQueueSize
+        self._high_water = max(1, int(eventsQueueSize * QUEUE_HIGH_WATER_MARK))
+        self._flush_requested = False
         self._lock = asyncio.Lock()
         self._events = asyncio.Queue(maxsize=eventsQueueSize)
         self._queue_full_hook = None
@@ -1218,7 +1331,10 @@ class InMemoryEventStorageAsync(InMemoryEventStorageBase):
 
                     await self._events.put(event.event)
                     events_stored += 1
+                flush = self._reached_high_water()
             await self._telemetry_runtime_producer.record_event_stats(CounterConstants.EVENTS_QUEUED, len(events))
+            if flush and self._queue_full_hook is not None:
+                await self._queue_full_hook()
             return True
 
         except asyncio.QueueFull:
@@ -1243,6 +1359,7 @@ class InMemoryEventStorageAsync(InMemoryEventStorageBase):
             while not self._events.empty() and count > 0:
                 events.append(await self._events.get())
                 count -= 1
+            self._flush_requested = False
         self._size = 0
         return events
 
@@ -1335,7 +1452,7 @@ class InMemoryTelemetryStorageBase(TelemetryStorage):
         """Record session length."""
         pass
 
-    def record_update_from_sse(self, event):
+    def record_update_from_sse(self, event, value=1):
         """Record update from sse."""
         pass
 
@@ -1457,9 +1574,9 @@ class InMemoryTelemetryStorage(InMemoryTelemetryStorageBase):
         """record non-ready usage."""
         self._tel_config.record_not_ready_usage()
 
-    def record_latency(self, method, latency):
-        """Record method latency time."""
-        self._method_latencies.add_latency(method,latency)
+    def record_latency(self, method, bucket):
+        """Record method latency bucket."""
+        self._method_latencies.add_bucket(method, bucket)
 
     def record_exception(self, method):
         """Record method exception."""
@@ -1501,9 +1618,9 @@ class InMemoryTelemetryStorage(InMemoryTelemetryStorageBase):
         """Record session length."""
         self._counters.record_session_length(session)
 
-    def record_update_from_sse(self, event):
+    def record_update_from_sse(self, event, value=1):
         """Record update from sse."""
-        self._counters.record_update_from_sse(event)
+        self._counters.record_update_from_sse(event, value)
 
     def get_bur_time_outs(self):
         """Get block until ready timeout."""
@@ -1585,7 +1702,6 @@ class InMemoryTelemetryStorageAsync(InMemoryTelemetryStorageBase):
     async def create(cls):
         """Constructor"""
         self = cls()
-        self._lock = asyncio.Lock()
         self._method_exceptions = await MethodExceptionsAsync.create()
         self._last_synchronization = await LastSynchronizationAsync.create()
         self._counters = await TelemetryCountersAsync.create()
@@ -1594,9 +1710,8 @@ class InMemoryTelemetryStorageAsync(InMemoryTelemetryStorageBase):
         self._http_latencies = await HTTPLatenciesAsync.create()
         self._streaming_events = await StreamingEventsAsync.create()
         self._tel_config = await TelemetryConfigAsync.create()
-        async with self._lock:
-            self._reset_tags()
-            self._reset_config_tags()
+        self._reset_tags()
+        self._reset_config_tags()
         return self
 
     async def record_config(self, config, extra_config, total_flag_sets, invalid_flag_sets):
@@ -1613,15 +1728,13 @@ class InMemoryTelemetryStorageAsync(InMemoryTelemetryStorageBase):
 
     async def add_tag(self, tag):
         """Record tag string."""
-        async with self._lock:
-            if len(self._tags) < MAX_TAGS:
-                self._tags.append(tag)
+        if len(self._tags) < MAX_TAGS:
+            self._tags.append(tag)
 
     async def add_config_tag(self, tag):
         """Record tag string."""
-        async with self._lock:
-            if len(self._config_tags) < MAX_TAGS:
-                self._config_tags.append(tag)
+        if len(self._config_tags) < MAX_TAGS:
+            self._config_tags.append(tag)
 
     async def record_bur_time_out(self):
         """Record block until ready timeout."""
@@ -1631,9 +1744,9 @@ class InMemoryTelemetryStorageAsync(InMemoryTelemetryStorageBase):
         """record non-ready usage."""
         await self._tel_config.record_not_ready_usage()
 
-    async def record_latency(self, method, latency):
-        """Record method latency time."""
-        await self._method_latencies.add_latency(method,latency)
+    async def record_latency(self, method, bucket):
+        """Record method latency bucket."""
+        await self._method_latencies.add_bucket(method, bucket)
 
     async def record_exception(self, method):
         """Record method exception."""
@@ -1675,9 +1788,9 @@ class InMemoryTelemetryStorageAsync(InMemoryTelemetryStorageBase):
         """Record session length."""
         await self._counters.record_session_length(session)
 
-    async def record_update_from_sse(self, event):
+    async def record_update_from_sse(self, event, value=1):
         """Record update from sse."""
-        await self._counters.record_update_from_sse(event)
+        await self._counters.record_update_from_sse(event, value)
 
     async def get_bur_time_outs(self):
         """Get block until ready timeout."""
@@ -1697,17 +1810,15 @@ class InMemoryTelemetryStorageAsync(InMemoryTelemetryStorageBase):
 
     async def pop_tags(self):
         """Get and reset tags."""
-        async with self._lock:
-            tags = self._tags
-            self._reset_tags()
-            return tags
+        tags = self._tags
+        self._reset_tags()
+        return tags
 
     async def pop_config_tags(self):
         """Get and reset tags."""
-        async with self._lock:
-            tags = self._config_tags
-            self._reset_config_tags()
-            return tags
+        tags = self._config_tags
+        self._reset_config_tags()
+        return tags
 
     async def pop_latencies(self):
         """Get and reset eval latencies."""
@@ -1834,7 +1945,7 @@ class LocalhostTelemetryStorageAsync():
         """Record session length."""
         pass
 
-    async def record_update_from_sse(self, event):
+    async def record_update_from_sse(self, event, value=1):
         """Record update from sse."""
         pass
 
@@ -3,6 +3,8 @@
 import logging
 import json
 import threading
+import inspect
+import time
 
 from splitio.optional.loaders import asyncio
 from splitio.models import splits, segments
@@ -10,17 +12,31 @@ from splitio.models.impressions import Impression
 from splitio.models.telemetry import MethodExceptions, MethodLatencies, TelemetryConfig, MAX_TAGS,\
     MethodLatenciesAsync, MethodExceptionsAsync, TelemetryConfigAsync
 from splitio.storage import FlagSetsFilter, SplitStorage, SegmentStorage, ImpressionStorage, EventStorage, TelemetryStorage
+from splitio.storage.adapters.cache_trait import LocalMemoryCache, LocalMemoryCacheAsync, DEFAULT_MAX_AGE, DEFAULT_MAX_SIZE
 from splitio.util.storage_helper import get_valid_flag_sets, combine_valid_flag_sets
 
 _LOGGER = logging.getLogger(__name__)
 
+def _adapter_supports(pluggable_adapter, method_name):
+    """
+    Return whether the pluggable adapter implements an optional batch method.
+
+    :param pluggable_adapter: Storage client or compliant interface.
+    :type pluggable_adapter: TBD
+    :param method_name: Name of the optional method.
+    :type method_name: str
+
+    :rtype: bool
+    """
+    return inspect.ismethod(getattr(pluggable_adapter, method_name, None))
+
 class PluggableSplitStorageBase(SplitStorage):
     """InMemory implementation of a feature flag storage."""
 
     _FEATURE_FLAG_NAME_LENGTH = 19
     _TILL_LENGTH = 4
 
-    def __init__(self, pluggable_adapter, prefix=None, config_flag_sets=[]):
+    def __init__(self, pluggable_adapter, prefix=None, config_flag_sets=[], max_age=DEFAULT_MAX_AGE):
         """
         Class constructor.
 
@@ -28,8 +44,14 @@ class PluggableSplitStorageBase(SplitStorage):
         :type pluggable_adapter: TBD
         :param prefix: optional, prefix to storage keys
         :type prefix: str
+        :param max_age: Seconds cached feature flags are served before checking the stored change number.
+        :type max_age: int
         """
         self._pluggable_adapter = pluggable_adapter
+        self._cache = None
+        self._cache_max_age = max_age
+        self._cached_till = None
+        self._till_checked_at = None
         self._prefix = "SPLITIO.split.{feature_flag_name}"
         self._traffic_type_prefix = "SPLITIO.trafficType.{traffic_type_name}"
         self._feature_flag_till_prefix = "SPLITIO.splits.till"
@@ -64,6 +86,22 @@ class PluggableSplitStorageBase(SplitStorage):
         """
         pass
 
+    def _till_check_due(self):
+        """Return whether cached feature flags must be validated against the stored change number."""
+        return self._till_checked_at is None or time.time() - self._till_checked_at >= self._cache_max_age
+
+    def _validate_cached_till(self, change_number):
+        """
+        Drop the cached feature flags if the stored change number moved since the last check.
+
+        :param change_number: Change number currently stored by the synchronizer.
+        :type change_number: int
+        """
+        if change_number != self._cached_till:
+            self._cache.clear()
+            self._cached_till = change_number
+        self._till_checked_at = time.time()
+
     # TODO: To be added when producer mode is supported
 #    def put_many(self, splits, change_number):
 #        """
@@ -236,7 +274,7 @@ class PluggableSplitStorageBase(SplitStorage):
 class PluggableSplitStorage(PluggableSplitStorageBase):
     """InMemory implementation of a feature flag storage."""
 
-    def __init__(self, pluggable_adapter, prefix=None, config_flag_sets=[]):
+    def __init__(self, pluggable_adapter, prefix=None, config_flag_sets=[], enable_caching=False, max_age=DEFAULT_MAX_AGE, max_size=DEFAULT_MAX_SIZE):
         """
         Class constructor.
 
@@ -244,8 +282,21 @@ class PluggableSplitStorage(PluggableSplitStorageBase):
         :type pluggable_adapter: TBD
         :param prefix: optional, prefix to storage keys
         :type prefix: str
-        """
-        PluggableSplitStorageBase.__init__(self, pluggable_adapter, prefix)
+        :param enable_caching: Whether to keep parsed feature flags in a local cache.
+        :type enable_caching: bool
+        :param max_age: Seconds cached feature flags are served before checking the stored change number.
+        :type max_age: int
+        :param max_size: Maximum number of feature flags kept in the local cache.
+        :type max_size: int
+        """
+        PluggableSplitStorageBase.__init__(self, pluggable_adapter, prefix, max_age=max_age)
+        if enable_caching:
+            self._cache = LocalMemoryCache(None, None, None, max_size)
+
+    def _validate_cache(self):
+        """Invalidate the local cache if the stored change number moved."""
+        if self._till_check_due():
+            self._validate_cached_till(self._pluggable_adapter.get(self._feature_flag_till_prefix))
 
     def get(self, feature_flag_name):
         """
@@ -257,11 +308,20 @@ class PluggableSplitStorage(PluggableSplitStorageBase):
         :rtype: splitio.models.splits.Split
         """
         try:
-            feature_flag = self._pluggable_adapter.get(self._prefix.format(feature_flag_name=feature_flag_name))
-            if not feature_flag:
+            if self._cache is not None:
+                self._validate_cache()
+                feature_flag = self._cache.get_key(feature_flag_name)
+                if feature_flag is not None:
+                    return feature_flag
+
+            raw_feature_flag = self._pluggable_adapter.get(self._prefix.format(feature_flag_name=feature_flag_name))
+            if not raw_feature_flag:
                 return None
 
-            return splits.from_raw(feature_flag)
+            feature_flag = splits.from_raw(raw_feature_flag)
+            if self._cache is not None:
+                self._cache.add_key(feature_flag_name, feature_flag)
+            return feature_flag
 
         except Exception:
             _LOGGER.error('Error getting feature flag from storage')
@@ -279,8 +339,27 @@ class PluggableSplitStorage(PluggableSplitStorageBase):
         :rtype: dict(feature_flag_name, splitio.models.splits.Split)
         """
         try:
-            prefix_added = [self._prefix.format(feature_flag_name=feature_flag_name) for feature_flag_name in feature_flag_names]
-            return {feature_flag['name']: splits.from_raw(feature_flag) for feature_flag in self._pluggable_adapter.get_many(prefix_added)}
+            if self._cache is None:
+                prefix_added = [self._prefix.format(feature_flag_name=feature_flag_name) for feature_flag_name in feature_flag_names]
+                return {feature_flag['name']: splits.from_raw(feature_flag) for feature_flag in self._pluggable_adapter.get_many(prefix_added)}
+
+            self._validate_cache()
+            to_return = {}
+            pending = []
+            for feature_flag_name in feature_flag_names:
+                feature_flag = self._cache.get_key(feature_flag_name)
+                if feature_flag is None:
+                    pending.append(feature_flag_name)
+                else:
+                    to_return[feature_flag_name] = feature_flag
+
+            if pending:
+                prefix_added = [self._prefix.format(feature_flag_name=feature_flag_name) for feature_flag_name in pending]
+                for raw_feature_flag in self._pluggable_adapter.get_many(prefix_added):
+                    feature_flag = splits.from_raw(raw_feature_flag)
+                    self._cache.add_key(feature_flag.name, feature_flag)
+                    to_return[feature_flag.name] = feature_flag
+            return to_return
 
         except Exception:
             _LOGGER.error('Error getting feature flag from storage')
@@ -401,7 +480,7 @@ class PluggableSplitStorage(PluggableSplitStorageBase):
 class PluggableSplitStorageAsync(PluggableSplitStorageBase):
     """InMemory async implementation of a feature flag storage."""
 
-    def __init__(self, pluggable_adapter, prefix=None):
+    def __init__(self, pluggable_adapter, prefix=None, enable_caching=False, max_age=DEFAULT_MAX_AGE, max_size=DEFAULT_MAX_SIZE):
         """
         Class constructor.
 
@@ -409,8 +488,21 @@ class PluggableSplitStorageAsync(PluggableSplitStorageBase):
         :type pluggable_adapter: TBD
         :param prefix: optional, prefix to storage keys
         :type prefix: str
-        """
-        PluggableSplitStorageBase.__init__(self, pluggable_adapter, prefix)
+        :param enable_caching: Whether to keep parsed feature flags in a local cache.
+        :type enable_caching: bool
+        :param max_age: Seconds cached feature flags are served before checking the stored change number.
+        :type max_age: int
+        :param max_size: Maximum number of feature flags kept in the local cache.
+        :type max_size: int
+        """
+        PluggableSplitStorageBase.__init__(self, pluggable_adapter, prefix, max_age=max_age)
+        if enable_caching:
+            self._cache = LocalMemoryCacheAsync(None, None, None, max_size)
+
+    async def _validate_cache(self):
+        """Invalidate the local cache if the stored change number moved."""
+        if self._till_check_due():
+            self._validate_cached_till(await self._pluggable_adapter.get(self._feature_flag_till_prefix))
 
     async def get(self, feature_flag_name):
         """
@@ -422,11 +514,20 @@ class PluggableSplitStorageAsync(PluggableSplitStorageBase):
         :rtype: splitio.models.splits.Split
         """
         try:
-            feature_flag = await self._pluggable_adapter.get(self._prefix.format(feature_flag_name=feature_flag_name))
-            if not feature_flag:
+            if self._cache is not None:
+                await self._validate_cache()
+                feature_flag = await self._cache.get_key(feature_flag_name)
+                if feature_flag is not None:
+                    return feature_flag
+
+            raw_feature_flag = await self._pluggable_adapter.get(self._prefix.format(feature_flag_name=feature_flag_name))
+            if not raw_feature_flag:
                 return None
 
-            return splits.from_raw(feature_flag)
+            feature_flag = splits.from_raw(raw_feature_flag)
+            if self._cache is not None:
+                await self._cache.add_key(feature_flag_name, feature_flag)
+            return feature_flag
 
         except Exception:
             _LOGGER.error('Error getting feature flag from storage')
@@ -444,8 +545,27 @@ class PluggableSplitStorageAsync(PluggableSplitStorageBase):
         :rtype: dict(split_feature_flag, splitio.models.splits.Split)
         """
         try:
-            prefix_added = [self._prefix.format(feature_flag_name=feature_flag_name) for feature_flag_name in feature_flag_names]
-            return {feature_flag['name']: splits.from_raw(feature_flag) for feature_flag in await self._pluggable_adapter.get_many(prefix_added)}
+            if self._cache is None:
+                prefix_added = [self._prefix.format(feature_flag_name=feature_flag_name) for feature_flag_name in feature_flag_names]
+                return {feature_flag['name']: splits.from_raw(feature_flag) for feature_flag in await self._pluggable_adapter.get_many(prefix_added)}
+
+            await self._validate_cache()
+            to_return = {}
+            pending = []
+            for feature_flag_name in feature_flag_names:
+                feature_flag = await self._cache.get_key(feature_flag_name)
+                if feature_flag is None:
+                    pending.append(feature_flag_name)
+                else:
+                    to_return[feature_flag_name] = feature_flag
+
+            if pending:
+                prefix_added = [self._prefix.format(feature_flag_name=feature_flag_name) for feature_flag_name in pending]
+                for raw_feature_flag in await self._pluggable_adapter.get_many(prefix_added):
+                    feature_flag = splits.from_raw(raw_feature_flag)
+                    await self._cache.add_key(feature_flag.name, feature_flag)
+                    to_return[feature_flag.name] = feature_flag
+            return to_return
 
         except Exception:
             _LOGGER.error('Error getting feature flag from storage')
@@ -568,7 +688,7 @@ class PluggableSegmentStorageBase(SegmentStorage):
     _SEGMENT_NAME_LENGTH = 14
     _TILL_LENGTH = 4
 
-    def __init__(self, pluggable_adapter, prefix=None):
+    def __init__(self, pluggable_adapter, prefix=None, max_age=DEFAULT_MAX_AGE):
         """
         Class constructor.
 
@@ -576,14 +696,68 @@ class PluggableSegmentStorageBase(SegmentStorage):
         :type pluggable_adapter: TBD
         :param prefix: optional, prefix to storage keys
         :type prefix: str
+        :param max_age: Seconds cached memberships are served before checking the segment change number.
+        :type max_age: int
         """
         self._pluggable_adapter = pluggable_adapter
+        self._item_contains_many = _adapter_supports(pluggable_adapter, 'item_contains_many')
+        self._cache = None
+        self._cache_max_age = max_age
+        self._segment_tills = {}
         self._prefix = "SPLITIO.segment.{segment_name}"
         self._segment_till_prefix = "SPLITIO.segment.{segment_name}.till"
         if prefix is not None:
             self._prefix = prefix + "." + self._prefix
             self._segment_till_prefix = prefix + "." + self._segment_till_prefix
 
+    def _till_check_due(self, segment_name):
+        """Return whether the cached change number of a segment must be read again from storage."""
+        checked = self._segment_tills.get(segment_name)
+        return checked is None or time.time() - checked[1] >= self._cache_max_age
+
+    def _partition_cached(self, segment_names, tills, cached_values):
+        """
+        Split segments between memberships still valid in the local cache and the ones to fetch.
+
+        :param segment_names: segment names
+        :type segment_names: list(str)
+        :param tills: Current change number of each segment.
+        :type tills: dict(str, int)
+        :param cached_values: Cached (change number, membership) pairs, None when missing.
+        :type cached_values: list
+
+        :return: Valid cached memberships and the segment names to fetch.
+        :rtype: tuple(dict(str, bool), list(str))
+        """
+        to_return = {}
+        pending = []
+        for segment_name, cached in zip(segment_names, cached_values):
+            if cached is not None and cached[0] == tills[segment_name]:
+                to_return[segment_name] = cached[1]
+            else:
+                pending.append(segment_name)
+        return to_return, pending
+
+    def _batch_memberships(self, segment_names, results):
+        """
+        Match the results of an `item_contains_many` call with the segments checked.
+
+        :param segment_names: segment names
+        :type segment_names: list(str)
+        :param results: Results returned by the wrapper.
+        :type results: list(bool)
+
+        :return: Membership of the key for each segment, None if there isn't one result per segment.
+        :rtype: dict(str, bool)
+        """
+        results = list(results) if results is not None else []
+        if len(results) != len(segment_names):
+            _LOGGER.warning('Pluggable adapter item_contains_many returned %d results for %d segments, '
+                            'checking them one by one', len(results), len(segment_names))
+            return None
+
+        return dict(zip(segment_names, results))
+
     def update(self, segment_name, to_add, to_remove, change_number=None):
         """
         Update a segment. Create it if it doesn't exist.
@@ -727,7 +901,7 @@ class PluggableSegmentStorageBase(SegmentStorage):
 class PluggableSegmentStorage(PluggableSegmentStorageBase):
     """Pluggable implementation of segment storage."""
 
-    def __init__(self, pluggable_adapter, prefix=None):
+    def __init__(self, pluggable_adapter, prefix=None, enable_caching=False, max_age=DEFAULT_MAX_AGE, max_size=DEFAULT_MAX_SIZE):
         """
         Class constructor.
 
@@ -735,8 +909,70 @@ class PluggableSegmentStorage(PluggableSegmentStorageBase):
         :type pluggable_adapter: TBD
         :param prefix: optional, prefix to storage keys
         :type prefix: str
+        :param enable_caching: Whether to keep segment memberships in a local cache.
+        :type enable_caching: bool
+        :param max_age: Seconds cached memberships are served before checking the segment change number.
+        :type max_age: int
+        :param max_size: Maximum number of (segment, key) memberships kept in the local cache.
+        :type max_size: int
         """
-        PluggableSegmentStorageBase.__init__(self, pluggable_adapter, prefix)
+        PluggableSegmentStorageBase.__init__(self, pluggable_adapter, prefix, max_age)
+        if enable_caching:
+            self._cache = LocalMemoryCache(None, None, None, max_size)
+
+    def _segment_till(self, segment_name):
+        """Return the stored change number of a segment, reading it at most once per max age."""
+        if self._till_check_due(segment_name):
+            change_number = self._pluggable_adapter.get(self._segment_till_prefix.format(segment_name=segment_name))
+            self._segment_tills[segment_name] = (change_number, time.time())
+        return self._segment_tills[segment_name][0]
+
+    def _fetch_contains(self, segment_names, key):
+        """
+        Fetch the membership of a key for each segment from the wrapper.
+
+        Uses a single `item_contains_many` call when the wrapper implements it, and falls back
+        to `item_contains` calls when it doesn't or its results don't match the segments.
+
+        :param segment_names: segment names
+        :type segment_names: list(str)
+        :param key: key
+        :type key: str
+
+        :return: Membership of the key for each segment.
+        :rtype: dict(str, bool)
+        """
+        keys = [self._prefix.format(segment_name=segment_name) for segment_name in segment_names]
+        if self._item_contains_many:
+            fetched = self._batch_memberships(segment_names, self._pluggable_adapter.item_contains_many(keys, key))
+            if fetched is not None:
+                return fetched
+
+        return {segment_name: self._pluggable_adapter.item_contains(segment_key, key)
+                for segment_name, segment_key in zip(segment_names, keys)}
+
+    def _cached_contains_many(self, segment_names, key):
+        """
+        Resolve memberships from the local cache, fetching the missing or outdated ones.
+
+        :param segment_names: segment names
+        :type segment_names: list(str)
+        :param key: key
+        :type key: str
+
+        :return: Membership of the key for each segment.
+        :rtype: dict(str, bool)
+        """
+        tills = {segment_name: self._segment_till(segment_name) for segment_name in segment_names}
+        to_return, pending = self._partition_cached(segment_names, tills, [self._cache.get_key((segment_name, key)) for segment_name in segment_names])
+        if not pending:
+            return to_return
+
+        fetched = self._fetch_contains(pending, key)
+        for segment_name, contains in fetched.items():
+            self._cache.add_key((segment_name, key), (tills[segment_name], contains))
+        to_return.update(fetched)
+        return to_return
 
     def get_change_number(self, segment_name):
         """
@@ -788,6 +1024,9 @@ class PluggableSegmentStorage(PluggableSegmentStorageBase):
         :rtype: bool
         """
         try:
+            if self._cache is not None:
+                return self._cached_contains_many([segment_name], key)[segment_name]
+
             return self._pluggable_adapter.item_contains(self._prefix.format(segment_name=segment_name), key)
 
         except Exception:
@@ -795,6 +1034,40 @@ class PluggableSegmentStorage(PluggableSegmentStorageBase):
             _LOGGER.debug('Error: ', exc_info=True)
             return False
 
+    def segment_contains_many(self, segment_names, key):
+        """
+        Check if a key belongs to each one of the given segments.
+
+        Uses a single `item_contains_many` call when the wrapper implements it.
+
+        :param segment_names: segment names
+        :type segment_names: list(str)
+        :param key: key
+        :type key: str
+
+        :return: Membership of the key for each segment.
+        :rtype: dict(str, bool)
+        """
+        if self._cache is not None:
+            try:
+                return self._cached_contains_many(segment_names, key)
+
+            except Exception:
+                _LOGGER.error('Error checking segment key')
+                _LOGGER.debug('Error: ', exc_info=True)
+                return {segment_name: False for segment_name in segment_names}
+
+        if not self._item_contains_many:
+            return PluggableSegmentStorageBase.segment_contains_many(self, segment_names, key)
+
+        try:
+            return self._fetch_contains(segment_names, key)
+
+        except Exception:
+            _LOGGER.error('Error checking segment key')
+            _LOGGER.debug('Error: ', exc_info=True)
+            return {segment_name: False for segment_name in segment_names}
+
     def get(self, segment_name):
         """
         Get a segment
@@ -816,7 +1089,7 @@ class PluggableSegmentStorage(PluggableSegmentStorageBase):
 class PluggableSegmentStorageAsync(PluggableSegmentStorageBase):
     """Pluggable async implementation of segment storage."""
 
-    def __init__(self, pluggable_adapter, prefix=None):
+    def __init__(self, pluggable_adapter, prefix=None, enable_caching=False, max_age=DEFAULT_MAX_AGE, max_size=DEFAULT_MAX_SIZE):
         """
         Class constructor.
 
@@ -824,8 +1097,71 @@ class PluggableSegmentStorageAsync(PluggableSegmentStorageBase):
         :type pluggable_adapter: TBD
         :param prefix: optional, prefix to storage keys
         :type prefix: str
+        :param enable_caching: Whether to keep segment memberships in a local cache.
+        :type enable_caching: bool
+        :param max_age: Seconds cached memberships are served before checking the segment change number.
+        :type max_age: int
+        :param max_size: Maximum number of (segment, key) memberships kept in the local cache.
+        :type max_size: int
+        """
+        PluggableSegmentStorageBase.__init__(self, pluggable_adapter, prefix, max_age)
+        if enable_caching:
+            self._cache = LocalMemoryCacheAsync(None, None, None, max_size)
+
+    async def _segment_till(self, segment_name):
+        """Return the stored change number of a segment, reading it at most once per max age."""
+        if self._till_check_due(segment_name):
+            change_number = await self._pluggable_adapter.get(self._segment_till_prefix.format(segment_name=segment_name))
+            self._segment_tills[segment_name] = (change_number, time.time())
+        return self._segment_tills[segment_name][0]
+
+    async def _fetch_contains(self, segment_names, key):
+        """
+        Fetch the membership of a key for each segment from the wrapper.
+
+        Uses a single `item_contains_many` call when the wrapper implements it, and issues the
+        `item_contains` calls concurrently when it doesn't or its results don't match the segments.
+
+        :param segment_names: segment names
+        :type segment_names: list(str)
+        :param key: key
+        :type key: str
+
+        :return: Membership of the key for each segment.
+        :rtype: dict(str, bool)
+        """
+        keys = [self._prefix.format(segment_name=segment_name) for segment_name in segment_names]
+        if self._item_contains_many:
+            fetched = self._batch_memberships(segment_names, await self._pluggable_adapter.item_contains_many(keys, key))
+            if fetched is not None:
+                return fetched
+
+        return dict(zip(segment_names, await asyncio.gather(*[
+            self._pluggable_adapter.item_contains(segment_key, key) for segment_key in keys
+        ])))
+
+    async def _cached_contains_many(self, segment_names, key):
         """
-        PluggableSegmentStorageBase.__init__(self, pluggable_adapter, prefix)
+        Resolve memberships from the local cache, fetching the missing or outdated ones.
+
+        :param segment_names: segment names
+        :type segment_names: list(str)
+        :param key: key
+        :type key: str
+
+        :return: Membership of the key for each segment.
+        :rtype: dict(str, bool)
+        """
+        tills = {segment_name: await self._segment_till(segment_name) for segment_name in segment_names}
+        to_return, pending = self._partition_cached(segment_names, tills, [await self._cache.get_key((segment_name, key)) for segment_name in segment_names])
+        if not pending:
+            return to_return
+
+        fetched = await self._fetch_contains(pending, key)
+        for segment_name, contains in fetched.items():
+            await self._cache.add_key((segment_name, key), (tills[segment_name], contains))
+        to_return.update(fetched)
+        return to_return
 
     async def get_change_number(self, segment_name):
         """
@@ -877,6 +1213,9 @@ class PluggableSegmentStorageAsync(PluggableSegmentStorageBase):
         :rtype: bool
         """
         try:
+            if self._cache is not None:
+                return (await self._cached_contains_many([segment_name], key))[segment_name]
+
             return await self._pluggable_adapter.item_contains(self._prefix.format(segment_name=segment_name), key)
 
         except Exception:
@@ -884,6 +1223,43 @@ class PluggableSegmentStorageAsync(PluggableSegmentStorageBase):
             _LOGGER.debug('Error: ', exc_info=True)
             return None
 
+    async def segment_contains_many(self, segment_names, key):
+        """
+        Check if a key belongs to each one of the given segments.
+
+        Uses a single `item_contains_many` call when the wrapper implements it,
+        otherwise the `item_contains` calls are issued concurrently.
+
+        :param segment_names: segment names
+        :type segment_names: list(str)
+        :param key: key
+        :type key: str
+
+        :return: Membership of the key for each segment.
+        :rtype: dict(str, bool)
+        """
+        if self._cache is not None:
+            try:
+                return await self._cached_contains_many(segment_names, key)
+
+            except Exception:
+                _LOGGER.error('Error checking segment key')
+                _LOGGER.debug('Error: ', exc_info=True)
+                return {segment_name: False for segment_name in segment_names}
+
+        if not self._item_contains_many:
+            return dict(zip(segment_names, await asyncio.gather(*[
+                self.segment_contains(segment_name, key) for segment_name in segment_names
+            ])))
+
+        try:
+            return await self._fetch_contains(segment_names, key)
+
+        except Exception:
+            _LOGGER.error('Error checking segment key')
+            _LOGGER.debug('Error: ', exc_info=True)
+            return {segment_name: False for segment_name in segment_names}
+
     async def get(self, segment_name):
         """
         Get a segment
@@ -1,8 +1,10 @@
 """Redis storage module."""
+import abc
 import json
 import logging
 import threading
 
+from splitio.optional.loaders import asyncio
 from splitio.models.impressions import Impression
 from splitio.models import splits, segments
 from splitio.models.telemetry import TelemetryConfig, TelemetryConfigAsync
@@ -342,6 +344,18 @@ class RedisSplitStorageAsync(RedisSplitStorage):
             self._traffic_type_cache = LocalMemoryCacheAsync(None, None, max_age)
 
 
+    async def _fetch_raw_feature_flag(self, feature_flag_name):
+        """
+        Read a raw feature flag from redis.
+        :param feature_flag_name: Name of the feature to fetch.
+        :type feature_flag_name: str
+        :rtype: str
+        """
+        raw_feature_flags = await self.redis.get(self._get_key(feature_flag_name))
+        _LOGGER.debug("Fetchting feature flag [%s] from redis" % feature_flag_name)
+        _LOGGER.debug(raw_feature_flags)
+        return raw_feature_flags
+
     async def get(self, feature_flag_name):  # pylint: disable=method-hidden
         """
         Retrieve a feature flag.
@@ -357,15 +371,11 @@ class RedisSplitStorageAsync(RedisSplitStorage):
         :type change_number: int
         """
         try:
-            raw_feature_flags = None
             if self._enable_caching:
-                raw_feature_flags = await self._feature_flag_cache.get_key(feature_flag_name)
-            if raw_feature_flags is None:
-                raw_feature_flags = await self.redis.get(self._get_key(feature_flag_name))
-                if self._enable_caching:
-                    await self._feature_flag_cache.add_key(feature_flag_name, raw_feature_flags)
-                _LOGGER.debug("Fetchting feature flag [%s] from redis" % feature_flag_name)
-                _LOGGER.debug(raw_feature_flags)
+                raw_feature_flags = await self._feature_flag_cache.get_or_load(
+                    feature_flag_name, lambda: self._fetch_raw_feature_flag(feature_flag_name))
+            else:
+                raw_feature_flags = await self._fetch_raw_feature_flag(feature_flag_name)
             return splits.from_raw(json.loads(raw_feature_flags)) if raw_feature_flags is not None else None
 
         except RedisAdapterException:
@@ -409,13 +419,11 @@ class RedisSplitStorageAsync(RedisSplitStorage):
         """
         to_return = dict()
         try:
-            raw_feature_flags = None
+            fetch = lambda: self.redis.mget([self._get_key(feature_flag_name) for feature_flag_name in feature_flag_names])
             if self._enable_caching:
-                raw_feature_flags = await self._feature_flag_cache.get_key(frozenset(feature_flag_names))
-            if raw_feature_flags is None:
-                raw_feature_flags = await self.redis.mget([self._get_key(feature_flag_name) for feature_flag_name in feature_flag_names])
-                if self._enable_caching:
-                    await self._feature_flag_cache.add_key(frozenset(feature_flag_names), raw_feature_flags)
+                raw_feature_flags = await self._feature_flag_cache.get_or_load(frozenset(feature_flag_names), fetch)
+            else:
+                raw_feature_flags = await fetch()
             for i in range(len(feature_flag_names)):
                 feature_flag = None
                 try:
@@ -438,13 +446,11 @@ class RedisSplitStorageAsync(RedisSplitStorage):
         :rtype: bool
         """
         try:
-            raw_traffic_type = None
+            fetch = lambda: self.redis.get(self._get_traffic_type_key(traffic_type_name))
             if self._enable_caching:
-                raw_traffic_type = await self._traffic_type_cache.get_key(traffic_type_name)
-            if raw_traffic_type is None:
-                raw_traffic_type = await self.redis.get(self._get_traffic_type_key(traffic_type_name))
-                if self._enable_caching:
-                    await self._traffic_type_cache.add_key(traffic_type_name, raw_traffic_type)
+                raw_traffic_type = await self._traffic_type_cache.get_or_load(traffic_type_name, fetch)
+            else:
+                raw_traffic_type = await fetch()
             count = json.loads(raw_traffic_type) if raw_traffic_type else 0
             return count > 0
 
@@ -756,6 +762,23 @@ class RedisSegmentStorageAsync(RedisSegmentStorageBase):
             _LOGGER.debug('Error: ', exc_info=True)
             return None
 
+    async def segment_contains_many(self, segment_names, key):
+        """
+        Check whether a specific key belongs to each one of the given segments.
+
+        :param segment_names: Names of the segments to search in.
+        :type segment_names: list(str)
+        :param key: Key to search for.
+        :type key: str
+
+        :return: Membership of the key for each segment.
+        :rtype: dict(str, bool)
+        """
+        memberships = await asyncio.gather(*[
+            self.segment_contains(segment_name, key) for segment_name in segment_names
+        ])
+        return dict(zip(segment_names, memberships))
+
     async def segment_contains(self, segment_name, key):
         """
         Check whether a specific key belongs to a segment in storage.
@@ -779,6 +802,203 @@ class RedisSegmentStorageAsync(RedisSegmentStorageBase):
             return None
 
 
+class RedisEvaluationStorageBase(object, metaclass=abc.ABCMeta):
+    """
+    Redis based storage base that fetches all the data needed by an evaluation in one call.
+
+    A lua script walks the dependency chain of the requested feature flags and checks
+    segment memberships server-side, so the whole evaluation context is retrieved
+    in a single round trip instead of one mget per dependency level plus one
+    sismember per segment.
+
+    The script reads keys it only finds out about as it goes, which can't be declared
+    upfront, so it must only be used against a standalone redis (or sentinel master),
+    never a cluster. It's registered once and run with EVALSHA.
+    """
+
+    _EVALUATION_DATA_SCRIPT = """
+local flag_key_prefix = KEYS[1]
+local segment_key_prefix = KEYS[2]
+local key = ARGV[1]
+local flags = {}
+local memberships = {}
+local visited = {}
+local segments = {}
+local pending = {}
+for i = 2, #ARGV do
+    pending[#pending + 1] = ARGV[i]
+end
+while #pending > 0 do
+    local name = table.remove(pending)
+    if not visited[name] then
+        visited[name] = true
+        local raw = redis.call('GET', flag_key_prefix .. name)
+        if raw then
+            flags[#flags + 1] = name
+            flags[#flags + 1] = raw
+            local ok, flag = pcall(cjson.decode, raw)
+            if ok and type(flag) == 'table' and type(flag['conditions']) == 'table' then
+                for _, condition in ipairs(flag['conditions']) do
+                    local group = type(condition) == 'table' and condition['matcherGroup']
+                    if type(group) == 'table' and type(group['matchers']) == 'table' then
+                        for _, matcher in ipairs(group['matchers']) do
+                            if type(matcher) == 'table' then
+                                local segment_data = matcher['userDefinedSegmentMatcherData']
+                                local dependency_data = matcher['dependencyMatcherData']
+                                if matcher['matcherType'] == 'IN_SEGMENT' and type(segment_data) == 'table'
+                                        and type(segment_data['segmentName']) == 'string' then
+                                    segments[segment_data['segmentName']] = true
+                                elseif matcher['matcherType'] == 'IN_SPLIT_TREATMENT' and type(dependency_data) == 'table'
+                                        and type(dependency_data['split']) == 'string' then
+                                    pending[#pending + 1] = dependency_data['split']
+                                end
+                            end
+                        end
+                    end
+                end
+            end
+        end
+    end
+end
+for segment_name, _ in pairs(segments) do
+    memberships[#memberships + 1] = segment_name
+    memberships[#memberships + 1] = redis.call('SISMEMBER', segment_key_prefix .. segment_name, key)
+end
+return {flags, memberships}
+"""
+
+    _FEATURE_FLAG_KEY_PREFIX = RedisSplitStorageBase._FEATURE_FLAG_KEY.format(feature_flag_name='')
+    _SEGMENT_KEY_PREFIX = RedisSegmentStorageBase._SEGMENTS_KEY.format(segment_name='')
+
+    def _build_script_call(self, key, feature_flag_names):
+        """
+        Build the arguments for the evaluation data script.
+
+        :param key: Matching key.
+        :type key: str
+        :param feature_flag_names: Names of the features to fetch.
+        :type feature_flag_names: list(str)
+
+        :return: Positional arguments for the registered script call.
+        :rtype: list
+        """
+        return [2, self._FEATURE_FLAG_KEY_PREFIX, self._SEGMENT_KEY_PREFIX, key] + list(feature_flag_names)
+
+    def _parse_script_result(self, result):
+        """
+        Parse the raw script response into feature flags and segment memberships.
+
+        :param result: Script response as a pair of flattened name/value lists.
+        :type result: list
+
+        :return: Feature flags and segment memberships.
+        :rtype: tuple(dict(str, splitio.models.splits.Split), dict(str, bool))
+        """
+        raw_flags, raw_memberships = result
+        feature_flags = {}
+        for name, raw in zip(raw_flags[::2], raw_flags[1::2]):
+            name = name.decode('utf-8') if isinstance(name, bytes) else name
+            try:
+                feature_flags[name] = splits.from_raw(json.loads(raw))
+            except (ValueError, TypeError):
+                _LOGGER.error('Could not parse feature flag.')
+                _LOGGER.debug("Raw feature flag that failed parsing attempt: %s", raw)
+
+        memberships = {}
+        for name, member in zip(raw_memberships[::2], raw_memberships[1::2]):
+            name = name.decode('utf-8') if isinstance(name, bytes) else name
+            memberships[name] = bool(member)
+
+        return feature_flags, memberships
+
+    @abc.abstractmethod
+    def fetch_evaluation_data(self, key, feature_flag_names):
+        """
+        Retrieve feature flags, their dependencies and the key's segment memberships.
+
+        :param key: Matching key.
+        :type key: str
+        :param feature_flag_names: Names of the features to fetch.
+        :type feature_flag_names: list(str)
+
+        :return: Feature flags and segment memberships, None if the script could not be run.
+        :rtype: tuple(dict(str, splitio.models.splits.Split), dict(str, bool))
+        """
+        pass
+
+
+class RedisEvaluationStorage(RedisEvaluationStorageBase):
+    """Redis based evaluation data storage class."""
+
+    def __init__(self, redis_client):
+        """
+        Class constructor.
+
+        :param redis_client: Redis client or compliant interface.
+        :type redis_client: splitio.storage.adapters.redis.RedisAdapter
+        """
+        self._redis = redis_client
+        self._script = redis_client.register_script(self._EVALUATION_DATA_SCRIPT)
+
+    def fetch_evaluation_data(self, key, feature_flag_names):
+        """
+        Retrieve feature flags, their dependencies and the key's segment memberships.
+
+        :param key: Matching key.
+        :type key: str
+        :param feature_flag_names: Names of the features to fetch.
+        :type feature_flag_names: list(str)
+
+        :return: Feature flags and segment memberships, None if the script could not be run.
+        :rtype: tuple(dict(str, splitio.models.splits.Split), dict(str, bool))
+        """
+        try:
+            result = self._script(*self._build_script_call(key, feature_flag_names))
+            _LOGGER.debug("Fetching evaluation data for features [%s] from redis" % feature_flag_names)
+            return self._parse_script_result(result)
+
+        except (RedisAdapterException, ValueError):
+            _LOGGER.error('Error fetching evaluation data from storage')
+            _LOGGER.debug('Error: ', exc_info=True)
+            return None
+
+
+class RedisEvaluationStorageAsync(RedisEvaluationStorageBase):
+    """Redis based evaluation data storage async class."""
+
+    def __init__(self, redis_client):
+        """
+        Class constructor.
+
+        :param redis_client: Redis client or compliant interface.
+        :type redis_client: splitio.storage.adapters.redis.RedisAdapterAsync
+        """
+        self._redis = redis_client
+        self._script = redis_client.register_script(self._EVALUATION_DATA_SCRIPT)
+
+    async def fetch_evaluation_data(self, key, feature_flag_names):
+        """
+        Retrieve feature flags, their dependencies and the key's segment memberships.
+
+        :param key: Matching key.
+        :type key: str
+        :param feature_flag_names: Names of the features to fetch.
+        :type feature_flag_names: list(str)
+
+        :return: Feature flags and segment memberships, None if the script could not be run.
+        :rtype: tuple(dict(str, splitio.models.splits.Split), dict(str, bool))
+        """
+        try:
+            result = await self._script(*self._build_script_call(key, feature_flag_names))
+            _LOGGER.debug("Fetching evaluation data for features [%s] from redis" % feature_flag_names)
+            return self._parse_script_result(result)
+
+        except (RedisAdapterException, ValueError):
+            _LOGGER.error('Error fetching evaluation data from storage')
+            _LOGGER.debug('Error: ', exc_info=True)
+            return None
+
+
 class RedisImpressionsStorageBase(ImpressionStorage, ImpressionPipelinedStorage):
     """Redis based event storage base class."""
 
@@ -0,0 +1,365 @@
+"""Storage snapshot module, used to warm start in-memory storages after a restart."""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+from splitio.optional.loaders import asyncio
+from splitio.models import splits, segments
+
+_LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+class SnapshotException(Exception):
+    """Exception raised when a snapshot file can't be used."""
+
+    pass
+
+
+class StorageSnapshotBase(object):
+    """
+    Snapshot of feature flags, segments and their change numbers stored in a local file.
+
+    The file holds a header line followed by the payload:
+
+    {"version": 1, "checksum": <sha256 of payload>, "sdkKey": <sha256 of sdk key>, "flagSets": [...], "createdAt": <ms>}
+    {"splits": {"till": <change number>, "items": [...]}, "segments": [{"name": ..., "till": ..., "keys": [...]}]}
+    """
+
+    def __init__(self, file_path, sdk_key, flag_sets=None, max_age=None):
+        """
+        Class constructor.
+
+        :param file_path: Path of the snapshot file.
+        :type file_path: str
+        :param sdk_key: SDK key, only its hash is stored to discard snapshots of other environments.
+        :type sdk_key: str
+        :param flag_sets: Flag sets filter, snapshots taken with a different filter are discarded.
+        :type flag_sets: list(str)
+        :param max_age: Optional, seconds after which a snapshot is too old to be loaded.
+        :type max_age: int
+        """
+        self._file_path = file_path
+        self._sdk_key_hash = hashlib.sha256(sdk_key.encode('utf-8')).hexdigest()
+        self._flag_sets = sorted(flag_sets) if flag_sets else []
+        self._max_age = max_age
+        self._last_saved = None
+        self._last_loaded = None
+
+    def _serialize(self, change_number, feature_flags, segment_list):
+        """
+        Build the snapshot file content.
+
+        :param change_number: Feature flags change number.
+        :type change_number: int
+        :param feature_flags: Feature flags to persist.
+        :type feature_flags: list(splitio.models.splits.Split)
+        :param segment_list: Segments to persist.
+        :type segment_list: list(splitio.models.segments.Segment)
+
+        :rtype: bytes
+        """
+        payload = json.dumps({
+            'splits': {'till': change_number, 'items': [feature_flag.to_json() for feature_flag in feature_flags]},
+            'segments': [{'name': segment.name, 'till': segment.change_number, 'keys': list(segment.keys)} for segment in segment_list]
+        }, separators=(',', ':')).encode('utf-8')
+        header = json.dumps({
+            'version': SNAPSHOT_VERSION,
+            'checksum': hashlib.sha256(payload).hexdigest(),
+            'sdkKey': self._sdk_key_hash,
+            'flagSets': self._flag_sets,
+            'createdAt': int(time.time() * 1000)
+        }).encode('utf-8')
+        return header + b'\n' + payload
+
+    def _parse(self, content):
+        """
+        Validate the snapshot file content and return its payload.
+
+        :param content: Snapshot file content.
+        :type content: bytes
+
+        :return: Feature flags change number and items, and the raw segments.
+        :rtype: tuple(int, list(splitio.models.splits.Split), list(splitio.models.segments.Segment))
+        """
+        header, separator, payload = content.partition(b'\n')
+        if not separator:
+            raise SnapshotException('snapshot header is missing')
+
+        try:
+            header = json.loads(header)
+        except ValueError:
+            raise SnapshotException('snapshot header is corrupted')
+
+        if header.get('version') != SNAPSHOT_VERSION:
+            raise SnapshotException('unsupported snapshot version %s' % header.get('version'))
+
+        if header.get('sdkKey') != self._sdk_key_hash:
+            raise SnapshotException('snapshot was taken with a different sdk key')
+
+        if header.get('flagSets') != self._flag_sets:
+            raise SnapshotException('snapshot was taken with a different flag sets filter')
+
+        if self._max_age is not None and time.time() * 1000 - header.get('createdAt', 0) > self._max_age * 1000:
+            raise SnapshotException('snapshot is older than %d seconds' % self._max_age)
+
+        if hashlib.sha256(payload).hexdigest() != header.get('checksum'):
+            raise SnapshotException('snapshot checksum does not match')
+
+        payload = json.loads(payload)
+        return (
+            payload['splits']['till'],
+            [splits.from_raw(feature_flag) for feature_flag in payload['splits']['items']],
+            [segments.from_raw({'name': segment['name'], 'added': segment['keys'], 'removed': [], 'till': segment['till']})
+             for segment in payload['segments']]
+        )
+
+    def _read(self):
+        """
+        Read the snapshot file.
+
+        :return: File content, None if there is no snapshot.
+        :rtype: bytes
+        """
+        try:
+            with open(self._file_path, 'rb') as snapshot_file:
+                return snapshot_file.read()
+
+        except FileNotFoundError:
+            _LOGGER.debug('No storage snapshot found at %s', self._file_path)
+            return None
+
+    def _write(self, content):
+        """
+        Replace the snapshot file atomically, so readers never see a partial file.
+
+        :param content: Snapshot file content.
+        :type content: bytes
+        """
+        directory = os.path.dirname(os.path.abspath(self._file_path))
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.split-snapshot-')
+        try:
+            with os.fdopen(descriptor, 'wb') as temp_file:
+                temp_file.write(content)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, self._file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _dump(self, change_number, feature_flags, segment_list):
+        """
+        Serialize the storages content and write it to the snapshot file.
+
+        :param change_number: Feature flags change number.
+        :type change_number: int
+        :param feature_flags: Feature flags to persist.
+        :type feature_flags: list(splitio.models.splits.Split)
+        :param segment_list: Segments to persist.
+        :type segment_list: list(splitio.models.segments.Segment)
+        """
+        self._write(self._serialize(change_number, feature_flags, segment_list))
+
+    def _should_save(self, change_number, segment_tills):
+        """
+        Return whether storages changed since the last snapshot and hold synchronized data.
+
+        :param change_number: Feature flags change number.
+        :type change_number: int
+        :param segment_tills: Change number of each stored segment.
+        :type segment_tills: dict
+
+        :rtype: bool
+        """
+        if change_number is None or change_number == -1:
+            return False
+
+        state = (change_number, tuple(sorted(segment_tills.items())))
+        if state == self._last_saved:
+            return False
+
+        self._last_saved = state
+        return True
+
+
+class StorageSnapshot(StorageSnapshotBase):
+    """Storage snapshot for in-memory storages."""
+
+    def save(self, split_storage, segment_storage):
+        """
+        Persist the storages content if it changed since the last snapshot.
+
+        :param split_storage: Feature flag storage.
+        :type split_storage: splitio.storage.inmemmory.InMemorySplitStorage
+        :param segment_storage: Segment storage.
+        :type segment_storage: splitio.storage.inmemmory.InMemorySegmentStorage
+
+        :return: True if a snapshot was written.
+        :rtype: bool
+        """
+        try:
+            change_number = split_storage.get_change_number()
+            segment_tills = {}
+            for segment_name in split_storage.get_segment_names():
+                segment_till = segment_storage.get_change_number(segment_name)
+                if segment_till is not None:
+                    segment_tills[segment_name] = segment_till
+            if not self._should_save(change_number, segment_tills):
+                return False
+
+            # Copies are taken only when writing, since segments keep being updated in place.
+            segment_list = [segment for segment in (segment_storage.get_copy(segment_name) for segment_name in segment_tills)
+                            if segment is not None]
+
+            self._dump(change_number, split_storage.get_all_splits(), segment_list)
+            _LOGGER.debug('Storage snapshot written to %s', self._file_path)
+            return True
+
+        except Exception:
+            self._last_saved = None
+            _LOGGER.error('Error writing storage snapshot')
+            _LOGGER.debug('Error: ', exc_info=True)
+            return False
+
+    def load(self, split_storage, segment_storage):
+        """
+        Fill the storages with the snapshot content.
+
+        :param split_storage: Feature flag storage.
+        :type split_storage: splitio.storage.inmemmory.InMemorySplitStorage
+        :param segment_storage: Segment storage.
+        :type segment_storage: splitio.storage.inmemmory.InMemorySegmentStorage
+
+        :return: True if the storages were loaded.
+        :rtype: bool
+        """
+        try:
+            content = self._read()
+            if content is None:
+                return False
+
+            change_number, feature_flags, segment_list = self._parse(content)
+            for segment in segment_list:
+                segment_storage.put(segment)
+            names = set(feature_flag.name for feature_flag in feature_flags)
+            split_storage.update(feature_flags, [name for name in split_storage.get_split_names() if name not in names], change_number)
+            _LOGGER.debug('Storages loaded from snapshot %s at change number %s', self._file_path, change_number)
+            return True
+
+        except SnapshotException as exc:
+            _LOGGER.warning('Ignoring storage snapshot %s: %s', self._file_path, str(exc))
+            return False
+
+        except Exception:
+            _LOGGER.error('Error loading storage snapshot')
+            _LOGGER.debug('Error: ', exc_info=True)
+            return False
+
+    def load_if_changed(self, split_storage, segment_storage):
+        """
+        Fill the storages with the snapshot content if the file was replaced since the last load.
+
+        :param split_storage: Feature flag storage.
+        :type split_storage: splitio.storage.inmemmory.InMemorySplitStorage
+        :param segment_storage: Segment storage.
+        :type segment_storage: splitio.storage.inmemmory.InMemorySegmentStorage
+
+        :return: True if the storages were loaded.
+        :rtype: bool
+        """
+        try:
+            stat = os.stat(self._file_path)
+        except FileNotFoundError:
+            return False
+
+        # snapshots are written to a new file and moved in place, so every save changes the inode.
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if version == self._last_loaded or not self.load(split_storage, segment_storage):
+            return False
+
+        self._last_loaded = version
+        return True
+
+
+class StorageSnapshotAsync(StorageSnapshotBase):
+    """Storage snapshot for in-memory async storages, file access runs in the default executor."""
+
+    async def save(self, split_storage, segment_storage):
+        """
+        Persist the storages content if it changed since the last snapshot.
+
+        :param split_storage: Feature flag storage.
+        :type split_storage: splitio.storage.inmemmory.InMemorySplitStorageAsync
+        :param segment_storage: Segment storage.
+        :type segment_storage: splitio.storage.inmemmory.InMemorySegmentStorageAsync
+
+        :return: True if a snapshot was written.
+        :rtype: bool
+        """
+        try:
+            change_number = await split_storage.get_change_number()
+            segment_tills = {}
+            for segment_name in await split_storage.get_segment_names():
+                segment_till = await segment_storage.get_change_number(segment_name)
+                if segment_till is not None:
+                    segment_tills[segment_name] = segment_till
+            if not self._should_save(change_number, segment_tills):
+                return False
+
+            segment_list = []
+            for segment_name in segment_tills:
+                segment = await segment_storage.get_copy(segment_name)
+                if segment is not None:
+                    segment_list.append(segment)
+
+            # serialized in the executor too, dumping every segment key would otherwise block the loop.
+            feature_flags = await split_storage.get_all_splits()
+            await asyncio.get_running_loop().run_in_executor(None, self._dump, change_number, feature_flags, segment_list)
+            _LOGGER.debug('Storage snapshot written to %s', self._file_path)
+            return True
+
+        except Exception:
+            self._last_saved = None
+            _LOGGER.error('Error writing storage snapshot')
+            _LOGGER.debug('Error: ', exc_info=True)
+            return False
+
+    async def load(self, split_storage, segment_storage):
+        """
+        Fill the storages with the snapshot content.
+
+        :param split_storage: Feature flag storage.
+        :type split_storage: splitio.storage.inmemmory.InMemorySplitStorageAsync
+        :param segment_storage: Segment storage.
+        :type segment_storage: splitio.storage.inmemmory.InMemorySegmentStorageAsync
+
+        :return: True if the storages were loaded.
+        :rtype: bool
+        """
+        try:
+            content = await asyncio.get_running_loop().run_in_executor(None, self._read)
+            if content is None:
+                return False
+
+            change_number, feature_flags, segment_list = self._parse(content)
+            for segment in segment_list:
+                await segment_storage.put(segment)
+            names = set(feature_flag.name for feature_flag in feature_flags)
+            await split_storage.update(feature_flags, [name for name in await split_storage.get_split_names() if name not in names],
+                                       change_number)
+            _LOGGER.debug('Storages loaded from snapshot %s at change number %s', self._file_path, change_number)
+            return True
+
+        except SnapshotException as exc:
+            _LOGGER.warning('Ignoring storage snapshot %s: %s', self._file_path, str(exc))
+            return False
+
+        except Exception:
+            _LOGGER.error('Error loading storage snapshot')
+            _LOGGER.debug('Error: ', exc_info=True)
+            return False
@@ -1,8 +1,10 @@
 import logging
 import queue
+import time
 
 from splitio.api import APIException
 from splitio.optional.loaders import asyncio
+from splitio.sync.util import FlushPacer
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,16 +26,16 @@ class EventSynchronizer(object):
         self._api = events_api
         self._event_storage = storage
         self._bulk_size = bulk_size
+        self._pacer = FlushPacer(bulk_size)
         self._failed = queue.Queue()
 
-    def _get_failed(self):
-        """Return up to <BULK_SIZE> events stored in the failed eventes queue."""
+    def _get_failed(self, count):
+        """Return up to <count> events stored in the failed eventes queue."""
         events = []
-        count = 0
-        while count < self._bulk_size:
+        while count > 0:
             try:
                 events.append(self._failed.get(False))
-                count += 1
+                count -= 1
             except queue.Empty:
                 # If no more items in queue, break the loop
                 break
@@ -50,22 +52,33 @@ class EventSynchronizer(object):
             self._failed.put(event, False)
 
     def synchronize_events(self):
-        """Send events from both the failed and new queues."""
-        to_send = self._get_failed()
-        if len(to_send) < self._bulk_size:
-            # If the amount of previously failed items is less than the bulk
-            # size, try to complete with new events from storage
-            to_send.extend(self._event_storage.pop_many(self._bulk_size - len(to_send)))
-
-        if not to_send:
-            return
+        """Send events from both the failed and new queues, in as many bulks as the pacer allows."""
+        bulks = 0
+        while True:
+            bulk_size = self._pacer.bulk_size
+            to_send = self._get_failed(bulk_size)
+            if len(to_send) < bulk_size:
+                # If the amount of previously failed items is less than the bulk
+                # size, try to complete with new events from storage
+                to_send.extend(self._event_storage.pop_many(bulk_size - len(to_send)))
+
+            if not to_send:
+                return
+
+            failed = False
+            start = time.monotonic()
+            try:
+                self._api.flush_events(to_send)
+            except APIException:
+                _LOGGER.error('Exception raised while reporting events')
+                _LOGGER.debug('Exception information: ', exc_info=True)
+                self._add_to_failed_queue(to_send)
+                failed = True
 
-        try:
-            self._api.flush_events(to_send)
-        except APIException:
-            _LOGGER.error('Exception raised while reporting events')
-            _LOGGER.debug('Exception information: ', exc_info=True)
-            self._add_to_failed_queue(to_send)
+            self._pacer.sent(time.monotonic() - start, failed)
+            bulks += 1
+            if not self._pacer.keep_sending(bulks, len(to_send) == bulk_size):
+                return
 
 
 class EventSynchronizerAsync(object):
@@ -85,16 +98,16 @@ class EventSynchronizerAsync(object):
         self._api = events_api
         self._event_storage = storage
         self._bulk_size = bulk_size
+        self._pacer = FlushPacer(bulk_size)
         self._failed = asyncio.Queue()
 
-    async def _get_failed(self):
-        """Return up to <BULK_SIZE> events stored in the failed eventes queue."""
+    async def _get_failed(self, count):
+        """Return up to <count> events stored in the failed eventes queue."""
         events = []
-        count = 0
-        while count < self._bulk_size and self._failed.qsize() > 0:
+        while count > 0 and self._failed.qsize() > 0:
             try:
                 events.append(await self._failed.get())
-                count += 1
+                count -= 1
             except asyncio.QueueEmpty:
                 # If no more items in queue, break the loop
                 break
@@ -111,19 +124,30 @@ class EventSynchronizerAsync(object):
             await self._failed.put(event)
 
     async def synchronize_events(self):
-        """Send events from both the failed and new queues."""
-        to_send = await self._get_failed()
-        if len(to_send) < self._bulk_size:
-            # If the amount of previously failed items is less than the bulk
-            # size, try to complete with new events from storage
-            to_send.extend(await self._event_storage.pop_many(self._bulk_size - len(to_send)))
-
-        if not to_send:
-            return
-
-        try:
-            await self._api.flush_events(to_send)
-        except APIException:
-            _LOGGER.error('Exception raised while reporting events')
-            _LOGGER.debug('Exception information: ', exc_info=True)
-            await self._add_to_failed_queue(to_send)
+        """Send events from both the failed and new queues, in as many bulks as the pacer allows."""
+        bulks = 0
+        while True:
+            bulk_size = self._pacer.bulk_size
+            to_send = await self._get_failed(bulk_size)
+            if len(to_send) < bulk_size:
+                # If the amount of previously failed items is less than the bulk
+                # size, try to complete with new events from storage
+                to_send.extend(await self._event_storage.pop_many(bulk_size - len(to_send)))
+
+            if not to_send:
+                return
+
+            failed = False
+            start = time.monotonic()
+            try:
+                await self._api.flush_events(to_send)
+            except APIException:
+                _LOGGER.error('Exception raised while reporting events')
+                _LOGGER.debug('Exception information: ', exc_info=True)
+                await self._add_to_failed_queue(to_send)
+                failed = True
+
+            self._pacer.sent(time.monotonic() - start, failed)
+            bulks += 1
+            if not self._pacer.keep_sending(bulks, len(to_send) == bulk_size):
+                return
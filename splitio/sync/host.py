@@ -0,0 +1,399 @@
+"""
+Host-local synchronization, sharing a single sync leader between the SDK processes of a host.
+
+The process holding an exclusive lock on a file leads: it synchronizes feature flags and segments (streaming
+included), publishes its storages as a snapshot file next to the lock file and flushes the impressions and
+events forwarded by the other processes through a unix domain socket. Followers load every new snapshot and
+try to take the lock over on each refresh, so a new leader is elected when the current one exits.
+"""
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from splitio.client.input_validator import valid_properties
+from splitio.models.events import Event, EventWrapper
+from splitio.models.impressions import Impression
+from splitio.sync.synchronizer import _SYNC_ALL_NO_RETRIES
+from splitio.tasks.util.asynctask import AsyncTask
+
+_LOGGER = logging.getLogger(__name__)
+
+_FORWARD_TIMEOUT = 5
+_ACK = b'ok\n'
+_NACK = b'error\n'
+
+
+class HostLeaderLock(object):
+    """Exclusive lock on a file, held by the sync leader of the host until it releases it or exits."""
+
+    def __init__(self, lock_path):
+        """
+        Class constructor.
+
+        :param lock_path: Path of the lock file.
+        :type lock_path: str
+        """
+        self._lock_path = lock_path
+        self._lock_file = None
+
+    @property
+    def is_leader(self):
+        """Return whether this process holds the lock."""
+        return self._lock_file is not None
+
+    def acquire(self):
+        """
+        Try to take the lock without blocking.
+
+        :return: True if this process holds the lock.
+        :rtype: bool
+        """
+        if self._lock_file is not None:
+            return True
+
+        if fcntl is None:
+            _LOGGER.warning('File locks are not supported on this platform, every process will synchronize on its own.')
+            self._lock_file = False
+            return True
+
+        lock_file = open(self._lock_path, 'a+')
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._lock_file = lock_file
+        return True
+
+    def release(self):
+        """Release the lock if this process holds it."""
+        if not self._lock_file:
+            self._lock_file = None
+            return
+
+        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+        self._lock_file.close()
+        self._lock_file = None
+
+    def recreate(self):
+        """Forget a lock inherited from the parent process, which still holds it."""
+        if self._lock_file:
+            self._lock_file.close()
+        self._lock_file = None
+
+
+class _ForwardedDataHandler(socketserver.StreamRequestHandler):
+    """Handle messages with impressions or events forwarded by a follower, one json document per line."""
+
+    def handle(self):
+        """Store the items of every message received and acknowledge it."""
+        for line in self.rfile:
+            try:
+                message = json.loads(line)
+                stored = self.server.receive(message['type'], message['items'])
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.error('Error receiving data forwarded by a follower process')
+                _LOGGER.debug('Error: ', exc_info=True)
+                self.wfile.write(_NACK)
+                continue
+
+            self.wfile.write(_ACK if stored else _NACK)
+
+
+class ForwardingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix domain socket server receiving impressions and events from follower processes."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, impression_storage, event_storage):
+        """
+        Class constructor.
+
+        :param socket_path: Path of the unix domain socket.
+        :type socket_path: str
+        :param impression_storage: Storage forwarded impressions are added to.
+        :type impression_storage: splitio.storage.inmemmory.InMemoryImpressionStorage
+        :param event_storage: Storage forwarded events are added to.
+        :type event_storage: splitio.storage.inmemmory.InMemoryEventStorage
+        """
+        if os.path.exists(socket_path):
+            # left behind by a previous leader, only the lock holder gets here.
+            os.unlink(socket_path)
+        socketserver.UnixStreamServer.__init__(self, socket_path, _ForwardedDataHandler)
+        os.chmod(socket_path, 0o600)
+        self._socket_path = socket_path
+        self._impression_storage = impression_storage
+        self._event_storage = event_storage
+        self._thread = None
+
+    def receive(self, kind, items):
+        """
+        Add forwarded items to storage.
+
+        :param kind: Either `impressions` or `events`.
+        :type kind: str
+        :param items: Serialized impressions or events.
+        :type items: list(list)
+
+        :return: Whether the items were stored, False when the storage queue is full.
+        :rtype: bool
+        """
+        if kind == 'impressions':
+            return self._impression_storage.put([Impression(*item) for item in items])
+        elif kind == 'events':
+            events = [Event(*item) for item in items]
+            return self._event_storage.put([EventWrapper(event=event, size=valid_properties(event.properties)[2]) for event in events])
+        else:
+            raise ValueError('unknown forwarded data type %s' % kind)
+
+    def start(self):
+        """Start serving followers."""
+        self._thread = threading.Thread(target=self.serve_forever, name='HostSyncForwardingServer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving followers and remove the socket."""
+        self.shutdown()
+        self.server_close()
+        try:
+            os.unlink(self._socket_path)
+        except FileNotFoundError:
+            pass
+
+
+class Forwarder(object):
+    """Send impressions and events to the sync leader of the host."""
+
+    def __init__(self, socket_path, timeout=_FORWARD_TIMEOUT):
+        """
+        Class constructor.
+
+        :param socket_path: Path of the leader unix domain socket.
+        :type socket_path: str
+        :param timeout: Seconds to wait for the leader.
+        :type timeout: float
+        """
+        self._socket_path = socket_path
+        self._timeout = timeout
+
+    def send(self, kind, items):
+        """
+        Send items to the leader and wait until it stores them.
+
+        :param kind: Either `impressions` or `events`.
+        :type kind: str
+        :param items: Serialized impressions or events.
+        :type items: list(list)
+
+        :raises OSError: if the leader can't be reached or rejects the items.
+        """
+        message = json.dumps({'type': kind, 'items': items}, separators=(',', ':')).encode('utf-8') + b'\n'
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(self._timeout)
+            connection.connect(self._socket_path)
+            connection.sendall(message)
+            with connection.makefile('rb') as response:
+                if response.readline() != _ACK:
+                    raise OSError('Sync leader did not store the forwarded %s' % kind)
+
+
+class ForwardingImpressionsAPI(object):
+    """Impressions API sending impressions through the host sync leader while following it."""
+
+    def __init__(self, impressions_api, leader_lock, forwarder):
+        """
+        Class constructor.
+
+        :param impressions_api: API posting impressions to the backend.
+        :type impressions_api: splitio.api.impressions.ImpressionsAPI
+        :param leader_lock: Host leader lock.
+        :type leader_lock: splitio.sync.host.HostLeaderLock
+        :param forwarder: Forwarder to the leader.
+        :type forwarder: splitio.sync.host.Forwarder
+        """
+        self._api = impressions_api
+        self._leader_lock = leader_lock
+        self._forwarder = forwarder
+
+    def flush_impressions(self, impressions):
+        """
+        Forward impressions to the leader, or post them when leading or the leader can't be reached.
+
+        :param impressions: Impressions bulk
+        :type impressions: list
+        """
+        if not self._leader_lock.is_leader:
+            try:
+                self._forwarder.send('impressions', [list(impression) for impression in impressions])
+                return
+            except OSError:
+                _LOGGER.debug('Could not forward impressions to the sync leader, posting them', exc_info=True)
+
+        self._api.flush_impressions(impressions)
+
+    def flush_counters(self, counters):
+        """
+        Post impressions counters, already aggregated by each process.
+
+        :param counters: Impressions counters
+        :type counters: list
+        """
+        self._api.flush_counters(counters)
+
+
+class ForwardingEventsAPI(object):
+    """Events API sending events through the host sync leader while following it."""
+
+    def __init__(self, events_api, leader_lock, forwarder):
+        """
+        Class constructor.
+
+        :param events_api: API posting events to the backend.
+        :type events_api: splitio.api.events.EventsAPI
+        :param leader_lock: Host leader lock.
+        :type leader_lock: splitio.sync.host.HostLeaderLock
+        :param forwarder: Forwarder to the leader.
+        :type forwarder: splitio.sync.host.Forwarder
+        """
+        self._api = events_api
+        self._leader_lock = leader_lock
+        self._forwarder = forwarder
+
+    def flush_events(self, events):
+        """
+        Forward events to the leader, or post them when leading or the leader can't be reached.
+
+        :param events: Events bulk
+        :type events: list
+        """
+        if not self._leader_lock.is_leader:
+            try:
+                self._forwarder.send('events', [list(event) for event in events])
+                return
+            except OSError:
+                _LOGGER.debug('Could not forward events to the sync leader, posting them', exc_info=True)
+
+        self._api.flush_events(events)
+
+
+class HostSyncManager(object):  # pylint:disable=too-many-instance-attributes
+    """Synchronization manager leading or following the synchronization of the host."""
+
+    def __init__(self, ready_flag, manager, synchronizer, leader_lock, snapshot, storages, socket_path, refresh_rate):  # pylint:disable=too-many-arguments
+        """
+        Class constructor.
+
+        :param ready_flag: Flag to set when storages hold feature flags.
+        :type ready_flag: threading.Event
+        :param manager: Manager running the synchronization while leading.
+        :type manager: splitio.sync.manager.Manager
+        :param synchronizer: Synchronizer of the manager.
+        :type synchronizer: splitio.sync.synchronizer.Synchronizer
+        :param leader_lock: Host leader lock.
+        :type leader_lock: splitio.sync.host.HostLeaderLock
+        :param snapshot: Snapshot the leader publishes storages to.
+        :type snapshot: splitio.storage.snapshot.StorageSnapshot
+        :param storages: Storages of the factory.
+        :type storages: dict
+        :param socket_path: Path of the unix domain socket impressions and events are forwarded to.
+        :type socket_path: str
+        :param refresh_rate: Seconds between snapshots published, or loaded and leadership checks.
+        :type refresh_rate: int
+        """
+        self._ready_flag = ready_flag
+        self._manager = manager
+        self._synchronizer = synchronizer
+        self._leader_lock = leader_lock
+        self._snapshot = snapshot
+        self._storages = storages
+        self._socket_path = socket_path
+        self._refresh_rate = refresh_rate
+        self._max_retry_attempts = _SYNC_ALL_NO_RETRIES
+        self._server = None
+        self._task = AsyncTask(self._refresh, refresh_rate)
+
+    def recreate(self):
+        """Recreate poolers, the lock and the refresh task for forked processes."""
+        self._manager.recreate()
+        self._leader_lock.recreate()
+        self._task = AsyncTask(self._refresh, self._refresh_rate)
+
+    def start(self, max_retry_attempts=_SYNC_ALL_NO_RETRIES):
+        """Lead the host synchronization if no other process does, follow the leader otherwise."""
+        # the factory replaces the ready flag after a fork.
+        self._manager._ready_flag = self._ready_flag
+        self._max_retry_attempts = max_retry_attempts
+        if self._leader_lock.acquire():
+            self._lead(True)
+        else:
+            _LOGGER.info('Following the synchronization of another process on this host')
+            self._follow()
+            self._synchronizer.start_periodic_data_recording()
+        self._task.start()
+
+    def stop(self, blocking):
+        """
+        Stop synchronizing, flushing the impressions and events stored.
+
+        :param blocking: flag to wait until tasks are stopped
+        :type blocking: bool
+        """
+        self._task.stop()
+        if not self._leader_lock.is_leader:
+            self._synchronizer.shutdown(blocking)
+            return
+
+        if self._server is not None:
+            self._server.stop()
+            self._server = None
+        self._manager.stop(blocking)
+        self._leader_lock.release()
+
+    def _lead(self, start_data_recording):
+        """
+        Start synchronizing and serving followers.
+
+        :param start_data_recording: Whether impressions and events tasks need to be started.
+        :type start_data_recording: bool
+        """
+        _LOGGER.info('Leading the synchronization of this host')
+        try:
+            self._server = ForwardingServer(self._socket_path, self._storages['impressions'], self._storages['events'])
+            self._server.start()
+        except OSError:
+            _LOGGER.error('Error listening for impressions and events of follower processes')
+            _LOGGER.debug('Error: ', exc_info=True)
+
+        self._manager.start(self._max_retry_attempts, start_data_recording)
+        self._snapshot.save(self._storages['splits'], self._storages['segments'])
+
+    def _follow(self):
+        """Load the snapshot published by the leader if it changed."""
+        if self._snapshot.load_if_changed(self._storages['splits'], self._storages['segments']):
+            self._ready_flag.set()
+
+    def _refresh(self):
+        """Publish storages while leading, otherwise take over if the leader is gone or follow it."""
+        if self._leader_lock.is_leader:
+            self._snapshot.save(self._storages['splits'], self._storages['segments'])
+            return
+
+        if self._leader_lock.acquire():
+            _LOGGER.info('Sync leader of this host is gone, taking over')
+            self._lead(False)
+            return
+
+        self._follow()
@@ -1,8 +1,10 @@
 import logging
 import queue
+import time
 
 from splitio.api import APIException
 from splitio.optional.loaders import asyncio
+from splitio.sync.util import FlushPacer
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,16 +26,16 @@ class ImpressionSynchronizer(object):
         self._api = impressions_api
         self._impression_storage = storage
         self._bulk_size = bulk_size
+        self._pacer = FlushPacer(bulk_size)
         self._failed = queue.Queue()
 
-    def _get_failed(self):
-        """Return up to <BULK_SIZE> impressions stored in the failed impressions queue."""
+    def _get_failed(self, count):
+        """Return up to <count> impressions stored in the failed impressions queue."""
         imps = []
-        count = 0
-        while count < self._bulk_size:
+        while count > 0:
             try:
                 imps.append(self._failed.get(False))
-                count += 1
+                count -= 1
             except queue.Empty:
                 # If no more items in queue, break the loop
                 break
@@ -50,22 +52,33 @@ class ImpressionSynchronizer(object):
             self._failed.put(impression, False)
 
     def synchronize_impressions(self):
-        """Send impressions from both the failed and new queues."""
-        to_send = self._get_failed()
-        if len(to_send) < self._bulk_size:
-            # If the amount of previously failed items is less than the bulk
-            # size, try to complete with new impressions from storage
-            to_send.extend(self._impression_storage.pop_many(self._bulk_size - len(to_send)))
+        """Send impressions from both the failed and new queues, in as many bulks as the pacer allows."""
+        bulks = 0
+        while True:
+            bulk_size = self._pacer.bulk_size
+            to_send = self._get_failed(bulk_size)
+            if len(to_send) < bulk_size:
+                # If the amount of previously failed items is less than the bulk
+                # size, try to complete with new impressions from storage
+                to_send.extend(self._impression_storage.pop_many(bulk_size - len(to_send)))
+
+            if not to_send:
+                return
+
+            failed = False
+            start = time.monotonic()
+            try:
+                self._api.flush_impressions(to_send)
+            except APIException:
+                _LOGGER.error('Exception raised while reporting impressions')
+                _LOGGER.debug('Exception information: ', exc_info=True)
+                self._add_to_failed_queue(to_send)
+                failed = True
 
-        if not to_send:
-            return
-
-        try:
-            self._api.flush_impressions(to_send)
-        except APIException:
-            _LOGGER.error('Exception raised while reporting impressions')
-            _LOGGER.debug('Exception information: ', exc_info=True)
-            self._add_to_failed_queue(to_send)
+            self._pacer.sent(time.monotonic() - start, failed)
+            bulks += 1
+            if not self._pacer.keep_sending(bulks, len(to_send) == bulk_size):
+                return
 
 
 class ImpressionsCountSynchronizer(object):
@@ -116,16 +129,16 @@ class ImpressionSynchronizerAsync(object):
         self._api = impressions_api
         self._impression_storage = storage
         self._bulk_size = bulk_size
+        self._pacer = FlushPacer(bulk_size)
         self._failed = asyncio.Queue()
 
-    async def _get_failed(self):
-        """Return up to <BULK_SIZE> impressions stored in the failed impressions queue."""
+    async def _get_failed(self, count):
+        """Return up to <count> impressions stored in the failed impressions queue."""
         imps = []
-        count = 0
-        while count < self._bulk_size and self._failed.qsize() > 0:
+        while count > 0 and self._failed.qsize() > 0:
             try:
                 imps.append(await self._failed.get())
-                count += 1
+                count -= 1
             except asyncio.QueueEmpty:
                 # If no more items in queue, break the loop
                 break
@@ -142,22 +155,33 @@ class ImpressionSynchronizerAsync(object):
             await self._failed.put(impression)
 
     async def synchronize_impressions(self):
-        """Send impressions from both the failed and new queues."""
-        to_send = await self._get_failed()
-        if len(to_send) < self._bulk_size:
-            # If the amount of previously failed items is less than the bulk
-            # size, try to complete with new impressions from storage
-            to_send.extend(await self._impression_storage.pop_many(self._bulk_size - len(to_send)))
-
-        if not to_send:
-            return
-
-        try:
-            await self._api.flush_impressions(to_send)
-        except APIException:
-            _LOGGER.error('Exception raised while reporting impressions')
-            _LOGGER.debug('Exception information: ', exc_info=True)
-            await self._add_to_failed_queue(to_send)
+        """Send impressions from both the failed and new queues, in as many bulks as the pacer allows."""
+        bulks = 0
+        while True:
+            bulk_size = self._pacer.bulk_size
+            to_send = await self._get_failed(bulk_size)
+            if len(to_send) < bulk_size:
+                # If the amount of previously failed items is less than the bulk
+                # size, try to complete with new impressions from storage
+                to_send.extend(await self._impression_storage.pop_many(bulk_size - len(to_send)))
+
+            if not to_send:
+                return
+
+            failed = False
+            start = time.monotonic()
+            try:
+                await self._api.flush_impressions(to_send)
+            except APIException:
+                _LOGGER.error('Exception raised while reporting impressions')
+                _LOGGER.debug('Exception information: ', exc_info=True)
+                await self._add_to_failed_queue(to_send)
+                failed = True
+
+            self._pacer.sent(time.monotonic() - start, failed)
+            bulks += 1
+            if not self._pacer.keep_sending(bulks, len(to_send) == bulk_size):
+                return
 
 
 class ImpressionsCountSynchronizerAsync(object):
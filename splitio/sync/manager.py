@@ -61,12 +61,20 @@ class Manager(object):  # pylint:disable=too-many-instance-attributes
         """Recreate poolers for forked processes."""
         self._synchronizer._split_synchronizers._segment_sync.recreate()
 
-    def start(self, max_retry_attempts=_SYNC_ALL_NO_RETRIES):
-        """Start the SDK synchronization tasks."""
+    def start(self, max_retry_attempts=_SYNC_ALL_NO_RETRIES, start_data_recording=True):
+        """
+        Start the SDK synchronization tasks.
+
+        :param max_retry_attempts: Attempts of the initial sync, unlimited by default.
+        :type max_retry_attempts: int
+        :param start_data_recording: Whether to start the impressions and events tasks too.
+        :type start_data_recording: bool
+        """
         try:
             self._synchronizer.sync_all(max_retry_attempts)
             self._ready_flag.set()
-            self._synchronizer.start_periodic_data_recording()
+            if start_data_recording:
+                self._synchronizer.start_periodic_data_recording()
             if self._streaming_enabled:
                 self._push_status_handler.start()
                 self._push.start()
@@ -1,4 +1,5 @@
 import logging
+import threading
 import time
 import json
 import os
@@ -8,9 +9,10 @@ from splitio.api.commons import FetchOptions
 from splitio.tasks.util import workerpool
 from splitio.models import segments
 from splitio.util.backoff import Backoff
+from splitio.util.concurrency import AdaptiveLimit, AdaptiveLimitAsync
+from splitio.util.offload import LoopOffloader
 from splitio.optional.loaders import asyncio, aiofiles
 from splitio.sync import util
-from splitio.optional.loaders import asyncio
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,7 +20,24 @@ _LOGGER = logging.getLogger(__name__)
 _ON_DEMAND_FETCH_BACKOFF_BASE = 10  # backoff base starting at 10 seconds
 _ON_DEMAND_FETCH_BACKOFF_MAX_WAIT = 60  # don't sleep for more than 1 minute
 _ON_DEMAND_FETCH_BACKOFF_MAX_RETRIES = 10
-_MAX_WORKERS = 10
+_MAX_WORKERS = 25
+_INITIAL_CONCURRENT_FETCHES = 10
+_THROTTLED_FETCH_RETRIES = 3
+_THROTTLED_FETCH_BACKOFF_BASE = 0.1
+_THROTTLED_FETCH_BACKOFF_MAX_WAIT = 1
+
+
+def _sha_of(segment_changes):
+    """
+    Return the sha256 of a segment file content, module level so it can run in a process pool.
+
+    :param segment_changes: Parsed segment file.
+    :type segment_changes: dict
+
+    :return: hex representation of sha256
+    :rtype: str
+    """
+    return util._get_sha(json.dumps(segment_changes))
 
 
 class SegmentSynchronizer(object):
@@ -41,6 +60,9 @@ class SegmentSynchronizer(object):
         self._segment_storage = segment_storage
         self._worker_pool = workerpool.WorkerPool(_MAX_WORKERS, self.synchronize_segment)
         self._worker_pool.start()
+        self._pending_futures = []
+        self._pending_lock = threading.Lock()
+        self._fetch_limit = AdaptiveLimit(_INITIAL_CONCURRENT_FETCHES, 1, _MAX_WORKERS)
         self._backoff = Backoff(
                                 _ON_DEMAND_FETCH_BACKOFF_BASE,
                                 _ON_DEMAND_FETCH_BACKOFF_MAX_WAIT)
@@ -52,6 +74,8 @@ class SegmentSynchronizer(object):
         """
         self._worker_pool = workerpool.WorkerPool(_MAX_WORKERS, self.synchronize_segment)
         self._worker_pool.start()
+        self._pending_futures = []
+        self._pending_lock = threading.Lock()
 
     def shutdown(self):
         """
@@ -60,9 +84,48 @@ class SegmentSynchronizer(object):
         """
         self._worker_pool.stop()
 
+    def _fetch_segment(self, segment_name, change_number, fetch_options):
+        """
+        Fetch a page of segment changes once the adaptive limit allows another concurrent request.
+
+        Throttled requests are retried a few times, once the limit has been reduced.
+
+        :param segment_name: Name of the segment to fetch.
+        :type segment_name: str
+
+        :param change_number: Last known change number of the segment.
+        :type change_number: int
+
+        :param fetch_options Fetch options for getting segment definitions.
+        :type fetch_options splitio.api.FetchOptions
+
+        :return: Segment changes.
+        :rtype: dict
+        """
+        backoff = Backoff(_THROTTLED_FETCH_BACKOFF_BASE, _THROTTLED_FETCH_BACKOFF_MAX_WAIT)
+        retries = 0
+        while True:
+            self._fetch_limit.acquire()
+            start = time.monotonic()
+            try:
+                segment_changes = self._api.fetch_segment(segment_name, change_number, fetch_options)
+            except Exception as exc:
+                throttled = self._fetch_limit.is_throttled(exc)
+                self._fetch_limit.release(throttled=throttled)
+                if not throttled or retries >= _THROTTLED_FETCH_RETRIES:
+                    raise
+
+                retries += 1
+                _LOGGER.debug('Segment %s fetch was throttled, retrying with %d concurrent fetches', segment_name, self._fetch_limit.limit)
+                time.sleep(backoff.get())
+                continue
+
+            self._fetch_limit.release(time.monotonic() - start)
+            return segment_changes
+
     def _fetch_until(self, segment_name, fetch_options, till=None):
         """
-        Hit endpoint, update storage and return when since==till.
+        Hit endpoint until since==till, then update storage with all the fetched changes at once.
 
         :param segment_name: Name of the segment to update.
         :type segment_name: str
@@ -76,35 +139,59 @@ class SegmentSynchronizer(object):
         :return: last change number
         :rtype: int
         """
-        while True:  # Fetch until since==till
-            change_number = self._segment_storage.get_change_number(segment_name)
-            if change_number is None:
-                change_number = -1
-            if till is not None and till < change_number:
-                # the passed till is less than change_number, no need to perform updates
-                return change_number
+        change_number = self._segment_storage.get_change_number(segment_name)
+        if change_number is None:
+            change_number = -1
+        if till is not None and till < change_number:
+            # the passed till is less than change_number, no need to perform updates
+            return change_number
 
+        first_fetch = change_number == -1
+        pages = 0
+        merged = None
+        while True:  # Fetch until since==till
             try:
-                segment_changes = self._api.fetch_segment(segment_name, change_number,
-                                                          fetch_options)
+                segment_changes = self._fetch_segment(segment_name, change_number, fetch_options)
             except APIException as exc:
                 _LOGGER.error('Exception raised while fetching segment %s', segment_name)
                 _LOGGER.debug('Exception information: ', exc_info=True)
+                if pages:
+                    # keep the progress made so far
+                    self._apply_segment_changes(segment_name, first_fetch, *merged, change_number)
                 raise exc
 
-            if change_number == -1:  # first time fetching the segment
-                new_segment = segments.from_raw(segment_changes)
-                self._segment_storage.put(new_segment)
-            else:
-                self._segment_storage.update(
-                    segment_name,
-                    segment_changes['added'],
-                    segment_changes['removed'],
-                    segment_changes['till']
-                )
-
+            # only the net changes are kept, so pages can be dropped as soon as they're fetched.
+            merged = segments.merge_changes(merged, segment_changes)
+            pages += 1
+            change_number = segment_changes['till']
             if segment_changes['till'] == segment_changes['since']:
-                return segment_changes['till']
+                # nothing to store when the only response has no changes
+                if first_fetch or pages > 1 or merged[0] or merged[1]:
+                    self._apply_segment_changes(segment_name, first_fetch, *merged, change_number)
+                return change_number
+
+    def _apply_segment_changes(self, segment_name, first_fetch, to_add, to_remove, change_number):
+        """
+        Store the net changes of consecutive segment changes responses as a single storage update.
+
+        :param segment_name: Name of the segment to update.
+        :type segment_name: str
+
+        :param first_fetch: Whether the segment wasn't in storage before.
+        :type first_fetch: bool
+
+        :param to_add: Net keys added by the fetched segment changes.
+        :type to_add: iterable
+        :param to_remove: Net keys removed by the fetched segment changes.
+        :type to_remove: iterable
+
+        :param change_number: Change number of the last response.
+        :type change_number: int
+        """
+        if first_fetch:
+            self._segment_storage.put(segments.from_raw({'name': segment_name, 'added': to_add, 'removed': to_remove, 'till': change_number}))
+        else:
+            self._segment_storage.update(segment_name, to_add, to_remove, change_number)
 
     def _attempt_segment_sync(self, segment_name, fetch_options, till=None):
         """
@@ -174,7 +261,8 @@ class SegmentSynchronizer(object):
         :param segment_names: Optional, array of segment names to update.
         :type segment_name: {str}
 
-        :param dont_wait: Optional, instruct the function to not wait for task completion
+        :param dont_wait: Optional, instruct the function to not wait for task completion. Otherwise it also waits
+            for segments previously submitted without waiting
         :type segment_name: boolean
 
         :return: True if no error occurs or dont_wait flag is True. False otherwise.
@@ -183,12 +271,20 @@ class SegmentSynchronizer(object):
         if segment_names is None:
             segment_names = self._feature_flag_storage.get_segment_names()
 
-        for segment_name in segment_names:
-            self._worker_pool.submit_work(segment_name)
-        if (dont_wait):
-            return True
+        futures = self._worker_pool.submit_many(segment_names)
+        with self._pending_lock:
+            self._pending_futures = [future for future in self._pending_futures if not future.done()] + futures
+            if (dont_wait):
+                return True
+
+            # Also wait for segments scheduled earlier without waiting, but not for unrelated work.
+            pending_futures, self._pending_futures = self._pending_futures, []
 
-        return not self._worker_pool.wait_for_completion()
+        if not self._worker_pool.wait_for(pending_futures):
+            return False
+
+        # synchronize_segment reports failures it handled itself with a False result.
+        return all(future.result() is not False for future in pending_futures)
 
     def segment_exist_in_storage(self, segment_name):
         """
@@ -204,7 +300,7 @@ class SegmentSynchronizer(object):
 
 
 class SegmentSynchronizerAsync(object):
-    def __init__(self, segment_api, feature_flag_storage, segment_storage):
+    def __init__(self, segment_api, feature_flag_storage, segment_storage, offloader=None):
         """
         Class constructor.
 
@@ -217,12 +313,18 @@ class SegmentSynchronizerAsync(object):
         :param segment_storage: Segment storage reference.
         :type segment_storage: splitio.storage.SegmentStorage
 
+        :param offloader: Builds large segments in slices that don't block the event loop.
+        :type offloader: splitio.util.offload.LoopOffloader
+
         """
         self._api = segment_api
         self._feature_flag_storage = feature_flag_storage
         self._segment_storage = segment_storage
+        self._offloader = offloader if offloader is not None else LoopOffloader()
         self._worker_pool = workerpool.WorkerPoolAsync(_MAX_WORKERS, self.synchronize_segment)
         self._worker_pool.start()
+        self._fetch_limit = AdaptiveLimitAsync(_INITIAL_CONCURRENT_FETCHES, 1, _MAX_WORKERS)
+        self._pending_jobs = []
         self._backoff = Backoff(
                                 _ON_DEMAND_FETCH_BACKOFF_BASE,
                                 _ON_DEMAND_FETCH_BACKOFF_MAX_WAIT)
@@ -242,9 +344,48 @@ class SegmentSynchronizerAsync(object):
         """
         await self._worker_pool.stop()
 
+    async def _fetch_segment(self, segment_name, change_number, fetch_options):
+        """
+        Fetch a page of segment changes once the adaptive limit allows another concurrent request.
+
+        Throttled requests are retried a few times, once the limit has been reduced.
+
+        :param segment_name: Name of the segment to fetch.
+        :type segment_name: str
+
+        :param change_number: Last known change number of the segment.
+        :type change_number: int
+
+        :param fetch_options Fetch options for getting segment definitions.
+        :type fetch_options splitio.api.FetchOptions
+
+        :return: Segment changes.
+        :rtype: dict
+        """
+        backoff = Backoff(_THROTTLED_FETCH_BACKOFF_BASE, _THROTTLED_FETCH_BACKOFF_MAX_WAIT)
+        retries = 0
+        while True:
+            await self._fetch_limit.acquire()
+            start = time.monotonic()
+            try:
+                segment_changes = await self._api.fetch_segment(segment_name, change_number, fetch_options)
+            except Exception as exc:
+                throttled = self._fetch_limit.is_throttled(exc)
+                await self._fetch_limit.release(throttled=throttled)
+                if not throttled or retries >= _THROTTLED_FETCH_RETRIES:
+                    raise
+
+                retries += 1
+                _LOGGER.debug('Segment %s fetch was throttled, retrying with %d concurrent fetches', segment_name, self._fetch_limit.limit)
+                await asyncio.sleep(backoff.get())
+                continue
+
+            await self._fetch_limit.release(time.monotonic() - start)
+            return segment_changes
+
     async def _fetch_until(self, segment_name, fetch_options, till=None):
         """
-        Hit endpoint, update storage and return when since==till.
+        Hit endpoint until since==till, then update storage with all the fetched changes at once.
 
         :param segment_name: Name of the segment to update.
         :type segment_name: str
@@ -258,35 +399,62 @@ class SegmentSynchronizerAsync(object):
         :return: last change number
         :rtype: int
         """
-        while True:  # Fetch until since==till
-            change_number = await self._segment_storage.get_change_number(segment_name)
-            if change_number is None:
-                change_number = -1
-            if till is not None and till < change_number:
-                # the passed till is less than change_number, no need to perform updates
-                return change_number
+        change_number = await self._segment_storage.get_change_number(segment_name)
+        if change_number is None:
+            change_number = -1
+        if till is not None and till < change_number:
+            # the passed till is less than change_number, no need to perform updates
+            return change_number
 
+        first_fetch = change_number == -1
+        pages = 0
+        merged = None
+        while True:  # Fetch until since==till
             try:
-                segment_changes = await self._api.fetch_segment(segment_name, change_number,
-                                                          fetch_options)
+                segment_changes = await self._fetch_segment(segment_name, change_number, fetch_options)
             except APIException as exc:
                 _LOGGER.error('Exception raised while fetching segment %s', segment_name)
                 _LOGGER.debug('Exception information: ', exc_info=True)
+                if pages:
+                    # keep the progress made so far
+                    await self._apply_segment_changes(segment_name, first_fetch, *merged, change_number)
                 raise exc
 
-            if change_number == -1:  # first time fetching the segment
-                new_segment = segments.from_raw(segment_changes)
-                await self._segment_storage.put(new_segment)
-            else:
-                await self._segment_storage.update(
-                    segment_name,
-                    segment_changes['added'],
-                    segment_changes['removed'],
-                    segment_changes['till']
-                )
-
+            # only the net changes are kept, so pages can be dropped as soon as they're fetched.
+            merged = segments.merge_changes(merged, segment_changes)
+            pages += 1
+            change_number = segment_changes['till']
             if segment_changes['till'] == segment_changes['since']:
-                return segment_changes['till']
+                # nothing to store when the only response has no changes
+                if first_fetch or pages > 1 or merged[0] or merged[1]:
+                    await self._apply_segment_changes(segment_name, first_fetch, *merged, change_number)
+                return change_number
+
+    async def _apply_segment_changes(self, segment_name, first_fetch, to_add, to_remove, change_number):
+        """
+        Store the net changes of consecutive segment changes responses as a single storage update.
+
+        :param segment_name: Name of the segment to update.
+        :type segment_name: str
+
+        :param first_fetch: Whether the segment wasn't in storage before.
+        :type first_fetch: bool
+
+        :param to_add: Net keys added by the fetched segment changes.
+        :type to_add: iterable
+        :param to_remove: Net keys removed by the fetched segment changes.
+        :type to_remove: iterable
+
+        :param change_number: Change number of the last response.
+        :type change_number: int
+        """
+        if first_fetch:
+            segment = segments.Segment(segment_name, [], change_number)
+            await self._offloader.apply_in_slices(lambda keys: segment.update(keys, []), to_add)
+            await self._offloader.apply_in_slices(lambda keys: segment.update([], keys), to_remove)
+            await self._segment_storage.put(segment)
+        else:
+            await self._segment_storage.update(segment_name, to_add, to_remove, change_number)
 
     async def _attempt_segment_sync(self, segment_name, fetch_options, till=None):
         """
@@ -357,7 +525,8 @@ class SegmentSynchronizerAsync(object):
         :param segment_names: Optional, array of segment names to update.
         :type segment_name: {str}
 
-        :param dont_wait: Optional, instruct the function to not wait for task completion
+        :param dont_wait: Optional, instruct the function to not wait for task completion. Otherwise it also waits
+            for segments previously submitted without waiting
         :type segment_name: boolean
 
         :return: True if no error occurs or dont_wait flag is True. False otherwise.
@@ -367,10 +536,15 @@ class SegmentSynchronizerAsync(object):
             segment_names = await self._feature_flag_storage.get_segment_names()
 
         self._jobs = await self._worker_pool.submit_work(segment_names)
+        self._pending_jobs = [job for job in self._pending_jobs if not job.is_complete()]
+        self._pending_jobs.append(self._jobs)
         if (dont_wait):
             return True
 
-        return await self._jobs.await_completion()
+        # Also wait for segments scheduled earlier without waiting, as the thread based pool does.
+        pending_jobs, self._pending_jobs = self._pending_jobs, []
+        results = [await job.await_completion() for job in pending_jobs]
+        return all(results)
 
     async def segment_exist_in_storage(self, segment_name):
         """
@@ -416,6 +590,17 @@ class LocalSegmentSynchronizerBase(object):
 
         return parsed
 
+    def _segment_path(self, segment_name):
+        """
+        Return the path of a segment file.
+
+        :param segment_name: Name of the segment
+        :type segment_name: str
+
+        :rtype: str
+        """
+        return os.path.join(self._segment_folder, "%s.json" % segment_name)
+
 
 class LocalSegmentSynchronizer(LocalSegmentSynchronizerBase):
     """Localhost mode segment synchronizer."""
@@ -438,6 +623,7 @@ class LocalSegmentSynchronizer(LocalSegmentSynchronizerBase):
         self._feature_flag_storage = feature_flag_storage
         self._segment_storage = segment_storage
         self._segment_sha = {}
+        self._segment_signature = {}
 
     def synchronize_segments(self, segment_names = None):
         """
@@ -474,14 +660,21 @@ class LocalSegmentSynchronizer(LocalSegmentSynchronizerBase):
         :rtype: bool
         """
         try:
+            # Only segment files rewritten since they were last read are parsed and hashed again.
+            signature = util._file_signature(self._segment_path(segment_name))
+            if signature is not None and signature == self._segment_signature.get(segment_name):
+                return True
+
             fetched = self._read_segment_from_json_file(segment_name)
             fetched_sha = util._get_sha(json.dumps(fetched))
             if not self.segment_exist_in_storage(segment_name):
                     self._segment_sha[segment_name] = fetched_sha
                     self._segment_storage.put(segments.from_raw(fetched))
                     _LOGGER.debug("segment %s is added to storage", segment_name)
+                    self._segment_signature[segment_name] = signature
                     return True
 
+            self._segment_signature[segment_name] = signature
             if fetched_sha == self._segment_sha[segment_name]:
                 return True
 
@@ -508,7 +701,7 @@ class LocalSegmentSynchronizer(LocalSegmentSynchronizerBase):
         :rtype: Dict
         """
         try:
-            with open(os.path.join(self._segment_folder, "%s.json" % filename), 'r') as flo:
+            with open(self._segment_path(filename), 'r') as flo:
                 parsed = json.load(flo)
             santitized_segment = self._sanitize_segment(parsed)
             return santitized_segment
@@ -531,7 +724,7 @@ class LocalSegmentSynchronizer(LocalSegmentSynchronizerBase):
 class LocalSegmentSynchronizerAsync(LocalSegmentSynchronizerBase):
     """Localhost mode segment async synchronizer."""
 
-    def __init__(self, segment_folder, feature_flag_storage, segment_storage):
+    def __init__(self, segment_folder, feature_flag_storage, segment_storage, offloader=None):
         """
         Class constructor.
 
@@ -544,11 +737,16 @@ class LocalSegmentSynchronizerAsync(LocalSegmentSynchronizerBase):
         :param segment_storage: Segment storage reference.
         :type segment_storage: splitio.storage.SegmentStorage
 
+        :param offloader: Parses and builds large segments without blocking the event loop.
+        :type offloader: splitio.util.offload.LoopOffloader
+
         """
         self._segment_folder = segment_folder
         self._feature_flag_storage = feature_flag_storage
         self._segment_storage = segment_storage
+        self._offloader = offloader if offloader is not None else LoopOffloader()
         self._segment_sha = {}
+        self._segment_signature = {}
 
     async def synchronize_segments(self, segment_names = None):
         """
@@ -585,14 +783,24 @@ class LocalSegmentSynchronizerAsync(LocalSegmentSynchronizerBase):
         :rtype: bool
         """
         try:
+            # Only segment files rewritten since they were last read are parsed and hashed again.
+            signature = util._file_signature(self._segment_path(segment_name))
+            if signature is not None and signature == self._segment_signature.get(segment_name):
+                return True
+
             fetched = await self._read_segment_from_json_file(segment_name)
-            fetched_sha = util._get_sha(json.dumps(fetched))
+            fetched_sha = await self._offloader.run(_sha_of, fetched)
             if not await self.segment_exist_in_storage(segment_name):
                     self._segment_sha[segment_name] = fetched_sha
-                    await self._segment_storage.put(segments.from_raw(fetched))
+                    segment = segments.Segment(fetched['name'], [], fetched['till'])
+                    await self._offloader.apply_in_slices(lambda keys: segment.update(keys, []), fetched['added'])
+                    await self._offloader.apply_in_slices(lambda keys: segment.update([], keys), fetched['removed'])
+                    await self._segment_storage.put(segment)
                     _LOGGER.debug("segment %s is added to storage", segment_name)
+                    self._segment_signature[segment_name] = signature
                     return True
 
+            self._segment_signature[segment_name] = signature
             if fetched_sha == self._segment_sha[segment_name]:
                 return True
 
@@ -619,8 +827,8 @@ class LocalSegmentSynchronizerAsync(LocalSegmentSynchronizerBase):
         :rtype: Dict
         """
         try:
-            async with aiofiles.open(os.path.join(self._segment_folder, "%s.json" % filename), 'r') as flo:
-                parsed = json.loads(await flo.read())
+            async with aiofiles.open(self._segment_path(filename), 'r') as flo:
+                parsed = await self._offloader.decode_json(await flo.read())
             santitized_segment = self._sanitize_segment(parsed)
             return santitized_segment
         except Exception as exc:
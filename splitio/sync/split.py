@@ -2,7 +2,6 @@
 import logging
 import re
 import itertools
-import yaml
 import time
 import json
 from enum import Enum
@@ -12,8 +11,10 @@ from splitio.api.commons import FetchOptions
 from splitio.client.input_validator import validate_flag_sets
 from splitio.models import splits
 from splitio.util.backoff import Backoff
+from splitio.util.offload import LoopOffloader
 from splitio.util.time import get_current_epoch_time_ms
-from splitio.util.storage_helper import update_feature_flag_storage, update_feature_flag_storage_async
+from splitio.util.storage_helper import update_feature_flag_storage, update_feature_flag_storage_async, \
+    sort_segments_by_references
 from splitio.sync import util
 from splitio.optional.loaders import asyncio, aiofiles
 
@@ -79,7 +80,7 @@ class SplitSynchronizer(SplitSynchronizerBase):
         """
         SplitSynchronizerBase.__init__(self, feature_flag_api, feature_flag_storage)
 
-    def _fetch_until(self, fetch_options, till=None):
+    def _fetch_until(self, fetch_options, till=None, on_segments=None):
         """
         Hit endpoint, update storage and return when since==till.
 
@@ -89,6 +90,9 @@ class SplitSynchronizer(SplitSynchronizerBase):
         :param till: Passed till from Streaming.
         :type till: int
 
+        :param on_segments: Optional, called with the segments of each page as soon as it's stored.
+        :type on_segments: callable
+
         :return: last change number
         :rtype: int
         """
@@ -114,6 +118,8 @@ class SplitSynchronizer(SplitSynchronizerBase):
                 raise exc
             fetched_feature_flags = [(splits.from_raw(feature_flag)) for feature_flag in feature_flag_changes.get('splits', [])]
             segment_list = update_feature_flag_storage(self._feature_flag_storage, fetched_feature_flags, feature_flag_changes['till'])
+            if on_segments is not None and segment_list:
+                on_segments(sort_segments_by_references(fetched_feature_flags, segment_list))
             if feature_flag_changes['till'] == feature_flag_changes['since']:
                 return feature_flag_changes['till'], segment_list
 
@@ -122,7 +128,7 @@ class SplitSynchronizer(SplitSynchronizerBase):
             if feature_flag_changes['till'] == feature_flag_changes['since']:
                 return feature_flag_changes['till'], segment_list
 
-    def _attempt_feature_flag_sync(self, fetch_options, till=None):
+    def _attempt_feature_flag_sync(self, fetch_options, till=None, on_segments=None):
         """
         Hit endpoint, update storage and return True if sync is complete.
 
@@ -132,6 +138,9 @@ class SplitSynchronizer(SplitSynchronizerBase):
         :param till: Passed till from Streaming.
         :type till: int
 
+        :param on_segments: Optional, called with the segments of each page as soon as it's stored.
+        :type on_segments: callable
+
         :return: Flags to check if it should perform bypass or operation ended
         :rtype: bool, int, int
         """
@@ -140,7 +149,7 @@ class SplitSynchronizer(SplitSynchronizerBase):
         remaining_attempts = _ON_DEMAND_FETCH_BACKOFF_MAX_RETRIES
         while True:
             remaining_attempts -= 1
-            change_number, segment_list = self._fetch_until(fetch_options, till)
+            change_number, segment_list = self._fetch_until(fetch_options, till, on_segments)
             final_segment_list.update(segment_list)
             if till is None or till <= change_number:
                 return True, remaining_attempts, change_number, final_segment_list
@@ -163,17 +172,21 @@ class SplitSynchronizer(SplitSynchronizerBase):
 
         return ','.join(self._feature_flag_storage.flag_set_filter.sorted_flag_sets)
 
-    def synchronize_splits(self, till=None):
+    def synchronize_splits(self, till=None, on_segments=None):
         """
         Hit endpoint, update storage and return True if sync is complete.
 
         :param till: Passed till from Streaming.
         :type till: int
+
+        :param on_segments: Optional, called with the segments of each page, most referenced first, as soon as
+            the page is stored so segments can be fetched while the remaining pages are.
+        :type on_segments: callable
         """
         final_segment_list = set()
         fetch_options = FetchOptions(True, sets=self._get_config_sets())  # Set Cache-Control to no-cache
         successful_sync, remaining_attempts, change_number, segment_list = self._attempt_feature_flag_sync(fetch_options,
-                                                                                      till)
+                                                                                      till, on_segments)
         final_segment_list.update(segment_list)
         attempts = _ON_DEMAND_FETCH_BACKOFF_MAX_RETRIES - remaining_attempts
         if successful_sync:  # succedeed sync
@@ -181,7 +194,7 @@ class SplitSynchronizer(SplitSynchronizerBase):
             return final_segment_list
 
         with_cdn_bypass = FetchOptions(True, change_number, sets=self._get_config_sets())  # Set flag for bypassing CDN
-        without_cdn_successful_sync, remaining_attempts, change_number, segment_list = self._attempt_feature_flag_sync(with_cdn_bypass, till)
+        without_cdn_successful_sync, remaining_attempts, change_number, segment_list = self._attempt_feature_flag_sync(with_cdn_bypass, till, on_segments)
         final_segment_list.update(segment_list)
         without_cdn_attempts = _ON_DEMAND_FETCH_BACKOFF_MAX_RETRIES - remaining_attempts
         if without_cdn_successful_sync:
@@ -220,7 +233,7 @@ class SplitSynchronizerAsync(SplitSynchronizerBase):
         """
         SplitSynchronizerBase.__init__(self, feature_flag_api, feature_flag_storage)
 
-    async def _fetch_until(self, fetch_options, till=None):
+    async def _fetch_until(self, fetch_options, till=None, on_segments=None):
         """
         Hit endpoint, update storage and return when since==till.
 
@@ -230,6 +243,9 @@ class SplitSynchronizerAsync(SplitSynchronizerBase):
         :param till: Passed till from Streaming.
         :type till: int
 
+        :param on_segments: Optional, called with the segments of each page as soon as it's stored.
+        :type on_segments: callable
+
         :return: last change number
         :rtype: int
         """
@@ -256,10 +272,12 @@ class SplitSynchronizerAsync(SplitSynchronizerBase):
 
             fetched_feature_flags = [(splits.from_raw(feature_flag)) for feature_flag in feature_flag_changes.get('splits', [])]
             segment_list = await update_feature_flag_storage_async(self._feature_flag_storage, fetched_feature_flags, feature_flag_changes['till'])
+            if on_segments is not None and segment_list:
+                await on_segments(sort_segments_by_references(fetched_feature_flags, segment_list))
             if feature_flag_changes['till'] == feature_flag_changes['since']:
                 return feature_flag_changes['till'], segment_list
 
-    async def _attempt_feature_flag_sync(self, fetch_options, till=None):
+    async def _attempt_feature_flag_sync(self, fetch_options, till=None, on_segments=None):
         """
         Hit endpoint, update storage and return True if sync is complete.
 
@@ -269,6 +287,9 @@ class SplitSynchronizerAsync(SplitSynchronizerBase):
         :param till: Passed till from Streaming.
         :type till: int
 
+        :param on_segments: Optional, called with the segments of each page as soon as it's stored.
+        :type on_segments: callable
+
         :return: Flags to check if it should perform bypass or operation ended
         :rtype: bool, int, int
         """
@@ -277,7 +298,7 @@ class SplitSynchronizerAsync(SplitSynchronizerBase):
         remaining_attempts = _ON_DEMAND_FETCH_BACKOFF_MAX_RETRIES
         while True:
             remaining_attempts -= 1
-            change_number, segment_list = await self._fetch_until(fetch_options, till)
+            change_number, segment_list = await self._fetch_until(fetch_options, till, on_segments)
             final_segment_list.update(segment_list)
             if till is None or till <= change_number:
                 return True, remaining_attempts, change_number, final_segment_list
@@ -288,17 +309,21 @@ class SplitSynchronizerAsync(SplitSynchronizerBase):
             how_long = self._backoff.get()
             await asyncio.sleep(how_long)
 
-    async def synchronize_splits(self, till=None):
+    async def synchronize_splits(self, till=None, on_segments=None):
         """
         Hit endpoint, update storage and return True if sync is complete.
 
         :param till: Passed till from Streaming.
         :type till: int
+
+        :param on_segments: Optional, called with the segments of each page, most referenced first, as soon as
+            the page is stored so segments can be fetched while the remaining pages are.
+        :type on_segments: callable
         """
         final_segment_list = set()
         fetch_options = FetchOptions(True, sets=self._get_config_sets())  # Set Cache-Control to no-cache
         successful_sync, remaining_attempts, change_number, segment_list = await self._attempt_feature_flag_sync(fetch_options,
-                                                                                      till)
+                                                                                      till, on_segments)
         final_segment_list.update(segment_list)
         attempts = _ON_DEMAND_FETCH_BACKOFF_MAX_RETRIES - remaining_attempts
         if successful_sync:  # succedeed sync
@@ -306,7 +331,7 @@ class SplitSynchronizerAsync(SplitSynchronizerBase):
             return final_segment_list
 
         with_cdn_bypass = FetchOptions(True, change_number, sets=self._get_config_sets())  # Set flag for bypassing CDN
-        without_cdn_successful_sync, remaining_attempts, change_number, segment_list = await self._attempt_feature_flag_sync(with_cdn_bypass, till)
+        without_cdn_successful_sync, remaining_attempts, change_number, segment_list = await self._attempt_feature_flag_sync(with_cdn_bypass, till, on_segments)
         final_segment_list.update(segment_list)
         without_cdn_attempts = _ON_DEMAND_FETCH_BACKOFF_MAX_RETRIES - remaining_attempts
         if without_cdn_successful_sync:
@@ -566,6 +591,7 @@ class LocalSplitSynchronizer(LocalSplitSynchronizerBase):
         self._feature_flag_storage = feature_flag_storage
         self._localhost_mode = localhost_mode
         self._current_json_sha = "-1"
+        self._current_file_signature = None
 
     @classmethod
     def _read_feature_flags_from_legacy_file(cls, filename):
@@ -613,9 +639,10 @@ class LocalSplitSynchronizer(LocalSplitSynchronizerBase):
         :return: Storage populated with feature flags ready to be evaluated.
         :rtype: InMemorySplitStorage
         """
+        import yaml  # only localhost mode with a yaml file needs it
         try:
             with open(filename, 'r') as flo:
-                parsed = yaml.load(flo.read(), Loader=yaml.FullLoader)
+                parsed = yaml.load(flo.read(), Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
 
             return cls._convert_yaml_to_feature_flag(parsed)
         except IOError as exc:
@@ -637,6 +664,9 @@ class LocalSplitSynchronizer(LocalSplitSynchronizerBase):
         :return: empty array for compatibility with json mode
         :rtype: []
         """
+        signature = util._file_signature(self._filename)
+        if signature is not None and signature == self._current_file_signature:
+            return []
 
         if self._filename.lower().endswith(('.yaml', '.yml')):
             fetched = self._read_feature_flags_from_yaml_file(self._filename)
@@ -646,6 +676,7 @@ class LocalSplitSynchronizer(LocalSplitSynchronizerBase):
                      if name not in fetched.keys()]
         to_add = [feature_flag for feature_flag in fetched.values()]
         self._feature_flag_storage.update(to_add, to_delete, 0)
+        self._current_file_signature = signature
         return []
 
     def _synchronize_json(self):
@@ -656,13 +687,20 @@ class LocalSplitSynchronizer(LocalSplitSynchronizerBase):
         :rtype: [str]
         """
         try:
+            # Only a rewritten file is read, parsed and hashed again.
+            signature = util._file_signature(self._filename)
+            if signature is not None and signature == self._current_file_signature:
+                return []
+
             fetched, till = self._read_feature_flags_from_json_file(self._filename)
             segment_list = set()
             fecthed_sha = util._get_sha(json.dumps(fetched))
             if fecthed_sha == self._current_json_sha:
+                self._current_file_signature = signature
                 return []
 
             self._current_json_sha = fecthed_sha
+            self._current_file_signature = signature
             if self._feature_flag_storage.get_change_number() > till and till != self._DEFAULT_FEATURE_FLAG_TILL:
                 return []
 
@@ -697,7 +735,7 @@ class LocalSplitSynchronizer(LocalSplitSynchronizerBase):
 class LocalSplitSynchronizerAsync(LocalSplitSynchronizerBase):
     """Localhost mode async feature_flag synchronizer."""
 
-    def __init__(self, filename, feature_flag_storage, localhost_mode=LocalhostMode.LEGACY):
+    def __init__(self, filename, feature_flag_storage, localhost_mode=LocalhostMode.LEGACY, offloader=None):
         """
         Class constructor.
 
@@ -707,11 +745,15 @@ class LocalSplitSynchronizerAsync(LocalSplitSynchronizerBase):
         :type feature_flag_storage: splitio.storage.InMemorySplitStorage
         :param localhost_mode: mode for localhost either JSON, YAML or LEGACY.
         :type localhost_mode: splitio.sync.split.LocalhostMode
+        :param offloader: Parses large files without blocking the event loop.
+        :type offloader: splitio.util.offload.LoopOffloader
         """
         self._filename = filename
         self._feature_flag_storage = feature_flag_storage
         self._localhost_mode = localhost_mode
+        self._offloader = offloader if offloader is not None else LoopOffloader()
         self._current_json_sha = "-1"
+        self._current_file_signature = None
 
     @classmethod
     async def _read_feature_flags_from_legacy_file(cls, filename):
@@ -748,8 +790,7 @@ class LocalSplitSynchronizerAsync(LocalSplitSynchronizerBase):
         except IOError as exc:
             raise ValueError("Error parsing file %s. Make sure it's readable." % filename) from exc
 
-    @classmethod
-    async def _read_feature_flags_from_yaml_file(cls, filename):
+    async def _read_feature_flags_from_yaml_file(self, filename):
         """
         Parse a feature flags file and return a populated storage.
 
@@ -759,11 +800,12 @@ class LocalSplitSynchronizerAsync(LocalSplitSynchronizerBase):
         :return: Storage populated with feature flags ready to be evaluated.
         :rtype: InMemorySplitStorage
         """
+        import yaml  # only localhost mode with a yaml file needs it
         try:
             async with aiofiles.open(filename, 'r') as flo:
-                parsed = yaml.load(await flo.read(), Loader=yaml.FullLoader)
+                parsed = await self._offloader.run(yaml.load, await flo.read(), getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
 
-            return cls._convert_yaml_to_feature_flag(parsed)
+            return self._convert_yaml_to_feature_flag(parsed)
         except IOError as exc:
             raise ValueError("Error parsing file %s. Make sure it's readable." % filename) from exc
 
@@ -783,6 +825,9 @@ class LocalSplitSynchronizerAsync(LocalSplitSynchronizerBase):
         :return: empty array for compatibility with json mode
         :rtype: []
         """
+        signature = util._file_signature(self._filename)
+        if signature is not None and signature == self._current_file_signature:
+            return []
 
         if self._filename.lower().endswith(('.yaml', '.yml')):
             fetched = await self._read_feature_flags_from_yaml_file(self._filename)
@@ -792,7 +837,7 @@ class LocalSplitSynchronizerAsync(LocalSplitSynchronizerBase):
                      if name not in fetched.keys()]
         to_add = [feature_flag for feature_flag in fetched.values()]
         await self._feature_flag_storage.update(to_add, to_delete, 0)
-
+        self._current_file_signature = signature
         return []
 
     async def _synchronize_json(self):
@@ -803,13 +848,20 @@ class LocalSplitSynchronizerAsync(LocalSplitSynchronizerBase):
         :rtype: [str]
         """
         try:
+            # Only a rewritten file is read, parsed and hashed again.
+            signature = util._file_signature(self._filename)
+            if signature is not None and signature == self._current_file_signature:
+                return []
+
             fetched, till = await self._read_feature_flags_from_json_file(self._filename)
             segment_list = set()
             fecthed_sha = util._get_sha(json.dumps(fetched))
             if fecthed_sha == self._current_json_sha:
+                self._current_file_signature = signature
                 return []
 
             self._current_json_sha = fecthed_sha
+            self._current_file_signature = signature
             if await self._feature_flag_storage.get_change_number() > till and till != self._DEFAULT_FEATURE_FLAG_TILL:
                 return []
 
@@ -833,7 +885,7 @@ class LocalSplitSynchronizerAsync(LocalSplitSynchronizerBase):
         """
         try:
             async with aiofiles.open(filename, 'r') as flo:
-                parsed = json.loads(await flo.read())
+                parsed = await self._offloader.decode_json(await flo.read())
             santitized = self._sanitize_feature_flag(parsed)
             return santitized['splits'], santitized['till']
         except Exception as exc:
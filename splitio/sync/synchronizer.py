@@ -90,7 +90,8 @@ class SplitTasks(object):
     """SplitTasks."""
 
     def __init__(self, feature_flag_task, segment_task, impressions_task, events_task,  # pylint:disable=too-many-arguments
-                 impressions_count_task, telemetry_task=None, unique_keys_task = None, clear_filter_task = None):
+                 impressions_count_task, telemetry_task=None, unique_keys_task = None, clear_filter_task = None,
+                 snapshot_task=None):
         """
         Class constructor.
 
@@ -104,6 +105,8 @@ class SplitTasks(object):
         :type events_task: splitio.tasks.events_sync.EventsSyncTask
         :param impressions_count_task: sync for impression_counts
         :type impressions_count_task: splitio.tasks.impressions_sync.ImpressionsCountSyncTask
+        :param snapshot_task: optional, task persisting storages for warm starts
+        :type snapshot_task: splitio.tasks.snapshot_sync.SnapshotSyncTask
         """
         self._feature_flag_task = feature_flag_task
         self._segment_task = segment_task
@@ -113,6 +116,7 @@ class SplitTasks(object):
         self._unique_keys_task = unique_keys_task
         self._clear_filter_task = clear_filter_task
         self._telemetry_task = telemetry_task
+        self._snapshot_task = snapshot_task
 
     @property
     def split_task(self):
@@ -154,6 +158,11 @@ class SplitTasks(object):
         """Return clear filter sync task."""
         return self._telemetry_task
 
+    @property
+    def snapshot_task(self):
+        """Return storage snapshot task."""
+        return self._snapshot_task
+
 class BaseSynchronizer(object, metaclass=abc.ABCMeta):
     """Synchronizer interface."""
 
@@ -257,6 +266,8 @@ class SynchronizerInMemoryBase(BaseSynchronizer):
             self._periodic_data_recording_tasks.append(self._split_tasks.unique_keys_task)
         if self._split_tasks.clear_filter_task:
             self._periodic_data_recording_tasks.append(self._split_tasks.clear_filter_task)
+        if self._split_tasks.snapshot_task:
+            self._periodic_data_recording_tasks.append(self._split_tasks.snapshot_task)
 
     @property
     def split_sync(self):
@@ -360,9 +371,40 @@ class Synchronizer(SynchronizerInMemoryBase):
         """
         SynchronizerInMemoryBase.__init__(self, split_synchronizers, split_tasks)
 
-    def _synchronize_segments(self):
+    def _synchronize_segments(self, scheduled_segments=None):
         _LOGGER.debug('Starting segments synchronization')
-        return self._split_synchronizers.segment_sync.synchronize_segments()
+        if not scheduled_segments:
+            return self._split_synchronizers.segment_sync.synchronize_segments()
+
+        # Segments found while fetching feature flags are already queued, refresh the rest and wait for all of them.
+        remaining_segments = [segment for segment in self._split_synchronizers.split_sync.feature_flag_storage.get_segment_names()
+                              if segment not in scheduled_segments]
+        return self._split_synchronizers.segment_sync.synchronize_segments(remaining_segments)
+
+    def _schedule_segments(self, segment_names, scheduled_segments):
+        """
+        Start fetching segments not in storage yet without waiting for them.
+
+        :param segment_names: Segment names, most referenced first.
+        :type segment_names: list(str)
+        :param scheduled_segments: Segments already scheduled, updated with the new ones.
+        :type scheduled_segments: set(str)
+        """
+        new_segments = []
+        for segment in segment_names:
+            if segment not in scheduled_segments and not self._split_synchronizers.segment_sync.segment_exist_in_storage(segment):
+                new_segments.append(segment)
+        if len(new_segments) == 0:
+            return
+
+        scheduled_segments.update(new_segments)
+        _LOGGER.debug('Synching Segments: %s', ','.join(new_segments))
+        success = self._split_synchronizers.segment_sync.synchronize_segments(new_segments, True)
+        if not success:
+            _LOGGER.error('Failed to schedule sync one or all segment(s) below.')
+            _LOGGER.error(','.join(new_segments))
+        else:
+            _LOGGER.debug('Segment sync scheduled.')
 
     def synchronize_segment(self, segment_name, till):
         """
@@ -373,6 +415,10 @@ class Synchronizer(SynchronizerInMemoryBase):
         :param till: to fetch
         :type till: int
         """
+        if segment_name not in self._split_synchronizers.split_sync.feature_flag_storage.get_segment_names():
+            _LOGGER.debug('Segment %s is not referenced by any feature flag, skipping update', segment_name)
+            return True
+
         _LOGGER.debug('Synchronizing segment %s', segment_name)
         success = self._split_synchronizers.segment_sync.synchronize_segment(segment_name, till)
         if not success:
@@ -386,23 +432,33 @@ class Synchronizer(SynchronizerInMemoryBase):
         :param till: to fetch
         :type till: int
 
+        :returns: whether the synchronization was successful or not.
+        :rtype: bool
+        """
+        return self._synchronize_splits(till, set() if sync_segments else None)
+
+    def _synchronize_splits(self, till, scheduled_segments):
+        """
+        Synchronize all feature flags, fetching new segments as soon as each page of feature flags is stored.
+
+        :param till: to fetch
+        :type till: int
+        :param scheduled_segments: Segments already scheduled, updated with the new ones. None to skip segments.
+        :type scheduled_segments: set(str)
+
         :returns: whether the synchronization was successful or not.
         :rtype: bool
         """
         _LOGGER.debug('Starting feature flags synchronization')
         try:
-            new_segments = []
-            for segment in self._split_synchronizers.split_sync.synchronize_splits(till):
-                    if not self._split_synchronizers.segment_sync.segment_exist_in_storage(segment):
-                        new_segments.append(segment)
-            if sync_segments and len(new_segments) != 0:
-                _LOGGER.debug('Synching Segments: %s', ','.join(new_segments))
-                success = self._split_synchronizers.segment_sync.synchronize_segments(new_segments, True)
-                if not success:
-                    _LOGGER.error('Failed to schedule sync one or all segment(s) below.')
-                    _LOGGER.error(','.join(new_segments))
-                else:
-                    _LOGGER.debug('Segment sync scheduled.')
+            on_segments = None
+            if scheduled_segments is not None:
+                def on_segments(segment_names):
+                    self._schedule_segments(segment_names, scheduled_segments)
+
+            segment_list = self._split_synchronizers.split_sync.synchronize_splits(till, on_segments)
+            if scheduled_segments is not None:
+                self._schedule_segments(segment_list, scheduled_segments)
             return SplitSyncResult(True, 0)
         except APIUriException as exc:
             _LOGGER.error('Failed syncing feature flags due to long URI')
@@ -424,7 +480,8 @@ class Synchronizer(SynchronizerInMemoryBase):
         retry_attempts = 0
         while True:
             try:
-                sync_result = self.synchronize_splits(None, False)
+                scheduled_segments = set()
+                sync_result = self._synchronize_splits(None, scheduled_segments)
                 if not sync_result.success and sync_result.error_code is not None and sync_result.error_code == 414:
                     _LOGGER.error("URI too long exception caught, aborting retries")
                     break
@@ -434,7 +491,7 @@ class Synchronizer(SynchronizerInMemoryBase):
 
                 # Only retrying feature flags, since segments may trigger too many calls.
 
-                if not self._synchronize_segments():
+                if not self._synchronize_segments(scheduled_segments):
                     _LOGGER.warning('Segments failed to synchronize.')
 
                 # All is good
@@ -522,9 +579,40 @@ class SynchronizerAsync(SynchronizerInMemoryBase):
         SynchronizerInMemoryBase.__init__(self, split_synchronizers, split_tasks)
         self._shutdown = False
 
-    async def _synchronize_segments(self):
+    async def _synchronize_segments(self, scheduled_segments=None):
         _LOGGER.debug('Starting segments synchronization')
-        return await self._split_synchronizers.segment_sync.synchronize_segments()
+        if not scheduled_segments:
+            return await self._split_synchronizers.segment_sync.synchronize_segments()
+
+        # Segments found while fetching feature flags are already queued, refresh the rest and wait for all of them.
+        remaining_segments = [segment for segment in (await self._split_synchronizers.split_sync.feature_flag_storage.get_segment_names())
+                              if segment not in scheduled_segments]
+        return await self._split_synchronizers.segment_sync.synchronize_segments(remaining_segments)
+
+    async def _schedule_segments(self, segment_names, scheduled_segments):
+        """
+        Start fetching segments not in storage yet without waiting for them.
+
+        :param segment_names: Segment names, most referenced first.
+        :type segment_names: list(str)
+        :param scheduled_segments: Segments already scheduled, updated with the new ones.
+        :type scheduled_segments: set(str)
+        """
+        new_segments = []
+        for segment in segment_names:
+            if segment not in scheduled_segments and not await self._split_synchronizers.segment_sync.segment_exist_in_storage(segment):
+                new_segments.append(segment)
+        if len(new_segments) == 0:
+            return
+
+        scheduled_segments.update(new_segments)
+        _LOGGER.debug('Synching Segments: %s', ','.join(new_segments))
+        success = await self._split_synchronizers.segment_sync.synchronize_segments(new_segments, True)
+        if not success:
+            _LOGGER.error('Failed to schedule sync one or all segment(s) below.')
+            _LOGGER.error(','.join(new_segments))
+        else:
+            _LOGGER.debug('Segment sync scheduled.')
 
     async def synchronize_segment(self, segment_name, till):
         """
@@ -535,6 +623,10 @@ class SynchronizerAsync(SynchronizerInMemoryBase):
         :param till: to fetch
         :type till: int
         """
+        if segment_name not in (await self._split_synchronizers.split_sync.feature_flag_storage.get_segment_names()):
+            _LOGGER.debug('Segment %s is not referenced by any feature flag, skipping update', segment_name)
+            return True
+
         _LOGGER.debug('Synchronizing segment %s', segment_name)
         success = await self._split_synchronizers.segment_sync.synchronize_segment(segment_name, till)
         if not success:
@@ -548,6 +640,20 @@ class SynchronizerAsync(SynchronizerInMemoryBase):
         :param till: to fetch
         :type till: int
 
+        :returns: whether the synchronization was successful or not.
+        :rtype: bool
+        """
+        return await self._synchronize_splits(till, set() if sync_segments else None)
+
+    async def _synchronize_splits(self, till, scheduled_segments):
+        """
+        Synchronize all feature flags, fetching new segments as soon as each page of feature flags is stored.
+
+        :param till: to fetch
+        :type till: int
+        :param scheduled_segments: Segments already scheduled, updated with the new ones. None to skip segments.
+        :type scheduled_segments: set(str)
+
         :returns: whether the synchronization was successful or not.
         :rtype: bool
         """
@@ -556,18 +662,14 @@ class SynchronizerAsync(SynchronizerInMemoryBase):
 
         _LOGGER.debug('Starting feature flags synchronization')
         try:
-            new_segments = []
-            for segment in await self._split_synchronizers.split_sync.synchronize_splits(till):
-                if not await self._split_synchronizers.segment_sync.segment_exist_in_storage(segment):
-                    new_segments.append(segment)
-            if sync_segments and len(new_segments) != 0:
-                _LOGGER.debug('Synching Segments: %s', ','.join(new_segments))
-                success = await self._split_synchronizers.segment_sync.synchronize_segments(new_segments, True)
-                if not success:
-                    _LOGGER.error('Failed to schedule sync one or all segment(s) below.')
-                    _LOGGER.error(','.join(new_segments))
-                else:
-                    _LOGGER.debug('Segment sync scheduled.')
+            on_segments = None
+            if scheduled_segments is not None:
+                async def on_segments(segment_names):
+                    await self._schedule_segments(segment_names, scheduled_segments)
+
+            segment_list = await self._split_synchronizers.split_sync.synchronize_splits(till, on_segments)
+            if scheduled_segments is not None:
+                await self._schedule_segments(segment_list, scheduled_segments)
             return SplitSyncResult(True, 0)
         except APIUriException as exc:
             _LOGGER.error('Failed syncing feature flags due to long URI')
@@ -590,7 +692,8 @@ class SynchronizerAsync(SynchronizerInMemoryBase):
         retry_attempts = 0
         while not self._shutdown:
             try:
-                sync_result = await self.synchronize_splits(None, False)
+                scheduled_segments = set()
+                sync_result = await self._synchronize_splits(None, scheduled_segments)
                 if not sync_result.success and sync_result.error_code is not None and sync_result.error_code == 414:
                     _LOGGER.error("URI too long exception caught, aborting retries")
                     break
@@ -600,7 +703,7 @@ class SynchronizerAsync(SynchronizerInMemoryBase):
 
                 # Only retrying feature flags, since segments may trigger too many calls.
 
-                if not await self._synchronize_segments():
+                if not await self._synchronize_segments(scheduled_segments):
                     _LOGGER.warning('Segments failed to synchronize.')
 
                 # All is good
@@ -15,10 +15,10 @@ class UniqueKeysSynchronizerBase(object):
     def _split_cache_to_bulks(self, cache):
         """
         Split the current unique keys dictionary into seperate dictionaries,
-        each with the size of max_bulk_size. Overflow the last feature_flag set() to new unique keys dictionary.
+        each with the size of max_bulk_size. Overflow the last feature_flag keys to new unique keys dictionary.
 
         :return: array of unique keys dictionaries
-        :rtype: [Dict{'feature_flag1': set(), 'feature_flag2': set(), .. }]
+        :rtype: [Dict{'feature_flag1': list(), 'feature_flag2': list(), .. }]
         """
         bulks = []
         bulk = {}
@@ -26,12 +26,11 @@ class UniqueKeysSynchronizerBase(object):
         for feature_flag in cache:
             total_size += len(cache[feature_flag])
             if total_size > self._max_bulk_size:
-                keys_list = list(cache[feature_flag])
-                chunk_list = self._chunks(keys_list)
+                chunk_list = self._chunks(list(cache[feature_flag]))
                 if bulk != {}:
                     bulks.append(bulk)
                 for bulk_keys in chunk_list:
-                    bulk[feature_flag] = set(bulk_keys)
+                    bulk[feature_flag] = bulk_keys
                     bulks.append(bulk)
                     bulk = {}
             else:
@@ -1,8 +1,18 @@
 import hashlib
 import logging
+import os
+import time
+
+from splitio.util.backoff import Backoff
 
 _LOGGER = logging.getLogger(__name__)
 
+_RECENTLY_MODIFIED_NS = 2 * 10**9
+
+_MAX_BULKS_PER_FLUSH = 10
+_SLOW_FLUSH_SECONDS = 5
+_FLUSH_BACKOFF_MAX_SECONDS = 5 * 60
+
 def _get_sha(fetched):
     """
     Return sha256 of given string.
@@ -15,6 +25,27 @@ def _get_sha(fetched):
     """
     return hashlib.sha256(fetched.encode()).hexdigest()
 
+def _file_signature(filename):
+    """
+    Return what changes when a file is rewritten: its modification time, size and inode.
+
+    Files modified within the last couple of seconds have no signature, since filesystems stamp
+    modification times with a coarse clock and a same sized rewrite could go unnoticed.
+
+    :param filename: path of the file
+    :type filename: str
+
+    :return: file signature, None when the file can't be stat'ed or was just modified
+    :rtype: tuple
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    if time.time_ns() - stat.st_mtime_ns < _RECENTLY_MODIFIED_NS:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
 def _sanitize_object_element(object, object_name, element_name, default_value, lower_value=None, upper_value=None, in_list=None, not_in_list=None):
     """
     Sanitize specific object element.
@@ -62,3 +93,68 @@ def _sanitize_object_element(object, object_name, element_name, default_value, l
             _LOGGER.debug("Sanitized element [%s] to '%s' in %s: %s.", element_name, default_value, object_name, object['name'])
 
     return object
+
+
+class FlushPacer(object):
+    """
+    Pace the bulks a synchronizer posts: how many items each, and how many in a row.
+
+    A run sends a first bulk as it always did, and keeps sending while bulks come out full and are
+    posted quickly, so that a burst is drained before its queue overflows without sending more
+    requests in steady state. Bulks are halved whenever posting one fails or is slow, and grow back
+    to the configured size as posts go through quickly. After a failure, runs send a single bulk
+    until an exponential backoff is over.
+    """
+
+    def __init__(self, bulk_size):
+        """
+        Class constructor.
+
+        :param bulk_size: How many items to send per post at most.
+        :type bulk_size: int
+        """
+        self._max_bulk_size = bulk_size
+        self._min_bulk_size = max(1, bulk_size // 16)
+        self._bulk_size = bulk_size
+        self._backoff = Backoff(1, _FLUSH_BACKOFF_MAX_SECONDS)
+        self._retry_at = 0
+        self._slow = False
+
+    @property
+    def bulk_size(self):
+        """Return how many items to send in the next post."""
+        return self._bulk_size
+
+    def sent(self, elapsed, failed):
+        """
+        Record how posting a bulk went.
+
+        :param elapsed: Seconds the post took.
+        :type elapsed: float
+        :param failed: Whether the post failed.
+        :type failed: bool
+        """
+        self._slow = elapsed >= _SLOW_FLUSH_SECONDS
+        if failed or self._slow:
+            self._bulk_size = max(self._min_bulk_size, self._bulk_size // 2)
+        else:
+            self._bulk_size = min(self._max_bulk_size, self._bulk_size * 2)
+
+        if failed:
+            self._retry_at = time.monotonic() + self._backoff.get()
+        else:
+            self._backoff.reset()
+            self._retry_at = 0
+
+    def keep_sending(self, bulks, full):
+        """
+        Return whether another bulk should be sent in the same run.
+
+        :param bulks: Bulks sent so far in the run.
+        :type bulks: int
+        :param full: Whether the last bulk was full, so more items are likely queued.
+        :type full: bool
+
+        :rtype: bool
+        """
+        return full and bulks < _MAX_BULKS_PER_FLUSH and not self._slow and time.monotonic() >= self._retry_at
@@ -0,0 +1,70 @@
+"""Storage snapshot task."""
+import abc
+import logging
+
+from splitio.tasks import BaseSynchronizationTask
+from splitio.tasks.util.asynctask import AsyncTask, AsyncTaskAsync
+
+
+_LOGGER = logging.getLogger(__name__)
+_SNAPSHOT_PERIOD = 5 * 60  # 5 minutes
+
+
+class SnapshotSyncTaskBase(BaseSynchronizationTask):
+    """Snapshot task uses an asynctask.AsyncTask to persist storages periodically."""
+
+    def start(self):
+        """Start executing the snapshot task."""
+        self._task.start()
+
+    @abc.abstractmethod
+    def stop(self, event=None):
+        """Stop executing the snapshot task."""
+        pass
+
+    def is_running(self):
+        """
+        Return whether the task is running or not.
+
+        :return: True if the task is running. False otherwise.
+        :rtype: bool
+        """
+        return self._task.running()
+
+
+class SnapshotSyncTask(SnapshotSyncTaskBase):
+    """Snapshot task uses an asynctask.AsyncTask to persist storages periodically."""
+
+    def __init__(self, save_snapshot, period=_SNAPSHOT_PERIOD):
+        """
+        Class constructor.
+
+        :param save_snapshot: Function that writes the snapshot.
+        :type save_snapshot: func
+        :param period: How many seconds to wait between subsequent snapshots.
+        :type period: int
+        """
+        self._task = AsyncTask(save_snapshot, period, on_stop=save_snapshot)
+
+    def stop(self, event=None):
+        """Stop executing the snapshot task, writing a last snapshot."""
+        self._task.stop(event)
+
+
+class SnapshotSyncTaskAsync(SnapshotSyncTaskBase):
+    """Snapshot task uses an asynctask.AsyncTaskAsync to persist storages periodically."""
+
+    def __init__(self, save_snapshot, period=_SNAPSHOT_PERIOD):
+        """
+        Class constructor.
+
+        :param save_snapshot: Coroutine function that writes the snapshot.
+        :type save_snapshot: func
+        :param period: How many seconds to wait between subsequent snapshots.
+        :type period: int
+        """
+        self._task = AsyncTaskAsync(save_snapshot, period, on_stop=save_snapshot)
+
+    async def stop(self):
+        """Stop executing the snapshot task, writing a last snapshot."""
+        await self._task.stop(True)
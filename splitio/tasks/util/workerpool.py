@@ -1,16 +1,38 @@
 """Worker pool module."""
 
 import logging
+from concurrent.futures import Future, wait
 from threading import Thread, Event
 import queue
+import time
 
 from splitio.optional.loaders import asyncio
 
 _LOGGER = logging.getLogger(__name__)
 
+class WorkerFuture(Future):
+    """Future of a message submitted to a worker pool, also reporting how long it took to process."""
+
+    def __init__(self, message, tracked=False):
+        """
+        Class constructor.
+
+        :param message: Message submitted to the pool.
+        :type message: object
+        :param tracked: Whether the submitter waits on this future instead of the whole queue.
+        :type tracked: bool
+        """
+        Future.__init__(self)
+        self.message = message
+        self.tracked = tracked
+        self.latency = None
+
+
 class WorkerPool(object):
     """Worker pool class to implement single producer/multiple consumer."""
 
+    _SHUTDOWN = object()
+
     def __init__(self, worker_count, worker_func):
         """
         Class constructor.
@@ -20,7 +42,6 @@ class WorkerPool(object):
         """
         self._failed = False
         self._incoming = queue.Queue()
-        self._should_be_working = [True for _ in range(0, worker_count)]
         self._worker_events = [Event() for _ in range(0, worker_count)]
         self._threads = [
             Thread(target=self._wrapper, args=(i, worker_func), name="pool_worker_%d" % i)
@@ -35,62 +56,68 @@ class WorkerPool(object):
             thread.start()
 
     @staticmethod
-    def _safe_run(func, message):
+    def _safe_run(func, future):
         """
         Execute the user funcion for a given message without raising exceptions.
 
+        The outcome and the time it took are reported through the message future.
+
         :param func: User defined function.
         :type func: callable
-        :param message: Message fetched from the queue.
-        :param message: object
+        :param future: Future holding the message fetched from the queue.
+        :param future: WorkerFuture
 
         :return True if no everything goes well. False otherwise.
         :rtype bool
         """
-        try:
-            func(message)
+        if not future.set_running_or_notify_cancel():
             return True
-        except Exception:  # pylint: disable=broad-except
-            _LOGGER.error("Something went wrong when processing message %s", message)
+
+        start = time.monotonic()
+        try:
+            result = func(future.message)
+        except Exception as exc:  # pylint: disable=broad-except
+            future.latency = time.monotonic() - start
+            _LOGGER.error("Something went wrong when processing message %s", future.message)
             _LOGGER.debug('Original traceback: ', exc_info=True)
+            future.set_exception(exc)
             return False
 
+        future.latency = time.monotonic() - start
+        future.set_result(result)
+        return True
+
     def _wrapper(self, worker_number, func):
         """
         Fetch message, execute tasks, and acknowledge results.
 
+        Workers block on the queue until a message or the shutdown sentinel arrives.
+
         :param worker_number: # (id) of worker whose function will be executed.
         :type worker_number: int
         :param func: User defined function.
         :type func: callable.
         """
-        while self._should_be_working[worker_number]:
-            try:
-                message = self._incoming.get(True, 0.5)
-
-                # For some reason message can be None in python2 implementation of queue.
-                # This method must be both ignored and acknowledged with .task_done()
-                # otherwise .join() will halt.
-                if message is None:
-                    _LOGGER.debug('spurious message received. acking and ignoring.')
-                    self._incoming.task_done()
-                    continue
-
-                # If the task is successfully executed, the ack is done AFTERWARDS,
-                # to avoid race conditions on SDK initialization.
-                _LOGGER.debug("processing message '%s'", message)
-                ok = self._safe_run(func, message)  # pylint: disable=invalid-name
-                if not ok:
-                    self._failed = True
-                    _LOGGER.error(
-                        ("Something went wrong during the execution, "
-                         "removing message \"%s\" from queue."),
-                        message
-                    )
+        while True:
+            future = self._incoming.get()
+            if future is self._SHUTDOWN:
                 self._incoming.task_done()
-            except queue.Empty:
-                # No message was fetched, just keep waiting.
-                pass
+                break
+
+            # If the task is successfully executed, the ack is done AFTERWARDS,
+            # to avoid race conditions on SDK initialization.
+            _LOGGER.debug("processing message '%s'", future.message)
+            ok = self._safe_run(func, future)  # pylint: disable=invalid-name
+            if not ok:
+                # failures of tracked messages are reported through their futures only.
+                if not future.tracked:
+                    self._failed = True
+                _LOGGER.error(
+                    ("Something went wrong during the execution, "
+                     "removing message \"%s\" from queue."),
+                    future.message
+                )
+            self._incoming.task_done()
 
         # Set my flag indicating that i have finished
         self._worker_events[worker_number].set()
@@ -101,9 +128,48 @@ class WorkerPool(object):
 
         :param message: New message to add.
         :type message: object.
+
+        :return: Future resolved with the worker function result once the message is processed.
+        :rtype: WorkerFuture
         """
-        self._incoming.put(message)
+        future = WorkerFuture(message)
+        self._incoming.put(future)
         _LOGGER.debug('queued message %s for processing.', message)
+        return future
+
+    def submit_many(self, messages):
+        """
+        Add a batch of messages to the work-queue, to be waited on with `wait_for`.
+
+        Their failures are not reported by `wait_for_completion`.
+
+        :param messages: New messages to add.
+        :type messages: iterable
+
+        :return: One future per message, in the same order.
+        :rtype: list(WorkerFuture)
+        """
+        futures = [WorkerFuture(message, tracked=True) for message in messages]
+        for future in futures:
+            self._incoming.put(future)
+        _LOGGER.debug('queued %d messages for processing.', len(futures))
+        return futures
+
+    @staticmethod
+    def wait_for(futures, timeout=None):
+        """
+        Block until the given messages are processed.
+
+        :param futures: Futures returned when submitting the messages.
+        :type futures: list(WorkerFuture)
+        :param timeout: Optional, max seconds to wait.
+        :type timeout: float
+
+        :return: True if every message was processed without errors in time. False otherwise.
+        :rtype: bool
+        """
+        done, not_done = wait(futures, timeout)
+        return not not_done and all(not future.cancelled() and future.exception() is None for future in done)
 
     def wait_for_completion(self):
         """Block until the work queue is empty."""
@@ -115,9 +181,18 @@ class WorkerPool(object):
         return old
 
     def stop(self, event=None):
-        """Stop all worker nodes."""
-        async_stop = Thread(target=self._wait_workers_shutdown, args=(event,), daemon=True)
-        async_stop.start()
+        """
+        Stop all worker nodes once the messages already queued are processed.
+
+        :param event: Optional, event to set as soon as all the workers have shut down.
+        :type event: threading.Event
+        """
+        for _ in self._threads:
+            self._incoming.put(self._SHUTDOWN)
+
+        if event is not None:
+            async_stop = Thread(target=self._wait_workers_shutdown, args=(event,), daemon=True)
+            async_stop.start()
 
     def _wait_workers_shutdown(self, event):
         """
@@ -126,14 +201,9 @@ class WorkerPool(object):
         :param event: Event to set as soon as all the workers have shut down.
         :type event: threading.Event
         """
-        self.wait_for_completion()
-        for index, _ in enumerate(self._should_be_working):
-            self._should_be_working[index] = False
-
-        if event is not None:
-            for worker_event in self._worker_events:
-                worker_event.wait()
-            event.set()
+        for worker_event in self._worker_events:
+            worker_event.wait()
+        event.set()
 
 
 class WorkerPoolAsync(object):
@@ -168,7 +238,9 @@ class WorkerPoolAsync(object):
             await self._semaphore.acquire() # wait until "there's a free worker"
             if self._aborted: # check in case the pool was shutdown while we were waiting for a worker
                 return
-            await self._handler(message._message)
+            start = time.monotonic()
+            message.result = await self._handler(message._message)
+            message.latency = time.monotonic() - start
         except Exception:
             _LOGGER.error("Something went wrong when processing message %s", message)
             _LOGGER.debug('Original traceback: ', exc_info=True)
@@ -210,6 +282,8 @@ class TaskCompletionWraper:
         self._message = message
         self._complete = asyncio.Event()
         self._failed = False
+        self.result = None
+        self.latency = None
 
     async def await_completion(self):
         await self._complete.wait()
@@ -218,6 +292,9 @@ class TaskCompletionWraper:
     def _mark_as_complete(self):
         self._complete.set()
 
+    def is_complete(self):
+        return self._complete.is_set()
+
 
 class BatchCompletionWrapper:
     """Batch completion class"""
@@ -227,3 +304,6 @@ class BatchCompletionWrapper:
     async def await_completion(self):
         await asyncio.gather(*[task.await_completion() for task in self._tasks])
         return not any(task._failed for task in self._tasks)
+
+    def is_complete(self):
+        return all(task.is_complete() for task in self._tasks)
@@ -0,0 +1,179 @@
+"""Adaptive concurrency limits for outgoing requests."""
+import threading
+
+from splitio.optional.loaders import asyncio
+
+
+class AdaptiveLimitBase(object):
+    """
+    Additive increase / multiplicative decrease limit on concurrent requests.
+
+    The limit grows by one slot each time a full window of requests completes with a latency close
+    to the fastest one observed, shrinks slightly when latency degrades, and is halved whenever the
+    backend throttles a request (http 429).
+    """
+
+    THROTTLED_STATUS_CODE = 429
+
+    def __init__(self, initial, minimum=1, maximum=None, latency_tolerance=2.0, latency_floor=0.05):
+        """
+        Class constructor.
+
+        :param initial: Starting number of concurrent requests.
+        :type initial: int
+        :param minimum: Lower bound for the limit.
+        :type minimum: int
+        :param maximum: Upper bound for the limit, defaults to the initial value.
+        :type maximum: int
+        :param latency_tolerance: How many times slower than the baseline a request can be before the limit shrinks.
+        :type latency_tolerance: float
+        :param latency_floor: Latencies below this many seconds never shrink the limit.
+        :type latency_floor: float
+        """
+        self._minimum = max(1, minimum)
+        self._maximum = max(self._minimum, maximum if maximum is not None else initial)
+        self._limit = float(min(max(initial, self._minimum), self._maximum))
+        self._latency_tolerance = latency_tolerance
+        self._latency_floor = latency_floor
+        self._baseline = None
+        self._in_flight = 0
+
+    @property
+    def limit(self):
+        """
+        Return the current number of allowed concurrent requests.
+
+        :rtype: int
+        """
+        return int(self._limit)
+
+    def _has_capacity(self):
+        """Return whether a new request can start."""
+        return self._in_flight < int(self._limit)
+
+    def _update(self, latency, throttled):
+        """
+        Adjust the limit with the outcome of a finished request.
+
+        :param latency: Seconds the request took, None if it failed.
+        :type latency: float
+        :param throttled: Whether the backend rejected the request with a 429.
+        :type throttled: bool
+        """
+        if throttled:
+            self._limit = max(self._minimum, self._limit / 2)
+            return
+
+        if latency is None:
+            return
+
+        # Baseline follows the fastest request, slowly drifting up so a slower network is eventually accepted.
+        self._baseline = latency if self._baseline is None else min(latency, self._baseline * 1.05)
+        if latency > self._latency_floor and latency > self._baseline * self._latency_tolerance:
+            self._limit = max(self._minimum, self._limit * 0.9)
+        else:
+            self._limit = min(self._maximum, self._limit + 1 / self._limit)
+
+    @classmethod
+    def is_throttled(cls, exc):
+        """
+        Return whether an exception was caused by backend throttling.
+
+        :param exc: Exception raised by the request.
+        :type exc: Exception
+
+        :rtype: bool
+        """
+        return getattr(exc, 'status_code', None) == cls.THROTTLED_STATUS_CODE
+
+
+class AdaptiveLimit(AdaptiveLimitBase):
+    """Adaptive concurrency limit shared by threads."""
+
+    def __init__(self, initial, minimum=1, maximum=None, latency_tolerance=2.0, latency_floor=0.05):
+        """
+        Class constructor.
+
+        :param initial: Starting number of concurrent requests.
+        :type initial: int
+        :param minimum: Lower bound for the limit.
+        :type minimum: int
+        :param maximum: Upper bound for the limit, defaults to the initial value.
+        :type maximum: int
+        :param latency_tolerance: How many times slower than the baseline a request can be before the limit shrinks.
+        :type latency_tolerance: float
+        :param latency_floor: Latencies below this many seconds never shrink the limit.
+        :type latency_floor: float
+        """
+        AdaptiveLimitBase.__init__(self, initial, minimum, maximum, latency_tolerance, latency_floor)
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Block until a request slot is available and take it."""
+        with self._condition:
+            self._condition.wait_for(self._has_capacity)
+            self._in_flight += 1
+
+    def release(self, latency=None, throttled=False):
+        """
+        Return a request slot and adjust the limit.
+
+        :param latency: Seconds the request took, None if it failed.
+        :type latency: float
+        :param throttled: Whether the backend rejected the request with a 429.
+        :type throttled: bool
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._update(latency, throttled)
+            self._condition.notify_all()
+
+
+class AdaptiveLimitAsync(AdaptiveLimitBase):
+    """Adaptive concurrency limit shared by tasks of the same event loop."""
+
+    def __init__(self, initial, minimum=1, maximum=None, latency_tolerance=2.0, latency_floor=0.05):
+        """
+        Class constructor.
+
+        :param initial: Starting number of concurrent requests.
+        :type initial: int
+        :param minimum: Lower bound for the limit.
+        :type minimum: int
+        :param maximum: Upper bound for the limit, defaults to the initial value.
+        :type maximum: int
+        :param latency_tolerance: How many times slower than the baseline a request can be before the limit shrinks.
+        :type latency_tolerance: float
+        :param latency_floor: Latencies below this many seconds never shrink the limit.
+        :type latency_floor: float
+        """
+        AdaptiveLimitBase.__init__(self, initial, minimum, maximum, latency_tolerance, latency_floor)
+        self._condition = None
+
+    def _get_condition(self):
+        """Create the condition lazily, so it binds to the running loop."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self):
+        """Wait until a request slot is available and take it."""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(self._has_capacity)
+            self._in_flight += 1
+
+    async def release(self, latency=None, throttled=False):
+        """
+        Return a request slot and adjust the limit.
+
+        :param latency: Seconds the request took, None if it failed.
+        :type latency: float
+        :param throttled: Whether the backend rejected the request with a 429.
+        :type throttled: bool
+        """
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight -= 1
+            self._update(latency, throttled)
+            condition.notify_all()
@@ -0,0 +1,167 @@
+"""Keep CPU-bound work from stalling the asyncio event loop."""
+import functools
+import logging
+import time
+from itertools import islice
+
+from splitio.api.commons import decode_json
+from splitio.optional.loaders import asyncio
+
+_LOGGER = logging.getLogger(__name__)
+
+_DEFAULT_BUDGET = 0.01
+_DEFAULT_OFFLOAD_SIZE = 256 * 1024
+_INITIAL_SLICE_SIZE = 10000
+_MIN_SLICE_SIZE = 1000
+
+
+class LoopOffloader(object):
+    """
+    Run CPU-bound work of the async sync path without blocking the event loop beyond a time budget.
+
+    Parsing large payloads is sent to an executor, while work that must happen on the loop (i.e. building
+    segment key sets) is split in slices that yield back to the loop once the budget is spent.
+
+    A thread pool keeps parsing off the loop, but holds the GIL while in C code (json, set operations).
+    A process pool can be supplied to parse large json bodies without holding the loop's GIL at all.
+    """
+
+    def __init__(self, executor=None, budget=_DEFAULT_BUDGET, offload_size=_DEFAULT_OFFLOAD_SIZE):
+        """
+        Class constructor.
+
+        :param executor: Executor running the offloaded work, None for the loop's default one.
+        :type executor: concurrent.futures.Executor
+        :param budget: Seconds the loop can be blocked before yielding.
+        :type budget: float
+        :param offload_size: Payloads of at least this many bytes are parsed in the executor.
+        :type offload_size: int
+        """
+        self._executor = executor
+        self._budget = budget
+        self._offload_size = offload_size
+        self._slice_size = _INITIAL_SLICE_SIZE
+
+    async def run(self, func, *args):
+        """
+        Run a function in the executor.
+
+        :param func: Function to run.
+        :type func: callable
+
+        :returns: the function result.
+        :rtype: object
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def decode_json(self, body):
+        """
+        Parse a JSON body, in the executor when it's large.
+
+        :param body: JSON text.
+        :type body: str
+
+        :rtype: object
+        """
+        if len(body) < self._offload_size:
+            return decode_json(body)
+
+        return await self.run(decode_json, body)
+
+    async def apply_in_slices(self, func, items):
+        """
+        Call a function over consecutive slices of items, yielding to the loop each time the budget is spent.
+
+        Slices are sized from the time the previous one took, so each takes about a budget.
+
+        :param func: Function receiving a list of items.
+        :type func: callable
+        :param items: Items to process.
+        :type items: iterable
+        """
+        iterator = iter(items)
+        spent = 0
+        while True:
+            items_slice = list(islice(iterator, self._slice_size))
+            if not items_slice:
+                return
+
+            start = time.perf_counter()
+            func(items_slice)
+            elapsed = time.perf_counter() - start
+            if elapsed > 0:
+                self._slice_size = max(_MIN_SLICE_SIZE, int(len(items_slice) * self._budget / elapsed))
+
+            spent += elapsed
+            if spent >= self._budget:
+                await asyncio.sleep(0)
+                spent = 0
+
+
+class LoopLagMonitor(object):
+    """Measure how late the event loop wakes up a periodic task, to detect code blocking it."""
+
+    def __init__(self, threshold, interval=1):
+        """
+        Class constructor.
+
+        :param threshold: Lag in seconds above which a warning is logged.
+        :type threshold: float
+        :param interval: Seconds between measures.
+        :type interval: float
+        """
+        self._threshold = threshold
+        self._interval = interval
+        self._last_lag = 0
+        self._max_lag = 0
+        self._task = None
+
+    def start(self):
+        """Start measuring."""
+        if self._task is not None:
+            _LOGGER.debug('Loop lag monitor is already running')
+            return
+
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop measuring."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        """Sleep for the interval and record how much later than expected the loop woke up."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self._interval
+            await asyncio.sleep(self._interval)
+            self.record(loop.time() - expected)
+
+    def record(self, lag):
+        """
+        Record a measured lag.
+
+        :param lag: Seconds the loop was late.
+        :type lag: float
+        """
+        self._last_lag = max(0, lag)
+        self._max_lag = max(self._max_lag, self._last_lag)
+        if self._last_lag > self._threshold:
+            _LOGGER.warning('Event loop was blocked for %d ms', self._last_lag * 1000)
+
+    def pop_stats(self):
+        """
+        Return the last and max lag measured in milliseconds, and reset the max.
+
+        :rtype: dict
+        """
+        stats = {'last': int(self._last_lag * 1000), 'max': int(self._max_lag * 1000)}
+        self._max_lag = 0
+        return stats
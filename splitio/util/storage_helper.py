@@ -1,5 +1,6 @@
 """Storage Helper."""
 import logging
+from collections import Counter
 
 from splitio.models import splits
 
@@ -61,6 +62,23 @@ async def update_feature_flag_storage_async(feature_flag_storage, feature_flags,
     await feature_flag_storage.update(to_add, to_delete, change_number)
     return segment_list
 
+def sort_segments_by_references(feature_flags, segment_names):
+    """
+    Sort segment names so the ones used by more feature flags come first.
+
+    :param feature_flags: Feature flags referencing the segments.
+    :type feature_flags: list(splitio.models.splits.Split)
+    :param segment_names: Segment names to sort.
+    :type segment_names: set(str)
+
+    :return: segment names, most referenced first
+    :rtype: list(str)
+    """
+    references = Counter()
+    for feature_flag in feature_flags:
+        references.update(set(feature_flag.get_segment_names()))
+    return sorted(segment_names, key=lambda segment_name: (-references[segment_name], segment_name))
+
 def get_valid_flag_sets(flag_sets, flag_set_filter):
     """
     Check each flag set in given array, return it if exist in a given config flag set array, if config array is empty return all
@@ -112,6 +112,23 @@ class ImpressionsAPITests(object):
         # validate key-value args (body)
         assert call_made[2]['body'] == expectedImpressions
 
+    def test_post_sampled_impressions(self, mocker):
+        """Test sampled impressions are posted with their sampling rate."""
+        httpclient = mocker.Mock(spec=client.HttpClient)
+        httpclient.post.return_value = client.HttpResponse(200, '', {})
+        impressions_api = impressions.ImpressionsAPI(httpclient, 'some_api_key', get_metadata(DEFAULT_CONFIG), mocker.Mock(), ImpressionsMode.DEBUG)
+        impressions_api.flush_impressions([
+            Impression('k1', 'f1', 'on', 'l1', 123456, 'b1', 321654, None, 0.25),
+            Impression('k3', 'f1', 'on', 'l1', 123456, 'b1', 321654)
+        ])
+        assert httpclient.post.mock_calls[0][2]['body'] == [{
+            'f': 'f1',
+            'i': [
+                {'k': 'k1', 'b': 'b1', 't': 'on', 'r': 'l1', 'm': 321654, 'c': 123456, 'pt': None, 'sr': 0.25},
+                {'k': 'k3', 'b': 'b1', 't': 'on', 'r': 'l1', 'm': 321654, 'c': 123456, 'pt': None},
+            ],
+        }]
+
     def test_post_counters(self, mocker):
         """Test impressions posting API call."""
         httpclient = mocker.Mock(spec=client.HttpClient)
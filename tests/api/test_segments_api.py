@@ -59,6 +59,32 @@ class SegmentAPITests(object):
             assert exc_info.type == APIException
             assert exc_info.value.message == 'some_message'
 
+    def test_fetch_segment_not_modified(self, mocker):
+        """Test unchanged segments are requested conditionally and served from cache when not modified."""
+        httpclient = mocker.Mock(spec=client.HttpClient)
+        unchanged = '{"name": "some_segment", "added": [], "removed": [], "since": 123, "till": 123}'
+        httpclient.get.return_value = client.HttpResponse(200, unchanged, {'ETag': '"abc"'})
+        segment_api = segments.SegmentsAPI(httpclient, 'some_api_key', SdkMetadata('1.0', 'some', '1.2.3.4'), mocker.Mock())
+
+        response = segment_api.fetch_segment('some_segment', 123, FetchOptions())
+        assert response['till'] == 123
+        assert 'If-None-Match' not in httpclient.get.mock_calls[0][2]['extra_headers']
+
+        httpclient.get.return_value = client.HttpResponse(304, '', {})
+        assert segment_api.fetch_segment('some_segment', 123, FetchOptions()) == response
+        assert httpclient.get.mock_calls[1][2]['extra_headers']['If-None-Match'] == '"abc"'
+
+        # a different change number is requested unconditionally
+        httpclient.get.return_value = client.HttpResponse(200, '{"since": 124, "till": 125, "added": ["key1"], "removed": []}', {'ETag': '"def"'})
+        segment_api.fetch_segment('some_segment', 124, FetchOptions())
+        assert 'If-None-Match' not in httpclient.get.mock_calls[2][2]['extra_headers']
+        segment_api.fetch_segment('some_segment', 124, FetchOptions())
+        assert 'If-None-Match' not in httpclient.get.mock_calls[3][2]['extra_headers']
+
+        httpclient.get.return_value = client.HttpResponse(304, '', {})
+        with pytest.raises(APIException):
+            segment_api.fetch_segment('some_segment', 124, FetchOptions())
+
 
 class SegmentAPIAsyncTests(object):
     """Segment async API test cases."""
@@ -130,3 +130,25 @@ class SplitAPIAsyncTests(object):
             response = await split_api.fetch_splits(123, FetchOptions())
             assert exc_info.type == APIException
             assert exc_info.value.message == 'some_message'
+
+    @pytest.mark.asyncio
+    async def test_fetch_split_changes_not_modified(self, mocker):
+        """Test unchanged feature flags are requested conditionally and served from cache when not modified."""
+        httpclient = mocker.Mock(spec=client.HttpClientAsync)
+        split_api = splits.SplitsAPIAsync(httpclient, 'some_api_key', SdkMetadata('1.0', 'some', '1.2.3.4'), mocker.Mock())
+        responses = [
+            client.HttpResponse(200, '{"splits": [], "since": 123, "till": 123}', {'ETag': '"abc"'}),
+            client.HttpResponse(304, '', {}),
+        ]
+        headers = []
+        async def get(verb, url, key, query, extra_headers):
+            headers.append(extra_headers)
+            return responses.pop(0)
+        httpclient.get = get
+
+        response = await split_api.fetch_splits(123, FetchOptions())
+        assert response == {'splits': [], 'since': 123, 'till': 123}
+        assert 'If-None-Match' not in headers[0]
+
+        assert await split_api.fetch_splits(123, FetchOptions()) == response
+        assert headers[1]['If-None-Match'] == '"abc"'
@@ -38,3 +38,11 @@ class UtilTests(object):
         assert 'SplitSDKMachineIP' not in metadata
         assert 'SplitSDKMachineName' not in metadata
         assert 'SplitSDKClientKey' not in metadata
+
+    def test_decode_json(self, mocker):
+        """Test response bodies are decoded with either parser."""
+        from splitio.api.commons import decode_json
+        body = '{"name": "segment", "added": ["key1", "key2"], "removed": [], "since": -1, "till": 1}'
+        assert decode_json(body) == {'name': 'segment', 'added': ['key1', 'key2'], 'removed': [], 'since': -1, 'till': 1}
+        with pytest.raises(ValueError):
+            decode_json('{"name": ')
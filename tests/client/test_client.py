@@ -7,10 +7,15 @@ import unittest.mock as mock
 import time
 import pytest
 
-from splitio.client.client import Client, _LOGGER as _logger, CONTROL, ClientAsync
+from splitio.client import input_validator
+from splitio.client.client import Client, _LOGGER as _logger, CONTROL, ClientAsync, _InvalidInputError
+from splitio.client.key import Key
 from splitio.client.factory import SplitFactory, Status as FactoryStatus, SplitFactoryAsync
+from splitio.client.profiling import EvaluationProfiler
+from splitio.engine.profiling import EvaluationStage
 from splitio.models.impressions import Impression, Label
 from splitio.models.events import Event, EventWrapper
+from splitio.models.telemetry import MethodExceptionsAndLatencies
 from splitio.storage import EventStorage, ImpressionStorage, SegmentStorage, SplitStorage
 from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage, \
     InMemoryImpressionStorage, InMemoryTelemetryStorage, InMemorySplitStorageAsync, \
@@ -18,7 +23,7 @@ from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStora
 from splitio.models.splits import Split, Status, from_raw
 from splitio.engine.impressions.impressions import Manager as ImpressionManager
 from splitio.engine.telemetry import TelemetryStorageConsumer, TelemetryStorageProducer, TelemetryStorageProducerAsync
-from splitio.engine.evaluator import Evaluator
+from splitio.engine.evaluator import Evaluator, EvaluationResult
 from splitio.recorder.recorder import StandardRecorder, StandardRecorderAsync
 from splitio.engine.impressions.strategies import StrategyDebugMode
 from tests.integration import splits_json
@@ -67,14 +72,7 @@ class ClientTests(object):  # pylint: disable=too-few-public-methods
         split_storage.update([from_raw(splits_json['splitChange1_1']['splits'][0])], [], -1)
         client = Client(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        client._evaluator.eval_with_context.return_value = {
-            'treatment': 'on',
-            'configurations': None,
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            },
-        }
+        client._evaluator.eval_with_context.return_value = EvaluationResult('on', None, 'some_label', 123)
         _logger = mocker.Mock()
         assert client.get_treatment('some_key', 'SPLIT_2') == 'on'
         assert impression_storage.pop_many(100) == [Impression('some_key', 'SPLIT_2', 'on', 'some_label', 123, None, 1000)]
@@ -135,14 +133,7 @@ class ClientTests(object):  # pylint: disable=too-few-public-methods
         split_storage.update([from_raw(splits_json['splitChange1_1']['splits'][0])], [], -1)
         client = Client(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        client._evaluator.eval_with_context.return_value = {
-            'treatment': 'on',
-            'configurations': '{"some_config": True}',
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            }
-        }
+        client._evaluator.eval_with_context.return_value = EvaluationResult('on', '{"some_config": True}', 'some_label', 123)
         _logger = mocker.Mock()
         client._send_impression_to_listener = mocker.Mock()
 
@@ -209,14 +200,7 @@ class ClientTests(object):  # pylint: disable=too-few-public-methods
 
         client = Client(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        evaluation = {
-            'treatment': 'on',
-            'configurations': '{"color": "red"}',
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            }
-        }
+        evaluation = EvaluationResult('on', '{"color": "red"}', 'some_label', 123)
         client._evaluator.eval_many_with_context.return_value = {
             'SPLIT_2': evaluation,
             'SPLIT_1': evaluation
@@ -285,14 +269,7 @@ class ClientTests(object):  # pylint: disable=too-few-public-methods
 
         client = Client(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        evaluation = {
-            'treatment': 'on',
-            'configurations': '{"color": "red"}',
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            }
-        }
+        evaluation = EvaluationResult('on', '{"color": "red"}', 'some_label', 123)
         client._evaluator.eval_many_with_context.return_value = {
             'SPLIT_2': evaluation,
             'SPLIT_1': evaluation
@@ -361,14 +338,7 @@ class ClientTests(object):  # pylint: disable=too-few-public-methods
 
         client = Client(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        evaluation = {
-            'treatment': 'on',
-            'configurations': '{"color": "red"}',
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            }
-        }
+        evaluation = EvaluationResult('on', '{"color": "red"}', 'some_label', 123)
         client._evaluator.eval_many_with_context.return_value = {
             'SPLIT_2': evaluation,
             'SPLIT_1': evaluation
@@ -436,14 +406,7 @@ class ClientTests(object):  # pylint: disable=too-few-public-methods
 
         client = Client(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        evaluation = {
-            'treatment': 'on',
-            'configurations': '{"color": "red"}',
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            }
-        }
+        evaluation = EvaluationResult('on', '{"color": "red"}', 'some_label', 123)
         client._evaluator.eval_many_with_context.return_value = {
             'SPLIT_1': evaluation,
             'SPLIT_2': evaluation
@@ -516,14 +479,7 @@ class ClientTests(object):  # pylint: disable=too-few-public-methods
 
         client = Client(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        evaluation = {
-            'treatment': 'on',
-            'configurations': '{"color": "red"}',
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            }
-        }
+        evaluation = EvaluationResult('on', '{"color": "red"}', 'some_label', 123)
         client._evaluator.eval_many_with_context.return_value = {
             'SPLIT_1': evaluation,
             'SPLIT_2': evaluation
@@ -593,14 +549,7 @@ class ClientTests(object):  # pylint: disable=too-few-public-methods
 
         client = Client(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        evaluation = {
-            'treatment': 'on',
-            'configurations': '{"color": "red"}',
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            }
-        }
+        evaluation = EvaluationResult('on', '{"color": "red"}', 'some_label', 123)
         client._evaluator.eval_many_with_context.return_value = {
             'SPLIT_1': evaluation,
             'SPLIT_2': evaluation
@@ -962,37 +911,122 @@ class ClientTests(object):  # pylint: disable=too-few-public-methods
         def stop(*_):
             pass
         factory._sync_manager.stop = stop
+        assert factory.latency_percentiles() is None
+        factory._latency_histograms = mocker.Mock()
 
         client = Client(factory, recorder, True)
         assert client.get_treatment('key', 'SPLIT_2') == 'on'
-        assert(telemetry_storage._method_latencies._treatment[0] == 1)
+        assert(telemetry_storage._method_latencies.pop_all()['methodLatencies']['treatment'][5] == 1)
+        assert factory._latency_histograms.record.mock_calls[0][1][0] == MethodExceptionsAndLatencies.TREATMENT
+        assert factory.latency_percentiles() == factory._latency_histograms.percentiles.return_value
 
         client.get_treatment_with_config('key', 'SPLIT_2')
-        assert(telemetry_storage._method_latencies._treatment_with_config[0] == 1)
+        assert(telemetry_storage._method_latencies.pop_all()['methodLatencies']['treatment_with_config'][5] == 1)
 
         client.get_treatments('key', ['SPLIT_2'])
-        assert(telemetry_storage._method_latencies._treatments[0] == 1)
+        assert(telemetry_storage._method_latencies.pop_all()['methodLatencies']['treatments'][5] == 1)
 
         client.get_treatments_by_flag_set('key', 'set_1')
-        assert(telemetry_storage._method_latencies._treatments_by_flag_set[0] == 1)
+        assert(telemetry_storage._method_latencies.pop_all()['methodLatencies']['treatments_by_flag_set'][5] == 1)
 
         client.get_treatments_by_flag_sets('key', ['set_1'])
-        assert(telemetry_storage._method_latencies._treatments_by_flag_sets[0] == 1)
+        assert(telemetry_storage._method_latencies.pop_all()['methodLatencies']['treatments_by_flag_sets'][5] == 1)
 
         client.get_treatments_with_config('key', ['SPLIT_2'])
-        assert(telemetry_storage._method_latencies._treatments_with_config[0] == 1)
+        assert(telemetry_storage._method_latencies.pop_all()['methodLatencies']['treatments_with_config'][5] == 1)
 
         client.get_treatments_with_config_by_flag_set('key', 'set_1')
-        assert(telemetry_storage._method_latencies._treatments_with_config_by_flag_set[0] == 1)
+        assert(telemetry_storage._method_latencies.pop_all()['methodLatencies']['treatments_with_config_by_flag_set'][5] == 1)
 
         client.get_treatments_with_config_by_flag_sets('key', ['set_1'])
-        assert(telemetry_storage._method_latencies._treatments_with_config_by_flag_sets[0] == 1)
+        assert(telemetry_storage._method_latencies.pop_all()['methodLatencies']['treatments_with_config_by_flag_sets'][5] == 1)
 
         mocker.patch('splitio.client.client.utctime_ms', new=lambda: 1000)
         client.track('key', 'tt', 'ev')
-        assert(telemetry_storage._method_latencies._track[0] == 1)
+        assert(telemetry_storage._method_latencies.pop_all()['methodLatencies']['track'][5] == 1)
+        factory.destroy()
+
+    def test_evaluation_profiling(self, mocker):
+        telemetry_storage = InMemoryTelemetryStorage()
+        telemetry_producer = TelemetryStorageProducer(telemetry_storage)
+        telemetry_runtime_producer = telemetry_producer.get_telemetry_runtime_producer()
+        impression_storage = InMemoryImpressionStorage(10, telemetry_runtime_producer)
+        impmanager = ImpressionManager(StrategyDebugMode(), telemetry_runtime_producer)
+        split_storage = InMemorySplitStorage()
+        segment_storage = InMemorySegmentStorage()
+        split_storage.update([from_raw(splits_json['splitChange1_1']['splits'][0])], [], -1)
+        recorder = StandardRecorder(impmanager, mocker.Mock(spec=EventStorage), impression_storage, telemetry_producer.get_telemetry_evaluation_producer(), telemetry_runtime_producer)
+        factory = SplitFactory(mocker.Mock(),
+            {'splits': split_storage,
+            'segments': segment_storage,
+            'impressions': impression_storage,
+            'events': mocker.Mock()},
+            mocker.Mock(),
+            recorder,
+            impmanager,
+            mocker.Mock(),
+            telemetry_producer,
+            telemetry_producer.get_telemetry_init_producer(),
+            mocker.Mock()
+        )
+        factory._telemetry_submitter = mocker.Mock()
+        factory._sync_manager.stop = mocker.Mock()
+        assert factory.evaluation_profile() is None
+
+        hook = mocker.Mock()
+        factory._evaluation_profiler = EvaluationProfiler(1, hook)
+        client = Client(factory, recorder, True)
+        assert client.get_treatment('key', 'SPLIT_2') == 'on'
+        assert client.get_treatments('key', ['SPLIT_2']) == {'SPLIT_2': 'on'}
+
+        stages = [EvaluationStage.VALIDATE, EvaluationStage.FETCH_FLAGS, EvaluationStage.FETCH_SEGMENTS,
+                  EvaluationStage.EVALUATE, EvaluationStage.RECORD_IMPRESSIONS]
+        assert [call[1][0] for call in hook.mock_calls] == [MethodExceptionsAndLatencies.TREATMENT, MethodExceptionsAndLatencies.TREATMENTS]
+        for call in hook.mock_calls:
+            assert [stage for stage, _, _ in call[1][1]] == stages
+        assert set(factory.evaluation_profile()) == set(stage.value for stage in stages)
+        assert factory.evaluation_profile()['evaluate']['count'] == 2
+
+        factory._evaluation_profiler = EvaluationProfiler(0.000001, hook)
+        hook.reset_mock()
+        client = Client(factory, recorder, True)
+        mocker.patch('splitio.client.profiling.random.random', new=lambda: 0.5)
+        client.get_treatment('key', 'SPLIT_2')
+        assert hook.mock_calls == []
         factory.destroy()
 
+    def test_validated_input_cache(self, mocker):
+        """Test valid keys and flag names skip validation once seen, and the rest are always validated."""
+        client = Client(mocker.Mock(), mocker.Mock(), True)
+        validate_key = mocker.spy(input_validator, 'validate_key')
+        validate_name = mocker.spy(input_validator, 'validate_feature_flag_name')
+        method = MethodExceptionsAndLatencies.TREATMENT
+
+        assert client._validate_treatment_input('key', 'SPLIT_2', None, method) == ('key', None, 'SPLIT_2', None)
+        assert client._validate_treatment_input('key', 'SPLIT_2', {'a': 1}, method) == ('key', None, 'SPLIT_2', {'a': 1})
+        assert validate_key.call_count == 1
+        assert validate_name.call_count == 1
+
+        # converted, trimmed and Key inputs aren't cached, so they keep logging
+        assert client._validate_treatment_input(123, ' SPLIT_2 ', None, method) == ('123', None, 'SPLIT_2', None)
+        assert client._validate_treatment_input(123, ' SPLIT_2 ', None, method) == ('123', None, 'SPLIT_2', None)
+        assert client._validate_treatment_input(Key('key', 'bucket'), 'SPLIT_2', None, method) == ('key', 'bucket', 'SPLIT_2', None)
+        assert validate_key.call_count == 4
+        assert validate_name.call_count == 3
+        assert client._validated_keys == {'key'}
+        assert client._validated_flag_names == {'SPLIT_2'}
+
+        with pytest.raises(_InvalidInputError):
+            client._validate_treatment_input('', 'SPLIT_2', None, method)
+        with pytest.raises(_InvalidInputError):
+            client._validate_treatment_input('key', 'SPLIT_2', 'not a dict', method)
+        assert client._validated_keys == {'key'}
+
+        client._VALIDATED_INPUT_CACHE_SIZE = 2
+        client._validate_treatment_input('key2', 'SPLIT_2', None, method)
+        client._validate_treatment_input('key3', 'SPLIT_2', None, method)
+        assert client._validated_keys == {'key3'}
+
     @mock.patch('splitio.recorder.recorder.StandardRecorder.record_track_stats', side_effect=Exception())
     def test_telemetry_track_exception(self, mocker):
         split_storage = mocker.Mock(spec=SplitStorage)
@@ -1078,14 +1112,7 @@ class ClientAsyncTests(object):  # pylint: disable=too-few-public-methods
         await factory.block_until_ready(1)
         client = ClientAsync(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        client._evaluator.eval_with_context.return_value = {
-            'treatment': 'on',
-            'configurations': None,
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            },
-        }
+        client._evaluator.eval_with_context.return_value = EvaluationResult('on', None, 'some_label', 123)
         _logger = mocker.Mock()
         assert await client.get_treatment('some_key', 'SPLIT_2') == 'on'
         assert await impression_storage.pop_many(100) == [Impression('some_key', 'SPLIT_2', 'on', 'some_label', 123, None, 1000)]
@@ -1147,14 +1174,7 @@ class ClientAsyncTests(object):  # pylint: disable=too-few-public-methods
         await factory.block_until_ready(1)
         client = ClientAsync(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        client._evaluator.eval_with_context.return_value = {
-            'treatment': 'on',
-            'configurations': '{"some_config": True}',
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            }
-        }
+        client._evaluator.eval_with_context.return_value = EvaluationResult('on', '{"some_config": True}', 'some_label', 123)
         _logger = mocker.Mock()
         client._send_impression_to_listener = mocker.Mock()
         assert await client.get_treatment_with_config(
@@ -1221,14 +1241,7 @@ class ClientAsyncTests(object):  # pylint: disable=too-few-public-methods
         await factory.block_until_ready(1)
         client = ClientAsync(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        evaluation = {
-            'treatment': 'on',
-            'configurations': '{"color": "red"}',
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            }
-        }
+        evaluation = EvaluationResult('on', '{"color": "red"}', 'some_label', 123)
         client._evaluator.eval_many_with_context.return_value = {
             'SPLIT_2': evaluation,
             'SPLIT_1': evaluation
@@ -1298,14 +1311,7 @@ class ClientAsyncTests(object):  # pylint: disable=too-few-public-methods
         await factory.block_until_ready(1)
         client = ClientAsync(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        evaluation = {
-            'treatment': 'on',
-            'configurations': '{"color": "red"}',
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            }
-        }
+        evaluation = EvaluationResult('on', '{"color": "red"}', 'some_label', 123)
         client._evaluator.eval_many_with_context.return_value = {
             'SPLIT_2': evaluation,
             'SPLIT_1': evaluation
@@ -1375,14 +1381,7 @@ class ClientAsyncTests(object):  # pylint: disable=too-few-public-methods
         await factory.block_until_ready(1)
         client = ClientAsync(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        evaluation = {
-            'treatment': 'on',
-            'configurations': '{"color": "red"}',
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            }
-        }
+        evaluation = EvaluationResult('on', '{"color": "red"}', 'some_label', 123)
         client._evaluator.eval_many_with_context.return_value = {
             'SPLIT_2': evaluation,
             'SPLIT_1': evaluation
@@ -1451,14 +1450,7 @@ class ClientAsyncTests(object):  # pylint: disable=too-few-public-methods
         await factory.block_until_ready(1)
         client = ClientAsync(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        evaluation = {
-            'treatment': 'on',
-            'configurations': '{"color": "red"}',
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            }
-        }
+        evaluation = EvaluationResult('on', '{"color": "red"}', 'some_label', 123)
         client._evaluator.eval_many_with_context.return_value = {
             'SPLIT_1': evaluation,
             'SPLIT_2': evaluation
@@ -1532,14 +1524,7 @@ class ClientAsyncTests(object):  # pylint: disable=too-few-public-methods
         await factory.block_until_ready(1)
         client = ClientAsync(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        evaluation = {
-            'treatment': 'on',
-            'configurations': '{"color": "red"}',
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            }
-        }
+        evaluation = EvaluationResult('on', '{"color": "red"}', 'some_label', 123)
         client._evaluator.eval_many_with_context.return_value = {
             'SPLIT_1': evaluation,
             'SPLIT_2': evaluation
@@ -1613,14 +1598,7 @@ class ClientAsyncTests(object):  # pylint: disable=too-few-public-methods
         await factory.block_until_ready(1)
         client = ClientAsync(factory, recorder, True)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        evaluation = {
-            'treatment': 'on',
-            'configurations': '{"color": "red"}',
-            'impression': {
-                'label': 'some_label',
-                'change_number': 123
-            }
-        }
+        evaluation = EvaluationResult('on', '{"color": "red"}', 'some_label', 123)
         client._evaluator.eval_many_with_context.return_value = {
             'SPLIT_1': evaluation,
             'SPLIT_2': evaluation
@@ -1861,32 +1839,32 @@ class ClientAsyncTests(object):  # pylint: disable=too-few-public-methods
             pass
         client = ClientAsync(factory, recorder, True)
         assert await client.get_treatment('key', 'SPLIT_2') == 'on'
-        assert(telemetry_storage._method_latencies._treatment[0] == 1)
+        assert((await telemetry_storage._method_latencies.pop_all())['methodLatencies']['treatment'][5] == 1)
 
         await client.get_treatment_with_config('key', 'SPLIT_2')
-        assert(telemetry_storage._method_latencies._treatment_with_config[0] == 1)
+        assert((await telemetry_storage._method_latencies.pop_all())['methodLatencies']['treatment_with_config'][5] == 1)
 
         await client.get_treatments('key', ['SPLIT_2'])
-        assert(telemetry_storage._method_latencies._treatments[0] == 1)
+        assert((await telemetry_storage._method_latencies.pop_all())['methodLatencies']['treatments'][5] == 1)
 
         await client.get_treatments_by_flag_set('key', 'set_1')
-        assert(telemetry_storage._method_latencies._treatments_by_flag_set[0] == 1)
+        assert((await telemetry_storage._method_latencies.pop_all())['methodLatencies']['treatments_by_flag_set'][5] == 1)
 
         await client.get_treatments_by_flag_sets('key', ['set_1'])
-        assert(telemetry_storage._method_latencies._treatments_by_flag_sets[0] == 1)
+        assert((await telemetry_storage._method_latencies.pop_all())['methodLatencies']['treatments_by_flag_sets'][5] == 1)
 
         await client.get_treatments_with_config('key', ['SPLIT_2'])
-        assert(telemetry_storage._method_latencies._treatments_with_config[0] == 1)
+        assert((await telemetry_storage._method_latencies.pop_all())['methodLatencies']['treatments_with_config'][5] == 1)
 
         await client.get_treatments_with_config_by_flag_set('key', 'set_1')
-        assert(telemetry_storage._method_latencies._treatments_with_config_by_flag_set[0] == 1)
+        assert((await telemetry_storage._method_latencies.pop_all())['methodLatencies']['treatments_with_config_by_flag_set'][5] == 1)
 
         await client.get_treatments_with_config_by_flag_sets('key', ['set_1'])
-        assert(telemetry_storage._method_latencies._treatments_with_config_by_flag_sets[0] == 1)
+        assert((await telemetry_storage._method_latencies.pop_all())['methodLatencies']['treatments_with_config_by_flag_sets'][5] == 1)
 
         mocker.patch('splitio.client.client.utctime_ms', new=lambda: 1000)
         await client.track('key', 'tt', 'ev')
-        assert(telemetry_storage._method_latencies._track[0] == 1)
+        assert((await telemetry_storage._method_latencies.pop_all())['methodLatencies']['track'][5] == 1)
         await factory.destroy()
 
     @pytest.mark.asyncio
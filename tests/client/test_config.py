@@ -13,6 +13,7 @@ class ConfigSanitizationTests(object):
         assert (config._parse_operation_mode('some', {})) == ('standalone', 'memory')
         assert (config._parse_operation_mode('localhost', {})) == ('localhost', 'localhost')
         assert (config._parse_operation_mode('some', {'redisHost': 'x'})) == ('consumer', 'redis')
+        assert (config._parse_operation_mode('some', {'redisClusterNodes': [('x', 7000)]})) == ('consumer', 'redis')
         assert (config._parse_operation_mode('some', {'storageType': 'pluggable'})) == ('consumer', 'pluggable')
         assert (config._parse_operation_mode('some', {'storageType': 'custom2'})) == ('standalone', 'memory')
 
@@ -87,3 +88,20 @@ class ConfigSanitizationTests(object):
 
         processed = config.sanitize('some', {'httpAuthenticateScheme': 'NONE'})
         assert processed['httpAuthenticateScheme'] is config.AuthenticateScheme.NONE
+
+        processed = config.sanitize('some', {'evaluationProfilingRate': 0.01, 'evaluationProfilingHook': print})
+        assert processed['evaluationProfilingRate'] == 0.01
+        assert processed['evaluationProfilingHook'] is print
+
+        processed = config.sanitize('some', {'evaluationProfilingRate': 2, 'evaluationProfilingHook': 'hook'})
+        assert processed['evaluationProfilingRate'] == 0
+        assert processed['evaluationProfilingHook'] is None
+
+        processed = config.sanitize('some', {'impressionsSamplingByFlag': {'f1': 0.5, 'f2': 2, 'f3': 'x', 'f4': 0},
+                                             'impressionsRateLimit': 1000})
+        assert processed['impressionsSamplingByFlag'] == {'f1': 0.5, 'f4': 0}
+        assert processed['impressionsRateLimit'] == 1000
+
+        processed = config.sanitize('some', {'impressionsSamplingByFlag': ['f1'], 'impressionsRateLimit': 0})
+        assert processed['impressionsSamplingByFlag'] is None
+        assert processed['impressionsRateLimit'] is None
@@ -8,8 +8,9 @@ import threading
 import pytest
 from splitio.optional.loaders import asyncio
 from splitio.client.factory import get_factory, get_factory_async, SplitFactory, _INSTANTIATED_FACTORIES, Status,\
-    _LOGGER as _logger, SplitFactoryAsync
-from splitio.client.config import DEFAULT_CONFIG
+    _LOGGER as _logger, SplitFactoryAsync, _build_impressions_sampler, _use_redis_evaluation_script
+from splitio.client.config import DEFAULT_CONFIG, sanitize
+from splitio.engine.impressions.manager import Sampler
 from splitio.storage import redis, inmemmory, pluggable
 from splitio.tasks.util import asynctask
 from splitio.engine.impressions.impressions import Manager as ImpressionsManager
@@ -48,6 +49,30 @@ class SplitFactoryTests(object):
         assert factory._telemetry_init_producer._telemetry_storage._tel_config._flag_sets_invalid == 2
         factory.destroy()
 
+    def test_build_impressions_sampler(self):
+        """Test debug mode impressions are only sampled when sampling or a rate limit is set."""
+        assert _build_impressions_sampler(sanitize('some', {'impressionsMode': 'debug'})) is None
+        assert _build_impressions_sampler(sanitize('some', {'impressionsMode': 'optimized', 'dataSampling': 0.5})) is None
+
+        sampler = _build_impressions_sampler(sanitize('some', {'impressionsMode': 'debug', 'dataSampling': 0.01}))
+        assert isinstance(sampler, Sampler)
+        assert sampler._rate == 0.1
+        assert sampler._max_per_second is None
+
+        sampler = _build_impressions_sampler(sanitize('some', {'impressionsMode': 'debug', 'impressionsRateLimit': 100,
+                                                               'impressionsSamplingByFlag': {'f1': 0.2}}))
+        assert sampler._rate == 1
+        assert sampler._rates_by_flag == {'f1': 0.2}
+        assert sampler._max_per_second == 100
+
+    def test_use_redis_evaluation_script(self):
+        """Test the evaluation script is only used when enabled, and never with redis cluster."""
+        assert not _use_redis_evaluation_script({})
+        assert _use_redis_evaluation_script({'redisEvaluationScriptEnabled': True})
+        assert not _use_redis_evaluation_script({'redisEvaluationScriptEnabled': True,
+                                                 'redisClusterNodes': [{'host': 'localhost', 'port': 7000}],
+                                                 'redisClusterKeyHashTag': '{SPLITIO}'})
+
     def test_inmemory_client_creation_streaming_false(self, mocker):
         """Test that a client with in-memory storage is created correctly."""
 
@@ -189,7 +214,7 @@ class SplitFactoryTests(object):
         def _split_task_init_mock(self, synchronize_splits, period):
             self._task = split_async_task_mock
             self._period = period
-        mocker.patch('splitio.client.factory.SplitSynchronizationTask.__init__',
+        mocker.patch('splitio.tasks.split_sync.SplitSynchronizationTask.__init__',
                      new=_split_task_init_mock)
 
         segment_async_task_mock = mocker.Mock(spec=asynctask.AsyncTask)
@@ -198,7 +223,7 @@ class SplitFactoryTests(object):
         def _segment_task_init_mock(self, synchronize_segments, period):
             self._task = segment_async_task_mock
             self._period = period
-        mocker.patch('splitio.client.factory.SegmentSynchronizationTask.__init__',
+        mocker.patch('splitio.tasks.segment_sync.SegmentSynchronizationTask.__init__',
                      new=_segment_task_init_mock)
 
         imp_async_task_mock = mocker.Mock(spec=asynctask.AsyncTask)
@@ -207,7 +232,7 @@ class SplitFactoryTests(object):
         def _imppression_task_init_mock(self, synchronize_impressions, period):
             self._period = period
             self._task = imp_async_task_mock
-        mocker.patch('splitio.client.factory.ImpressionsSyncTask.__init__',
+        mocker.patch('splitio.tasks.impressions_sync.ImpressionsSyncTask.__init__',
                      new=_imppression_task_init_mock)
 
         evt_async_task_mock = mocker.Mock(spec=asynctask.AsyncTask)
@@ -216,14 +241,14 @@ class SplitFactoryTests(object):
         def _event_task_init_mock(self, synchronize_events, period):
             self._period = period
             self._task = evt_async_task_mock
-        mocker.patch('splitio.client.factory.EventsSyncTask.__init__', new=_event_task_init_mock)
+        mocker.patch('splitio.tasks.events_sync.EventsSyncTask.__init__', new=_event_task_init_mock)
 
         imp_count_async_task_mock = mocker.Mock(spec=asynctask.AsyncTask)
         imp_count_async_task_mock.stop.side_effect = stop_mock
 
         def _imppression_count_task_init_mock(self, synchronize_counters):
             self._task = imp_count_async_task_mock
-        mocker.patch('splitio.client.factory.ImpressionsCountSyncTask.__init__',
+        mocker.patch('splitio.tasks.impressions_sync.ImpressionsCountSyncTask.__init__',
                      new=_imppression_count_task_init_mock)
 
         telemetry_async_task_mock = mocker.Mock(spec=asynctask.AsyncTask)
@@ -231,7 +256,7 @@ class SplitFactoryTests(object):
 
         def _telemetry_task_init_mock(self, synchronize_telemetry, synchronize_telemetry2):
             self._task = telemetry_async_task_mock
-        mocker.patch('splitio.client.factory.TelemetrySyncTask.__init__',
+        mocker.patch('splitio.tasks.telemetry_sync.TelemetrySyncTask.__init__',
                      new=_telemetry_task_init_mock)
 
         split_sync = mocker.Mock(spec=SplitSynchronizer)
@@ -290,7 +315,7 @@ class SplitFactoryTests(object):
         def _split_task_init_mock(self, synchronize_splits, period):
             self._task = split_async_task_mock
             self._period = period
-        mocker.patch('splitio.client.factory.SplitSynchronizationTask.__init__',
+        mocker.patch('splitio.tasks.split_sync.SplitSynchronizationTask.__init__',
                      new=_split_task_init_mock)
 
         segment_async_task_mock = mocker.Mock(spec=asynctask.AsyncTask)
@@ -299,7 +324,7 @@ class SplitFactoryTests(object):
         def _segment_task_init_mock(self, synchronize_segments, period):
             self._task = segment_async_task_mock
             self._period = period
-        mocker.patch('splitio.client.factory.SegmentSynchronizationTask.__init__',
+        mocker.patch('splitio.tasks.segment_sync.SegmentSynchronizationTask.__init__',
                      new=_segment_task_init_mock)
 
         imp_async_task_mock = mocker.Mock(spec=asynctask.AsyncTask)
@@ -308,7 +333,7 @@ class SplitFactoryTests(object):
         def _imppression_task_init_mock(self, synchronize_impressions, period):
             self._period = period
             self._task = imp_async_task_mock
-        mocker.patch('splitio.client.factory.ImpressionsSyncTask.__init__',
+        mocker.patch('splitio.tasks.impressions_sync.ImpressionsSyncTask.__init__',
                      new=_imppression_task_init_mock)
 
         evt_async_task_mock = mocker.Mock(spec=asynctask.AsyncTask)
@@ -317,14 +342,14 @@ class SplitFactoryTests(object):
         def _event_task_init_mock(self, synchronize_events, period):
             self._period = period
             self._task = evt_async_task_mock
-        mocker.patch('splitio.client.factory.EventsSyncTask.__init__', new=_event_task_init_mock)
+        mocker.patch('splitio.tasks.events_sync.EventsSyncTask.__init__', new=_event_task_init_mock)
 
         imp_count_async_task_mock = mocker.Mock(spec=asynctask.AsyncTask)
         imp_count_async_task_mock.stop.side_effect = stop_mock
 
         def _imppression_count_task_init_mock(self, synchronize_counters):
             self._task = imp_count_async_task_mock
-        mocker.patch('splitio.client.factory.ImpressionsCountSyncTask.__init__',
+        mocker.patch('splitio.tasks.impressions_sync.ImpressionsCountSyncTask.__init__',
                      new=_imppression_count_task_init_mock)
 
         telemetry_async_task_mock = mocker.Mock(spec=asynctask.AsyncTask)
@@ -332,7 +357,7 @@ class SplitFactoryTests(object):
 
         def _telemetry_task_init_mock(self, synchronize_telemetry, synchronize_telemetry2):
             self._task = telemetry_async_task_mock
-        mocker.patch('splitio.client.factory.TelemetrySyncTask.__init__',
+        mocker.patch('splitio.tasks.telemetry_sync.TelemetrySyncTask.__init__',
                      new=_telemetry_task_init_mock)
 
         split_sync = mocker.Mock(spec=SplitSynchronizer)
@@ -785,7 +810,7 @@ class SplitFactoryAsyncTests(object):
         def _split_task_init_mock(self, synchronize_splits, period):
             self._task = split_async_task_mock
             self._period = period
-        mocker.patch('splitio.client.factory.SplitSynchronizationTaskAsync.__init__',
+        mocker.patch('splitio.tasks.split_sync.SplitSynchronizationTaskAsync.__init__',
                      new=_split_task_init_mock)
 
         segment_async_task_mock = mocker.Mock(spec=asynctask.AsyncTaskAsync)
@@ -794,7 +819,7 @@ class SplitFactoryAsyncTests(object):
         def _segment_task_init_mock(self, synchronize_segments, period):
             self._task = segment_async_task_mock
             self._period = period
-        mocker.patch('splitio.client.factory.SegmentSynchronizationTaskAsync.__init__',
+        mocker.patch('splitio.tasks.segment_sync.SegmentSynchronizationTaskAsync.__init__',
                      new=_segment_task_init_mock)
 
         imp_async_task_mock = mocker.Mock(spec=asynctask.AsyncTaskAsync)
@@ -803,7 +828,7 @@ class SplitFactoryAsyncTests(object):
         def _imppression_task_init_mock(self, synchronize_impressions, period):
             self._period = period
             self._task = imp_async_task_mock
-        mocker.patch('splitio.client.factory.ImpressionsSyncTaskAsync.__init__',
+        mocker.patch('splitio.tasks.impressions_sync.ImpressionsSyncTaskAsync.__init__',
                      new=_imppression_task_init_mock)
 
         evt_async_task_mock = mocker.Mock(spec=asynctask.AsyncTaskAsync)
@@ -812,14 +837,14 @@ class SplitFactoryAsyncTests(object):
         def _event_task_init_mock(self, synchronize_events, period):
             self._period = period
             self._task = evt_async_task_mock
-        mocker.patch('splitio.client.factory.EventsSyncTaskAsync.__init__', new=_event_task_init_mock)
+        mocker.patch('splitio.tasks.events_sync.EventsSyncTaskAsync.__init__', new=_event_task_init_mock)
 
         imp_count_async_task_mock = mocker.Mock(spec=asynctask.AsyncTaskAsync)
         imp_count_async_task_mock.stop.side_effect = stop_mock
 
         def _imppression_count_task_init_mock(self, synchronize_counters):
             self._task = imp_count_async_task_mock
-        mocker.patch('splitio.client.factory.ImpressionsCountSyncTaskAsync.__init__',
+        mocker.patch('splitio.tasks.impressions_sync.ImpressionsCountSyncTaskAsync.__init__',
                      new=_imppression_count_task_init_mock)
 
         telemetry_async_task_mock = mocker.Mock(spec=asynctask.AsyncTaskAsync)
@@ -827,7 +852,7 @@ class SplitFactoryAsyncTests(object):
 
         def _telemetry_task_init_mock(self, synchronize_telemetry, synchronize_telemetry2):
             self._task = telemetry_async_task_mock
-        mocker.patch('splitio.client.factory.TelemetrySyncTaskAsync.__init__',
+        mocker.patch('splitio.tasks.telemetry_sync.TelemetrySyncTaskAsync.__init__',
                      new=_telemetry_task_init_mock)
 
         split_sync = mocker.Mock(spec=SplitSynchronizerAsync)
@@ -3572,6 +3572,14 @@ class PluggableInputValidationTests(object):  #pylint: disable=too-few-public-me
         def expire(self, key, value, till):
             print(key)
 
+    class mock_adapter5(mock_adapter4):
+        def item_contains_many(self, keys):
+            print(keys)
+
+    class mock_adapter6(mock_adapter4):
+        def item_contains_many(self, keys, item):
+            print(keys)
+
     def test_validate_pluggable_adapter(self):
         # missing storageWrapper config parameter
         assert(not input_validator.validate_pluggable_adapter({'storageType': 'pluggable'}))
@@ -3600,6 +3608,12 @@ class PluggableInputValidationTests(object):  #pylint: disable=too-few-public-me
         # using non-string type prefix should not pass
         assert(not input_validator.validate_pluggable_adapter({'storageType': 'pluggable', 'storagePrefix': 'myprefix', 123: self.mock_adapter4()}))
 
+        # optional batch method with less than required arguments should not pass
+        assert(not input_validator.validate_pluggable_adapter({'storageType': 'pluggable', 'storageWrapper': self.mock_adapter5()}))
+
+        # optional batch method with the required arguments should pass
+        assert(input_validator.validate_pluggable_adapter({'storageType': 'pluggable', 'storageWrapper': self.mock_adapter6()}))
+
     def test_sanitize_flag_sets(self):
         """Test sanitization for flag sets."""
         flag_sets = input_validator.validate_flag_sets([' set1', 'set2 ', 'set3'], 'm')
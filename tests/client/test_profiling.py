@@ -0,0 +1,71 @@
+"""Evaluation profiling tests."""
+# pylint: disable=no-self-use,protected-access
+import pytest
+
+from splitio.client.profiling import EvaluationProfiler, OpenTelemetryProfilingHook
+from splitio.engine.profiling import EvaluationStage, EvaluationProfile
+from splitio.models.telemetry import MethodExceptionsAndLatencies
+
+
+class EvaluationProfilerTests(object):
+    """Evaluation profiler test cases."""
+
+    def test_profile(self, mocker):
+        """Test stages are closed in order and reported in epoch nanoseconds."""
+        clock = iter([1000, 3000, 7000, 8000])
+        mocker.patch('splitio.engine.profiling.perf_counter_ns', new=lambda: next(clock))
+        mocker.patch('splitio.engine.profiling.time_ns', new=lambda: 1000000)
+        profile = EvaluationProfile(MethodExceptionsAndLatencies.TREATMENT)
+        profile.mark(EvaluationStage.VALIDATE)
+        profile.mark(EvaluationStage.EVALUATE)
+        assert profile.stages() == [(EvaluationStage.VALIDATE, 993000, 995000),
+                                    (EvaluationStage.EVALUATE, 995000, 999000)]
+
+    def test_sampling_and_stats(self, mocker):
+        """Test only sampled calls are profiled and their stages aggregated."""
+        profiler = EvaluationProfiler(0.25)
+        mocker.patch('splitio.client.profiling.random.random', new=lambda: 0.5)
+        assert profiler.sample(MethodExceptionsAndLatencies.TREATMENT) is None
+        mocker.patch('splitio.client.profiling.random.random', new=lambda: 0.1)
+        assert profiler.sample(MethodExceptionsAndLatencies.TREATMENT) is not None
+
+        for elapsed in [2000, 6000]:
+            profile = mocker.Mock()
+            profile.method = MethodExceptionsAndLatencies.TREATMENT
+            profile.stages.return_value = [(EvaluationStage.EVALUATE, 1000, 1000 + elapsed)]
+            profiler.finish(profile)
+        assert profiler.stats() == {'evaluate': {'count': 2, 'mean': 4.0, 'max': 6.0}}
+
+    def test_hook(self, mocker):
+        """Test the hook gets every sampled call and its failures don't propagate."""
+        hook = mocker.Mock()
+        profiler = EvaluationProfiler(1, hook)
+        profile = profiler.sample(MethodExceptionsAndLatencies.TREATMENTS)
+        profile.mark(EvaluationStage.VALIDATE)
+        profiler.finish(profile)
+        assert hook.mock_calls == [mocker.call(MethodExceptionsAndLatencies.TREATMENTS, mocker.ANY)]
+        assert [stage for stage, _, _ in hook.mock_calls[0][1][1]] == [EvaluationStage.VALIDATE]
+
+        hook.side_effect = Exception('some')
+        profiler.finish(profile)
+        assert profiler.stats()['validate']['count'] == 2
+
+    def test_opentelemetry_hook(self):
+        """Test sampled calls are reported as spans with a child span per stage."""
+        pytest.importorskip('opentelemetry.sdk')
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        hook = OpenTelemetryProfilingHook(provider.get_tracer('splitio'))
+        hook(MethodExceptionsAndLatencies.TREATMENT, [(EvaluationStage.VALIDATE, 1000, 2000),
+                                                      (EvaluationStage.EVALUATE, 2000, 5000)])
+
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        assert set(spans) == {'split.get_treatment', 'split.validate', 'split.evaluate'}
+        assert (spans['split.get_treatment'].start_time, spans['split.get_treatment'].end_time) == (1000, 5000)
+        assert (spans['split.evaluate'].start_time, spans['split.evaluate'].end_time) == (2000, 5000)
+        assert spans['split.validate'].parent.span_id == spans['split.get_treatment'].context.span_id
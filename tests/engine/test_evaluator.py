@@ -7,6 +7,7 @@ from splitio.models.grammar.condition import Condition, ConditionType
 from splitio.models.impressions import Label
 from splitio.engine import evaluator, splitters
 from splitio.engine.evaluator import EvaluationContext
+from splitio.engine.profiling import EvaluationStage
 
 class EvaluatorTests(object):
     """Test evaluator behavior."""
@@ -29,10 +30,10 @@ class EvaluatorTests(object):
         mocked_split.get_configurations_for.return_value = '{"some_property": 123}'
         ctx = EvaluationContext(flags={'some': mocked_split}, segment_memberships=set())
         result = e.eval_with_context('some_key', 'some_bucketing_key', 'some', {}, ctx)
-        assert result['treatment'] == 'off'
-        assert result['configurations'] == '{"some_property": 123}'
-        assert result['impression']['change_number'] == 123
-        assert result['impression']['label'] == Label.KILLED
+        assert result.treatment == 'off'
+        assert result.configurations == '{"some_property": 123}'
+        assert result.change_number == 123
+        assert result.label == Label.KILLED
         assert mocked_split.get_configurations_for.mock_calls == [mocker.call('off')]
 
     def test_evaluate_treatment_ok(self, mocker):
@@ -47,10 +48,10 @@ class EvaluatorTests(object):
         mocked_split.get_configurations_for.return_value = '{"some_property": 123}'
         ctx = EvaluationContext(flags={'some': mocked_split}, segment_memberships=set())
         result = e.eval_with_context('some_key', 'some_bucketing_key', 'some', {}, ctx)
-        assert result['treatment'] == 'on'
-        assert result['configurations'] == '{"some_property": 123}'
-        assert result['impression']['change_number'] == 123
-        assert result['impression']['label'] == 'some_label'
+        assert result.treatment == 'on'
+        assert result.configurations == '{"some_property": 123}'
+        assert result.change_number == 123
+        assert result.label == 'some_label'
         assert mocked_split.get_configurations_for.mock_calls == [mocker.call('on')]
 
 
@@ -66,12 +67,20 @@ class EvaluatorTests(object):
         mocked_split.get_configurations_for.return_value = None
         ctx = EvaluationContext(flags={'some': mocked_split}, segment_memberships=set())
         result = e.eval_with_context('some_key', 'some_bucketing_key', 'some', {}, ctx)
-        assert result['treatment'] == 'on'
-        assert result['configurations'] == None
-        assert result['impression']['change_number'] == 123
-        assert result['impression']['label'] == 'some_label'
+        assert result.treatment == 'on'
+        assert result.configurations == None
+        assert result.change_number == 123
+        assert result.label == 'some_label'
         assert mocked_split.get_configurations_for.mock_calls == [mocker.call('on')]
 
+    def test_evaluate_treatment_missing_split(self, mocker):
+        """Test that a missing split returns the shared control result."""
+        e = self._build_evaluator_with_mocks(mocker)
+        ctx = EvaluationContext(flags={}, segment_memberships=set())
+        result = e.eval_with_context('some_key', 'some_bucketing_key', 'some', {}, ctx)
+        assert result == evaluator.EvaluationResult(evaluator.CONTROL, None, Label.SPLIT_NOT_FOUND, -1)
+        assert e.eval_with_context('other_key', None, 'other', {}, ctx) is result
+
     def test_evaluate_treatments(self, mocker):
         """Test that a missing split logs and returns CONTROL."""
         e = self._build_evaluator_with_mocks(mocker)
@@ -94,15 +103,15 @@ class EvaluatorTests(object):
         ctx = EvaluationContext(flags={'feature2': mocked_split, 'feature4': mocked_split2}, segment_memberships=set())
         results = e.eval_many_with_context('some_key', 'some_bucketing_key', ['feature2', 'feature4'], {}, ctx)
         result = results['feature4']
-        assert result['configurations'] == None
-        assert result['treatment'] == 'on'
-        assert result['impression']['change_number'] == 123
-        assert result['impression']['label'] == 'some_label'
+        assert result.configurations == None
+        assert result.treatment == 'on'
+        assert result.change_number == 123
+        assert result.label == 'some_label'
         result = results['feature2']
-        assert result['configurations'] == '{"some_property": 123}'
-        assert result['treatment'] == 'on'
-        assert result['impression']['change_number'] == 123
-        assert result['impression']['label'] == 'some_label'
+        assert result.configurations == '{"some_property": 123}'
+        assert result.treatment == 'on'
+        assert result.change_number == 123
+        assert result.label == 'some_label'
 
     def test_get_gtreatment_for_split_no_condition_matches(self, mocker):
         """Test no condition matches."""
@@ -134,3 +143,34 @@ class EvaluatorTests(object):
         treatment, label = e._treatment_for_flag(mocked_split, 'some_key', 'some_bucketing', {}, EvaluationContext(None, None))
         assert treatment == 'on'
         assert label == 'some_label'
+
+
+class EvaluationDataFactoryTests(object):
+    """Test evaluation data factory behavior."""
+
+    def test_context_for_evaluation_storage(self, mocker):
+        """Test the evaluation storage is used when available and storages are the fallback."""
+        split_storage = mocker.Mock()
+        segment_storage = mocker.Mock()
+        evaluation_storage = mocker.Mock()
+        mocked_split = mocker.Mock(spec=Split)
+        evaluation_storage.fetch_evaluation_data.return_value = ({'some': mocked_split}, {'segment1': True})
+        factory = evaluator.EvaluationDataFactory(split_storage, segment_storage, evaluation_storage)
+
+        ctx = factory.context_for('some_key', ['some'])
+        assert ctx.flags == {'some': mocked_split}
+        assert ctx.segment_memberships == {'segment1': True}
+        assert evaluation_storage.fetch_evaluation_data.mock_calls == [mocker.call('some_key', ['some'])]
+        assert split_storage.fetch_many.mock_calls == []
+
+        evaluation_storage.fetch_evaluation_data.return_value = None
+        mocked_split.conditions = []
+        split_storage.fetch_many.return_value = {'some': mocked_split}
+        ctx = factory.context_for('some_key', ['some'])
+        assert ctx.flags == {'some': mocked_split}
+        assert ctx.segment_memberships == {}
+        assert split_storage.fetch_many.mock_calls == [mocker.call(['some'])]
+
+        profile = mocker.Mock()
+        factory.context_for('some_key', ['some'], profile)
+        assert profile.mark.mock_calls == [mocker.call(EvaluationStage.FETCH_FLAGS), mocker.call(EvaluationStage.FETCH_SEGMENTS)]
@@ -3,7 +3,7 @@ from datetime import datetime
 import unittest.mock as mock
 import pytest
 from splitio.engine.impressions.impressions import Manager, ImpressionsMode
-from splitio.engine.impressions.manager import Hasher, Observer, Counter, truncate_time
+from splitio.engine.impressions.manager import Hasher, Observer, Counter, Sampler, truncate_time
 from splitio.engine.impressions.strategies import StrategyDebugMode, StrategyOptimizedMode, StrategyNoneMode
 from splitio.models.impressions import Impression
 from splitio.client.listener import ImpressionListenerWrapper
@@ -64,6 +64,37 @@ class ImpressionObserverTests(object):
                 == Impression('key1', 'f1', 'on', 'killed', 123, None, 456))
 
 
+class ImpressionSamplerTests(object):
+    """Impression sampler test cases."""
+
+    def test_sampling(self, mocker):
+        """Test impressions are kept at their flag's rate, and carry it."""
+        sampler = Sampler(0.5, {'f2': 0.1, 'f3': 1})
+        mocker.patch('splitio.engine.impressions.manager.random.random', new=lambda: 0.3)
+        imps = [(Impression('k1', 'f1', 'on', 'l1', 123, None, 456), None),
+                (Impression('k1', 'f2', 'on', 'l1', 123, None, 456), None),
+                (Impression('k1', 'f3', 'on', 'l1', 123, None, 456), {'a': 1})]
+        assert sampler.sample(imps) == [(Impression('k1', 'f1', 'on', 'l1', 123, None, 456, None, 0.5), None),
+                                        (Impression('k1', 'f3', 'on', 'l1', 123, None, 456), {'a': 1})]
+
+        mocker.patch('splitio.engine.impressions.manager.random.random', new=lambda: 0.05)
+        assert [imp.sampling_rate for imp, _ in sampler.sample(imps)] == [0.5, 0.1, None]
+
+    def test_rate_limit(self, mocker):
+        """Test the token bucket caps the impressions kept and refills over time."""
+        now = [100.0]
+        mocker.patch('splitio.engine.impressions.manager.time.monotonic', new=lambda: now[0])
+        sampler = Sampler(max_per_second=3)
+        imps = [(Impression('k%d' % i, 'f1', 'on', 'l1', 123, None, 456), None) for i in range(5)]
+        assert sampler.sample(imps) == imps[:3]
+        assert sampler.sample(imps) == []
+
+        now[0] += 0.5
+        assert sampler.sample(imps) == imps[:1]
+        now[0] += 10
+        assert sampler.sample(imps) == imps[:3]
+
+
 class ImpressionCounterTests(object):
     """Impression counter test cases."""
 
@@ -227,6 +258,22 @@ class ImpressionManagerTests(object):
 
         assert len(manager._strategy._observer._cache._data) == 3  # distinct impressions seen
 
+    def test_standalone_debug_sampled(self, mocker):
+        """Test impressions are sampled before being observed in debug mode."""
+        sampler = Sampler(0.5, max_per_second=2)
+        mocker.patch('splitio.engine.impressions.manager.random.random', new=lambda: 0.4)
+        manager = Manager(StrategyDebugMode(sampler), mocker.Mock())
+        imps, deduped, listen, for_counter, for_unique_keys_tracker = manager.process_impressions([
+            (Impression('k1', 'f1', 'on', 'l1', 123, None, 456), None),
+            (Impression('k1', 'f1', 'on', 'l1', 123, None, 457), None),
+            (Impression('k2', 'f1', 'on', 'l1', 123, None, 458), None)
+        ])
+        assert imps == [Impression('k1', 'f1', 'on', 'l1', 123, None, 456, None, 0.5),
+                        Impression('k1', 'f1', 'on', 'l1', 123, None, 457, 456, 0.5)]
+        assert deduped == 1
+        assert [imp for imp, _ in listen] == imps
+        assert len(manager._strategy._observer._cache._data) == 1
+
     def test_standalone_none(self, mocker):
         """Test impressions manager in none mode with sdk in standalone mode."""
 
@@ -1,8 +1,8 @@
 """BloomFilter unit tests."""
+import threading
 import pytest
 
 from splitio.engine.impressions.unique_keys_tracker import UniqueKeysTracker, UniqueKeysTrackerAsync
-from splitio.engine.filters import BloomFilter
 
 class UniqueKeysTrackerTests(object):
     """StandardRecorderTests test cases."""
@@ -11,9 +11,7 @@ class UniqueKeysTrackerTests(object):
         tracker = UniqueKeysTracker()
 
         assert(tracker._cache_size > 0)
-        assert(tracker._current_cache_size == 0)
-        assert(tracker._cache == {})
-        assert(isinstance(tracker._filter, BloomFilter))
+        assert(tracker.get_cache_info_and_pop_all() == ({}, 0))
 
         key1 = 'key1'
         key2 = 'key2'
@@ -25,27 +23,20 @@ class UniqueKeysTrackerTests(object):
         assert(tracker.track(key3, split1))
         assert(not tracker.track(key1, split1))
         assert(tracker.track(key2, split2))
+        assert(not tracker.track(key2, split2))
 
-        assert(tracker._filter.contains(split1+key1))
-        assert(not tracker._filter.contains(split1+key2))
-        assert(tracker._filter.contains(split2+key2))
-        assert(not tracker._filter.contains(split2+key1))
-        assert(key1 in tracker._cache[split1])
-        assert(key3 in tracker._cache[split1])
-        assert(key2 in tracker._cache[split2])
-        assert(not key3 in tracker._cache[split2])
+        cache, cache_size = tracker.get_cache_info_and_pop_all()
+        assert(sorted(cache[split1]) == [key1, key3])
+        assert(cache[split2] == [key2])
+        assert(cache_size == 3)
+        assert(tracker.get_cache_info_and_pop_all() == ({}, 0))
 
+        # keys popped are still filtered out until the filter is cleared
+        assert(not tracker.track(key1, split1))
         tracker.clear_filter()
-        assert(not tracker._filter.contains(split1+key1))
-        assert(not tracker._filter.contains(split2+key2))
-
-        cache_backup = tracker._cache.copy()
-        cache_size_backup = tracker._current_cache_size
-        cache, cache_size = tracker.get_cache_info_and_pop_all()
-        assert(cache_backup == cache)
-        assert(cache_size_backup == cache_size)
-        assert(tracker._current_cache_size == 0)
-        assert(tracker._cache == {})
+        assert(tracker.track(key1, split1))
+        assert(tracker.track(key2, split2))
+        assert(tracker.get_cache_info_and_pop_all() == ({split1: [key1], split2: [key2]}, 2))
 
     def test_cache_size(self, mocker):
         cache_size = 10
@@ -58,9 +49,58 @@ class UniqueKeysTrackerTests(object):
         for x in range(1, int(cache_size / 2) + 1):
             tracker.track('key' + str(x), split2)
 
-        assert(tracker._current_cache_size == (cache_size + (cache_size / 2)))
-        assert(len(tracker._cache[split1]) == cache_size)
-        assert(len(tracker._cache[split2]) == cache_size / 2)
+        cache, cache_size_popped = tracker.get_cache_info_and_pop_all()
+        assert(cache_size_popped == (cache_size + (cache_size / 2)))
+        assert(len(cache[split1]) == cache_size)
+        assert(len(cache[split2]) == cache_size / 2)
+
+    def test_queue_full_hook(self, mocker):
+        tracker = UniqueKeysTracker(10)
+        hook = mocker.Mock()
+        tracker.set_queue_full_hook(hook)
+        for x in range(10):
+            tracker.track('key' + str(x), 'feature1')
+        assert(hook.mock_calls == [])
+
+        tracker.track('key10', 'feature1')
+        assert(len(hook.mock_calls) == 1)
+        tracker.track('key11', 'feature1')
+        assert(len(hook.mock_calls) == 1)  # once until the keys are popped
+
+        tracker.get_cache_info_and_pop_all()
+        tracker.clear_filter()
+        for x in range(12, 23):
+            tracker.track('key' + str(x), 'feature1')
+        assert(len(hook.mock_calls) == 2)
+
+    def test_bounded_filter(self, mocker):
+        tracker = UniqueKeysTracker(50000)
+        filter_bytes = sum(len(stripe.bits) for stripe in tracker._stripes)
+        assert(len(tracker._stripes) == 16)
+
+        added = sum(1 for x in range(50000) if tracker.track('key' + str(x), 'feature1'))
+        assert(added > 49000)  # false positives drop only a few keys
+        assert(sum(len(stripe.bits) for stripe in tracker._stripes) == filter_bytes)
+        assert(tracker.get_cache_info_and_pop_all()[1] == added)
+
+    def test_concurrent_tracking(self, mocker):
+        tracker = UniqueKeysTracker(100000)
+
+        def track(offset):
+            for x in range(5000):
+                tracker.track('key' + str(x % 2000), 'feature' + str(offset % 2))
+
+        threads = [threading.Thread(target=track, args=(offset,)) for offset in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        cache, cache_size = tracker.get_cache_info_and_pop_all()
+        assert(set(cache) == {'feature0', 'feature1'})
+        assert(cache_size == sum(len(keys) for keys in cache.values()))
+        for keys in cache.values():
+            assert(len(keys) == len(set(keys)))  # no key is kept twice
 
 
 class UniqueKeysTrackerAsyncTests(object):
@@ -71,9 +111,7 @@ class UniqueKeysTrackerAsyncTests(object):
         tracker = UniqueKeysTrackerAsync()
 
         assert(tracker._cache_size > 0)
-        assert(tracker._current_cache_size == 0)
-        assert(tracker._cache == {})
-        assert(isinstance(tracker._filter, BloomFilter))
+        assert(await tracker.get_cache_info_and_pop_all() == ({}, 0))
 
         key1 = 'key1'
         key2 = 'key2'
@@ -85,27 +123,19 @@ class UniqueKeysTrackerAsyncTests(object):
         assert(await tracker.track(key3, split1))
         assert(not await tracker.track(key1, split1))
         assert(await tracker.track(key2, split2))
+        assert(not await tracker.track(key2, split2))
 
-        assert(tracker._filter.contains(split1+key1))
-        assert(not tracker._filter.contains(split1+key2))
-        assert(tracker._filter.contains(split2+key2))
-        assert(not tracker._filter.contains(split2+key1))
-        assert(key1 in tracker._cache[split1])
-        assert(key3 in tracker._cache[split1])
-        assert(key2 in tracker._cache[split2])
-        assert(not key3 in tracker._cache[split2])
+        cache, cache_size = await tracker.get_cache_info_and_pop_all()
+        assert(sorted(cache[split1]) == [key1, key3])
+        assert(cache[split2] == [key2])
+        assert(cache_size == 3)
+        assert(await tracker.get_cache_info_and_pop_all() == ({}, 0))
 
+        assert(not await tracker.track(key1, split1))
         await tracker.clear_filter()
-        assert(not tracker._filter.contains(split1+key1))
-        assert(not tracker._filter.contains(split2+key2))
-
-        cache_backup = tracker._cache.copy()
-        cache_size_backup = tracker._current_cache_size
-        cache, cache_size = await tracker.get_cache_info_and_pop_all()
-        assert(cache_backup == cache)
-        assert(cache_size_backup == cache_size)
-        assert(tracker._current_cache_size == 0)
-        assert(tracker._cache == {})
+        assert(await tracker.track(key1, split1))
+        assert(await tracker.track(key2, split2))
+        assert(await tracker.get_cache_info_and_pop_all() == ({split1: [key1], split2: [key2]}, 2))
 
     @pytest.mark.asyncio
     async def test_cache_size(self, mocker):
@@ -119,6 +149,21 @@ class UniqueKeysTrackerAsyncTests(object):
         for x in range(1, int(cache_size / 2) + 1):
             await tracker.track('key' + str(x), split2)
 
-        assert(tracker._current_cache_size == (cache_size + (cache_size / 2)))
-        assert(len(tracker._cache[split1]) == cache_size)
-        assert(len(tracker._cache[split2]) == cache_size / 2)
+        cache, cache_size_popped = await tracker.get_cache_info_and_pop_all()
+        assert(cache_size_popped == (cache_size + (cache_size / 2)))
+        assert(len(cache[split1]) == cache_size)
+        assert(len(cache[split2]) == cache_size / 2)
+
+    @pytest.mark.asyncio
+    async def test_queue_full_hook(self, mocker):
+        tracker = UniqueKeysTrackerAsync(10)
+        self.hook_calls = 0
+        async def hook():
+            self.hook_calls += 1
+        tracker.set_queue_full_hook(hook)
+        for x in range(10):
+            await tracker.track('key' + str(x), 'feature1')
+        assert(self.hook_calls == 0)
+
+        await tracker.track('key10', 'feature1')
+        assert(self.hook_calls == 1)
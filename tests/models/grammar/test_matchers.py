@@ -15,7 +15,7 @@ from splitio.models import splits
 from splitio.models.grammar import condition
 from splitio.models.grammar.matchers.utils.utils import Semver
 from splitio.storage import SegmentStorage
-from splitio.engine.evaluator import Evaluator, EvaluationContext
+from splitio.engine.evaluator import Evaluator, EvaluationContext, EvaluationResult
 from tests.integration import splits_json
 
 class MatcherTestsBase(object):
@@ -781,10 +781,10 @@ class DependencyMatcherTests(MatcherTestsBase):
         cond = condition.from_raw(splits_json["splitChange1_1"]["splits"][0]['conditions'][0])
         split = splits.from_raw(splits_json["splitChange1_1"]["splits"][0])
 
-        evaluator.eval_with_context.return_value = {'treatment': 'on'}
+        evaluator.eval_with_context.return_value = EvaluationResult('on', None, 'some_label', 123)
         assert parsed.evaluate('SPLIT_2', {}, {'evaluator': evaluator, 'ec': [{'flags': [split], 'segment_memberships': {}}]}) is True
 
-        evaluator.eval_with_context.return_value = {'treatment': 'off'}
+        evaluator.eval_with_context.return_value = EvaluationResult('off', None, 'some_label', 123)
         assert parsed.evaluate('SPLIT_2', {}, {'evaluator': evaluator, 'ec': [{'flags': [split], 'segment_memberships': {}}]}) is False
 
         assert evaluator.eval_with_context.mock_calls == [
@@ -1,12 +1,14 @@
 """Telemetry model test module."""
 import os
 import random
+import threading
 import pytest
 
 from splitio.models.telemetry import StorageType, OperationMode, MethodLatencies, MethodExceptions, \
     HTTPLatencies, HTTPErrors, LastSynchronization, TelemetryCounters, TelemetryConfig, \
     StreamingEvent, StreamingEvents, MethodExceptionsAsync, HTTPLatenciesAsync, HTTPErrorsAsync, LastSynchronizationAsync, \
-    TelemetryCountersAsync, TelemetryConfigAsync, StreamingEventsAsync, MethodLatenciesAsync, UpdateFromSSE
+    TelemetryCountersAsync, TelemetryConfigAsync, StreamingEventsAsync, MethodLatenciesAsync, UpdateFromSSE, \
+    MethodLatencyHistograms
 
 import splitio.models.telemetry as ModelTelemetry
 
@@ -49,55 +51,19 @@ class TelemetryModelTests(object):
         method_latencies.pop_all() # should not raise exception
         for method in ModelTelemetry.MethodExceptionsAndLatencies:
             method_latencies.add_latency(method, 50)
-            if method.value == 'treatment':
-                assert(method_latencies._treatment[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'treatments':
-                assert(method_latencies._treatments[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'treatment_with_config':
-                assert(method_latencies._treatment_with_config[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'treatments_with_config':
-                assert(method_latencies._treatments_with_config[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'treatments_by_flag_set':
-                assert(method_latencies._treatments_by_flag_set[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'treatments_by_flag_sets':
-                assert(method_latencies._treatments_by_flag_sets[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'treatments_with_config_by_flag_set':
-                assert(method_latencies._treatments_with_config_by_flag_set[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'treatments_with_config_by_flag_sets':
-                assert(method_latencies._treatments_with_config_by_flag_sets[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'track':
-                assert(method_latencies._track[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-
             method_latencies.add_latency(method, 50000000)
-            if method.value == 'treatment':
-                assert(method_latencies._treatment[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            if method.value == 'treatments':
-                assert(method_latencies._treatments[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            if method.value == 'treatment_with_config':
-                assert(method_latencies._treatment_with_config[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            if method.value == 'treatments_with_config':
-                assert(method_latencies._treatments_with_config[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            elif method.value == 'treatments_by_flag_set':
-                assert(method_latencies._treatments_by_flag_set[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            elif method.value == 'treatments_by_flag_sets':
-                assert(method_latencies._treatments_by_flag_sets[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            elif method.value == 'treatments_with_config_by_flag_set':
-                assert(method_latencies._treatments_with_config_by_flag_set[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            elif method.value == 'treatments_with_config_by_flag_sets':
-                assert(method_latencies._treatments_with_config_by_flag_sets[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            if method.value == 'track':
-                assert(method_latencies._track[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-
-        method_latencies.pop_all()
-        assert(method_latencies._track == [0] * 23)
-        assert(method_latencies._treatment == [0] * 23)
-        assert(method_latencies._treatments == [0] * 23)
-        assert(method_latencies._treatment_with_config == [0] * 23)
-        assert(method_latencies._treatments_with_config == [0] * 23)
-        assert(method_latencies._treatments_by_flag_set == [0] * 23)
-        assert(method_latencies._treatments_by_flag_sets == [0] * 23)
-        assert(method_latencies._treatments_with_config_by_flag_set == [0] * 23)
-        assert(method_latencies._treatments_with_config_by_flag_sets == [0] * 23)
+        latencies = (method_latencies.pop_all())['methodLatencies']
+        assert(len(latencies) == 9)
+        for method_latency in latencies.values():
+            assert(method_latency[ModelTelemetry.get_latency_bucket_index(50)] == 1)
+            assert(method_latency[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
+            assert(sum(method_latency) == 2)
+
+        method_latencies.add_bucket(ModelTelemetry.MethodExceptionsAndLatencies.TRACK, 5)
+        method_latencies.add_bucket(ModelTelemetry.MethodExceptionsAndLatencies.METHOD_EXCEPTIONS, 5)
+        latencies = (method_latencies.pop_all())['methodLatencies']
+        assert(latencies['track'] == [0] * 5 + [1] + [0] * 17)
+        assert((method_latencies.pop_all())['methodLatencies']['track'] == [0] * 23)
 
         method_latencies.add_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT, 10)
         [method_latencies.add_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS, 20) for i in range(2)]
@@ -124,26 +90,19 @@ class TelemetryModelTests(object):
 
         http_latencies.pop_all() # should not raise exception
         for resource in ModelTelemetry.HTTPExceptionsAndLatencies:
-            if self._get_http_latency(resource, http_latencies) == None:
+            if self._pop_http_latency(resource, http_latencies) == None:
                 continue
             http_latencies.add_latency(resource, 50)
-            assert(self._get_http_latency(resource, http_latencies)[ModelTelemetry.get_latency_bucket_index(50)] == 1)
+            assert(self._pop_http_latency(resource, http_latencies)[ModelTelemetry.get_latency_bucket_index(50)] == 1)
             http_latencies.add_latency(resource, 50000000)
-            assert(self._get_http_latency(resource, http_latencies)[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
+            assert(self._pop_http_latency(resource, http_latencies)[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
             for j in range(10):
                 latency = random.randint(1001, 4987885)
-                current_count = self._get_http_latency(resource, http_latencies)[ModelTelemetry.get_latency_bucket_index(latency)]
                 [http_latencies.add_latency(resource, latency) for i in range(2)]
-                assert(self._get_http_latency(resource, http_latencies)[ModelTelemetry.get_latency_bucket_index(latency)] == 2 + current_count)
+                assert(self._pop_http_latency(resource, http_latencies)[ModelTelemetry.get_latency_bucket_index(latency)] == 2)
 
         http_latencies.pop_all()
-        assert(http_latencies._event == [0] * 23)
-        assert(http_latencies._impression == [0] * 23)
-        assert(http_latencies._impression_count == [0] * 23)
-        assert(http_latencies._segment == [0] * 23)
-        assert(http_latencies._split == [0] * 23)
-        assert(http_latencies._telemetry == [0] * 23)
-        assert(http_latencies._token == [0] * 23)
+        assert(all(latencies == [0] * 23 for latencies in (http_latencies.pop_all())['httpLatencies'].values()))
 
         http_latencies.add_latency(ModelTelemetry.HTTPExceptionsAndLatencies.SPLIT, 10)
         [http_latencies.add_latency(ModelTelemetry.HTTPExceptionsAndLatencies.IMPRESSION, i) for i in [10, 20]]
@@ -155,23 +114,53 @@ class TelemetryModelTests(object):
         latencies = http_latencies.pop_all()
         assert(latencies == {'httpLatencies': {'split': [1] + [0] * 22, 'segment': [1] + [0] * 22, 'impression': [2] + [0] * 22, 'impressionCount': [1] + [0] * 22, 'event': [1] + [0] * 22, 'telemetry': [1] + [0] * 22, 'token': [2] + [0] * 22}})
 
-    def _get_http_latency(self, resource, storage):
-        if resource == ModelTelemetry.HTTPExceptionsAndLatencies.SPLIT:
-            return storage._split
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.SEGMENT:
-            return storage._segment
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.IMPRESSION:
-            return storage._impression
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.IMPRESSION_COUNT:
-            return storage._impression_count
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.EVENT:
-            return storage._event
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.TELEMETRY:
-            return storage._telemetry
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.TOKEN:
-            return storage._token
-        else:
-            return
+    def _pop_http_latency(self, resource, storage):
+        return (storage.pop_all())['httpLatencies'].get(resource.value)
+
+    def test_method_latencies_threads(self, mocker):
+        method_latencies = MethodLatencies()
+        start = threading.Event()
+        def record():
+            start.wait()
+            for _ in range(10000):
+                method_latencies.add_bucket(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT, 3)
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        [thread.start() for thread in threads]
+        start.set()
+        popped = 0
+        while any(thread.is_alive() for thread in threads):
+            popped += method_latencies.pop_all()['methodLatencies']['treatment'][3]
+        [thread.join() for thread in threads]
+        popped += method_latencies.pop_all()['methodLatencies']['treatment'][3]
+
+        assert(popped == 40000)
+        assert(method_latencies._counters._threads == [])
+        assert(method_latencies.pop_all()['methodLatencies']['treatment'] == [0] * 23)
+
+    def test_method_latency_histograms(self, mocker):
+        pytest.importorskip('hdrh')
+        histograms = MethodLatencyHistograms()
+        def record():
+            for latency in range(1, 1001):
+                histograms.record(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT, latency)
+        thread = threading.Thread(target=record)
+        thread.start()
+        thread.join()
+        record()
+        histograms.record(ModelTelemetry.MethodExceptionsAndLatencies.TRACK, 100000000)
+        histograms.record(ModelTelemetry.MethodExceptionsAndLatencies.METHOD_EXCEPTIONS, 10)
+
+        percentiles = histograms.percentiles()
+        assert(len(percentiles) == 9)
+        assert(percentiles['treatment']['count'] == 2000)
+        assert(abs(percentiles['treatment']['p50'] - 500) <= 1)
+        assert(abs(percentiles['treatment']['p99'] - 990) <= 1)
+        assert(abs(percentiles['treatment']['p999'] - 999) <= 1)
+        assert(percentiles['track']['count'] == 1)
+        assert(abs(percentiles['track']['p50'] - ModelTelemetry.MAX_HISTOGRAM_LATENCY) <= ModelTelemetry.MAX_HISTOGRAM_LATENCY / 1000)
+        assert(percentiles['treatments'] == {'p50': 0, 'p99': 0, 'p999': 0, 'count': 0})
+        assert(len(histograms._threads) == 1)
+        assert(histograms.percentiles()['treatment']['count'] == 2000)
 
     def test_method_exceptions(self, mocker):
         method_exception = MethodExceptions()
@@ -242,14 +231,8 @@ class TelemetryModelTests(object):
 
     def test_telemetry_counters(self):
         telemetry_counter = TelemetryCounters()
-        assert(telemetry_counter._impressions_queued == 0)
-        assert(telemetry_counter._impressions_deduped == 0)
-        assert(telemetry_counter._impressions_dropped == 0)
-        assert(telemetry_counter._events_dropped == 0)
-        assert(telemetry_counter._events_queued == 0)
-        assert(telemetry_counter._auth_rejections == 0)
-        assert(telemetry_counter._token_refreshes == 0)
-        assert(telemetry_counter._update_from_sse == {})
+        for counter in ModelTelemetry.CounterConstants:
+            assert(telemetry_counter.get_counter_stats(counter) == 0)
 
         assert(telemetry_counter.get_session_length() == 0)
         telemetry_counter.record_session_length(20)
@@ -258,36 +241,55 @@ class TelemetryModelTests(object):
         assert(telemetry_counter.pop_auth_rejections() == 0)
         [telemetry_counter.record_auth_rejections() for i in range(5)]
         auth_rejections = telemetry_counter.pop_auth_rejections()
-        assert(telemetry_counter._auth_rejections == 0)
+        assert(telemetry_counter.pop_auth_rejections() == 0)
         assert(auth_rejections == 5)
 
         assert(telemetry_counter.pop_token_refreshes() == 0)
         [telemetry_counter.record_token_refreshes() for i in range(3)]
         token_refreshes = telemetry_counter.pop_token_refreshes()
-        assert(telemetry_counter._token_refreshes == 0)
+        assert(telemetry_counter.pop_token_refreshes() == 0)
         assert(token_refreshes == 3)
 
-        assert(telemetry_counter.get_counter_stats(ModelTelemetry.CounterConstants.IMPRESSIONS_QUEUED) == 0)
-        assert(telemetry_counter.get_counter_stats(ModelTelemetry.CounterConstants.IMPRESSIONS_DEDUPED) == 0)
-        assert(telemetry_counter.get_counter_stats(ModelTelemetry.CounterConstants.IMPRESSIONS_DROPPED) == 0)
-        assert(telemetry_counter.get_counter_stats(ModelTelemetry.CounterConstants.EVENTS_QUEUED) == 0)
-        assert(telemetry_counter.get_counter_stats(ModelTelemetry.CounterConstants.EVENTS_DROPPED) == 0)
         telemetry_counter.record_impressions_value(ModelTelemetry.CounterConstants.IMPRESSIONS_QUEUED, 10)
-        assert(telemetry_counter._impressions_queued == 10)
+        assert(telemetry_counter.get_counter_stats(ModelTelemetry.CounterConstants.IMPRESSIONS_QUEUED) == 10)
         telemetry_counter.record_impressions_value(ModelTelemetry.CounterConstants.IMPRESSIONS_DEDUPED, 14)
-        assert(telemetry_counter._impressions_deduped == 14)
+        assert(telemetry_counter.get_counter_stats(ModelTelemetry.CounterConstants.IMPRESSIONS_DEDUPED) == 14)
         telemetry_counter.record_impressions_value(ModelTelemetry.CounterConstants.IMPRESSIONS_DROPPED, 2)
-        assert(telemetry_counter._impressions_dropped == 2)
+        assert(telemetry_counter.get_counter_stats(ModelTelemetry.CounterConstants.IMPRESSIONS_DROPPED) == 2)
         telemetry_counter.record_events_value(ModelTelemetry.CounterConstants.EVENTS_QUEUED, 30)
-        assert(telemetry_counter._events_queued == 30)
+        assert(telemetry_counter.get_counter_stats(ModelTelemetry.CounterConstants.EVENTS_QUEUED) == 30)
         telemetry_counter.record_events_value(ModelTelemetry.CounterConstants.EVENTS_DROPPED, 1)
-        assert(telemetry_counter._events_dropped == 1)
+        assert(telemetry_counter.get_counter_stats(ModelTelemetry.CounterConstants.EVENTS_DROPPED) == 1)
+        telemetry_counter.record_impressions_value(ModelTelemetry.CounterConstants.EVENTS_QUEUED, 5)
+        assert(telemetry_counter.get_counter_stats(ModelTelemetry.CounterConstants.EVENTS_QUEUED) == 30)
+
+        assert(telemetry_counter.pop_update_from_sse(UpdateFromSSE.SPLIT_UPDATE) == 0)
         telemetry_counter.record_update_from_sse(UpdateFromSSE.SPLIT_UPDATE)
-        assert(telemetry_counter._update_from_sse[UpdateFromSSE.SPLIT_UPDATE.value] == 1)
         updates = telemetry_counter.pop_update_from_sse(UpdateFromSSE.SPLIT_UPDATE)
-        assert(telemetry_counter._update_from_sse[UpdateFromSSE.SPLIT_UPDATE.value] == 0)
+        assert(telemetry_counter.pop_update_from_sse(UpdateFromSSE.SPLIT_UPDATE) == 0)
         assert(updates == 1)
 
+    def test_telemetry_counters_threads(self):
+        telemetry_counter = TelemetryCounters()
+        start = threading.Event()
+        def record():
+            start.wait()
+            for _ in range(10000):
+                telemetry_counter.record_impressions_value(ModelTelemetry.CounterConstants.IMPRESSIONS_QUEUED, 1)
+                telemetry_counter.record_auth_rejections()
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        [thread.start() for thread in threads]
+        start.set()
+        popped = 0
+        while any(thread.is_alive() for thread in threads):
+            popped += telemetry_counter.pop_auth_rejections()
+        [thread.join() for thread in threads]
+        popped += telemetry_counter.pop_auth_rejections()
+
+        assert(popped == 40000)
+        assert(telemetry_counter.get_counter_stats(ModelTelemetry.CounterConstants.IMPRESSIONS_QUEUED) == 40000)
+        assert(telemetry_counter._counters._threads == [])
+
     def test_streaming_event(self, mocker):
         streaming_event = StreamingEvent((ModelTelemetry.StreamingEventTypes.CONNECTION_ESTABLISHED, 'split', 1234))
         assert(streaming_event.type == ModelTelemetry.StreamingEventTypes.CONNECTION_ESTABLISHED.value)
@@ -373,55 +375,19 @@ class TelemetryModelAsyncTests(object):
 
         for method in ModelTelemetry.MethodExceptionsAndLatencies:
             await method_latencies.add_latency(method, 50)
-            if method.value == 'treatment':
-                assert(method_latencies._treatment[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'treatments':
-                assert(method_latencies._treatments[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'treatment_with_config':
-                assert(method_latencies._treatment_with_config[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'treatments_with_config':
-                assert(method_latencies._treatments_with_config[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'treatments_by_flag_set':
-                assert(method_latencies._treatments_by_flag_set[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'treatments_by_flag_sets':
-                assert(method_latencies._treatments_by_flag_sets[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'treatments_with_config_by_flag_set':
-                assert(method_latencies._treatments_with_config_by_flag_set[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'treatments_with_config_by_flag_sets':
-                assert(method_latencies._treatments_with_config_by_flag_sets[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            elif method.value == 'track':
-                assert(method_latencies._track[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-
             await method_latencies.add_latency(method, 50000000)
-            if method.value == 'treatment':
-                assert(method_latencies._treatment[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            if method.value == 'treatments':
-                assert(method_latencies._treatments[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            if method.value == 'treatment_with_config':
-                assert(method_latencies._treatment_with_config[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            if method.value == 'treatments_with_config':
-                assert(method_latencies._treatments_with_config[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            elif method.value == 'treatments_by_flag_set':
-                assert(method_latencies._treatments_by_flag_set[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            elif method.value == 'treatments_by_flag_sets':
-                assert(method_latencies._treatments_by_flag_sets[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            elif method.value == 'treatments_with_config_by_flag_set':
-                assert(method_latencies._treatments_with_config_by_flag_set[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            elif method.value == 'treatments_with_config_by_flag_sets':
-                assert(method_latencies._treatments_with_config_by_flag_sets[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            if method.value == 'track':
-                assert(method_latencies._track[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-
-        await method_latencies.pop_all()
-        assert(method_latencies._track == [0] * 23)
-        assert(method_latencies._treatment == [0] * 23)
-        assert(method_latencies._treatments == [0] * 23)
-        assert(method_latencies._treatment_with_config == [0] * 23)
-        assert(method_latencies._treatments_with_config == [0] * 23)
-        assert(method_latencies._treatments_by_flag_set == [0] * 23)
-        assert(method_latencies._treatments_by_flag_sets == [0] * 23)
-        assert(method_latencies._treatments_with_config_by_flag_set == [0] * 23)
-        assert(method_latencies._treatments_with_config_by_flag_sets == [0] * 23)
+        latencies = (await method_latencies.pop_all())['methodLatencies']
+        assert(len(latencies) == 9)
+        for method_latency in latencies.values():
+            assert(method_latency[ModelTelemetry.get_latency_bucket_index(50)] == 1)
+            assert(method_latency[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
+            assert(sum(method_latency) == 2)
+
+        await method_latencies.add_bucket(ModelTelemetry.MethodExceptionsAndLatencies.TRACK, 5)
+        await method_latencies.add_bucket(ModelTelemetry.MethodExceptionsAndLatencies.METHOD_EXCEPTIONS, 5)
+        latencies = (await method_latencies.pop_all())['methodLatencies']
+        assert(latencies['track'] == [0] * 5 + [1] + [0] * 17)
+        assert((await method_latencies.pop_all())['methodLatencies']['track'] == [0] * 23)
 
         await method_latencies.add_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT, 10)
         [await method_latencies.add_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS, 20) for i in range(2)]
@@ -448,26 +414,19 @@ class TelemetryModelAsyncTests(object):
         http_latencies = await HTTPLatenciesAsync.create()
 
         for resource in ModelTelemetry.HTTPExceptionsAndLatencies:
-            if self._get_http_latency(resource, http_latencies) == None:
+            if await self._pop_http_latency(resource, http_latencies) == None:
                 continue
             await http_latencies.add_latency(resource, 50)
-            assert(self._get_http_latency(resource, http_latencies)[ModelTelemetry.get_latency_bucket_index(50)] == 1)
+            assert((await self._pop_http_latency(resource, http_latencies))[ModelTelemetry.get_latency_bucket_index(50)] == 1)
             await http_latencies.add_latency(resource, 50000000)
-            assert(self._get_http_latency(resource, http_latencies)[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
+            assert((await self._pop_http_latency(resource, http_latencies))[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
             for j in range(10):
                 latency = random.randint(1001, 4987885)
-                current_count = self._get_http_latency(resource, http_latencies)[ModelTelemetry.get_latency_bucket_index(latency)]
                 [await http_latencies.add_latency(resource, latency) for i in range(2)]
-                assert(self._get_http_latency(resource, http_latencies)[ModelTelemetry.get_latency_bucket_index(latency)] == 2 + current_count)
+                assert((await self._pop_http_latency(resource, http_latencies))[ModelTelemetry.get_latency_bucket_index(latency)] == 2)
 
         await http_latencies.pop_all()
-        assert(http_latencies._event == [0] * 23)
-        assert(http_latencies._impression == [0] * 23)
-        assert(http_latencies._impression_count == [0] * 23)
-        assert(http_latencies._segment == [0] * 23)
-        assert(http_latencies._split == [0] * 23)
-        assert(http_latencies._telemetry == [0] * 23)
-        assert(http_latencies._token == [0] * 23)
+        assert(all(latencies == [0] * 23 for latencies in (await http_latencies.pop_all())['httpLatencies'].values()))
 
         await http_latencies.add_latency(ModelTelemetry.HTTPExceptionsAndLatencies.SPLIT, 10)
         [await http_latencies.add_latency(ModelTelemetry.HTTPExceptionsAndLatencies.IMPRESSION, i) for i in [10, 20]]
@@ -479,23 +438,8 @@ class TelemetryModelAsyncTests(object):
         latencies = await http_latencies.pop_all()
         assert(latencies == {'httpLatencies': {'split': [1] + [0] * 22, 'segment': [1] + [0] * 22, 'impression': [2] + [0] * 22, 'impressionCount': [1] + [0] * 22, 'event': [1] + [0] * 22, 'telemetry': [1] + [0] * 22, 'token': [2] + [0] * 22}})
 
-    def _get_http_latency(self, resource, storage):
-        if resource == ModelTelemetry.HTTPExceptionsAndLatencies.SPLIT:
-            return storage._split
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.SEGMENT:
-            return storage._segment
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.IMPRESSION:
-            return storage._impression
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.IMPRESSION_COUNT:
-            return storage._impression_count
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.EVENT:
-            return storage._event
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.TELEMETRY:
-            return storage._telemetry
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.TOKEN:
-            return storage._token
-        else:
-            return
+    async def _pop_http_latency(self, resource, storage):
+        return (await storage.pop_all())['httpLatencies'].get(resource.value)
 
     @pytest.mark.asyncio
     async def test_method_exceptions(self, mocker):
@@ -1,10 +1,14 @@
 """SSE Parser unit tests."""
+import base64
+import gzip
 import json
+import zlib
 import pytest
 
 from splitio.push.sse import SSEEvent
 from splitio.push.parser import parse_incoming_event, BaseUpdate, AblyError, OccupancyMessage, \
-    SegmentChangeUpdate, SplitChangeUpdate, SplitKillUpdate, EventParsingException
+    SegmentChangeUpdate, SplitChangeUpdate, SplitKillUpdate, EventParsingException, \
+    decode_feature_flag_definition
 
 
 def make_message(channel, data):
@@ -113,3 +117,18 @@ class ParserTests(object):
         assert isinstance(parsed, OccupancyMessage)
         assert parsed.publishers == 1
         assert parsed.channel == 'control_sec'
+
+    def test_decode_feature_flag_definition(self):
+        """Test decoding instant update payloads for each compression mode."""
+        raw = json.dumps({'name': 'some_flag', 'changeNumber': 123}).encode('utf-8')
+        payloads = {
+            0: base64.b64encode(raw).decode('utf-8'),
+            1: base64.b64encode(gzip.compress(raw)).decode('utf-8'),
+            2: base64.b64encode(zlib.compress(raw)).decode('utf-8'),
+        }
+        for compression, payload in payloads.items():
+            event = SplitChangeUpdate('some', 123, 123, 122, payload, compression)
+            assert decode_feature_flag_definition(event) == {'name': 'some_flag', 'changeNumber': 123}
+
+        with pytest.raises(ValueError):
+            decode_feature_flag_definition(SplitChangeUpdate('some', 123, 123, 122, payloads[0], 3))
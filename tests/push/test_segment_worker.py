@@ -7,6 +7,9 @@ from splitio.api import APIException
 from splitio.push.workers import SegmentWorker, SegmentWorkerAsync
 from splitio.models.notification import SegmentChangeNotification
 from splitio.optional.loaders import asyncio
+from splitio.engine.telemetry import TelemetryStorageProducer, TelemetryStorageProducerAsync
+from splitio.models.telemetry import UpdateFromSSE
+from splitio.storage.inmemmory import InMemoryTelemetryStorage, InMemoryTelemetryStorageAsync
 
 change_number_received = None
 segment_name_received = None
@@ -60,6 +63,28 @@ class SegmentWorkerTests(object):
         segment_worker.stop()
         assert not segment_worker.is_running()
 
+    def test_coalesce_burst(self):
+        q = queue.Queue()
+        telemetry_storage = InMemoryTelemetryStorage()
+        telemetry_runtime_producer = TelemetryStorageProducer(telemetry_storage).get_telemetry_runtime_producer()
+        calls = []
+        def handler(segment_name, change_number):
+            calls.append((segment_name, change_number))
+
+        segment_worker = SegmentWorker(handler, q, telemetry_runtime_producer)
+        q.put(SegmentChangeNotification('some', 'SEGMENT_UPDATE', 3, 'segment1'))
+        q.put(SegmentChangeNotification('some', 'SEGMENT_UPDATE', 1, 'segment2'))
+        q.put(SegmentChangeNotification('some', 'SEGMENT_UPDATE', 5, 'segment1'))
+        q.put(SegmentChangeNotification('some', 'SEGMENT_UPDATE', 4, 'segment1'))
+        segment_worker.start()
+
+        time.sleep(0.1)
+        assert calls == [('segment1', 5), ('segment2', 1)]
+        assert telemetry_storage.pop_update_from_sse(UpdateFromSSE.SEGMENT_UPDATE_COALESCED) == 2
+
+        segment_worker.stop()
+        assert not segment_worker.is_running()
+
 class SegmentWorkerAsyncTests(object):
 
     @pytest.mark.asyncio
@@ -111,3 +136,27 @@ class SegmentWorkerAsyncTests(object):
         await segment_worker.stop()
         await asyncio.sleep(.1)
         assert(not self._worker_running())
+
+    @pytest.mark.asyncio
+    async def test_coalesce_burst(self):
+        q = asyncio.Queue()
+        telemetry_storage = await InMemoryTelemetryStorageAsync.create()
+        telemetry_runtime_producer = TelemetryStorageProducerAsync(telemetry_storage).get_telemetry_runtime_producer()
+        calls = []
+        async def handler(segment_name, change_number):
+            calls.append((segment_name, change_number))
+
+        segment_worker = SegmentWorkerAsync(handler, q, telemetry_runtime_producer)
+        await q.put(SegmentChangeNotification('some', 'SEGMENT_UPDATE', 3, 'segment1'))
+        await q.put(SegmentChangeNotification('some', 'SEGMENT_UPDATE', 1, 'segment2'))
+        await q.put(SegmentChangeNotification('some', 'SEGMENT_UPDATE', 5, 'segment1'))
+        await q.put(SegmentChangeNotification('some', 'SEGMENT_UPDATE', 4, 'segment1'))
+        segment_worker.start()
+
+        await asyncio.sleep(.1)
+        assert calls == [('segment1', 5), ('segment2', 1)]
+        assert telemetry_storage._counters._update_from_sse['sgc'] == 2
+
+        await segment_worker.stop()
+        await asyncio.sleep(.1)
+        assert(not self._worker_running())
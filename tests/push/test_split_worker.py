@@ -1,6 +1,8 @@
 """Split Worker tests."""
 import time
 import queue
+import base64
+import json
 import pytest
 
 from splitio.api import APIException
@@ -9,6 +11,7 @@ from splitio.models.notification import SplitChangeNotification
 from splitio.optional.loaders import asyncio
 from splitio.push.parser import SplitChangeUpdate
 from splitio.engine.telemetry import TelemetryStorageProducer, TelemetryStorageProducerAsync
+from splitio.models.telemetry import UpdateFromSSE
 from splitio.storage.inmemmory import InMemoryTelemetryStorage, InMemorySplitStorage, InMemorySegmentStorage, \
     InMemoryTelemetryStorageAsync, InMemorySplitStorageAsync, InMemorySegmentStorageAsync
 
@@ -25,6 +28,13 @@ async def handler_async(change_number):
     change_number_received = change_number
     return
 
+def _payload(name, change_number):
+    """Return an uncompressed instant update payload for a feature flag."""
+    return base64.b64encode(json.dumps({
+        'name': name, 'seed': 1, 'killed': False, 'defaultTreatment': 'off', 'trafficTypeName': 'user',
+        'status': 'ACTIVE', 'changeNumber': change_number, 'conditions': []
+    }).encode('utf-8'))
+
 
 class SplitWorkerTests(object):
 
@@ -120,7 +130,7 @@ class SplitWorkerTests(object):
         q.put(SplitChangeUpdate('some', 'SPLIT_UPDATE', 123456790, 2345,  'eyJ0cmFmZmljVHlwZU5hbWUiOiJ1c2VyIiwiaWQiOiIzM2VhZmE1MC0xYTY1LTExZWQtOTBkZi1mYTMwZDk2OTA0NDUiLCJuYW1lIjoiYmlsYWxfc3BsaXQiLCJ0cmFmZmljQWxsb2NhdGlvbiI6MTAwLCJ0cmFmZmljQWxsb2NhdGlvblNlZWQiOi0xMzY0MTE5MjgyLCJzZWVkIjotNjA1OTM4ODQzLCJzdGF0dXMiOiJBQ1RJVkUiLCJraWxsZWQiOmZhbHNlLCJkZWZhdWx0VHJlYXRtZW50Ijoib2ZmIiwiY2hhbmdlTnVtYmVyIjoxNjg0MzQwOTA4NDc1LCJhbGdvIjoyLCJjb25maWd1cmF0aW9ucyI6e30sImNvbmRpdGlvbnMiOlt7ImNvbmRpdGlvblR5cGUiOiJST0xMT1VUIiwibWF0Y2hlckdyb3VwIjp7ImNvbWJpbmVyIjoiQU5EIiwibWF0Y2hlcnMiOlt7ImtleVNlbGVjdG9yIjp7InRyYWZmaWNUeXBlIjoidXNlciJ9LCJtYXRjaGVyVHlwZSI6IklOX1NFR01FTlQiLCJuZWdhdGUiOmZhbHNlLCJ1c2VyRGVmaW5lZFNlZ21lbnRNYXRjaGVyRGF0YSI6eyJzZWdtZW50TmFtZSI6ImJpbGFsX3NlZ21lbnQifX1dfSwicGFydGl0aW9ucyI6W3sidHJlYXRtZW50Ijoib24iLCJzaXplIjowfSx7InRyZWF0bWVudCI6Im9mZiIsInNpemUiOjEwMH1dLCJsYWJlbCI6ImluIHNlZ21lbnQgYmlsYWxfc2VnbWVudCJ9LHsiY29uZGl0aW9uVHlwZSI6IlJPTExPVVQiLCJtYXRjaGVyR3JvdXAiOnsiY29tYmluZXIiOiJBTkQiLCJtYXRjaGVycyI6W3sia2V5U2VsZWN0b3IiOnsidHJhZmZpY1R5cGUiOiJ1c2VyIn0sIm1hdGNoZXJUeXBlIjoiQUxMX0tFWVMiLCJuZWdhdGUiOmZhbHNlfV19LCJwYXJ0aXRpb25zIjpbeyJ0cmVhdG1lbnQiOiJvbiIsInNpemUiOjB9LHsidHJlYXRtZW50Ijoib2ZmIiwic2l6ZSI6MTAwfV0sImxhYmVsIjoiZGVmYXVsdCBydWxlIn1dfQ==', 0))
         time.sleep(0.1)
         assert self._feature_flag_added[0].name == 'bilal_split'
-        assert telemetry_storage._counters._update_from_sse['sp'] == 1
+        assert telemetry_storage.pop_update_from_sse(UpdateFromSSE.SPLIT_UPDATE) == 1
 
         # compression 2
         self._feature_flag_added = None
@@ -128,7 +138,7 @@ class SplitWorkerTests(object):
         q.put(SplitChangeUpdate('some', 'SPLIT_UPDATE', 123456790, 2345,  'eJzEUtFq20AQ/JUwz2c4WZZr3ZupTQh1FKjcQinGrKU95cjpZE6nh9To34ssJ3FNX0sfd3Zm53b2TgietDbF9vXIGdUMha5lDwFTQiGOmTQlchLRPJlEEZeTVJZ6oimWZTpP5WyWQMCNyoOxZPft0ZoA8TZ5aW1TUDCNg4qk/AueM5dQkyiez6IonS6mAu0IzWWSxovFLBZoA4WuhcLy8/bh+xoCL8bagaXJtixQsqbOhq1nCjW7AIVGawgUz+Qqzrr6wB4qmi9m00/JIk7TZCpAtmqgpgJF47SpOn9+UQt16s9YaS71z9NHOYQFha9Pm83Tty0EagrFM/t733RHqIFZH4wb7LDMVh+Ecc4Lv+ZsuQiNH8hXF3hLv39XXNCHbJ+v7x/X2eDmuKLA74sPihVr47jMuRpWfxy1Kwo0GLQjmv1xpBFD3+96gSP5cLVouM7QQaA1vxhK9uKmd853bEZS9jsBSwe2UDDu7mJxd2Mo/muQy81m/2X9I7+N8R/FcPmUd76zjH7X/w4AAP//90glTw==', 2))
         time.sleep(0.1)
         assert self._feature_flag_added[0].name == 'bilal_split'
-        assert telemetry_storage._counters._update_from_sse['sp'] == 2
+        assert telemetry_storage.pop_update_from_sse(UpdateFromSSE.SPLIT_UPDATE) == 1
 
         # compression 1
         self._feature_flag_added = None
@@ -136,7 +146,7 @@ class SplitWorkerTests(object):
         q.put(SplitChangeUpdate('some', 'SPLIT_UPDATE', 123456790, 2345,  'H4sIAAkVZWQC/8WST0+DQBDFv0qzZ0ig/BF6a2xjGismUk2MaZopzOKmy9Isy0EbvrtDwbY2Xo233Tdv5se85cCMBs5FtvrYYwIlsglratTMYiKns+chcAgc24UwsF0Xczt2cm5z8Jw8DmPH9wPyqr5zKyTITb2XwpA4TJ5KWWVgRKXYxHWcX/QUkVi264W+68bjaGyxupdCJ4i9KPI9UgyYpibI9Ha1eJnT/J2QsnNxkDVaLEcOjTQrjWBKVIasFefky95BFZg05Zb2mrhh5I9vgsiL44BAIIuKTeiQVYqLotHHLyLOoT1quRjub4fztQuLxj89LpePzytClGCyd9R3umr21ErOcitUh2PTZHY29HN2+JGixMxUujNfvMB3+u2pY1AXySad3z3Mk46msACDp8W7jhly4uUpFt3qD33vDAx0gLpXkx+P1GusbdcE24M2F4uaywwVEWvxSa1Oa13Vjvn2RXradm0xCVuUVBJqNCBGV0DrX4OcLpeb+/lreh3jH8Uw/JQj3UhkxPgCCurdEnADAAA=', 1))
         time.sleep(0.1)
         assert self._feature_flag_added[0].name == 'bilal_split'
-        assert telemetry_storage._counters._update_from_sse['sp'] == 3
+        assert telemetry_storage.pop_update_from_sse(UpdateFromSSE.SPLIT_UPDATE) == 1
 
         # should call delete split
         self._feature_flag_added = None
@@ -216,6 +226,52 @@ class SplitWorkerTests(object):
         time.sleep(0.1)
         assert self.segment_name == "bilal_segment"
 
+    def test_coalesce_burst(self, mocker):
+        q = queue.Queue()
+        split_storage = InMemorySplitStorage()
+        split_storage.update([], [], 10)
+        telemetry_storage = InMemoryTelemetryStorage()
+        telemetry_runtime_producer = TelemetryStorageProducer(telemetry_storage).get_telemetry_runtime_producer()
+        handler = mocker.Mock()
+        split_worker = SplitWorker(handler, mocker.Mock(), q, split_storage, InMemorySegmentStorage(), telemetry_runtime_producer)
+
+        q.put(SplitChangeUpdate('some', 'SPLIT_UPDATE', 5, None, None, None))
+        q.put(SplitChangeUpdate('some', 'SPLIT_UPDATE', 11, 10, _payload('split1', 11), 0))
+        q.put(SplitChangeUpdate('some', 'SPLIT_UPDATE', 13, None, None, None))
+        q.put(SplitChangeUpdate('some', 'SPLIT_UPDATE', 12, None, None, None))
+        split_worker.start()
+        time.sleep(0.1)
+
+        assert split_storage.get('split1') is not None
+        assert handler.mock_calls == [mocker.call(13)]
+        assert telemetry_storage.pop_update_from_sse(UpdateFromSSE.SPLIT_UPDATE) == 1
+        assert telemetry_storage.pop_update_from_sse(UpdateFromSSE.SPLIT_UPDATE_COALESCED) == 2
+        split_worker.stop()
+
+    def test_coalesce_superseded(self, mocker):
+        q = queue.Queue()
+        split_storage = InMemorySplitStorage()
+        split_storage.update([], [], 10)
+        telemetry_storage = InMemoryTelemetryStorage()
+        telemetry_runtime_producer = TelemetryStorageProducer(telemetry_storage).get_telemetry_runtime_producer()
+        handler = mocker.Mock()
+        split_worker = SplitWorker(handler, mocker.Mock(), q, split_storage, InMemorySegmentStorage(), telemetry_runtime_producer)
+
+        # the stale event is covered by the instant updates, so no fetch is needed
+        q.put(SplitChangeUpdate('some', 'SPLIT_UPDATE', 11, None, None, None))
+        q.put(SplitChangeUpdate('some', 'SPLIT_UPDATE', 11, 10, _payload('split1', 11), 0))
+        q.put(SplitChangeUpdate('some', 'SPLIT_UPDATE', 12, 11, _payload('split2', 12), 0))
+        split_worker.start()
+        time.sleep(0.1)
+
+        assert split_storage.get_change_number() == 12
+        assert split_storage.get('split1') is not None
+        assert split_storage.get('split2') is not None
+        assert handler.mock_calls == []
+        assert telemetry_storage.pop_update_from_sse(UpdateFromSSE.SPLIT_UPDATE) == 2
+        assert telemetry_storage.pop_update_from_sse(UpdateFromSSE.SPLIT_UPDATE_COALESCED) == 1
+        split_worker.stop()
+
 class SplitWorkerAsyncTests(object):
 
     @pytest.mark.asyncio
@@ -450,3 +506,28 @@ class SplitWorkerAsyncTests(object):
         assert self.segment_name == "bilal_segment"
 
         await split_worker.stop()
+
+    @pytest.mark.asyncio
+    async def test_coalesce_burst(self, mocker):
+        q = asyncio.Queue()
+        split_storage = InMemorySplitStorageAsync()
+        await split_storage.update([], [], 10)
+        telemetry_storage = await InMemoryTelemetryStorageAsync.create()
+        telemetry_runtime_producer = TelemetryStorageProducerAsync(telemetry_storage).get_telemetry_runtime_producer()
+        self.change_numbers = []
+        async def handler(change_number):
+            self.change_numbers.append(change_number)
+        split_worker = SplitWorkerAsync(handler, mocker.Mock(), q, split_storage, InMemorySegmentStorageAsync(), telemetry_runtime_producer)
+
+        await q.put(SplitChangeUpdate('some', 'SPLIT_UPDATE', 5, None, None, None))
+        await q.put(SplitChangeUpdate('some', 'SPLIT_UPDATE', 11, 10, _payload('split1', 11), 0))
+        await q.put(SplitChangeUpdate('some', 'SPLIT_UPDATE', 13, None, None, None))
+        await q.put(SplitChangeUpdate('some', 'SPLIT_UPDATE', 12, None, None, None))
+        split_worker.start()
+        await asyncio.sleep(0.1)
+
+        assert await split_storage.get('split1') is not None
+        assert self.change_numbers == [13]
+        assert telemetry_storage._counters._update_from_sse['sp'] == 1
+        assert telemetry_storage._counters._update_from_sse['spc'] == 2
+        await split_worker.stop()
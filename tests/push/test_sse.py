@@ -5,10 +5,34 @@ import threading
 import pytest
 from contextlib import suppress
 
-from splitio.push.sse import SSEClient, SSEEvent, SSEClientAsync
+from splitio.push.sse import SSEClient, SSEEvent, SSEClientAsync, EventBuffer
 from splitio.optional.loaders import asyncio
 from tests.helpers.mockserver import SSEMockServer
 
+class EventBufferTests(object):
+    """EventBuffer test cases."""
+
+    def test_split_reads(self):
+        """Test events split across reads, with LF, CRLF and mixed line endings and comments."""
+        stream = b'id: 1\nevent: message\ndata: {"a": 1}\n\n:keepalive\n\nid:2\ndata:xyz\nfoo: bar\n\n'
+        expected = [
+            SSEEvent('1', 'message', None, '{"a": 1}'),
+            SSEEvent(None, None, None, None),
+            SSEEvent('2', None, None, 'xyz')
+        ]
+        for stream in [stream, stream.replace(b'\n', b'\r\n'), stream.replace(b'\n\n', b'\n\r\n')]:
+            for size in range(1, len(stream) + 1):
+                event_buffer = EventBuffer()
+                events = []
+                for index in range(0, len(stream), size):
+                    events.extend(event_buffer.feed(stream[index:index + size]))
+                assert events == expected
+
+        event_buffer = EventBuffer()
+        assert event_buffer.feed(b'id: 3\ndata: abc\n') == []
+        assert event_buffer.feed(b'\n') == [SSEEvent('3', None, None, 'abc')]
+
+
 class SSEClientTests(object):
     """SSEClient test cases."""
 
@@ -1,5 +1,6 @@
 """Cache testing module."""
 #pylint: disable=protected-access,no-self-use,line-too-long
+import threading
 import time
 from random import choice
 
@@ -132,6 +133,16 @@ class  CacheTraitTests(object):
         assert cache_trait.decorate(key_func, 10, 0)(user_func) is user_func
         assert cache_trait.decorate(key_func, 0, 0)(user_func) is user_func
 
+    def test_add_and_get_key(self, mocker):
+        cache = cache_trait.LocalMemoryCache(None, None, None, 1)
+        cache.add_key('split', {'split_name': 'split'})
+        assert cache.get_key('split') == {'split_name': 'split'}
+        cache.add_key('another', {'split_name': 'another'})
+        assert cache.get_key('split') == None
+        assert cache.get_key('another') == {'split_name': 'another'}
+        cache.clear()
+        assert cache.get_key('another') == None
+
     @pytest.mark.asyncio
     async def test_async_add_and_get_key(self, mocker):
         cache = cache_trait.LocalMemoryCacheAsync(None, None, 1, 1)
@@ -139,3 +150,64 @@ class  CacheTraitTests(object):
         assert await cache.get_key('split') == {'split_name': 'split'}
         await asyncio.sleep(1)
         assert await cache.get_key('split') == None
+
+    @pytest.mark.asyncio
+    async def test_async_get_or_load_coalesces_misses(self, mocker):
+        cache = cache_trait.LocalMemoryCacheAsync(None, None, 1, 5)
+        calls = []
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return len(calls)
+
+        results = await asyncio.gather(*[cache.get_or_load('split', loader) for _ in range(10)])
+        assert results == [1] * 10
+        assert len(calls) == 1
+        assert cache._in_flight == {}
+
+        # expired value is served while one refresh runs in the background.
+        await asyncio.sleep(1)
+        assert await cache.get_or_load('split', loader) == 1
+        assert await cache.get_or_load('split', loader) == 1
+        await asyncio.sleep(0.2)
+        assert len(calls) == 2
+        assert await cache.get_or_load('split', loader) == 2
+
+    @pytest.mark.asyncio
+    async def test_async_failed_refresh(self, mocker):
+        cache = cache_trait.LocalMemoryCacheAsync(None, None, 1, 5)
+        async def failing_loader():
+            raise Exception('some')
+
+        with pytest.raises(Exception):
+            await cache.get_or_load('split', failing_loader)
+        assert cache._in_flight == {}
+
+        logger = mocker.patch('splitio.storage.adapters.cache_trait._LOGGER')
+        await cache.add_key('split', 'value')
+        await asyncio.sleep(1)
+        assert await cache.get_or_load('split', failing_loader) == 'value'
+        await asyncio.sleep(0.1)
+        assert 'split' not in cache._data  # dropped so the next call fetches it again
+        assert logger.error.mock_calls == [mocker.call('Error refreshing cached item')]
+        with pytest.raises(Exception):
+            await cache.get_or_load('split', failing_loader)
+
+    def test_single_flight(self, mocker):
+        """Test concurrent misses on the same key call the user function once."""
+        calls = []
+        def user_func(key):
+            calls.append(key)
+            time.sleep(0.1)
+            return len(key)
+        cache = cache_trait.LocalMemoryCache(lambda key: key, user_func, 1, 5)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get('some'))) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [4] * 10
+        assert calls == ['some']
+        assert cache._in_flight == {}
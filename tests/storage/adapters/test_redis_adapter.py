@@ -6,6 +6,8 @@ from splitio.storage.adapters import redis
 from splitio.storage.adapters.redis import _build_default_client_async, _build_sentinel_client_async
 from redis import StrictRedis, Redis
 from redis.sentinel import Sentinel
+from redis.crc import key_slot
+from redis.exceptions import RedisClusterException
 
 
 class RedisStorageAdapterTests(object):
@@ -48,6 +50,14 @@ class RedisStorageAdapterTests(object):
         adapter.eval('script', 3, 'key1', 'key2', 'key3')
         assert redis_mock.eval.mock_calls[0] == mocker.call('script', 3, 'some_prefix.key1', 'some_prefix.key2', 'some_prefix.key3')
 
+        adapter.eval('script', 1, 'key1', 'arg1', 'arg2')
+        assert redis_mock.eval.mock_calls[1] == mocker.call('script', 1, 'some_prefix.key1', 'arg1', 'arg2')
+
+        script = adapter.register_script('script')
+        assert redis_mock.register_script.mock_calls[0] == mocker.call('script')
+        script(1, 'key1', 'arg1')
+        assert redis_mock.register_script.return_value.mock_calls[0] == mocker.call(keys=['some_prefix.key1'], args=['arg1'])
+
         adapter.hset('key1', 'name', 'value')
         assert redis_mock.hset.mock_calls[0] == mocker.call('some_prefix.key1', 'name', 'value')
 
@@ -551,6 +561,148 @@ class RedisStorageAdapterAsyncTests(object):
         assert self.retry_on_timeout == (True,)
 
 
+class _ClusterStandIn(object):
+    """Minimal multi-node cluster stand-in routing every key to the node owning its slot."""
+
+    def __init__(self, nodes=3):
+        self.nodes = [{} for _ in range(nodes)]
+        self.mget_calls = []
+
+    def keyslot(self, key):
+        return key_slot(key.encode('utf-8'))
+
+    def _node_for(self, key):
+        return self.nodes[self.keyslot(key) * len(self.nodes) // 16384]
+
+    def set(self, key, value):
+        self._node_for(key)[key] = value
+
+    def mget(self, keys):
+        if len(set(self.keyslot(key) for key in keys)) > 1:
+            raise RedisClusterException('CROSSSLOT Keys in request don\'t hash to the same slot')
+        self.mget_calls.append(keys)
+        return [self._node_for(key).get(key) for key in keys]
+
+    def pipeline(self):
+        cluster = self
+        class _Pipeline(object):
+            def __init__(self):
+                self._commands = []
+            def mget(self, keys):
+                self._commands.append(keys)
+            def execute(self):
+                return [cluster.mget(keys) for keys in self._commands]
+        return _Pipeline()
+
+
+class RedisClusterAdapterTests(object):
+    """Redis cluster adapter test cases."""
+
+    def test_mget_groups_by_slot(self):
+        """Test keys spread across slots are fetched with one mget per slot, in order."""
+        cluster = _ClusterStandIn()
+        for name in ['split1', 'split2', 'split3', 'split4']:
+            cluster.set('some_prefix.SPLITIO.split.' + name, name + '_value')
+
+        adapter = redis.RedisClusterAdapter(cluster, 'some_prefix')
+        names = ['SPLITIO.split.split3', 'SPLITIO.split.missing', 'SPLITIO.split.split1', 'SPLITIO.split.split4']
+        assert adapter.mget(names) == ['split3_value', None, 'split1_value', 'split4_value']
+        assert len(cluster.mget_calls) == len(set(cluster.keyslot('some_prefix.' + n) for n in names))
+        assert adapter.mget([]) == []
+
+        with pytest.raises(RedisClusterException):
+            cluster.mget(['some_prefix.' + n for n in names])
+
+    def test_mget_hash_tag(self):
+        """Test hash tagged keys are fetched with a single mget."""
+        cluster = _ClusterStandIn()
+        for name in ['split1', 'split2']:
+            cluster.set('{SPLITIO}.SPLITIO.split.' + name, name + '_value')
+
+        adapter = redis.RedisClusterAdapter(cluster, '{SPLITIO}')
+        assert adapter.mget(['SPLITIO.split.split1', 'SPLITIO.split.split2']) == ['split1_value', 'split2_value']
+        assert len(cluster.mget_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_mget_groups_by_slot_async(self, mocker):
+        """Test keys spread across slots are fetched with one mget per slot, in order."""
+        cluster = _ClusterStandIn()
+        for name in ['split1', 'split2', 'split3']:
+            cluster.set('SPLITIO.split.' + name, name + '_value')
+
+        pipe = cluster.pipeline()
+        async def execute():
+            return [cluster.mget(keys) for keys in pipe._commands]
+        pipe.execute = execute
+        cluster.pipeline = lambda: pipe
+        adapter = redis.RedisClusterAdapterAsync(cluster)
+        names = ['SPLITIO.split.split2', 'SPLITIO.split.split1', 'SPLITIO.split.split3']
+        assert await adapter.mget(names) == ['split2_value', 'split1_value', 'split3_value']
+        assert len(cluster.mget_calls) == len(set(cluster.keyslot(n) for n in names))
+
+    @pytest.mark.asyncio
+    async def test_close_async(self, mocker):
+        """Test closing the cluster client with aclose, or close when aclose isn't there."""
+        cluster = mocker.Mock(spec=['aclose', 'close'])
+        cluster.aclose = mocker.AsyncMock()
+        cluster.close = mocker.AsyncMock()
+        await redis.RedisClusterAdapterAsync(cluster).close()
+        assert cluster.aclose.mock_calls == [mocker.call()]
+        assert cluster.close.mock_calls == []
+
+        cluster = mocker.Mock(spec=['close'])
+        cluster.close = mocker.AsyncMock()
+        await redis.RedisClusterAdapterAsync(cluster).close()
+        assert cluster.close.mock_calls == [mocker.call()]
+
+    def test_adapter_building(self, mocker):
+        """Test building a cluster client."""
+        cluster_mock = mocker.Mock()
+        node_mock = mocker.Mock()
+        node_mock.side_effect = lambda host, port: (host, port)
+        mocker.patch('splitio.storage.adapters.redis.RedisCluster', new=cluster_mock)
+        mocker.patch('splitio.storage.adapters.redis.ClusterNode', new=node_mock)
+
+        config = {
+            'redisClusterNodes': [('10.0.0.1', 7000), ('10.0.0.2', 7001)],
+            'redisUsername': 'redis_user',
+            'redisPassword': 'some_password',
+            'redisMaxConnections': 5,
+            'redisPrefix': 'some_prefix',
+            'redisClusterKeyHashTag': '{SPLITIO}'
+        }
+        adapter = redis.build(config)
+        assert isinstance(adapter, redis.RedisClusterAdapter)
+        assert adapter._prefix_helper.add_prefix('SPLITIO.split.some') == '{SPLITIO}some_prefix.SPLITIO.split.some'
+        assert cluster_mock.mock_calls[0] == mocker.call(
+            startup_nodes=[('10.0.0.1', 7000), ('10.0.0.2', 7001)],
+            username='redis_user',
+            password='some_password',
+            socket_timeout=None,
+            socket_connect_timeout=None,
+            socket_keepalive=None,
+            socket_keepalive_options=None,
+            encoding='utf-8',
+            encoding_errors='strict',
+            decode_responses=True,
+            retry_on_timeout=False,
+            ssl=False,
+            ssl_keyfile=None,
+            ssl_certfile=None,
+            ssl_ca_certs=None,
+            max_connections=5
+        )
+
+        with pytest.raises(redis.ClusterConfigurationException):
+            redis.build({'redisClusterNodes': []})
+
+        with pytest.raises(redis.ClusterConfigurationException):
+            redis.build({'redisClusterNodes': ['a']})
+
+        with pytest.raises(redis.ClusterConfigurationException):
+            redis.build({'redisClusterNodes': [('10.0.0.1', 7000)], 'redisClusterKeyHashTag': 'SPLITIO'})
+
+
 class RedisPipelineAdapterTests(object):
     """Redis pipelined adapter test cases."""
 
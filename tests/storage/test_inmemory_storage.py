@@ -9,6 +9,8 @@ from splitio.models.impressions import Impression
 from splitio.models.events import Event, EventWrapper
 import splitio.models.telemetry as ModelTelemetry
 from splitio.engine.telemetry import TelemetryStorageProducer, TelemetryStorageProducerAsync
+from splitio.optional.loaders import asyncio
+from splitio.util.offload import LoopOffloader
 from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage, InMemorySegmentStorageAsync, InMemorySplitStorageAsync, \
     InMemoryImpressionStorage, InMemoryEventStorage, InMemoryTelemetryStorage, InMemoryImpressionStorageAsync, InMemoryEventStorageAsync, \
     InMemoryTelemetryStorageAsync, FlagSets
@@ -716,6 +718,20 @@ class InMemorySegmentStorageTests(object):
         assert not storage.segment_contains('some_segment', 'key3')
         assert storage.get_change_number('some_segment') == 456
 
+    def test_segment_update_in_place(self):
+        """Test updates mutate the stored keys and copies are isolated from them."""
+        storage = InMemorySegmentStorage()
+        storage.put(Segment('some_segment', ['key1', 'key2'], 123))
+        keys = storage.get('some_segment').keys
+        copy = storage.get_copy('some_segment')
+
+        storage.update('some_segment', ['key3'], ['key1'], 456)
+        assert storage.get('some_segment').keys is keys
+        assert keys == {'key2', 'key3'}
+        assert copy.keys == {'key1', 'key2'}
+        assert copy.change_number == 123
+        assert storage.get_copy('nonexistant-segment') is None
+
 
 class InMemorySegmentStorageAsyncTests(object):
     """In memory segment storage tests."""
@@ -733,6 +749,23 @@ class InMemorySegmentStorageAsyncTests(object):
         assert await storage.get('some_segment') == segment
         assert await storage.get('nonexistant-segment') is None
 
+    @pytest.mark.asyncio
+    async def test_large_update_doesnt_block_readers(self):
+        """Test readers get through while a large update is applied in slices."""
+        storage = InMemorySegmentStorageAsync(LoopOffloader(budget=0))
+        await storage.put(Segment('some_segment', ['key0'], 1))
+        update = asyncio.get_running_loop().create_task(
+            storage.update('some_segment', ['key%d' % index for index in range(1, 10001)], ['key0'], 2))
+        await asyncio.sleep(0)
+        assert not update.done()
+        assert await storage.get_change_number('some_segment') == 1  # not bumped until every slice is in
+
+        await update
+        assert await storage.get_change_number('some_segment') == 2
+        segment = await storage.get('some_segment')
+        assert segment.contains('key10000')
+        assert not segment.contains('key0')
+
     @pytest.mark.asyncio
     async def test_change_number(self, mocker):
         """Test storing and retrieving segment changeNumber."""
@@ -781,6 +814,20 @@ class InMemorySegmentStorageAsyncTests(object):
         assert not await storage.segment_contains('some_segment', 'key3')
         assert await storage.get_change_number('some_segment') == 456
 
+    @pytest.mark.asyncio
+    async def test_segment_update_in_place(self):
+        """Test updates mutate the stored keys and copies are isolated from them."""
+        storage = InMemorySegmentStorageAsync()
+        await storage.put(Segment('some_segment', ['key1', 'key2'], 123))
+        keys = (await storage.get('some_segment')).keys
+        copy = await storage.get_copy('some_segment')
+
+        await storage.update('some_segment', ['key3'], ['key1'], 456)
+        assert (await storage.get('some_segment')).keys is keys
+        assert keys == {'key2', 'key3'}
+        assert copy.keys == {'key1', 'key2'}
+        assert await storage.get_copy('nonexistant-segment') is None
+
 
 class InMemoryImpressionsStorageTests(object):
     """InMemory impressions storage test cases."""
@@ -794,7 +841,7 @@ class InMemoryImpressionsStorageTests(object):
         storage.put([Impression('key1', 'feature1', 'on', 'l1', 123456, 'b1', 321654)])
         storage.put([Impression('key2', 'feature1', 'on', 'l1', 123456, 'b1', 321654)])
         storage.put([Impression('key3', 'feature1', 'on', 'l1', 123456, 'b1', 321654)])
-        assert(telemetry_storage._counters._impressions_queued == 3)
+        assert(telemetry_storage.get_impressions_stats(ModelTelemetry.CounterConstants.IMPRESSIONS_QUEUED) == 3)
 
         # Assert impressions are retrieved in the same order they are inserted.
         assert storage.pop_many(1) == [
@@ -838,6 +885,26 @@ class InMemoryImpressionsStorageTests(object):
         storage.put(impressions)
         assert queue_full_hook.mock_calls == mocker.call()
 
+    def test_queue_high_water_hook(self, mocker):
+        """Test queue_full_hook is executed once when the queue reaches its high-water mark."""
+        storage = InMemoryImpressionStorage(100, mocker.Mock())
+        queue_full_hook = mocker.Mock()
+        storage.set_queue_full_hook(queue_full_hook)
+        impressions = [
+            Impression('key%d' % i, 'feature1', 'on', 'l1', 123456, 'b1', 321654)
+            for i in range(0, 80)
+        ]
+        assert storage.put(impressions[:74])
+        assert queue_full_hook.mock_calls == []
+        assert storage.put(impressions[74:75])
+        assert queue_full_hook.mock_calls == [mocker.call()]
+        assert storage.put(impressions[75:])
+        assert queue_full_hook.mock_calls == [mocker.call()]
+
+        storage.pop_many(1)
+        assert storage.put(impressions[:1])
+        assert queue_full_hook.mock_calls == [mocker.call(), mocker.call()]
+
     def test_clear(self, mocker):
         """Test clear method."""
         storage = InMemoryImpressionStorage(100, mocker.Mock())
@@ -856,8 +923,8 @@ class InMemoryImpressionsStorageTests(object):
         storage.put([Impression('key1', 'feature1', 'on', 'l1', 123456, 'b1', 321654)])
         storage.put([Impression('key1', 'feature1', 'on', 'l1', 123456, 'b1', 321654)])
         storage.put([Impression('key1', 'feature1', 'on', 'l1', 123456, 'b1', 321654)])
-        assert(telemetry_storage._counters._impressions_dropped == 1)
-        assert(telemetry_storage._counters._impressions_queued == 2)
+        assert(telemetry_storage.get_impressions_stats(ModelTelemetry.CounterConstants.IMPRESSIONS_DROPPED) == 1)
+        assert(telemetry_storage.get_impressions_stats(ModelTelemetry.CounterConstants.IMPRESSIONS_QUEUED) == 2)
 
 
 class InMemoryImpressionsStorageAsyncTests(object):
@@ -905,6 +972,25 @@ class InMemoryImpressionsStorageAsyncTests(object):
             Impression('key3', 'feature1', 'on', 'l1', 123456, 'b1', 321654)
         ]
 
+    @pytest.mark.asyncio
+    async def test_queue_high_water_hook(self, mocker):
+        """Test queue_full_hook is executed once when the queue reaches its high-water mark."""
+        storage = InMemoryImpressionStorageAsync(100, mocker.AsyncMock())
+        self.hook_calls = 0
+        async def queue_full_hook():
+            self.hook_calls += 1
+        storage.set_queue_full_hook(queue_full_hook)
+        impressions = [
+            Impression('key%d' % i, 'feature1', 'on', 'l1', 123456, 'b1', 321654)
+            for i in range(0, 80)
+        ]
+        assert await storage.put(impressions[:74])
+        assert self.hook_calls == 0
+        assert await storage.put(impressions[74:])
+        assert self.hook_calls == 1
+        assert await storage.put(impressions[:1])
+        assert self.hook_calls == 1
+
     @pytest.mark.asyncio
     async def test_queue_full_hook(self, mocker):
         """Test queue_full_hook is executed when the queue is full."""
@@ -1015,6 +1101,18 @@ class InMemoryEventsStorageTests(object):
         storage.put(events)
         assert queue_full_hook.mock_calls == [mocker.call()]
 
+    def test_queue_high_water_hook(self, mocker):
+        """Test queue_full_hook is executed once when the queue reaches its high-water mark by size."""
+        storage = InMemoryEventStorage(200, mocker.Mock())
+        queue_full_hook = mocker.Mock()
+        storage.set_queue_full_hook(queue_full_hook)
+        events = [EventWrapper(event=Event('key%d' % i, 'user', 'purchase', 12.5, 1, None), size=32768) for i in range(130)]
+        assert storage.put(events[:119])
+        assert queue_full_hook.mock_calls == []
+        assert storage.put(events[119:])
+        assert queue_full_hook.mock_calls == [mocker.call()]
+        assert len(storage.pop_many(200)) == 130
+
     def test_clear(self, mocker):
         """Test clear method."""
         storage = InMemoryEventStorage(100, mocker.Mock())
@@ -1044,8 +1142,8 @@ class InMemoryEventsStorageTests(object):
             event=Event('key1', 'user', 'purchase', 3.5, 123456, None),
             size=1024,
         )])
-        assert(telemetry_storage._counters._events_dropped == 1)
-        assert(telemetry_storage._counters._events_queued == 2)
+        assert(telemetry_storage.get_events_stats(ModelTelemetry.CounterConstants.EVENTS_DROPPED) == 1)
+        assert(telemetry_storage.get_events_stats(ModelTelemetry.CounterConstants.EVENTS_QUEUED) == 2)
 
 
 class InMemoryEventsStorageAsyncTests(object):
@@ -1173,13 +1271,13 @@ class InMemoryTelemetryStorageTests(object):
     def test_resets(self):
         storage = InMemoryTelemetryStorage()
 
-        assert(storage._counters._impressions_queued == 0)
-        assert(storage._counters._impressions_deduped == 0)
-        assert(storage._counters._impressions_dropped == 0)
-        assert(storage._counters._events_dropped == 0)
-        assert(storage._counters._events_queued == 0)
-        assert(storage._counters._auth_rejections == 0)
-        assert(storage._counters._token_refreshes == 0)
+        assert(storage.get_impressions_stats(ModelTelemetry.CounterConstants.IMPRESSIONS_QUEUED) == 0)
+        assert(storage.get_impressions_stats(ModelTelemetry.CounterConstants.IMPRESSIONS_DEDUPED) == 0)
+        assert(storage.get_impressions_stats(ModelTelemetry.CounterConstants.IMPRESSIONS_DROPPED) == 0)
+        assert(storage.get_events_stats(ModelTelemetry.CounterConstants.EVENTS_DROPPED) == 0)
+        assert(storage.get_events_stats(ModelTelemetry.CounterConstants.EVENTS_QUEUED) == 0)
+        assert(storage.pop_auth_rejections() == 0)
+        assert(storage.pop_token_refreshes() == 0)
 
         assert(storage._method_exceptions.pop_all() == {'methodExceptions': {'treatment': 0, 'treatments': 0, 'treatment_with_config': 0, 'treatments_with_config': 0, 'treatments_by_flag_set': 0, 'treatments_by_flag_sets': 0, 'treatments_with_config_by_flag_set': 0, 'treatments_with_config_by_flag_sets': 0, 'track': 0}})
         assert(storage._last_synchronization.get_all() == {'lastSynchronizations': {'split': 0, 'segment': 0, 'impression': 0, 'impressionCount': 0, 'event': 0, 'telemetry': 0, 'token': 0}})
@@ -1299,70 +1397,29 @@ class InMemoryTelemetryStorageTests(object):
         storage = InMemoryTelemetryStorage()
 
         for method in ModelTelemetry.MethodExceptionsAndLatencies:
-            if self._get_method_latency(method, storage) == None:
-                continue
-            storage.record_latency(method, 50)
-            assert(self._get_method_latency(method, storage)[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            storage.record_latency(method, 50000000)
-            assert(self._get_method_latency(method, storage)[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            for j in range(10):
-                latency = random.randint(1001, 4987885)
-                current_count = self._get_method_latency(method, storage)[ModelTelemetry.get_latency_bucket_index(latency)]
-                [storage.record_latency(method, latency) for i in range(2)]
-                assert(self._get_method_latency(method, storage)[ModelTelemetry.get_latency_bucket_index(latency)] == 2 + current_count)
+            storage.record_latency(method, 0)
+            storage.record_latency(method, 22)
+            for bucket in range(23):
+                [storage.record_latency(method, bucket) for i in range(2)]
+        latencies = storage.pop_latencies()
+        assert(len(latencies['methodLatencies']) == 9)
+        for method_latency in latencies['methodLatencies'].values():
+            assert(method_latency == [3] + [2] * 21 + [3])
 
         for resource in ModelTelemetry.HTTPExceptionsAndLatencies:
-            if self._get_http_latency(resource, storage) == None:
+            if self._pop_http_latency(resource, storage) == None:
                 continue
             storage.record_sync_latency(resource, 50)
-            assert(self._get_http_latency(resource, storage)[ModelTelemetry.get_latency_bucket_index(50)] == 1)
+            assert(self._pop_http_latency(resource, storage)[ModelTelemetry.get_latency_bucket_index(50)] == 1)
             storage.record_sync_latency(resource, 50000000)
-            assert(self._get_http_latency(resource, storage)[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
+            assert(self._pop_http_latency(resource, storage)[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
             for j in range(10):
                 latency = random.randint(1001, 4987885)
-                current_count = self._get_http_latency(resource, storage)[ModelTelemetry.get_latency_bucket_index(latency)]
                 [storage.record_sync_latency(resource, latency) for i in range(2)]
-                assert(self._get_http_latency(resource, storage)[ModelTelemetry.get_latency_bucket_index(latency)] == 2 + current_count)
-
-    def _get_method_latency(self, resource, storage):
-        if resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT:
-            return storage._method_latencies._treatment
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS:
-            return storage._method_latencies._treatments
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG:
-            return storage._method_latencies._treatment_with_config
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG:
-            return storage._method_latencies._treatments_with_config
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET:
-            return storage._method_latencies._treatments_by_flag_set
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS:
-            return storage._method_latencies._treatments_by_flag_sets
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET:
-            return storage._method_latencies._treatments_with_config_by_flag_set
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS:
-            return storage._method_latencies._treatments_with_config_by_flag_sets
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TRACK:
-            return storage._method_latencies._track
-        else:
-            return
-
-    def _get_http_latency(self, resource, storage):
-        if resource == ModelTelemetry.HTTPExceptionsAndLatencies.SPLIT:
-            return storage._http_latencies._split
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.SEGMENT:
-            return storage._http_latencies._segment
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.IMPRESSION:
-            return storage._http_latencies._impression
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.IMPRESSION_COUNT:
-            return storage._http_latencies._impression_count
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.EVENT:
-            return storage._http_latencies._event
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.TELEMETRY:
-            return storage._http_latencies._telemetry
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.TOKEN:
-            return storage._http_latencies._token
-        else:
-            return
+                assert(self._pop_http_latency(resource, storage)[ModelTelemetry.get_latency_bucket_index(latency)] == 2)
+
+    def _pop_http_latency(self, resource, storage):
+        return (storage.pop_http_latencies())['httpLatencies'].get(resource.value)
 
     def test_pop_counters(self):
         storage = InMemoryTelemetryStorage()
@@ -1415,13 +1472,13 @@ class InMemoryTelemetryStorageTests(object):
         storage.record_auth_rejections()
         storage.record_auth_rejections()
         auth_rejections = storage.pop_auth_rejections()
-        assert(storage._counters._auth_rejections == 0)
+        assert(storage.pop_auth_rejections() == 0)
         assert(auth_rejections == 2)
 
         storage.record_token_refreshes()
         storage.record_token_refreshes()
         token_refreshes = storage.pop_token_refreshes()
-        assert(storage._counters._token_refreshes == 0)
+        assert(storage.pop_token_refreshes() == 0)
         assert(token_refreshes == 2)
 
         storage.record_streaming_event((ModelTelemetry.StreamingEventTypes.CONNECTION_ESTABLISHED, 'split', 1234))
@@ -1434,36 +1491,30 @@ class InMemoryTelemetryStorageTests(object):
     def test_pop_latencies(self):
         storage = InMemoryTelemetryStorage()
 
-        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT, i) for i in [5, 10, 10, 10]]
-        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS, i) for i in [7, 10, 14, 13]]
-        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG, i) for i in [200]]
-        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG, i) for i in [50, 40]]
-        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET, i) for i in [15, 20]]
-        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS, i) for i in [14, 25]]
-        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET, i) for i in [100]]
-        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS, i) for i in [50, 20]]
-        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TRACK, i) for i in [1, 10, 100]]
+        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT, i) for i in [0, 3, 3, 3]]
+        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS, i) for i in [1, 2, 2, 22]]
+        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG, i) for i in [5]]
+        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG, i) for i in [0, 0]]
+        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET, i) for i in [4, 4]]
+        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS, i) for i in [0, 1]]
+        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET, i) for i in [10]]
+        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS, i) for i in [0, 0]]
+        [storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TRACK, i) for i in [0, 1, 2]]
         latencies = storage.pop_latencies()
 
-        assert(storage._method_latencies._treatment == [0] * 23)
-        assert(storage._method_latencies._treatments == [0] * 23)
-        assert(storage._method_latencies._treatment_with_config == [0] * 23)
-        assert(storage._method_latencies._treatments_with_config == [0] * 23)
-        assert(storage._method_latencies._treatments_by_flag_set == [0] * 23)
-        assert(storage._method_latencies._treatments_by_flag_sets == [0] * 23)
-        assert(storage._method_latencies._treatments_with_config_by_flag_set == [0] * 23)
-        assert(storage._method_latencies._treatments_with_config_by_flag_sets == [0] * 23)
-        assert(storage._method_latencies._track == [0] * 23)
         assert(latencies ==  {'methodLatencies': {
-                    'treatment': [4] + [0] * 22,
-                    'treatments': [4] + [0] * 22,
-                    'treatment_with_config': [1] + [0] * 22,
+                    'treatment': [1, 0, 0, 3] + [0] * 19,
+                    'treatments': [0, 1, 2] + [0] * 19 + [1],
+                    'treatment_with_config': [0] * 5 + [1] + [0] * 17,
                     'treatments_with_config': [2] + [0] * 22,
-                    'treatments_by_flag_set': [2] + [0] * 22,
-                    'treatments_by_flag_sets': [2] + [0] * 22,
-                    'treatments_with_config_by_flag_set': [1] + [0] * 22,
+                    'treatments_by_flag_set': [0] * 4 + [2] + [0] * 18,
+                    'treatments_by_flag_sets': [1, 1] + [0] * 21,
+                    'treatments_with_config_by_flag_set': [0] * 10 + [1] + [0] * 12,
                     'treatments_with_config_by_flag_sets': [2] + [0] * 22,
-                    'track': [3] + [0] * 22}})
+                    'track': [1, 1, 1] + [0] * 20}})
+        latencies = storage.pop_latencies()
+        for method_latency in latencies['methodLatencies'].values():
+            assert(method_latency == [0] * 23)
 
         [storage.record_sync_latency(ModelTelemetry.HTTPExceptionsAndLatencies.SPLIT, i) for i in [50, 10, 20, 40]]
         [storage.record_sync_latency(ModelTelemetry.HTTPExceptionsAndLatencies.SEGMENT, i) for i in [70, 100, 40, 30]]
@@ -1474,12 +1525,7 @@ class InMemoryTelemetryStorageTests(object):
         [storage.record_sync_latency(ModelTelemetry.HTTPExceptionsAndLatencies.TOKEN, i) for i in [10, 15, 100]]
         sync_latency = storage.pop_http_latencies()
 
-        assert(storage._http_latencies._split == [0] * 23)
-        assert(storage._http_latencies._segment == [0] * 23)
-        assert(storage._http_latencies._impression == [0] * 23)
-        assert(storage._http_latencies._impression_count == [0] * 23)
-        assert(storage._http_latencies._telemetry == [0] * 23)
-        assert(storage._http_latencies._token == [0] * 23)
+        assert(all(latencies == [0] * 23 for latencies in (storage.pop_http_latencies())['httpLatencies'].values()))
         assert(sync_latency == {'httpLatencies': {'split': [4] + [0] * 22, 'segment': [4] + [0] * 22,
                                 'impression': [2] + [0] * 22, 'impressionCount': [2] + [0] * 22, 'event': [2] + [0] * 22,
                                 'telemetry': [3] + [0] * 22, 'token': [3] + [0] * 22}})
@@ -1621,70 +1667,29 @@ class InMemoryTelemetryStorageAsyncTests(object):
         storage = await InMemoryTelemetryStorageAsync.create()
 
         for method in ModelTelemetry.MethodExceptionsAndLatencies:
-            if self._get_method_latency(method, storage) == None:
-                continue
-            await storage.record_latency(method, 50)
-            assert(self._get_method_latency(method, storage)[ModelTelemetry.get_latency_bucket_index(50)] == 1)
-            await storage.record_latency(method, 50000000)
-            assert(self._get_method_latency(method, storage)[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
-            for j in range(10):
-                latency = random.randint(1001, 4987885)
-                current_count = self._get_method_latency(method, storage)[ModelTelemetry.get_latency_bucket_index(latency)]
-                [await storage.record_latency(method, latency) for i in range(2)]
-                assert(self._get_method_latency(method, storage)[ModelTelemetry.get_latency_bucket_index(latency)] == 2 + current_count)
+            await storage.record_latency(method, 0)
+            await storage.record_latency(method, 22)
+            for bucket in range(23):
+                [await storage.record_latency(method, bucket) for i in range(2)]
+        latencies = await storage.pop_latencies()
+        assert(len(latencies['methodLatencies']) == 9)
+        for method_latency in latencies['methodLatencies'].values():
+            assert(method_latency == [3] + [2] * 21 + [3])
 
         for resource in ModelTelemetry.HTTPExceptionsAndLatencies:
-            if self._get_http_latency(resource, storage) == None:
+            if await self._pop_http_latency(resource, storage) == None:
                 continue
             await storage.record_sync_latency(resource, 50)
-            assert(self._get_http_latency(resource, storage)[ModelTelemetry.get_latency_bucket_index(50)] == 1)
+            assert((await self._pop_http_latency(resource, storage))[ModelTelemetry.get_latency_bucket_index(50)] == 1)
             await storage.record_sync_latency(resource, 50000000)
-            assert(self._get_http_latency(resource, storage)[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
+            assert((await self._pop_http_latency(resource, storage))[ModelTelemetry.get_latency_bucket_index(50000000)] == 1)
             for j in range(10):
                 latency = random.randint(1001, 4987885)
-                current_count = self._get_http_latency(resource, storage)[ModelTelemetry.get_latency_bucket_index(latency)]
                 [await storage.record_sync_latency(resource, latency) for i in range(2)]
-                assert(self._get_http_latency(resource, storage)[ModelTelemetry.get_latency_bucket_index(latency)] == 2 + current_count)
-
-    def _get_method_latency(self, resource, storage):
-        if resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT:
-            return storage._method_latencies._treatment
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS:
-            return storage._method_latencies._treatments
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG:
-            return storage._method_latencies._treatment_with_config
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG:
-            return storage._method_latencies._treatments_with_config
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET:
-            return storage._method_latencies._treatments_by_flag_set
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS:
-            return storage._method_latencies._treatments_by_flag_sets
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET:
-            return storage._method_latencies._treatments_with_config_by_flag_set
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS:
-            return storage._method_latencies._treatments_with_config_by_flag_sets
-        elif resource == ModelTelemetry.MethodExceptionsAndLatencies.TRACK:
-            return storage._method_latencies._track
-        else:
-            return
-
-    def _get_http_latency(self, resource, storage):
-        if resource == ModelTelemetry.HTTPExceptionsAndLatencies.SPLIT:
-            return storage._http_latencies._split
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.SEGMENT:
-            return storage._http_latencies._segment
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.IMPRESSION:
-            return storage._http_latencies._impression
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.IMPRESSION_COUNT:
-            return storage._http_latencies._impression_count
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.EVENT:
-            return storage._http_latencies._event
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.TELEMETRY:
-            return storage._http_latencies._telemetry
-        elif resource == ModelTelemetry.HTTPExceptionsAndLatencies.TOKEN:
-            return storage._http_latencies._token
-        else:
-            return
+                assert((await self._pop_http_latency(resource, storage))[ModelTelemetry.get_latency_bucket_index(latency)] == 2)
+
+    async def _pop_http_latency(self, resource, storage):
+        return (await storage.pop_http_latencies())['httpLatencies'].get(resource.value)
 
     @pytest.mark.asyncio
     async def test_pop_counters(self):
@@ -1758,36 +1763,30 @@ class InMemoryTelemetryStorageAsyncTests(object):
     async def test_pop_latencies(self):
         storage = await InMemoryTelemetryStorageAsync.create()
 
-        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT, i) for i in [5, 10, 10, 10]]
-        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS, i) for i in [7, 10, 14, 13]]
-        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG, i) for i in [200]]
-        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG, i) for i in [50, 40]]
-        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET, i) for i in [15, 20]]
-        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS, i) for i in [14, 25]]
-        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET, i) for i in [100]]
-        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS, i) for i in [50, 20]]
-        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TRACK, i) for i in [1, 10, 100]]
+        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT, i) for i in [0, 3, 3, 3]]
+        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS, i) for i in [1, 2, 2, 22]]
+        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENT_WITH_CONFIG, i) for i in [5]]
+        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG, i) for i in [0, 0]]
+        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET, i) for i in [4, 4]]
+        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SETS, i) for i in [0, 1]]
+        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET, i) for i in [10]]
+        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SETS, i) for i in [0, 0]]
+        [await storage.record_latency(ModelTelemetry.MethodExceptionsAndLatencies.TRACK, i) for i in [0, 1, 2]]
         latencies = await storage.pop_latencies()
 
-        assert(storage._method_latencies._treatment == [0] * 23)
-        assert(storage._method_latencies._treatments == [0] * 23)
-        assert(storage._method_latencies._treatment_with_config == [0] * 23)
-        assert(storage._method_latencies._treatments_with_config == [0] * 23)
-        assert(storage._method_latencies._treatments_by_flag_set == [0] * 23)
-        assert(storage._method_latencies._treatments_by_flag_sets == [0] * 23)
-        assert(storage._method_latencies._treatments_with_config_by_flag_set == [0] * 23)
-        assert(storage._method_latencies._treatments_with_config_by_flag_sets == [0] * 23)
-        assert(storage._method_latencies._track == [0] * 23)
         assert(latencies ==  {'methodLatencies': {
-                    'treatment': [4] + [0] * 22,
-                    'treatments': [4] + [0] * 22,
-                    'treatment_with_config': [1] + [0] * 22,
+                    'treatment': [1, 0, 0, 3] + [0] * 19,
+                    'treatments': [0, 1, 2] + [0] * 19 + [1],
+                    'treatment_with_config': [0] * 5 + [1] + [0] * 17,
                     'treatments_with_config': [2] + [0] * 22,
-                    'treatments_by_flag_set': [2] + [0] * 22,
-                    'treatments_by_flag_sets': [2] + [0] * 22,
-                    'treatments_with_config_by_flag_set': [1] + [0] * 22,
+                    'treatments_by_flag_set': [0] * 4 + [2] + [0] * 18,
+                    'treatments_by_flag_sets': [1, 1] + [0] * 21,
+                    'treatments_with_config_by_flag_set': [0] * 10 + [1] + [0] * 12,
                     'treatments_with_config_by_flag_sets': [2] + [0] * 22,
-                    'track': [3] + [0] * 22}})
+                    'track': [1, 1, 1] + [0] * 20}})
+        latencies = await storage.pop_latencies()
+        for method_latency in latencies['methodLatencies'].values():
+            assert(method_latency == [0] * 23)
 
         [await storage.record_sync_latency(ModelTelemetry.HTTPExceptionsAndLatencies.SPLIT, i) for i in [50, 10, 20, 40]]
         [await storage.record_sync_latency(ModelTelemetry.HTTPExceptionsAndLatencies.SEGMENT, i) for i in [70, 100, 40, 30]]
@@ -1798,12 +1797,7 @@ class InMemoryTelemetryStorageAsyncTests(object):
         [await storage.record_sync_latency(ModelTelemetry.HTTPExceptionsAndLatencies.TOKEN, i) for i in [10, 15, 100]]
         sync_latency = await storage.pop_http_latencies()
 
-        assert(storage._http_latencies._split == [0] * 23)
-        assert(storage._http_latencies._segment == [0] * 23)
-        assert(storage._http_latencies._impression == [0] * 23)
-        assert(storage._http_latencies._impression_count == [0] * 23)
-        assert(storage._http_latencies._telemetry == [0] * 23)
-        assert(storage._http_latencies._token == [0] * 23)
+        assert(all(latencies == [0] * 23 for latencies in (await storage.pop_http_latencies())['httpLatencies'].values()))
         assert(sync_latency == {'httpLatencies': {'split': [4] + [0] * 22, 'segment': [4] + [0] * 22,
                                 'impression': [2] + [0] * 22, 'impressionCount': [2] + [0] * 22, 'event': [2] + [0] * 22,
                                 'telemetry': [3] + [0] * 22, 'token': [3] + [0] * 22}})
@@ -236,6 +236,26 @@ class StorageMockAdapterAsync(object):
                 self._expire[key] = ttl
 
 
+class StorageMockAdapterBatch(StorageMockAdapter):
+    def __init__(self):
+        StorageMockAdapter.__init__(self)
+        self.item_contains_many_calls = 0
+
+    def item_contains_many(self, keys, item):
+        self.item_contains_many_calls += 1
+        with self._lock:
+            return [key in self._keys and item in self._keys[key] for key in keys]
+
+class StorageMockAdapterBatchAsync(StorageMockAdapterAsync):
+    def __init__(self):
+        StorageMockAdapterAsync.__init__(self)
+        self.item_contains_many_calls = 0
+
+    async def item_contains_many(self, keys, item):
+        self.item_contains_many_calls += 1
+        async with self._lock:
+            return [key in self._keys and item in self._keys[key] for key in keys]
+
 class PluggableSplitStorageTests(object):
     """In memory split storage test cases."""
 
@@ -296,6 +316,26 @@ class PluggableSplitStorageTests(object):
             assert(fetched[split1.name].to_json() == split1.to_json())
             assert(fetched[split2.name].to_json() == split2.to_json())
 
+    def test_fetch_many_cached(self, mocker):
+        adapter = StorageMockAdapter()
+        pluggable_split_storage = PluggableSplitStorage(adapter, prefix='myprefix', enable_caching=True, max_age=0)
+        split1 = splits.from_raw(splits_json['splitChange1_2']['splits'][0])
+        adapter.set(pluggable_split_storage._prefix.format(feature_flag_name=split1.name), split1.to_json())
+        adapter.set(pluggable_split_storage._feature_flag_till_prefix, 1)
+        get_many = mocker.spy(adapter, 'get_many')
+
+        fetched = pluggable_split_storage.fetch_many([split1.name])
+        assert(pluggable_split_storage.fetch_many([split1.name])[split1.name] is fetched[split1.name])
+        assert(pluggable_split_storage.get(split1.name) is fetched[split1.name])
+        assert(get_many.call_count == 1)
+
+        # a new change number invalidates the parsed feature flags
+        adapter.set(pluggable_split_storage._feature_flag_till_prefix, 2)
+        refetched = pluggable_split_storage.fetch_many([split1.name])
+        assert(refetched[split1.name] is not fetched[split1.name])
+        assert(refetched[split1.name].to_json() == split1.to_json())
+        assert(get_many.call_count == 2)
+
     # TODO: To be added when producer mode is aupported
 #    def test_remove(self):
 #        self.mock_adapter._keys = {}
@@ -434,6 +474,25 @@ class PluggableSplitStorageAsyncTests(object):
             assert(fetched[split1.name].to_json() == split1.to_json())
             assert(fetched[split2.name].to_json() == split2.to_json())
 
+    @pytest.mark.asyncio
+    async def test_fetch_many_cached(self, mocker):
+        adapter = StorageMockAdapterAsync()
+        pluggable_split_storage = PluggableSplitStorageAsync(adapter, prefix='myprefix', enable_caching=True, max_age=0)
+        split1 = splits.from_raw(splits_json['splitChange1_2']['splits'][0])
+        await adapter.set(pluggable_split_storage._prefix.format(feature_flag_name=split1.name), split1.to_json())
+        await adapter.set(pluggable_split_storage._feature_flag_till_prefix, 1)
+        get_many = mocker.spy(adapter, 'get_many')
+
+        fetched = await pluggable_split_storage.fetch_many([split1.name])
+        assert((await pluggable_split_storage.fetch_many([split1.name]))[split1.name] is fetched[split1.name])
+        assert(await pluggable_split_storage.get(split1.name) is fetched[split1.name])
+        assert(get_many.call_count == 1)
+
+        await adapter.set(pluggable_split_storage._feature_flag_till_prefix, 2)
+        refetched = await pluggable_split_storage.fetch_many([split1.name])
+        assert(refetched[split1.name] is not fetched[split1.name])
+        assert(get_many.call_count == 2)
+
     @pytest.mark.asyncio
     async def test_get_change_number(self):
         self.mock_adapter._keys = {}
@@ -524,6 +583,41 @@ class PluggableSegmentStorageTests(object):
             assert(not pluggable_segment_storage.segment_contains('segment1', 'key5'))
             assert(pluggable_segment_storage.segment_contains('segment1', 'key1'))
 
+    def test_segment_contains_many(self):
+        for adapter in [StorageMockAdapter(), StorageMockAdapterBatch()]:
+            pluggable_segment_storage = PluggableSegmentStorage(adapter, prefix='myprefix')
+            adapter.set(pluggable_segment_storage._prefix.format(segment_name='segment1'), {'key1', 'key2'})
+            adapter.set(pluggable_segment_storage._prefix.format(segment_name='segment2'), {'key3'})
+            assert(pluggable_segment_storage.segment_contains_many(['segment1', 'segment2'], 'key1') == {'segment1': True, 'segment2': False})
+
+        assert(adapter.item_contains_many_calls == 1)
+
+    def test_segment_contains_many_short_result(self, mocker):
+        adapter = StorageMockAdapterBatch()
+        pluggable_segment_storage = PluggableSegmentStorage(adapter, prefix='myprefix')
+        adapter.set(pluggable_segment_storage._prefix.format(segment_name='segment1'), {'key1', 'key2'})
+        adapter.set(pluggable_segment_storage._prefix.format(segment_name='segment2'), {'key3'})
+        adapter.item_contains_many = mocker.Mock(return_value=[False])
+        assert(pluggable_segment_storage.segment_contains_many(['segment1', 'segment2'], 'key1') == {'segment1': True, 'segment2': False})
+        assert(len(adapter.item_contains_many.mock_calls) == 1)
+
+    def test_segment_contains_cached(self, mocker):
+        adapter = StorageMockAdapter()
+        pluggable_segment_storage = PluggableSegmentStorage(adapter, prefix='myprefix', enable_caching=True, max_age=0)
+        adapter.set(pluggable_segment_storage._prefix.format(segment_name='segment1'), {'key1', 'key2'})
+        adapter.set(pluggable_segment_storage._segment_till_prefix.format(segment_name='segment1'), 1)
+        item_contains = mocker.spy(adapter, 'item_contains')
+
+        assert(pluggable_segment_storage.segment_contains('segment1', 'key1'))
+        assert(pluggable_segment_storage.segment_contains_many(['segment1'], 'key1') == {'segment1': True})
+        assert(item_contains.call_count == 1)
+
+        # key removed along with a new change number
+        adapter.set(pluggable_segment_storage._prefix.format(segment_name='segment1'), {'key2'})
+        adapter.set(pluggable_segment_storage._segment_till_prefix.format(segment_name='segment1'), 2)
+        assert(not pluggable_segment_storage.segment_contains('segment1', 'key1'))
+        assert(item_contains.call_count == 2)
+
     # TODO: To be added when producer mode is implemented
 #    def get_segment_keys_count(self):
 #        self.mock_adapter._keys = {}
@@ -603,6 +697,41 @@ class PluggableSegmentStorageAsyncTests(object):
             assert(not await pluggable_segment_storage.segment_contains('segment1', 'key5'))
             assert(await pluggable_segment_storage.segment_contains('segment1', 'key1'))
 
+    @pytest.mark.asyncio
+    async def test_segment_contains_many(self):
+        for adapter in [StorageMockAdapterAsync(), StorageMockAdapterBatchAsync()]:
+            pluggable_segment_storage = PluggableSegmentStorageAsync(adapter, prefix='myprefix')
+            await adapter.set(pluggable_segment_storage._prefix.format(segment_name='segment1'), {'key1', 'key2'})
+            await adapter.set(pluggable_segment_storage._prefix.format(segment_name='segment2'), {'key3'})
+            assert(await pluggable_segment_storage.segment_contains_many(['segment1', 'segment2'], 'key1') == {'segment1': True, 'segment2': False})
+
+        assert(adapter.item_contains_many_calls == 1)
+
+    @pytest.mark.asyncio
+    async def test_segment_contains_many_short_result(self, mocker):
+        adapter = StorageMockAdapterBatchAsync()
+        pluggable_segment_storage = PluggableSegmentStorageAsync(adapter, prefix='myprefix')
+        await adapter.set(pluggable_segment_storage._prefix.format(segment_name='segment1'), {'key1', 'key2'})
+        await adapter.set(pluggable_segment_storage._prefix.format(segment_name='segment2'), {'key3'})
+        adapter.item_contains_many = mocker.AsyncMock(return_value=[True, False, True])
+        assert(await pluggable_segment_storage.segment_contains_many(['segment1', 'segment2'], 'key1') == {'segment1': True, 'segment2': False})
+        assert(len(adapter.item_contains_many.mock_calls) == 1)
+
+    @pytest.mark.asyncio
+    async def test_segment_contains_cached(self):
+        adapter = StorageMockAdapterBatchAsync()
+        pluggable_segment_storage = PluggableSegmentStorageAsync(adapter, prefix='myprefix', enable_caching=True, max_age=0)
+        await adapter.set(pluggable_segment_storage._prefix.format(segment_name='segment1'), {'key1', 'key2'})
+        await adapter.set(pluggable_segment_storage._prefix.format(segment_name='segment2'), {'key3'})
+
+        assert(await pluggable_segment_storage.segment_contains_many(['segment1', 'segment2'], 'key1') == {'segment1': True, 'segment2': False})
+        assert(await pluggable_segment_storage.segment_contains('segment2', 'key1') is False)
+        assert(adapter.item_contains_many_calls == 1)
+
+        await adapter.set(pluggable_segment_storage._segment_till_prefix.format(segment_name='segment2'), 3)
+        assert(await pluggable_segment_storage.segment_contains_many(['segment1', 'segment2'], 'key1') == {'segment1': True, 'segment2': False})
+        assert(adapter.item_contains_many_calls == 2)
+
     @pytest.mark.asyncio
     async def test_get(self):
         self.mock_adapter._keys = {}
@@ -12,7 +12,8 @@ from splitio.storage.adapters.redis import RedisAdapter, RedisAdapterAsync, Redi
 from splitio.optional.loaders import asyncio
 from splitio.storage import FlagSetsFilter
 from splitio.storage.redis import RedisEventsStorage, RedisEventsStorageAsync, RedisImpressionsStorage, RedisImpressionsStorageAsync, \
-    RedisSegmentStorage, RedisSegmentStorageAsync, RedisSplitStorage, RedisSplitStorageAsync, RedisTelemetryStorage, RedisTelemetryStorageAsync
+    RedisSegmentStorage, RedisSegmentStorageAsync, RedisSplitStorage, RedisSplitStorageAsync, RedisTelemetryStorage, RedisTelemetryStorageAsync, \
+    RedisEvaluationStorage, RedisEvaluationStorageAsync
 from splitio.storage.adapters.redis import RedisAdapter, RedisAdapterException, build
 from redis.asyncio.client import Redis as aioredis
 from splitio.storage.adapters import redis
@@ -275,8 +276,12 @@ class RedisSplitStorageAsyncTests(object):
         assert result is not None
         assert self.name == None
         await asyncio.sleep(1)  # wait for expiration
+        # expired value is served while it's refreshed in the background
         result = await storage.get('some_split')
+        assert result is not None
+        await asyncio.sleep(0)
         assert self.name == 'SPLITIO.split.some_split'
+        result = await storage.get('some_split')
         assert result is None
 
     @pytest.mark.asyncio
@@ -319,6 +324,8 @@ class RedisSplitStorageAsyncTests(object):
         await asyncio.sleep(1)
         self.name = None
         result = await storage.fetch_many(['split1', 'split2', 'split3'])
+        assert result['split1'] is not None
+        await asyncio.sleep(0)
         assert self.name == ['SPLITIO.split.split1', 'SPLITIO.split.split2', 'SPLITIO.split.split3']
 
     @pytest.mark.asyncio
@@ -438,6 +445,8 @@ class RedisSplitStorageAsyncTests(object):
         mocker.patch('splitio.storage.adapters.redis.RedisAdapterAsync.get', new=get2)
         assert await storage.is_valid_traffic_type('any') is True
         await asyncio.sleep(1)
+        assert await storage.is_valid_traffic_type('any') is True  # stale, refresh scheduled
+        await asyncio.sleep(0)
         assert await storage.is_valid_traffic_type('any') is False
 
         async def get3(sel, name):
@@ -445,6 +454,8 @@ class RedisSplitStorageAsyncTests(object):
         mocker.patch('splitio.storage.adapters.redis.RedisAdapterAsync.get', new=get3)
         await asyncio.sleep(1)
         assert await storage.is_valid_traffic_type('any') is False
+        await asyncio.sleep(0)
+        assert await storage.is_valid_traffic_type('any') is False
 
 
 class RedisSegmentStorageTests(object):
@@ -576,6 +587,97 @@ class RedisSegmentStorageAsyncTests(object):
         assert self.key == 'some_key'
 
 
+def _raw_flag(name, matchers):
+    """Build a raw feature flag with a single condition holding the given matchers."""
+    return {
+        'name': name,
+        'seed': 123,
+        'killed': False,
+        'defaultTreatment': 'off',
+        'trafficTypeName': 'user',
+        'status': 'ACTIVE',
+        'changeNumber': 1675443569027,
+        'conditions': [{
+            'conditionType': 'WHITELIST',
+            'matcherGroup': {'combiner': 'AND', 'matchers': matchers},
+            'partitions': [{'treatment': 'on', 'size': 100}],
+            'label': 'some_label'
+        }]
+    }
+
+_SEGMENT_MATCHER = {
+    'matcherType': 'IN_SEGMENT', 'negate': False, 'keySelector': None,
+    'userDefinedSegmentMatcherData': {'segmentName': 'employees'}
+}
+_DEPENDENCY_MATCHER = {
+    'matcherType': 'IN_SPLIT_TREATMENT', 'negate': False, 'keySelector': None,
+    'dependencyMatcherData': {'split': 'dependency', 'treatments': ['on']}
+}
+
+
+class RedisEvaluationStorageTests(object):
+    """Redis evaluation data storage test cases."""
+
+    def _populate(self, client, prefix):
+        """Store a flag depending on another flag that targets a segment."""
+        client.set(prefix + 'SPLITIO.split.main', json.dumps(_raw_flag('main', [_DEPENDENCY_MATCHER])))
+        client.set(prefix + 'SPLITIO.split.dependency', json.dumps(_raw_flag('dependency', [_SEGMENT_MATCHER])))
+        client.sadd(prefix + 'SPLITIO.segment.employees', 'key1')
+
+    def test_fetch_evaluation_data(self, mocker):
+        """Test flags, dependencies and memberships are fetched in a single script call."""
+        fakeredis = pytest.importorskip('fakeredis')
+        client = fakeredis.FakeStrictRedis(decode_responses=True)
+        self._populate(client, 'some_prefix.')
+        adapter = RedisAdapter(client, 'some_prefix')
+        evalsha_spy = mocker.spy(client, 'evalsha')
+        script_load_spy = mocker.spy(client, 'script_load')
+        storage = RedisEvaluationStorage(adapter)
+
+        flags, memberships = storage.fetch_evaluation_data('key1', ['main', 'missing'])
+        assert set(flags.keys()) == {'main', 'dependency'}
+        assert flags['dependency'].change_number == 1675443569027
+        assert memberships == {'employees': True}
+        assert len(script_load_spy.mock_calls) == 1  # loaded when redis answered NOSCRIPT
+
+        flags, memberships = storage.fetch_evaluation_data('key2', ['dependency'])
+        assert set(flags.keys()) == {'dependency'}
+        assert memberships == {'employees': False}
+        assert len(script_load_spy.mock_calls) == 1
+        assert len(evalsha_spy.mock_calls) == 3
+
+        client.script_flush()
+        flags, memberships = storage.fetch_evaluation_data('key1', ['dependency'])
+        assert memberships == {'employees': True}
+        assert len(script_load_spy.mock_calls) == 2
+
+    def test_fetch_evaluation_data_error(self, mocker):
+        """Test None is returned when the script fails so callers can fall back."""
+        adapter = mocker.Mock(spec=RedisAdapter)
+        adapter.register_script.return_value.side_effect = RedisAdapterException('something')
+        storage = RedisEvaluationStorage(adapter)
+        assert storage.fetch_evaluation_data('key1', ['main']) is None
+        assert adapter.register_script.mock_calls[0] == mocker.call(RedisEvaluationStorage._EVALUATION_DATA_SCRIPT)
+
+
+class RedisEvaluationStorageAsyncTests(object):
+    """Redis evaluation data storage async test cases."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_evaluation_data(self, mocker):
+        """Test flags, dependencies and memberships are fetched in a single script call."""
+        fakeredis = pytest.importorskip('fakeredis')
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        await client.set('SPLITIO.split.main', json.dumps(_raw_flag('main', [_DEPENDENCY_MATCHER, _SEGMENT_MATCHER])))
+        await client.set('SPLITIO.split.dependency', json.dumps(_raw_flag('dependency', [])))
+        await client.sadd('SPLITIO.segment.employees', 'key1')
+        storage = RedisEvaluationStorageAsync(redis.RedisAdapterAsync(client))
+
+        flags, memberships = await storage.fetch_evaluation_data('key1', ['main'])
+        assert set(flags.keys()) == {'main', 'dependency'}
+        assert memberships == {'employees': True}
+
+
 class RedisImpressionsStorageTests(object):  # pylint: disable=too-few-public-methods
     """Redis Impressions storage test cases."""
 
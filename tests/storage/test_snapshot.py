@@ -0,0 +1,116 @@
+"""Storage snapshot test module."""
+# pylint: disable=no-self-use,protected-access
+import json
+import os
+import pytest
+import threading
+
+from splitio.models import splits
+from splitio.models.segments import Segment
+from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage, InMemorySplitStorageAsync, \
+    InMemorySegmentStorageAsync
+from splitio.storage.snapshot import StorageSnapshot, StorageSnapshotAsync
+
+
+def _raw_flag(name, segment_name):
+    """Build a raw feature flag matching users in a segment."""
+    return {
+        'name': name,
+        'seed': 123,
+        'killed': False,
+        'defaultTreatment': 'off',
+        'trafficTypeName': 'user',
+        'status': 'ACTIVE',
+        'changeNumber': 123,
+        'conditions': [{
+            'conditionType': 'WHITELIST',
+            'matcherGroup': {'combiner': 'AND', 'matchers': [{
+                'matcherType': 'IN_SEGMENT', 'negate': False, 'keySelector': None,
+                'userDefinedSegmentMatcherData': {'segmentName': segment_name}
+            }]},
+            'partitions': [{'treatment': 'on', 'size': 100}],
+            'label': 'some_label'
+        }]
+    }
+
+
+def _fill(split_storage, segment_storage):
+    split_storage.update([splits.from_raw(_raw_flag('flag1', 'employees'))], [], 123)
+    segment_storage.put(Segment('employees', ['key1', 'key2'], 456))
+
+
+class StorageSnapshotTests(object):
+    """Storage snapshot test cases."""
+
+    def test_save_and_load(self, tmp_path):
+        """Test storages are restored with their change numbers."""
+        path = str(tmp_path / 'snapshot')
+        split_storage, segment_storage = InMemorySplitStorage(), InMemorySegmentStorage()
+        _fill(split_storage, segment_storage)
+        snapshot = StorageSnapshot(path, 'some_sdk_key')
+        assert snapshot.save(split_storage, segment_storage)
+        assert not snapshot.save(split_storage, segment_storage)  # nothing changed
+        assert [name for name in os.listdir(str(tmp_path))] == ['snapshot']
+
+        split_storage, segment_storage = InMemorySplitStorage(), InMemorySegmentStorage()
+        assert StorageSnapshot(path, 'some_sdk_key').load(split_storage, segment_storage)
+        assert split_storage.get_change_number() == 123
+        assert split_storage.get('flag1').to_json() == splits.from_raw(_raw_flag('flag1', 'employees')).to_json()
+        assert segment_storage.get_change_number('employees') == 456
+        assert segment_storage.get('employees').keys == {'key1', 'key2'}
+
+    def test_not_synchronized(self, tmp_path):
+        """Test empty storages are not persisted."""
+        path = str(tmp_path / 'snapshot')
+        assert not StorageSnapshot(path, 'some_sdk_key').save(InMemorySplitStorage(), InMemorySegmentStorage())
+        assert not os.path.exists(path)
+        assert not StorageSnapshot(path, 'some_sdk_key').load(InMemorySplitStorage(), InMemorySegmentStorage())
+
+    def test_discarded_snapshots(self, tmp_path):
+        """Test corrupted or foreign snapshots are ignored."""
+        path = str(tmp_path / 'snapshot')
+        split_storage, segment_storage = InMemorySplitStorage(), InMemorySegmentStorage()
+        _fill(split_storage, segment_storage)
+        StorageSnapshot(path, 'some_sdk_key', ['set1']).save(split_storage, segment_storage)
+
+        assert not StorageSnapshot(path, 'other_sdk_key', ['set1']).load(InMemorySplitStorage(), InMemorySegmentStorage())
+        assert not StorageSnapshot(path, 'some_sdk_key').load(InMemorySplitStorage(), InMemorySegmentStorage())
+        assert not StorageSnapshot(path, 'some_sdk_key', ['set1'], max_age=-1).load(InMemorySplitStorage(), InMemorySegmentStorage())
+
+        with open(path, 'rb') as snapshot_file:
+            header, payload = snapshot_file.read().split(b'\n', 1)
+        with open(path, 'wb') as snapshot_file:
+            snapshot_file.write(header + b'\n' + payload.replace(b'key1', b'key3'))
+        split_storage = InMemorySplitStorage()
+        assert not StorageSnapshot(path, 'some_sdk_key', ['set1']).load(split_storage, InMemorySegmentStorage())
+        assert split_storage.get_change_number() == -1
+
+        header = json.loads(header)
+        header['version'] = 2
+        with open(path, 'wb') as snapshot_file:
+            snapshot_file.write(json.dumps(header).encode('utf-8') + b'\n' + payload)
+        assert not StorageSnapshot(path, 'some_sdk_key', ['set1']).load(InMemorySplitStorage(), InMemorySegmentStorage())
+
+    @pytest.mark.asyncio
+    async def test_save_and_load_async(self, tmp_path):
+        """Test storages are restored with their change numbers in async mode."""
+        path = str(tmp_path / 'snapshot')
+        split_storage, segment_storage = InMemorySplitStorageAsync(), InMemorySegmentStorageAsync()
+        await split_storage.update([splits.from_raw(_raw_flag('flag1', 'employees'))], [], 123)
+        await segment_storage.put(Segment('employees', ['key1', 'key2'], 456))
+        snapshot = StorageSnapshotAsync(path, 'some_sdk_key')
+        serialize = snapshot._serialize
+        serialized_in = []
+        def serialize_spy(*args):
+            serialized_in.append(threading.get_ident())
+            return serialize(*args)
+        snapshot._serialize = serialize_spy
+        assert await snapshot.save(split_storage, segment_storage)
+        assert not await snapshot.save(split_storage, segment_storage)
+        assert len(serialized_in) == 1 and serialized_in[0] != threading.get_ident()  # serialized off the event loop
+
+        split_storage, segment_storage = InMemorySplitStorageAsync(), InMemorySegmentStorageAsync()
+        assert await StorageSnapshotAsync(path, 'some_sdk_key').load(split_storage, segment_storage)
+        assert await split_storage.get_change_number() == 123
+        assert (await split_storage.get('flag1')).name == 'flag1'
+        assert (await segment_storage.get('employees')).keys == {'key1', 'key2'}
@@ -7,7 +7,8 @@ import pytest
 from splitio.api.client import HttpResponse
 from splitio.api import APIException
 from splitio.storage import EventStorage
-from splitio.models.events import Event
+from splitio.models.events import Event, EventWrapper
+from splitio.storage.inmemmory import InMemoryEventStorageAsync
 from splitio.sync.event import EventSynchronizer, EventSynchronizerAsync
 
 
@@ -129,3 +130,19 @@ class EventsSynchronizerAsyncTests(object):
         await event_synchronizer.synchronize_events()
         assert run._called == 1
         assert event_synchronizer._failed.qsize() == 0
+
+    @pytest.mark.asyncio
+    async def test_synchronize_events_drains_full_bulks(self, mocker):
+        storage = InMemoryEventStorageAsync(100, mocker.AsyncMock())
+        await storage.put([EventWrapper(event=Event('key%d' % i, 'user', 'purchase', 5.3, 123456, None), size=1024)
+                           for i in range(12)])
+        api = mocker.Mock()
+        self.sent = []
+        async def run(events):
+            self.sent.append(len(events))
+        api.flush_events = run
+
+        event_synchronizer = EventSynchronizerAsync(api, storage, 5)
+        await event_synchronizer.synchronize_events()
+        assert self.sent == [5, 5, 2]
+        assert await storage.pop_many(100) == []
@@ -0,0 +1,217 @@
+"""Host-local synchronization tests."""
+# pylint: disable=no-self-use,protected-access
+import multiprocessing
+import os
+import threading
+import pytest
+
+from splitio.models import splits
+from splitio.models.events import Event
+from splitio.models.impressions import Impression
+from splitio.models.segments import Segment
+from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage, InMemoryImpressionStorage, \
+    InMemoryEventStorage
+from splitio.storage.snapshot import StorageSnapshot
+from splitio.sync.host import HostLeaderLock, ForwardingServer, Forwarder, ForwardingImpressionsAPI, \
+    ForwardingEventsAPI, HostSyncManager
+from tests.storage.test_snapshot import _raw_flag
+
+
+def _hold_lock(lock_path, acquired, release):
+    """Take the leader lock in another process and hold it until told to release it."""
+    lock = HostLeaderLock(lock_path)
+    if lock.acquire():
+        acquired.set()
+        release.wait(10)
+
+
+def _forward_impressions(socket_path, process, bulks, bulk_size):
+    """Forward bulks of impressions from another process."""
+    forwarder = Forwarder(socket_path)
+    for bulk in range(bulks):
+        forwarder.send('impressions', [
+            list(Impression('key_%d_%d_%d' % (process, bulk, index), 'flag', 'on', 'label', 123, None, 456))
+            for index in range(bulk_size)
+        ])
+
+
+def _storages(mocker, queue_size=100):
+    return {
+        'splits': InMemorySplitStorage(),
+        'segments': InMemorySegmentStorage(),
+        'impressions': InMemoryImpressionStorage(queue_size, mocker.Mock()),
+        'events': InMemoryEventStorage(queue_size, mocker.Mock()),
+    }
+
+
+class HostLeaderLockTests(object):
+    """Host leader lock test cases."""
+
+    def test_acquire_release(self, tmp_path):
+        """Test a single lock holder at a time."""
+        path = str(tmp_path / 'split.lock')
+        leader, follower = HostLeaderLock(path), HostLeaderLock(path)
+        assert leader.acquire()
+        assert leader.is_leader
+        assert not follower.acquire()
+        assert not follower.is_leader
+
+        leader.release()
+        assert not leader.is_leader
+        assert follower.acquire()
+        with open(path) as lock_file:
+            assert lock_file.read() == str(os.getpid())
+
+    def test_failover(self, tmp_path):
+        """Test the lock is taken over once the leader process exits."""
+        path = str(tmp_path / 'split.lock')
+        acquired, release = multiprocessing.Event(), multiprocessing.Event()
+        leader = multiprocessing.Process(target=_hold_lock, args=(path, acquired, release))
+        leader.start()
+        assert acquired.wait(10)
+
+        follower = HostLeaderLock(path)
+        assert not follower.acquire()
+
+        release.set()
+        leader.join(10)
+        assert follower.acquire()
+
+
+class ForwardingTests(object):
+    """Impressions and events forwarding test cases."""
+
+    def test_forward(self, mocker, tmp_path):
+        """Test impressions and events are stored by the leader."""
+        socket_path = str(tmp_path / 'split.lock.sock')
+        storages = _storages(mocker)
+        server = ForwardingServer(socket_path, storages['impressions'], storages['events'])
+        server.start()
+        try:
+            forwarder = Forwarder(socket_path)
+            impressions = [Impression('key1', 'flag', 'on', 'label', 123, None, 456),
+                           Impression('key2', 'flag', 'off', 'label', 123, 'bucket', 456)]
+            forwarder.send('impressions', [list(impression) for impression in impressions])
+            forwarder.send('events', [list(Event('key1', 'user', 'purchase', 3.5, 123456, {'prop': 'value'}))])
+        finally:
+            server.stop()
+
+        assert storages['impressions'].pop_many(10) == impressions
+        assert storages['events'].pop_many(10) == [Event('key1', 'user', 'purchase', 3.5, 123456, {'prop': 'value'})]
+        assert not os.path.exists(socket_path)
+
+    def test_forward_queue_full(self, mocker, tmp_path):
+        """Test items the leader storage can't take are reported back to the follower."""
+        socket_path = str(tmp_path / 'split.lock.sock')
+        storages = _storages(mocker, queue_size=1)
+        server = ForwardingServer(socket_path, storages['impressions'], storages['events'])
+        server.start()
+        try:
+            forwarder = Forwarder(socket_path)
+            impressions = [Impression('key1', 'flag', 'on', 'label', 123, None, 456),
+                           Impression('key2', 'flag', 'off', 'label', 123, 'bucket', 456)]
+            with pytest.raises(OSError):
+                forwarder.send('impressions', [list(impression) for impression in impressions])
+        finally:
+            server.stop()
+
+    def test_forward_from_processes(self, mocker, tmp_path):
+        """Test impressions forwarded concurrently by several processes all reach the leader."""
+        socket_path = str(tmp_path / 'split.lock.sock')
+        storages = _storages(mocker, queue_size=100000)
+        server = ForwardingServer(socket_path, storages['impressions'], storages['events'])
+        server.start()
+        try:
+            followers = [multiprocessing.Process(target=_forward_impressions, args=(socket_path, process, 10, 1000))
+                         for process in range(4)]
+            for follower in followers:
+                follower.start()
+            for follower in followers:
+                follower.join(30)
+                assert follower.exitcode == 0
+        finally:
+            server.stop()
+
+        assert len(storages['impressions'].pop_many(100000)) == 40000
+
+    def test_apis(self, mocker):
+        """Test data is forwarded while following and posted while leading or when the leader is unreachable."""
+        leader_lock = mocker.Mock()
+        leader_lock.is_leader = False
+        forwarder = mocker.Mock()
+        impressions_api, events_api = mocker.Mock(), mocker.Mock()
+        impressions = ForwardingImpressionsAPI(impressions_api, leader_lock, forwarder)
+        events = ForwardingEventsAPI(events_api, leader_lock, forwarder)
+        impression = Impression('key1', 'flag', 'on', 'label', 123, None, 456)
+        event = Event('key1', 'user', 'purchase', 3.5, 123456, None)
+
+        impressions.flush_impressions([impression])
+        events.flush_events([event])
+        assert forwarder.send.mock_calls == [mocker.call('impressions', [list(impression)]), mocker.call('events', [list(event)])]
+        assert impressions_api.flush_impressions.mock_calls == []
+        assert events_api.flush_events.mock_calls == []
+
+        forwarder.send.side_effect = OSError('no leader')
+        impressions.flush_impressions([impression])
+        events.flush_events([event])
+        assert impressions_api.flush_impressions.mock_calls == [mocker.call([impression])]
+        assert events_api.flush_events.mock_calls == [mocker.call([event])]
+
+        forwarder.reset_mock()
+        leader_lock.is_leader = True
+        impressions.flush_impressions([impression])
+        impressions.flush_counters(['counter'])
+        assert forwarder.send.mock_calls == []
+        assert impressions_api.flush_counters.mock_calls == [mocker.call(['counter'])]
+
+
+class HostSyncManagerTests(object):
+    """Host sync manager test cases."""
+
+    def _manager(self, mocker, tmp_path, storages):
+        lock_path = str(tmp_path / 'split.lock')
+        return HostSyncManager(threading.Event(), mocker.Mock(), mocker.Mock(), HostLeaderLock(lock_path),
+                               StorageSnapshot(lock_path + '.snapshot', 'some_sdk_key'), storages, lock_path + '.sock', 1)
+
+    def test_lead_follow_and_take_over(self, mocker, tmp_path):
+        """Test a leader publishes storages to followers, which take over when it stops."""
+        leader_storages, follower_storages = _storages(mocker), _storages(mocker)
+        leader = self._manager(mocker, tmp_path, leader_storages)
+        follower = self._manager(mocker, tmp_path, follower_storages)
+
+        def sync_all(*_):
+            leader_storages['splits'].update([splits.from_raw(_raw_flag('flag1', 'employees'))], [], 123)
+            leader_storages['segments'].put(Segment('employees', ['key1'], 456))
+        leader._manager.start.side_effect = sync_all
+
+        leader.start(3)
+        follower.start(3)
+        try:
+            assert leader._manager.start.mock_calls == [mocker.call(3, True)]
+            assert leader._leader_lock.is_leader
+            assert os.path.exists(str(tmp_path / 'split.lock.sock'))
+
+            assert follower._manager.start.mock_calls == []
+            assert follower._synchronizer.start_periodic_data_recording.mock_calls == [mocker.call()]
+            assert follower._ready_flag.is_set()
+            assert follower_storages['splits'].get('flag1') is not None
+            assert follower_storages['segments'].segment_contains('employees', 'key1')
+
+            leader_storages['splits'].update([splits.from_raw(_raw_flag('flag2', 'employees'))], ['flag1'], 124)
+            leader._refresh()
+            follower._refresh()
+            assert follower_storages['splits'].get('flag1') is None
+            assert follower_storages['splits'].get('flag2') is not None
+            assert follower_storages['splits'].get_change_number() == 124
+
+            leader.stop(True)
+            assert leader._manager.stop.mock_calls == [mocker.call(True)]
+            assert not os.path.exists(str(tmp_path / 'split.lock.sock'))
+
+            follower._refresh()
+            assert follower._manager.start.mock_calls == [mocker.call(3, False)]
+            assert follower._leader_lock.is_leader
+        finally:
+            follower.stop(True)
+        assert follower._manager.stop.mock_calls == [mocker.call(True)]
+        assert follower._synchronizer.shutdown.mock_calls == []
@@ -8,6 +8,7 @@ from splitio.api.client import HttpResponse
 from splitio.api import APIException
 from splitio.storage import ImpressionStorage
 from splitio.models.impressions import Impression
+from splitio.storage.inmemmory import InMemoryImpressionStorage
 from splitio.sync.impression import ImpressionSynchronizer, ImpressionSynchronizerAsync
 
 
@@ -67,6 +68,38 @@ class ImpressionsSynchronizerTests(object):
         assert run._called == 1
         assert impression_synchronizer._failed.qsize() == 0
 
+    def test_synchronize_impressions_drains_full_bulks(self, mocker):
+        storage = InMemoryImpressionStorage(100, mocker.Mock())
+        storage.put([Impression('key%d' % i, 'split1', 'on', 'l1', 123456, 'b1', 321654) for i in range(12)])
+        api = mocker.Mock()
+
+        impression_synchronizer = ImpressionSynchronizer(api, storage, 5)
+        impression_synchronizer.synchronize_impressions()
+        assert [len(call[1][0]) for call in api.flush_impressions.mock_calls] == [5, 5, 2]
+        assert storage.pop_many(100) == []
+
+    def test_synchronize_impressions_error_backs_off(self, mocker):
+        storage = InMemoryImpressionStorage(100, mocker.Mock())
+        storage.put([Impression('key%d' % i, 'split1', 'on', 'l1', 123456, 'b1', 321654) for i in range(12)])
+        api = mocker.Mock()
+        api.flush_impressions.side_effect = APIException("something broke")
+
+        impression_synchronizer = ImpressionSynchronizer(api, storage, 8)
+        impression_synchronizer.synchronize_impressions()
+        assert len(api.flush_impressions.mock_calls) == 1  # no more bulks after a failure
+        assert impression_synchronizer._failed.qsize() == 8
+        assert impression_synchronizer._pacer.bulk_size == 4
+
+        impression_synchronizer.synchronize_impressions()
+        assert len(api.flush_impressions.mock_calls) == 2  # a single bulk per run while backing off
+        assert len(api.flush_impressions.mock_calls[1][1][0]) == 4
+
+        api.flush_impressions.side_effect = None
+        mocker.patch('splitio.sync.util.time.monotonic', return_value=time.monotonic() + 60)
+        impression_synchronizer.synchronize_impressions()
+        assert [len(call[1][0]) for call in api.flush_impressions.mock_calls[2:]] == [2, 4, 6]
+        assert impression_synchronizer._failed.qsize() == 0
+
 
 class ImpressionsSynchronizerAsyncTests(object):
     """Impressions synchronizer test cases."""
@@ -1,6 +1,7 @@
 """Split Worker tests."""
 
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 from splitio.util.backoff import Backoff
 from splitio.api import APIException
@@ -10,6 +11,7 @@ from splitio.storage.inmemmory import InMemorySegmentStorage, InMemorySegmentSto
 from splitio.sync.segment import SegmentSynchronizer, SegmentSynchronizerAsync, LocalSegmentSynchronizer, LocalSegmentSynchronizerAsync
 from splitio.models.segments import Segment
 from splitio.optional.loaders import aiofiles, asyncio
+from splitio.util.offload import LoopOffloader
 
 import pytest
 
@@ -33,6 +35,16 @@ class SegmentsSynchronizerTests(object):
         segments_synchronizer = SegmentSynchronizer(api, split_storage, storage)
         assert not segments_synchronizer.synchronize_segments()
 
+    def test_synchronize_segments_failed_result(self, mocker):
+        """A segment reported as not synchronized fails the whole run."""
+        split_storage = mocker.Mock(spec=SplitStorage)
+        split_storage.get_segment_names.return_value = ['segmentA', 'segmentB']
+        mocker.patch.object(SegmentSynchronizer, 'synchronize_segment', new=lambda self, segment_name: segment_name != 'segmentB')
+        segments_synchronizer = SegmentSynchronizer(mocker.Mock(), split_storage, mocker.Mock(spec=SegmentStorage))
+        assert not segments_synchronizer.synchronize_segments()
+        assert segments_synchronizer.synchronize_segments(['segmentA'])
+        segments_synchronizer.shutdown()
+
     def test_synchronize_segments(self, mocker):
         """Test the normal operation flow."""
         split_storage = mocker.Mock(spec=SplitStorage)
@@ -181,6 +193,71 @@ class SegmentsSynchronizerTests(object):
         assert mocker.call('segmentA', 12345, FetchOptions(True, 1234, None, None)) in api.fetch_segment.mock_calls
         assert len(api.fetch_segment.mock_calls) == 8 # 2 ok + BACKOFF(2 since==till + 2 re-attempts) + CDN(2 since==till)
 
+    def test_synchronize_segment_pages(self, mocker):
+        """Test consecutive pages of changes are stored with a single update."""
+        split_storage = mocker.Mock(spec=SplitStorage)
+        storage = InMemorySegmentStorage()
+        storage.put(Segment('segmentA', ['key1', 'key2'], 100))
+        pages = {
+            100: {'name': 'segmentA', 'added': ['key3', 'key4'], 'removed': ['key1'], 'since': 100, 'till': 101},
+            101: {'name': 'segmentA', 'added': ['key1'], 'removed': ['key3'], 'since': 101, 'till': 102},
+            102: {'name': 'segmentA', 'added': [], 'removed': [], 'since': 102, 'till': 102}
+        }
+        def fetch_segment(segment_name, change_number, fetch_options):
+            if change_number not in pages:
+                raise APIException('something broke')
+            return pages[change_number]
+        api = mocker.Mock()
+        api.fetch_segment.side_effect = fetch_segment
+        update = mocker.spy(storage, 'update')
+
+        segments_synchronizer = SegmentSynchronizer(api, split_storage, storage)
+        assert segments_synchronizer.synchronize_segment('segmentA')
+        assert len(api.fetch_segment.mock_calls) == 3
+        assert update.mock_calls == [mocker.call('segmentA', {'key1', 'key4'}, {'key3'}, 102)]
+        assert storage.get('segmentA').keys == {'key1', 'key2', 'key4'}
+
+        # progress is kept when a later page fails
+        pages[102] = {'name': 'segmentA', 'added': ['key5'], 'removed': [], 'since': 102, 'till': 103}
+        assert not segments_synchronizer.synchronize_segments(['segmentA'])
+        assert storage.get('segmentA').keys == {'key1', 'key2', 'key4', 'key5'}
+        assert storage.get_change_number('segmentA') == 103
+
+    def test_synchronize_segment_unchanged(self, mocker):
+        """Test a response without changes doesn't touch the storage."""
+        storage = InMemorySegmentStorage()
+        storage.put(Segment('segmentA', ['key1'], 100))
+        api = mocker.Mock()
+        api.fetch_segment.return_value = {'name': 'segmentA', 'added': [], 'removed': [], 'since': 100, 'till': 100}
+        update = mocker.spy(storage, 'update')
+
+        segments_synchronizer = SegmentSynchronizer(api, mocker.Mock(spec=SplitStorage), storage)
+        assert segments_synchronizer.synchronize_segment('segmentA')
+        assert len(api.fetch_segment.mock_calls) == 1
+        assert update.mock_calls == []
+        assert storage.get_change_number('segmentA') == 100
+
+    def test_synchronize_segments_throttled(self, mocker):
+        """Test concurrent fetches are reduced when the backend throttles requests."""
+        split_storage = mocker.Mock(spec=SplitStorage)
+        split_storage.get_segment_names.return_value = ['segmentA']
+
+        storage = mocker.Mock(spec=SegmentStorage)
+        storage.get_change_number.return_value = -1
+
+        api = mocker.Mock()
+        api.fetch_segment.side_effect = APIException("too many requests", 429)
+        segments_synchronizer = SegmentSynchronizer(api, split_storage, storage)
+        assert not segments_synchronizer.synchronize_segments()
+        assert len(api.fetch_segment.mock_calls) == 4  # 3 retries once throttled
+        assert segments_synchronizer._fetch_limit.limit == 1
+        assert segments_synchronizer._fetch_limit._in_flight == 0
+
+        api.fetch_segment.side_effect = [APIException("too many requests", 429),
+                                         {'name': 'segmentA', 'added': [], 'removed': [], 'since': 123, 'till': 123}]
+        storage.get_change_number.return_value = 123
+        assert segments_synchronizer.synchronize_segments()
+
     def test_recreate(self, mocker):
         """Test recreate logic."""
         segments_synchronizer = SegmentSynchronizer(mocker.Mock(), mocker.Mock(), mocker.Mock())
@@ -412,6 +489,27 @@ class SegmentsSynchronizerAsyncTests(object):
         assert len(self.segment) == 8 # 2 ok + BACKOFF(2 since==till + 2 re-attempts) + CDN(2 since==till)
         await segments_synchronizer.shutdown()
 
+    @pytest.mark.asyncio
+    async def test_synchronize_segments_throttled(self, mocker):
+        """Test concurrent fetches are reduced when the backend throttles requests."""
+        split_storage = mocker.Mock(spec=SplitStorage)
+        storage = mocker.Mock(spec=SegmentStorage)
+        async def get_change_number(*args):
+            return -1
+        storage.get_change_number = get_change_number
+
+        api = mocker.Mock()
+        async def run(*args):
+            raise APIException("too many requests", 429)
+        api.fetch_segment = run
+
+        segments_synchronizer = SegmentSynchronizerAsync(api, split_storage, storage)
+        assert await segments_synchronizer.synchronize_segments(['segmentA'], True)
+        assert not await segments_synchronizer.synchronize_segments(['segmentB'])  # waits for segmentA too
+        assert segments_synchronizer._fetch_limit.limit == 1
+        assert segments_synchronizer._pending_jobs == []
+        await segments_synchronizer.shutdown()
+
     @pytest.mark.asyncio
     async def test_recreate(self, mocker):
         """Test recreate logic."""
@@ -535,6 +633,25 @@ class LocalSegmentsSynchronizerTests(object):
 
         os.remove("./segmentA.json")
 
+    def test_skips_unchanged_files(self, mocker, tmp_path):
+        """Test segment files are only read again once they're rewritten."""
+        segment_file = tmp_path / 'segmentA.json'
+        segment_file.write_text('{"name": "segmentA", "added": ["key1"], "removed": [], "since": -1, "till": 123}')
+        os.utime(segment_file, (1000, 1000))
+        storage = InMemorySegmentStorage()
+        segments_synchronizer = LocalSegmentSynchronizer(str(tmp_path), mocker.Mock(spec=InMemorySplitStorage), storage)
+        read = mocker.spy(segments_synchronizer, '_read_segment_from_json_file')
+
+        assert segments_synchronizer.synchronize_segments(['segmentA'])
+        assert segments_synchronizer.synchronize_segments(['segmentA'])
+        assert read.call_count == 1
+
+        segment_file.write_text('{"name": "segmentA", "added": ["key2"], "removed": [], "since": 123, "till": 124}')
+        os.utime(segment_file, (2000, 2000))
+        assert segments_synchronizer.synchronize_segments(['segmentA'])
+        assert read.call_count == 2
+        assert storage.get('segmentA').contains('key2')
+
     def test_json_elements_sanitization(self, mocker):
         """Test sanitization."""
         segment_synchronizer = LocalSegmentSynchronizer(mocker.Mock(), mocker.Mock(), mocker.Mock())
@@ -595,7 +712,7 @@ class LocalSegmentsSynchronizerTests(object):
         assert(segment_synchronizer._sanitize_segment(segment2) == segment3)
 
 
-class LocalSegmentsSynchronizerTests(object):
+class LocalSegmentsSynchronizerAsyncTests(object):
     """Segments synchronizer test cases."""
 
     @pytest.mark.asyncio
@@ -713,4 +830,36 @@ class LocalSegmentsSynchronizerTests(object):
         assert segment.contains('key2')
         assert segment.contains('key3')
 
-        os.remove("./segmentA.json")
\ No newline at end of file
+        os.remove("./segmentA.json")
+
+    @pytest.mark.asyncio
+    async def test_process_pool_offloader(self, mocker, tmp_path):
+        """Test segment files are parsed and hashed in a process pool."""
+        (tmp_path / 'segmentA.json').write_text('{"name": "segmentA", "added": ["key1"], "removed": [], "since": -1, "till": 123}')
+        storage = InMemorySegmentStorageAsync()
+        with ProcessPoolExecutor(1) as executor:
+            offloader = LoopOffloader(executor, offload_size=0)
+            segments_synchronizer = LocalSegmentSynchronizerAsync(str(tmp_path), mocker.Mock(spec=InMemorySplitStorageAsync), storage, offloader)
+            assert await segments_synchronizer.synchronize_segments(['segmentA'])
+
+        assert (await storage.get('segmentA')).contains('key1')
+
+    @pytest.mark.asyncio
+    async def test_skips_unchanged_files(self, mocker, tmp_path):
+        """Test segment files are only read again once they're rewritten."""
+        segment_file = tmp_path / 'segmentA.json'
+        segment_file.write_text('{"name": "segmentA", "added": ["key1"], "removed": [], "since": -1, "till": 123}')
+        os.utime(segment_file, (1000, 1000))
+        storage = InMemorySegmentStorageAsync()
+        segments_synchronizer = LocalSegmentSynchronizerAsync(str(tmp_path), mocker.Mock(spec=InMemorySplitStorageAsync), storage)
+        read = mocker.spy(segments_synchronizer, '_read_segment_from_json_file')
+
+        assert await segments_synchronizer.synchronize_segments(['segmentA'])
+        assert await segments_synchronizer.synchronize_segments(['segmentA'])
+        assert read.call_count == 1
+
+        segment_file.write_text('{"name": "segmentA", "added": ["key2"], "removed": [], "since": 123, "till": 124}')
+        os.utime(segment_file, (2000, 2000))
+        assert await segments_synchronizer.synchronize_segments(['segmentA'])
+        assert read.call_count == 2
+        assert (await storage.get('segmentA')).contains('key2')
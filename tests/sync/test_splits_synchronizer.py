@@ -837,6 +837,25 @@ class LocalSplitsSynchronizerTests(object):
 
         os.remove("./splits.json")
 
+    def test_skips_unchanged_file(self, mocker, tmp_path):
+        """Test the feature flags file is only read again once it's rewritten."""
+        split_file = tmp_path / 'splits.yaml'
+        split_file.write_text('- my_feature:\n    treatment: "on"\n')
+        os.utime(split_file, (1000, 1000))
+        storage = InMemorySplitStorage()
+        split_synchronizer = LocalSplitSynchronizer(str(split_file), storage)
+        read = mocker.spy(split_synchronizer, '_read_feature_flags_from_yaml_file')
+
+        split_synchronizer.synchronize_splits()
+        split_synchronizer.synchronize_splits()
+        assert read.call_count == 1
+
+        split_file.write_text('- other_feature:\n    treatment: "off"\n')
+        os.utime(split_file, (2000, 2000))
+        split_synchronizer.synchronize_splits()
+        assert read.call_count == 2
+        assert storage.get_split_names() == ['other_feature']
+
     def test_json_elements_sanitization(self, mocker):
         """Test sanitization."""
         split_synchronizer = LocalSplitSynchronizer(mocker.Mock(), mocker.Mock(), mocker.Mock())
@@ -1158,3 +1177,23 @@ class LocalSplitsSynchronizerAsyncTests(object):
         assert inserted_split.name == 'some_name'
 
         os.remove("./splits.json")
+
+    @pytest.mark.asyncio
+    async def test_skips_unchanged_file(self, mocker, tmp_path):
+        """Test the feature flags file is only read again once it's rewritten."""
+        split_file = tmp_path / 'splits.yaml'
+        split_file.write_text('- my_feature:\n    treatment: "on"\n')
+        os.utime(split_file, (1000, 1000))
+        storage = InMemorySplitStorageAsync()
+        split_synchronizer = LocalSplitSynchronizerAsync(str(split_file), storage)
+        read = mocker.spy(split_synchronizer, '_read_feature_flags_from_yaml_file')
+
+        await split_synchronizer.synchronize_splits()
+        await split_synchronizer.synchronize_splits()
+        assert read.call_count == 1
+
+        split_file.write_text('- other_feature:\n    treatment: "off"\n')
+        os.utime(split_file, (2000, 2000))
+        await split_synchronizer.synchronize_splits()
+        assert read.call_count == 2
+        assert await storage.get_split_names() == ['other_feature']
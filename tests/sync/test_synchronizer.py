@@ -1,6 +1,7 @@
 """Synchronizer tests."""
 
 from turtle import clear
+import copy
 import unittest.mock as mock
 import pytest
 
@@ -50,6 +51,17 @@ splits = [{
     }]
 }]
 
+def _paged_splits():
+    """Return two pages of feature flags, the first one referencing segmentA and the second one segmentB."""
+    first, second = copy.deepcopy(splits[0]), copy.deepcopy(splits[0])
+    second['name'] = 'other_name'
+    second['conditions'][0]['matcherGroup']['matchers'][0]['userDefinedSegmentMatcherData']['segmentName'] = 'segmentB'
+    return {
+        -1: {'splits': [first], 'since': -1, 'till': 1},
+        1: {'splits': [second], 'since': 1, 'till': 2},
+        2: {'splits': [], 'since': 2, 'till': 2}
+    }
+
 class SynchronizerTests(object):
     def test_sync_all_failed_splits(self, mocker):
         api = mocker.Mock()
@@ -122,6 +134,23 @@ class SynchronizerTests(object):
         sychronizer.sync_all(1)  # SyncAll should not throw!
         assert not sychronizer._synchronize_segments()
 
+    def test_synchronize_segment_unreferenced(self, mocker):
+        split_storage = mocker.Mock(spec=SplitStorage)
+        split_storage.get_segment_names.return_value = {'segmentA'}
+        split_sync = mocker.Mock(spec=SplitSynchronizer)
+        split_sync.feature_flag_storage = split_storage
+        segment_sync = mocker.Mock(spec=SegmentSynchronizer)
+        segment_sync.synchronize_segment.return_value = True
+        split_synchronizers = SplitSynchronizers(split_sync, segment_sync, mocker.Mock(),
+                                                 mocker.Mock(), mocker.Mock())
+        synchronizer = Synchronizer(split_synchronizers, mocker.Mock(spec=SplitTasks))
+
+        assert synchronizer.synchronize_segment('segmentB', 123)
+        assert segment_sync.synchronize_segment.mock_calls == []
+
+        assert synchronizer.synchronize_segment('segmentA', 123)
+        assert segment_sync.synchronize_segment.mock_calls == [mocker.call('segmentA', 123)]
+
     def test_synchronize_splits(self, mocker):
         split_storage = InMemorySplitStorage()
         split_api = mocker.Mock()
@@ -211,6 +240,38 @@ class SynchronizerTests(object):
         assert inserted_segment[1] == ['key1', 'key2', 'key3']
         assert inserted_segment[2] == []
 
+    def test_sync_all_segments_per_page(self, mocker):
+        """Test segments start synchronizing as soon as their page of feature flags is stored, and only once."""
+        split_storage = InMemorySplitStorage()
+        segment_storage = InMemorySegmentStorage()
+        pages = _paged_splits()
+        segment_api = mocker.Mock()
+        segment_api.fetch_segment.side_effect = lambda name, change_number, options: {
+            'name': name, 'added': ['key1'], 'removed': [], 'since': change_number, 'till': 10}
+        segment_sync = SegmentSynchronizer(segment_api, split_storage, segment_storage)
+        scheduled = mocker.spy(segment_sync, 'synchronize_segments')
+
+        self.scheduled_before_page = {}
+        def fetch_splits(change_number, options):
+            self.scheduled_before_page[change_number] = [call[1] for call in scheduled.mock_calls]
+            return pages[change_number]
+        split_api = mocker.Mock()
+        split_api.fetch_splits.side_effect = fetch_splits
+
+        split_sync = SplitSynchronizer(split_api, split_storage)
+        split_synchronizers = SplitSynchronizers(split_sync, segment_sync, mocker.Mock(),
+                                                 mocker.Mock(), mocker.Mock())
+        synchronizer = Synchronizer(split_synchronizers, mocker.Mock(spec=SplitTasks))
+        synchronizer.sync_all()
+
+        assert self.scheduled_before_page[1] == [(['segmentA'], True)]
+        assert self.scheduled_before_page[2] == [(['segmentA'], True), (['segmentB'], True)]
+        assert segment_storage.get('segmentA').keys == {'key1'}
+        assert segment_storage.get('segmentB').keys == {'key1'}
+        assert sorted(call[1][:2] for call in segment_api.fetch_segment.mock_calls) == \
+            [('segmentA', -1), ('segmentA', 10), ('segmentB', -1), ('segmentB', 10)]
+        segment_sync.shutdown()
+
     def test_start_periodic_fetching(self, mocker):
         split_task = mocker.Mock(spec=SplitSynchronizationTask)
         segment_task = mocker.Mock(spec=SegmentSynchronizationTask)
@@ -615,6 +676,39 @@ class SynchronizerAsyncTests(object):
         assert self.inserted_segment[1] == ['key1', 'key2', 'key3']
         assert self.inserted_segment[2] == []
 
+    @pytest.mark.asyncio
+    async def test_sync_all_segments_per_page(self, mocker):
+        """Test segments start synchronizing as soon as their page of feature flags is stored, and only once."""
+        split_storage = InMemorySplitStorageAsync()
+        segment_storage = InMemorySegmentStorageAsync()
+        pages = _paged_splits()
+        self.fetched_segments = []
+        async def fetch_segment(name, change_number, options):
+            self.fetched_segments.append((name, change_number))
+            return {'name': name, 'added': ['key1'], 'removed': [], 'since': change_number, 'till': 10}
+        segment_api = mocker.Mock()
+        segment_api.fetch_segment = fetch_segment
+        segment_sync = SegmentSynchronizerAsync(segment_api, split_storage, segment_storage)
+
+        self.scheduled_before_page = {}
+        async def fetch_splits(change_number, options):
+            self.scheduled_before_page[change_number] = len(segment_sync._pending_jobs)
+            return pages[change_number]
+        split_api = mocker.Mock()
+        split_api.fetch_splits = fetch_splits
+
+        split_sync = SplitSynchronizerAsync(split_api, split_storage)
+        split_synchronizers = SplitSynchronizers(split_sync, segment_sync, mocker.Mock(),
+                                                 mocker.Mock(), mocker.Mock())
+        synchronizer = SynchronizerAsync(split_synchronizers, mocker.Mock(spec=SplitTasks))
+        await synchronizer.sync_all()
+
+        assert self.scheduled_before_page[1] == 1
+        assert (await segment_storage.get('segmentA')).keys == {'key1'}
+        assert (await segment_storage.get('segmentB')).keys == {'key1'}
+        assert sorted(self.fetched_segments) == [('segmentA', -1), ('segmentA', 10), ('segmentB', -1), ('segmentB', 10)]
+        await segment_sync.shutdown()
+
     @pytest.mark.asyncio
     async def test_start_periodic_fetching(self, mocker):
         split_task = mocker.Mock(spec=SplitSynchronizationTask)
@@ -7,7 +7,8 @@ from splitio.engine.telemetry import TelemetryStorageConsumer, TelemetryStorageC
 from splitio.storage.inmemmory import InMemoryTelemetryStorage, InMemoryTelemetryStorageAsync, InMemorySegmentStorage, InMemorySegmentStorageAsync, InMemorySplitStorage, InMemorySplitStorageAsync
 from splitio.models.splits import Split, Status
 from splitio.models.segments import Segment
-from splitio.models.telemetry import StreamingEvents, StreamingEventsAsync
+from splitio.models.telemetry import StreamingEvents, StreamingEventsAsync, CounterConstants, UpdateFromSSE, \
+    MethodExceptionsAndLatencies, HTTPExceptionsAndLatencies
 from splitio.api.telemetry import TelemetryAPI
 
 class TelemetrySynchronizerTests(object):
@@ -63,15 +64,15 @@ class TelemetrySubmitterTests(object):
         segment_storage.put(Segment('segment1', [], 123))
         telemetry_submitter = InMemoryTelemetrySubmitter(telemetry_consumer, split_storage, segment_storage, api)
 
-        telemetry_storage._counters._impressions_queued = 100
-        telemetry_storage._counters._impressions_deduped = 30
-        telemetry_storage._counters._impressions_dropped = 0
-        telemetry_storage._counters._events_queued = 20
-        telemetry_storage._counters._events_dropped = 10
-        telemetry_storage._counters._auth_rejections = 1
-        telemetry_storage._counters._token_refreshes = 3
-        telemetry_storage._counters._session_length = 3
-        telemetry_storage._counters._update_from_sse['sp'] = 3
+        telemetry_storage.record_impression_stats(CounterConstants.IMPRESSIONS_QUEUED, 100)
+        telemetry_storage.record_impression_stats(CounterConstants.IMPRESSIONS_DEDUPED, 30)
+        telemetry_storage.record_event_stats(CounterConstants.EVENTS_QUEUED, 20)
+        telemetry_storage.record_event_stats(CounterConstants.EVENTS_DROPPED, 10)
+        telemetry_storage.record_auth_rejections()
+        [telemetry_storage.record_token_refreshes() for _ in range(3)]
+        telemetry_storage.record_session_length(3)
+        telemetry_storage.record_update_from_sse(UpdateFromSSE.SPLIT_UPDATE, 3)
+        telemetry_storage.record_update_from_sse(UpdateFromSSE.SPLIT_UPDATE_COALESCED, 2)  # not reported
 
         telemetry_storage._method_exceptions._treatment =  10
         telemetry_storage._method_exceptions._treatments = 1
@@ -102,23 +103,11 @@ class TelemetrySubmitterTests(object):
         telemetry_storage._streaming_events = StreamingEvents()
         telemetry_storage._tags = ['tag1']
 
-        telemetry_storage._method_latencies._treatment = [1] + [0] * 22
-        telemetry_storage._method_latencies._treatments = [0] * 23
-        telemetry_storage._method_latencies._treatment_with_config = [0] * 23
-        telemetry_storage._method_latencies._treatments_with_config = [0] * 23
-        telemetry_storage._method_latencies._treatments_by_flag_set = [1] + [0] * 22
-        telemetry_storage._method_latencies._treatments_by_flag_sets = [0] * 23
-        telemetry_storage._method_latencies._treatments_with_config_by_flag_set = [1] + [0] * 22
-        telemetry_storage._method_latencies._treatments_with_config_by_flag_sets = [0] * 23
-        telemetry_storage._method_latencies._track = [0] * 23
-
-        telemetry_storage._http_latencies._split = [1] + [0] * 22
-        telemetry_storage._http_latencies._segment = [0] * 23
-        telemetry_storage._http_latencies._impression = [0] * 23
-        telemetry_storage._http_latencies._impression_count = [0] * 23
-        telemetry_storage._http_latencies._event = [0] * 23
-        telemetry_storage._http_latencies._telemetry = [0] * 23
-        telemetry_storage._http_latencies._token =  [0] * 23
+        telemetry_storage.record_latency(MethodExceptionsAndLatencies.TREATMENT, 0)
+        telemetry_storage.record_latency(MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET, 0)
+        telemetry_storage.record_latency(MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET, 0)
+
+        telemetry_storage.record_sync_latency(HTTPExceptionsAndLatencies.SPLIT, 10)
 
         telemetry_storage.record_config({'operationMode': 'inmemory',
                                          'storageType': None,
@@ -227,23 +216,11 @@ class TelemetrySubmitterAsyncTests(object):
         telemetry_storage._streaming_events = await StreamingEventsAsync.create()
         telemetry_storage._tags = ['tag1']
 
-        telemetry_storage._method_latencies._treatment = [1] + [0] * 22
-        telemetry_storage._method_latencies._treatments = [0] * 23
-        telemetry_storage._method_latencies._treatment_with_config = [0] * 23
-        telemetry_storage._method_latencies._treatments_with_config = [0] * 23
-        telemetry_storage._method_latencies._treatments_by_flag_set = [1] + [0] * 22
-        telemetry_storage._method_latencies._treatments_by_flag_sets = [0] * 23
-        telemetry_storage._method_latencies._treatments_with_config_by_flag_set = [1] + [0] * 22
-        telemetry_storage._method_latencies._treatments_with_config_by_flag_sets = [0] * 23
-        telemetry_storage._method_latencies._track = [0] * 23
-
-        telemetry_storage._http_latencies._split = [1] + [0] * 22
-        telemetry_storage._http_latencies._segment = [0] * 23
-        telemetry_storage._http_latencies._impression = [0] * 23
-        telemetry_storage._http_latencies._impression_count = [0] * 23
-        telemetry_storage._http_latencies._event = [0] * 23
-        telemetry_storage._http_latencies._telemetry = [0] * 23
-        telemetry_storage._http_latencies._token =  [0] * 23
+        await telemetry_storage.record_latency(MethodExceptionsAndLatencies.TREATMENT, 0)
+        await telemetry_storage.record_latency(MethodExceptionsAndLatencies.TREATMENTS_BY_FLAG_SET, 0)
+        await telemetry_storage.record_latency(MethodExceptionsAndLatencies.TREATMENTS_WITH_CONFIG_BY_FLAG_SET, 0)
+
+        await telemetry_storage.record_sync_latency(HTTPExceptionsAndLatencies.SPLIT, 10)
 
         await telemetry_storage.record_config({'operationMode': 'inmemory',
                                          'storageType': None,
@@ -52,7 +52,7 @@ class UniqueKeysSynchronizerTests(object):
         clear_filter_sync = ClearFilterSynchronizer(unique_keys_tracker)
         clear_filter_sync.clear_all()
         for i in range(0 , total_mtks):
-            assert(not unique_keys_tracker._filter.contains('feature1key'+str(i)))
+            assert(unique_keys_tracker.track('key'+str(i), 'feature1'))
 
 
 class UniqueKeysSynchronizerAsyncTests(object):
@@ -103,4 +103,4 @@ class UniqueKeysSynchronizerAsyncTests(object):
         clear_filter_sync = ClearFilterSynchronizerAsync(unique_keys_tracker)
         await clear_filter_sync.clear_all()
         for i in range(0 , total_mtks):
-            assert(not unique_keys_tracker._filter.contains('feature1key'+str(i)))
\ No newline at end of file
+            assert(await unique_keys_tracker.track('key'+str(i), 'feature1'))
\ No newline at end of file
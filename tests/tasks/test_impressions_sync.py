@@ -76,7 +76,8 @@ class ImpressionsSyncTaskAsyncTests(object):
             return  HttpResponse(200, '', {})
         api.flush_impressions = flush_impressions
 
-        impression_synchronizer = ImpressionSynchronizerAsync(api, storage, 5)
+        # bulks aren't filled, so each run pops once instead of draining the mocked storage
+        impression_synchronizer = ImpressionSynchronizerAsync(api, storage, 10)
         task = impressions_sync.ImpressionsSyncTaskAsync(
             impression_synchronizer.synchronize_impressions,
             1
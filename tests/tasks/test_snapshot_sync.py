@@ -0,0 +1,44 @@
+"""Storage snapshot task test module."""
+import asyncio
+import threading
+import time
+import pytest
+
+from splitio.tasks.snapshot_sync import SnapshotSyncTask, SnapshotSyncTaskAsync
+
+
+class SnapshotSyncTests(object):
+    """Snapshot task test cases."""
+
+    def test_normal_operation(self, mocker):
+        """Test that the task saves periodically and once more when stopped."""
+        save = mocker.Mock()
+        task = SnapshotSyncTask(save, 1)
+        task.start()
+        time.sleep(1.5)
+        assert task.is_running()
+        assert len(save.mock_calls) == 1
+        stop_event = threading.Event()
+        task.stop(stop_event)
+        stop_event.wait(5)
+        assert stop_event.is_set()
+        assert len(save.mock_calls) == 2
+
+
+class SnapshotSyncAsyncTests(object):
+    """Snapshot async task test cases."""
+
+    @pytest.mark.asyncio
+    async def test_normal_operation(self, mocker):
+        """Test that the task saves periodically and once more when stopped."""
+        calls = []
+        async def save():
+            calls.append(1)
+        task = SnapshotSyncTaskAsync(save, 1)
+        task.start()
+        await asyncio.sleep(1.5)
+        assert task.is_running()
+        assert len(calls) == 1
+        await task.stop()
+        assert not task.is_running()
+        assert len(calls) == 2
@@ -51,8 +51,8 @@ class ClearFilterSyncTests(object):
         task.start()
         time.sleep(2)
         assert task.is_running()
-        assert not unique_keys_tracker._filter.contains("split1key1")
-        assert not unique_keys_tracker._filter.contains("split1key2")
+        assert unique_keys_tracker.track("key1", "split1")
+        assert unique_keys_tracker.track("key2", "split1")
         stop_event = threading.Event()
         task.stop(stop_event)
         stop_event.wait(5)
@@ -96,7 +96,7 @@ class ClearFilterSyncTests(object):
         task.start()
         await asyncio.sleep(2)
         assert task.is_running()
-        assert not unique_keys_tracker._filter.contains("split1key1")
-        assert not unique_keys_tracker._filter.contains("split1key2")
+        assert await unique_keys_tracker.track("key1", "split1")
+        assert await unique_keys_tracker.track("key2", "split1")
         await task.stop()
         assert not task.is_running()
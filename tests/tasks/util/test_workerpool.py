@@ -75,6 +75,52 @@ class WorkerPoolTests(object):
         assert len(worker.worked) == 100
 
 
+    def test_futures(self):
+        """Test each submitted message reports its own result, error and latency."""
+        def do_work(work):
+            if work == 'fail':
+                raise ValueError('something')
+            time.sleep(0.05)
+            return work.upper()
+
+        wpool = workerpool.WorkerPool(5, do_work)
+        wpool.start()
+        single = wpool.submit_work('single')
+        batch = wpool.submit_many(['a', 'b', 'c'])
+        assert wpool.wait_for(batch)
+        assert [future.result() for future in batch] == ['A', 'B', 'C']
+        assert all(future.latency >= 0.05 for future in batch)
+        assert single.result(1) == 'SINGLE'
+
+        failed = wpool.submit_many(['d', 'fail'])
+        assert not wpool.wait_for(failed)
+        assert failed[0].result() == 'D'
+        assert isinstance(failed[1].exception(), ValueError)
+        assert not wpool.wait_for_completion()  # tracked failures are only reported by their futures
+
+        wpool.submit_work('fail')
+        assert wpool.wait_for_completion()
+        assert not wpool.wait_for_completion()  # reported once
+
+        stop_event = threading.Event()
+        wpool.stop(stop_event)
+        assert stop_event.wait(5)
+
+    def test_idle_stop_is_immediate(self, mocker):
+        """Test idle workers block on the queue and shut down as soon as stop is called."""
+        wpool = workerpool.WorkerPool(10, mocker.Mock())
+        wpool.start()
+        time.sleep(0.1)
+        started = time.monotonic()
+        stop_event = threading.Event()
+        wpool.stop(stop_event)
+        assert stop_event.wait(5)
+        assert time.monotonic() - started < 0.4
+        for thread in wpool._threads:
+            thread.join(1)
+            assert not thread.is_alive()
+
+
 class WorkerPoolAsyncTests(object):
     """Worker pool async test cases."""
 
@@ -0,0 +1,72 @@
+"""Adaptive concurrency limit tests."""
+import threading
+import time
+import pytest
+
+from splitio.api import APIException
+from splitio.util.concurrency import AdaptiveLimit, AdaptiveLimitAsync
+from splitio.optional.loaders import asyncio
+
+
+class AdaptiveLimitTests(object):
+    """Adaptive limit test cases."""
+
+    def test_increase_and_decrease(self):
+        """Test the limit grows with fast requests, shrinks when slow and halves when throttled."""
+        limit = AdaptiveLimit(2, 1, 4)
+        for _ in range(20):
+            limit.acquire()
+            limit.release(0.01)
+        assert limit.limit == 4
+
+        limit.acquire()
+        limit.release(1)
+        assert limit.limit == 3
+
+        limit.acquire()
+        limit.release(throttled=True)
+        assert limit.limit == 1
+
+        limit.acquire()
+        limit.release(throttled=True)
+        assert limit.limit == 1
+
+    def test_is_throttled(self):
+        """Test throttling is detected from the api exception status code."""
+        assert AdaptiveLimit.is_throttled(APIException('too many requests', 429))
+        assert not AdaptiveLimit.is_throttled(APIException('something broke', 500))
+        assert not AdaptiveLimit.is_throttled(ValueError())
+
+    def test_acquire_blocks(self):
+        """Test no more requests than the limit run at the same time."""
+        limit = AdaptiveLimit(1, 1, 1)
+        limit.acquire()
+        acquired = threading.Event()
+
+        def worker():
+            limit.acquire()
+            acquired.set()
+
+        threading.Thread(target=worker, daemon=True).start()
+        assert not acquired.wait(0.2)
+        limit.release(0.01)
+        assert acquired.wait(1)
+
+
+class AdaptiveLimitAsyncTests(object):
+    """Adaptive limit async test cases."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_blocks(self):
+        """Test no more requests than the limit run at the same time."""
+        limit = AdaptiveLimitAsync(1, 1, 2)
+        await limit.acquire()
+        task = asyncio.get_running_loop().create_task(limit.acquire())
+        await asyncio.sleep(0.1)
+        assert not task.done()
+
+        await limit.release(throttled=True)
+        await asyncio.wait_for(task, 1)
+        assert limit.limit == 1
+        await limit.release(0.01)
+        assert limit.limit == 2
@@ -0,0 +1,73 @@
+"""Event loop offloading unit tests."""
+import threading
+import pytest
+
+from splitio.optional.loaders import asyncio
+from splitio.util.offload import LoopOffloader, LoopLagMonitor
+
+
+class LoopOffloaderTests(object):
+    """Loop offloader test cases."""
+
+    @pytest.mark.asyncio
+    async def test_apply_in_slices(self, mocker):
+        """Test every item is processed and the loop is yielded once the budget is spent."""
+        offloader = LoopOffloader(budget=0)
+        processed = []
+        sleep = mocker.spy(asyncio, 'sleep')
+        await offloader.apply_in_slices(processed.extend, range(25000))
+        assert processed == list(range(25000))
+        assert sleep.call_count >= 2
+
+        processed = []
+        await offloader.apply_in_slices(processed.extend, [])
+        assert processed == []
+
+    @pytest.mark.asyncio
+    async def test_decode_json(self, mocker):
+        """Test small bodies are parsed on the loop and large ones in the executor."""
+        offloader = LoopOffloader(offload_size=10)
+        run = mocker.spy(offloader, 'run')
+        assert await offloader.decode_json('{"a": 1}') == {'a': 1}
+        assert run.call_count == 0
+
+        assert await offloader.decode_json('{"a": [1, 2, 3]}') == {'a': [1, 2, 3]}
+        assert run.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_run(self):
+        """Test functions run in the executor."""
+        offloader = LoopOffloader()
+        thread = await offloader.run(threading.current_thread)
+        assert thread is not threading.current_thread()
+        assert await offloader.run(divmod, 7, 2) == (3, 1)
+
+
+class LoopLagMonitorTests(object):
+    """Loop lag monitor test cases."""
+
+    def test_record(self, mocker):
+        """Test lags are tracked and warned about above the threshold."""
+        logger = mocker.patch('splitio.util.offload._LOGGER')
+        monitor = LoopLagMonitor(0.1)
+        monitor.record(0.05)
+        monitor.record(0.2)
+        monitor.record(-0.01)
+        assert logger.warning.mock_calls == [mocker.call('Event loop was blocked for %d ms', 200)]
+        assert monitor.pop_stats() == {'last': 0, 'max': 200}
+        assert monitor.pop_stats() == {'last': 0, 'max': 0}
+
+    @pytest.mark.asyncio
+    async def test_start_stop(self, mocker):
+        """Test the monitor measures until stopped."""
+        monitor = LoopLagMonitor(1, interval=0.01)
+        record = mocker.spy(monitor, 'record')
+        monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+        calls = record.call_count
+        assert calls > 0
+
+        await asyncio.sleep(0.05)
+        assert record.call_count == calls
+        await monitor.stop()
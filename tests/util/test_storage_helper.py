@@ -1,7 +1,8 @@
 """Storage Helper tests."""
 import pytest
 
-from splitio.util.storage_helper import update_feature_flag_storage, get_valid_flag_sets, combine_valid_flag_sets
+from splitio.util.storage_helper import update_feature_flag_storage, get_valid_flag_sets, combine_valid_flag_sets, \
+    sort_segments_by_references
 from splitio.storage.inmemmory import InMemorySplitStorage
 from splitio.models import splits
 from splitio.storage import FlagSetsFilter
@@ -126,4 +127,13 @@ class StorageHelperTests(object):
         assert combine_valid_flag_sets(results_set) == {'set2', 'set3'}
 
         results_set = ['set1', {'set2', 'set3'}]
-        assert combine_valid_flag_sets(results_set) == {'set2', 'set3'}
\ No newline at end of file
+        assert combine_valid_flag_sets(results_set) == {'set2', 'set3'}
+
+    def test_sort_segments_by_references(self, mocker):
+        feature_flags = [mocker.Mock(), mocker.Mock(), mocker.Mock()]
+        feature_flags[0].get_segment_names.return_value = ['segmentB', 'segmentB', 'segmentA']
+        feature_flags[1].get_segment_names.return_value = ['segmentA']
+        feature_flags[2].get_segment_names.return_value = ['segmentC', 'segmentA']
+
+        assert sort_segments_by_references(feature_flags, {'segmentA', 'segmentB', 'segmentC', 'segmentD'}) == \
+            ['segmentA', 'segmentB', 'segmentC', 'segmentD']